@@ -3,25 +3,33 @@ import uuid
 from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Tuple
 
 from actors.cloud_base import CloudBase
+from actors2.telemetry_compression import reconstruct
 from actors.utils import QOS
 from actors.utils import Subscription
 from actors.utils import responsive_sleep
+from config import CompressionMethod
 from config import ScadaSettings
 from data_classes.components.boolean_actuator_component import BooleanActuatorComponent
 from data_classes.hardware_layout import HardwareLayout
 from data_classes.sh_node import ShNode
 from proactor import Message
 from schema.enums import Role
+from schema.enums import TelemetryName
 from schema.messages import GsPwr
 from schema.messages import GsPwr_Maker
 from schema.messages import GtDispatchBoolean_Maker
 from schema.messages import GtShCliAtnCmd_Maker
+from schema.messages import GtShCliSnapshotDeltaCmd_Maker
+from schema.messages import GtShCliStatusBackfillCmd_Maker
 from schema.messages import GtShStatus
 from schema.messages import GtShStatus_Maker
+from schema.messages import GtShStatusCompact
 from schema.messages import SnapshotSpaceheat
 from schema.messages import SnapshotSpaceheat_Maker
+from schema.messages import SnapshotSpaceheatDelta
 
 
 class Atn(CloudBase):
@@ -54,6 +62,10 @@ class Atn(CloudBase):
         for node in self.power_nodes:
             self.latest_power_w[node] = None
         self.latest_status: Optional[GtShStatus] = None
+        self.latest_compact_status: Optional[GtShStatusCompact] = None
+        # Latest values assembled from snapshot deltas, and the Seq of the last delta applied.
+        self.snapshot_values: Dict[Tuple[str, TelemetryName], int] = {}
+        self.snapshot_seq = 0
         self.status_output_dir = self.settings.paths.data_dir / "status"
         self.status_output_dir.mkdir(parents=True, exist_ok=True)
         self.log_csv = str(self.settings.paths.log_dir / f"atn_{str(uuid.uuid4()).split('-')[1]}.csv")
@@ -87,8 +99,12 @@ class Atn(CloudBase):
             self.gs_pwr_received(payload)
         elif isinstance(payload, SnapshotSpaceheat):
             self.gt_sh_cli_scada_response_received(payload)
+        elif isinstance(payload, SnapshotSpaceheatDelta):
+            self.snapshot_delta_received(payload)
         elif isinstance(payload, GtShStatus):
             self.gt_sh_status_received(payload)
+        elif isinstance(payload, GtShStatusCompact):
+            self.latest_compact_status = payload
         else:
             self.screen_print(f"{payload} subscription not implemented!")
 
@@ -97,7 +113,9 @@ class Atn(CloudBase):
         self.total_power_w = self.latest_power_w
 
     def gt_sh_status_received(self, payload: GtShStatus):
-        self.latest_status = payload
+        # A backfilled status is written out but does not replace a later one.
+        if self.latest_status is None or payload.SlotStartUnixS >= self.latest_status.SlotStartUnixS:
+            self.latest_status = payload
         status_file = self.status_output_dir / f"GtShStatus.{payload.SlotStartUnixS}.json"
         with status_file.open("w") as f:
             f.write(payload.as_type())
@@ -114,6 +132,34 @@ class Atn(CloudBase):
                 f"{snapshot.AboutNodeAliasList[i]}: {snapshot.ValueList[i]} {snapshot.TelemetryNameList[i].value}"
             )
 
+    def snapshot_delta_received(self, payload: SnapshotSpaceheatDelta):
+        if payload.FromSeq == 0:
+            self.snapshot_values.clear()
+        elif payload.FromSeq != self.snapshot_seq:
+            self.screen_print(f"Ignoring delta from seq {payload.FromSeq}, expected {self.snapshot_seq}")
+            return
+        snapshot = payload.Snapshot
+        for alias, value, telemetry_name in zip(
+            snapshot.AboutNodeAliasList, snapshot.ValueList, snapshot.TelemetryNameList
+        ):
+            self.snapshot_values[(alias, telemetry_name)] = value
+        self.snapshot_seq = payload.Seq
+
+    def simple_telemetry_series(self, node_alias: str, at_times_unix_ms: List[int]) -> Optional[List[Optional[float]]]:
+        """The readings of a simple sensor over the period of the latest status, at each of at_times_unix_ms, as
+        reconstructed by the compression method the status says the Scada used. Uncompressed readings are held from
+        one to the next. None if the latest status has no readings of the sensor."""
+        if self.latest_status is None:
+            return None
+        for status in self.latest_status.SimpleTelemetryList:
+            if status.ShNodeAlias == node_alias:
+                if status.CompressionMethod is None:
+                    method = CompressionMethod.deadband
+                else:
+                    method = CompressionMethod(status.CompressionMethod)
+                return reconstruct(method, status.ValueList, status.ReadTimeUnixMsList, at_times_unix_ms)
+        return None
+
     ################################################
     # Primary functions
     ################################################
@@ -126,6 +172,25 @@ class Atn(CloudBase):
         ).tuple
         self.gw_publish(payload)
 
+    def snapshot_delta(self):
+        """Ask the Scada for the values changed since the last delta applied."""
+        payload = GtShCliSnapshotDeltaCmd_Maker(
+            from_g_node_alias=self.atn_g_node_alias,
+            from_g_node_id=self.atn_g_node_id,
+            acked_seq=self.snapshot_seq,
+        ).tuple
+        self.gw_publish(payload)
+
+    def status_backfill(self, start_unix_s: int, end_unix_s: int):
+        """Ask the Scada to resend the statuses it stored for the slots starting in [start_unix_s, end_unix_s)."""
+        payload = GtShCliStatusBackfillCmd_Maker(
+            from_g_node_alias=self.atn_g_node_alias,
+            from_g_node_id=self.atn_g_node_id,
+            start_unix_s=start_unix_s,
+            end_unix_s=end_unix_s,
+        ).tuple
+        self.gw_publish(payload)
+
     def turn_on(self, ba: ShNode):
         if not isinstance(ba.component, BooleanActuatorComponent):
             raise Exception(f"{ba} must be a BooleanActuator!")
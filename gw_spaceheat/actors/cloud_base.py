@@ -15,10 +15,12 @@ from actors.utils import QOS
 from actors.utils import Subscription
 from actors.utils import gw_mqtt_topic_decode
 from actors.utils import gw_mqtt_topic_encode
+from config import PayloadEncoding
 from config import ScadaSettings
 from data_classes.hardware_layout import HardwareLayout
 from data_classes.sh_node import ShNode
 from proactor.logger import MessageSummary
+from schema import binary_codec
 from schema.decoders_factory import DecoderExtractor
 from schema.decoders_factory import OneDecoderExtractor
 from schema.decoders_factory import PydanticExtractor
@@ -26,7 +28,9 @@ from schema.messages import GsDispatch
 from schema.messages import GsPwr
 from schema.messages import GsPwr_Maker
 from schema.messages import GtShStatus_Maker
+from schema.messages import GtShStatusCompact_Maker
 from schema.messages import SnapshotSpaceheat_Maker
+from schema.messages import SnapshotSpaceheatDelta_Maker
 from schema.schema_switcher import TypeMakerByAliasDict
 
 
@@ -55,7 +59,9 @@ class CloudBase(ABC):
         ]).from_objects(
             [
                 GtShStatus_Maker,
+                GtShStatusCompact_Maker,
                 SnapshotSpaceheat_Maker,
+                SnapshotSpaceheatDelta_Maker,
             ],
             message_payload_discriminator=ScadaMessageDecoder,
         ).add_decoder(
@@ -123,7 +129,14 @@ class CloudBase(ABC):
         else:
             path_dbg |= 0x00000004
             from_node = self.layout.node("a")
-        if type_alias not in TypeMakerByAliasDict.keys():
+        if binary_codec.is_binary(message.payload):
+            path_dbg |= 0x00000040
+            decoded = binary_codec.loads(message.payload)
+            if type_alias not in TypeMakerByAliasDict.keys():
+                payload_as_tuple = self.decoders.decode(type_alias, decoded).payload
+            else:
+                payload_as_tuple = TypeMakerByAliasDict[type_alias].dict_to_tuple(decoded)
+        elif type_alias not in TypeMakerByAliasDict.keys():
             path_dbg |= 0x00000008
             payload_as_tuple = self.decoders.decode_str(type_alias, message.payload).payload
         else:
@@ -158,9 +171,13 @@ class CloudBase(ABC):
         if self.settings.logging.verbose() or self.settings.logging.message_summary_enabled():
             self.logger.info(MessageSummary.format("OUT", self.atn_g_node_alias,
                              gw_mqtt_topic_encode(topic), payload, broker_flag="*"))
+        if self.settings.gridworks_payload_encoding == PayloadEncoding.cbor and hasattr(payload, "asdict"):
+            encoded = binary_codec.dumps(payload.asdict())
+        else:
+            encoded = payload.as_type()
         self.gw_client.publish(
             topic=gw_mqtt_topic_encode(topic),
-            payload=payload.as_type(),
+            payload=encoded,
             qos=qos.value,
             retain=False,
         )
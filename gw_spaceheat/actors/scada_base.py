@@ -8,9 +8,11 @@ from actors.actor_base import ActorBase
 from actors.utils import QOS
 from actors.utils import gw_mqtt_topic_decode
 from actors.utils import gw_mqtt_topic_encode
+from config import PayloadEncoding
 from config import ScadaSettings
 from data_classes.hardware_layout import HardwareLayout
 from proactor.logger import MessageSummary
+from schema import binary_codec
 from schema.messages import GsDispatch
 from schema.messages import GsPwr
 from schema.schema_switcher import TypeMakerByAliasDict
@@ -73,7 +75,10 @@ class ScadaBase(ActorBase):
             raise Exception(f"alias {from_alias} not my AtomicTNode!")
         if type_alias not in TypeMakerByAliasDict.keys():
             raise Exception(f"Type {type_alias} not recognized. Should be in TypeByAliasDict keys!")
-        payload_as_tuple = TypeMakerByAliasDict[type_alias].type_to_tuple(message.payload)
+        if binary_codec.is_binary(message.payload):
+            payload_as_tuple = TypeMakerByAliasDict[type_alias].dict_to_tuple(binary_codec.loads(message.payload))
+        else:
+            payload_as_tuple = TypeMakerByAliasDict[type_alias].type_to_tuple(message.payload)
         if self.settings.logging.verbose() or self.settings.logging.message_summary_enabled():
             print(
                 MessageSummary.format("IN", self.node.alias, message.topic, payload_as_tuple, broker_flag="*")
@@ -92,9 +97,13 @@ class ScadaBase(ActorBase):
         topic = f"{self.scada_g_node_alias}/{payload.TypeAlias}"
         if self.settings.logging.verbose() or self.settings.logging.message_summary_enabled():
             print(MessageSummary.format("OUT", self.node.alias, gw_mqtt_topic_encode(topic), payload, broker_flag="*"))
+        if self.settings.gridworks_payload_encoding == PayloadEncoding.cbor and hasattr(payload, "asdict"):
+            encoded = binary_codec.dumps(payload.asdict())
+        else:
+            encoded = payload.as_type()
         self.gw_client.publish(
             topic=gw_mqtt_topic_encode(topic),
-            payload=payload.as_type(),
+            payload=encoded,
             qos=qos.value,
             retain=False,
         )
@@ -18,6 +18,8 @@ from data_classes.components.electric_meter_component import ElectricMeterCompon
 from data_classes.components.resistive_heater_component import ResistiveHeaterComponent
 from data_classes.hardware_layout import HardwareLayout
 from data_classes.sh_node import ShNode
+from data_classes.telemetry_channels import ChannelMap
+from data_classes.telemetry_channels import TelemetryChannels
 from drivers.power_meter.gridworks_sim_pm1__power_meter_driver import (
     GridworksSimPm1_PowerMeterDriver,
 )
@@ -194,18 +196,24 @@ class DriverThreadSetupHelper:
 
 
 class PowerMeterDriverThread(SyncAsyncInteractionThread):
+    """Per-channel state is kept in ChannelMaps whose by_id lists are indexed by the channel ids of
+    hardware_layout.telemetry_channels. The polling loop works on channel ids; the methods taking a TelemetryTuple
+    are kept for callers outside it."""
 
     eq_reporting_config: Dict[TelemetryTuple, GtEqReportingConfig]
     reporting_config: ReportingConfig
     driver: PowerMeterDriver
-    nameplate_telemetry_value: Dict[TelemetryTuple, int]
+    nameplate_telemetry_value: ChannelMap[int]
     last_reported_agg_power_w: Optional[int] = None
-    last_reported_telemetry_value: Dict[TelemetryTuple, Optional[int]]
-    latest_telemetry_value: Dict[TelemetryTuple, Optional[int]]
-    _last_sampled_s: Dict[TelemetryTuple, Optional[int]]
+    last_reported_telemetry_value: ChannelMap[Optional[int]]
+    latest_telemetry_value: ChannelMap[Optional[int]]
+    _last_sampled_s: ChannelMap[Optional[int]]
+    _channel_eq_reporting_config: ChannelMap[GtEqReportingConfig]
+    _power_channel_ids: List[int]
     async_power_reporting_threshold: float
     _telemetry_destination: str
     _hardware_layout: HardwareLayout
+    _channels: TelemetryChannels
 
     def __init__(
         self,
@@ -224,6 +232,7 @@ class PowerMeterDriverThread(SyncAsyncInteractionThread):
             daemon=daemon,
         )
         self._hardware_layout = hardware_layout
+        self._channels = hardware_layout.telemetry_channels
         self._telemetry_destination = telemetry_destination
         setup_helper = DriverThreadSetupHelper(node, settings, hardware_layout)
         self.eq_reporting_config = setup_helper.make_eq_reporting_config()
@@ -231,17 +240,16 @@ class PowerMeterDriverThread(SyncAsyncInteractionThread):
             list(self.eq_reporting_config.values())
         )
         self.driver = setup_helper.make_power_meter_driver()
-        self.nameplate_telemetry_value = setup_helper.get_nameplate_telemetry_value()
+        nameplate_telemetry_value = setup_helper.get_nameplate_telemetry_value()
+        self.nameplate_telemetry_value = self._channels.map(lambda tt: nameplate_telemetry_value[tt])
+        self._channel_eq_reporting_config = self._channels.map(lambda tt: self.eq_reporting_config[tt])
+        self._power_channel_ids = [
+            self._channels.ids[tt] for tt in self._hardware_layout.all_power_tuples if tt in self._channels
+        ]
         self.last_reported_agg_power_w: Optional[int] = None
-        self.last_reported_telemetry_value = {
-            tt: None for tt in self._hardware_layout.all_power_meter_telemetry_tuples
-        }
-        self.latest_telemetry_value = {
-            tt: None for tt in self._hardware_layout.all_power_meter_telemetry_tuples
-        }
-        self._last_sampled_s = {
-            tt: None for tt in self._hardware_layout.all_power_meter_telemetry_tuples
-        }
+        self.last_reported_telemetry_value = self._channels.map(lambda tt: None)
+        self.latest_telemetry_value = self._channels.map(lambda tt: None)
+        self._last_sampled_s = self._channels.map(lambda tt: None)
         self.async_power_reporting_threshold = settings.async_power_reporting_threshold
 
     def _preiterate(self) -> None:
@@ -252,13 +260,11 @@ class PowerMeterDriverThread(SyncAsyncInteractionThread):
         self.update_latest_value_dicts()
         if self.should_report_aggregated_power():
             self.report_aggregated_power_w()
-        telemetry_tuple_report_list = [
-            tpl
-            for tpl in self._hardware_layout.all_power_meter_telemetry_tuples
-            if self.should_report_telemetry_reading(tpl)
+        report_channel_ids = [
+            channel_id for channel_id in range(len(self._channels)) if self._should_report_channel(channel_id)
         ]
-        if telemetry_tuple_report_list:
-            self.report_sampled_telemetry_values(telemetry_tuple_report_list)
+        if report_channel_ids:
+            self._report_sampled_channels(report_channel_ids)
         sleep_time_ms = self.reporting_config.PollPeriodMs
         delta_ms = 1000 * (time.time() - start_s)
         if delta_ms < self.reporting_config.PollPeriodMs:
@@ -266,48 +272,45 @@ class PowerMeterDriverThread(SyncAsyncInteractionThread):
         self._iterate_sleep_seconds = sleep_time_ms / 1000
 
     def update_latest_value_dicts(self):
-        for tt in self._hardware_layout.all_power_meter_telemetry_tuples:
-            self.latest_telemetry_value[tt] = self.driver.read_telemetry_value(
-                tt.TelemetryName
-            )
+        latest = self.latest_telemetry_value.by_id
+        for channel_id, tt in enumerate(self._channels.tuples):
+            latest[channel_id] = self.driver.read_telemetry_value(tt.TelemetryName)
 
     def report_sampled_telemetry_values(
         self, telemetry_sample_report_list: List[TelemetryTuple]
     ):
+        self._report_sampled_channels([self._channels.ids[tt] for tt in telemetry_sample_report_list])
+
+    def _report_sampled_channels(self, channel_ids: List[int]):
+        tuples = self._channels.tuples
+        latest = self.latest_telemetry_value.by_id
         self._put_to_async_queue(
             MultipurposeSensorTelemetryMessage(
                 src=self.name,
                 dst=self._telemetry_destination,
-                about_node_alias_list=list(
-                    map(lambda x: x.AboutNode.alias, telemetry_sample_report_list)
-                ),
-                value_list=list(
-                    map(
-                        lambda x: self.latest_telemetry_value[x],
-                        telemetry_sample_report_list,
-                    )
-                ),
-                telemetry_name_list=list(
-                    map(lambda x: x.TelemetryName, telemetry_sample_report_list)
-                ),
+                about_node_alias_list=[tuples[channel_id].AboutNode.alias for channel_id in channel_ids],
+                value_list=[latest[channel_id] for channel_id in channel_ids],
+                telemetry_name_list=[tuples[channel_id].TelemetryName for channel_id in channel_ids],
             )
         )
-        for tt in telemetry_sample_report_list:
-            self._last_sampled_s[tt] = int(time.time())
-            self.last_reported_telemetry_value[tt] = self.latest_telemetry_value[tt]
+        sampled_s = int(time.time())
+        for channel_id in channel_ids:
+            self._last_sampled_s.by_id[channel_id] = sampled_s
+            self.last_reported_telemetry_value.by_id[channel_id] = latest[channel_id]
 
     def value_exceeds_async_threshold(self, telemetry_tuple: TelemetryTuple) -> bool:
         """This telemetry tuple is supposed to report asynchronously on change, with
         the amount of change required (as a function of the absolute max value) determined
         in the EqConfig.
         """
-        telemetry_reporting_config = self.eq_reporting_config[telemetry_tuple]
-        last_reported_value = self.last_reported_telemetry_value[telemetry_tuple]
-        latest_telemetry_value = self.latest_telemetry_value[telemetry_tuple]
-        abs_telemetry_delta = abs(latest_telemetry_value - last_reported_value)
-        max_telemetry_value = self.nameplate_telemetry_value[telemetry_tuple]
-        change_ratio = abs_telemetry_delta / max_telemetry_value
-        if change_ratio > telemetry_reporting_config.AsyncReportThreshold:
+        return self._exceeds_async_threshold(self._channels.ids[telemetry_tuple])
+
+    def _exceeds_async_threshold(self, channel_id: int) -> bool:
+        abs_telemetry_delta = abs(
+            self.latest_telemetry_value.by_id[channel_id] - self.last_reported_telemetry_value.by_id[channel_id]
+        )
+        change_ratio = abs_telemetry_delta / self.nameplate_telemetry_value.by_id[channel_id]
+        if change_ratio > self._channel_eq_reporting_config.by_id[channel_id].AsyncReportThreshold:
             return True
         return False
 
@@ -322,42 +325,33 @@ class PowerMeterDriverThread(SyncAsyncInteractionThread):
         get at least one reading for this telemetry tuple in the Scada's status report; it does not need to be
         at the beginning or end of the status report time period.
         """
-        if self.latest_telemetry_value[telemetry_tuple] is None:
+        return self._should_report_channel(self._channels.ids[telemetry_tuple])
+
+    def _should_report_channel(self, channel_id: int) -> bool:
+        if self.latest_telemetry_value.by_id[channel_id] is None:
             return False
-        if (
-            self._last_sampled_s[telemetry_tuple] is None
-            or self.last_reported_telemetry_value[telemetry_tuple] is None
-        ):
+        last_sampled_s = self._last_sampled_s.by_id[channel_id]
+        if last_sampled_s is None or self.last_reported_telemetry_value.by_id[channel_id] is None:
             return True
-        if (
-            time.time() - self._last_sampled_s[telemetry_tuple]
-            > self.eq_reporting_config[telemetry_tuple].SamplePeriodS
-        ):
+        if time.time() - last_sampled_s > self._channel_eq_reporting_config.by_id[channel_id].SamplePeriodS:
             return True
-        if self.value_exceeds_async_threshold(telemetry_tuple):
+        if self._exceeds_async_threshold(channel_id):
             return True
         return False
 
     @property
     def latest_agg_power_w(self) -> Optional[int]:
         """Tracks the sum of the power of the all the nodes whose power is getting measured by the power meter"""
-        latest_power_list = [
-            v
-            for k, v in self.latest_telemetry_value.items()
-            if k in self._hardware_layout.all_power_tuples
-        ]
+        latest = self.latest_telemetry_value.by_id
+        latest_power_list = [latest[channel_id] for channel_id in self._power_channel_ids]
         if None in latest_power_list:
             return None
         return int(sum(latest_power_list))
 
     @property
     def nameplate_agg_power_w(self) -> int:
-        nameplate_power_list = [
-            v
-            for k, v in self.nameplate_telemetry_value.items()
-            if k in self._hardware_layout.all_power_tuples
-        ]
-        return int(sum(nameplate_power_list))
+        nameplate = self.nameplate_telemetry_value.by_id
+        return int(sum(nameplate[channel_id] for channel_id in self._power_channel_ids))
 
     def report_aggregated_power_w(self):
         self._put_to_async_queue(
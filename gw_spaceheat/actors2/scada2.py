@@ -1,38 +1,60 @@
 """Scada implementation"""
 
 import asyncio
+import json
 import time
 import typing
 from abc import ABC
 from abc import abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
+from typing import Callable
 from typing import List
+from typing import NamedTuple
 from typing import Optional
 
 from paho.mqtt.client import MQTTMessageInfo
+from pydantic import BaseModel
+from result import Err
 
 from actors2.actor_interface import ActorInterface
 from actors2.message import GtDispatchBooleanLocalMessage
 from actors2.message import ScadaDBG
 from actors2.message import ScadaDBGCommands
+from actors2.scada_data import RecentReadings
 from actors2.scada_data import ScadaData
+from actors2.status_history import StatusHistory
 from actors2.scada_interface import ScadaInterface
 from actors.scada import ScadaCmdDiagnostic
 from actors.utils import QOS
 from actors.utils import gw_mqtt_topic_decode
 from actors.utils import gw_mqtt_topic_encode
+from config import ForwardPolicy
+from config import PayloadEncoding
 from config import ScadaSettings
 from data_classes.components.boolean_actuator_component import BooleanActuatorComponent
 from data_classes.hardware_layout import HardwareLayout
 from data_classes.sh_node import ShNode
 from named_tuples.telemetry_tuple import TelemetryTuple
+from proactor.async_persister import AsyncPersister
+from proactor.dispatch import DispatchTable
+from proactor.dispatch import HandlerStats
 from proactor.logger import ProactorLogger
 from proactor.message import Message
+from proactor.message import MessageType
 from proactor.message import MQTTReceiptPayload
+from proactor.persister import TimedRollingFilePersister
 from proactor.proactor_implementation import MQTTCodec
+from proactor.proactor_implementation import ProcessBatching
 from proactor.proactor_implementation import Proactor
+from proactor.receive_queue import Lane
+from proactor.receive_queue import message_type_key
+from proactor.store_and_forward import StoreAndForward
 from schema import DecoderExtractor
+from schema import Decoder
 from schema import Decoders
+from schema import binary_codec
 from schema import create_message_payload_discriminator
 from schema.messages import GsPwr
 from schema.messages import GtDispatchBoolean
@@ -42,25 +64,89 @@ from schema.messages import GtDriverBooleanactuatorCmd
 from schema.messages import GtDriverBooleanactuatorCmd_Maker
 from schema.messages import GtShCliAtnCmd
 from schema.messages import GtShCliAtnCmd_Maker
+from schema.messages import GtShCliSnapshotDeltaCmd
+from schema.messages import GtShCliSnapshotDeltaCmd_Maker
+from schema.messages import GtShCliStatusBackfillCmd
+from schema.messages import GtShCliStatusBackfillCmd_Maker
+from schema.messages import GtShStatus
+from schema.messages import GtShStatus_Maker
 from schema.messages import GtShTelemetryFromMultipurposeSensor
 from schema.messages import GtShTelemetryFromMultipurposeSensor_Maker
 from schema.messages import GtTelemetry
 from schema.messages import GtTelemetry_Maker
+from schema.messages import SnapshotSpaceheat
+
+
+class TopicRoute(NamedTuple):
+    """Where messages received on one topic go, resolved once per topic by ScadaMQTTCodec."""
+    source_alias: str
+    type_alias: str
+    decoder: Decoder
+
+
+class RouteStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            invalidations=self.invalidations,
+        )
 
 
 class ScadaMQTTCodec(MQTTCodec, ABC):
+    """Encodes for, and decodes from, one broker.
+
+    decode() resolves each topic to a TopicRoute once: the topic is split into source and type alias, the source is
+    validated and the decoder looked up, and the result kept in an LRU cache of up to max_routes topics. Topics that
+    fail to resolve are not cached. The cache is dropped by invalidate_routes(), which the Proactor calls when the
+    client's subscriptions change, and whenever hardware_layout is replaced.
+    """
     ENCODING = "utf-8"
-    hardware_layout: HardwareLayout
+    DEFAULT_MAX_ROUTES = 256
     decoders: Decoders
+    payload_encoding: PayloadEncoding
+    route_stats: RouteStats
+    _hardware_layout: HardwareLayout
+    _max_routes: int
+    _routes: OrderedDict[str, TopicRoute]
 
-    def __init__(self, hardware_layout: HardwareLayout, decoders: Decoders):
-        self.hardware_layout = hardware_layout
+    def __init__(
+        self,
+        hardware_layout: HardwareLayout,
+        decoders: Decoders,
+        payload_encoding: PayloadEncoding = PayloadEncoding.json,
+        max_routes: int = DEFAULT_MAX_ROUTES,
+    ):
+        self._hardware_layout = hardware_layout
         self.decoders = Decoders().merge(decoders)
+        self.payload_encoding = payload_encoding
+        self.route_stats = RouteStats()
+        self._max_routes = max(1, max_routes)
+        self._routes = OrderedDict()
         super().__init__()
 
+    @property
+    def hardware_layout(self) -> HardwareLayout:
+        return self._hardware_layout
+
+    @hardware_layout.setter
+    def hardware_layout(self, hardware_layout: HardwareLayout) -> None:
+        self._hardware_layout = hardware_layout
+        self.invalidate_routes()
+
     def encode(self, content: Any) -> bytes:
         if isinstance(content, bytes):
             encoded = content
+        elif self.payload_encoding == PayloadEncoding.cbor and hasattr(content, "asdict"):
+            encoded = binary_codec.dumps(content.asdict())
+        elif self.payload_encoding == PayloadEncoding.cbor and isinstance(content, BaseModel):
+            encoded = binary_codec.dumps(content)
         else:
             if hasattr(content, "as_type"):
                 payload_as_str = content.as_type()
@@ -73,19 +159,45 @@ class ScadaMQTTCodec(MQTTCodec, ABC):
         return encoded
 
     def decode(self, receipt_payload: MQTTReceiptPayload) -> Any:
+        route = self.route(receipt_payload.message.topic)
+        payload = receipt_payload.message.payload
+        # Either encoding is accepted, whatever this codec encodes with, so that peers can switch independently.
+        if binary_codec.is_binary(payload):
+            return route.decoder(binary_codec.loads(payload))
+        # json.loads(bytes) is slower than this: it sniffs the encoding and decodes with 'surrogatepass'.
+        # TODO: Payloads that are not json, e.g. GSwPwr over mqtt, would need a decoder taking bytes.
+        return route.decoder(json.loads(payload.decode(self.ENCODING)))
+
+    def route(self, topic: str) -> TopicRoute:
+        route = self._routes.get(topic)
+        if route is not None:
+            self._routes.move_to_end(topic)
+            self.route_stats.hits += 1
+            return route
+        self.route_stats.misses += 1
         try:
-            decoded_topic = gw_mqtt_topic_decode(receipt_payload.message.topic)
-            (from_alias, type_alias) = decoded_topic.split("/")
-        except IndexError:
+            (from_alias, type_alias) = gw_mqtt_topic_decode(topic).split("/")
+        except ValueError:
             raise Exception("topic must be of format A/B")
         if type_alias not in self.decoders:
             raise Exception(
                 f"Type {type_alias} not recognized. Available decoders: {self.decoders.types()}"
             )
         self.validate_source_alias(from_alias)
-        # TODO: This should probably be decode_str so that we can handle payloads that are not json, e.g.
-        #       GSwPwr over mqtt.
-        return self.decoders.decode_json(type_alias, receipt_payload.message.payload, encoding=self.ENCODING)
+        route = TopicRoute(from_alias, type_alias, self.decoders.decoder(type_alias))
+        self._routes[topic] = route
+        if len(self._routes) > self._max_routes:
+            self._routes.popitem(last=False)
+            self.route_stats.evictions += 1
+        return route
+
+    def invalidate_routes(self) -> None:
+        self._routes.clear()
+        self.route_stats.invalidations += 1
+
+    @property
+    def num_routes(self) -> int:
+        return len(self._routes)
 
     @abstractmethod
     def validate_source_alias(self, source_alias: str):
@@ -103,16 +215,25 @@ ScadaMessageDecoder = create_message_payload_discriminator(
 
 class GridworksMQTTCodec(ScadaMQTTCodec):
 
-    def __init__(self, hardware_layout: HardwareLayout):
+    def __init__(
+        self,
+        hardware_layout: HardwareLayout,
+        payload_encoding: PayloadEncoding = PayloadEncoding.json,
+        max_routes: int = ScadaMQTTCodec.DEFAULT_MAX_ROUTES,
+    ):
         super().__init__(
             hardware_layout,
             decoders=DecoderExtractor().from_objects(
                 [
                     GtDispatchBoolean_Maker,
                     GtShCliAtnCmd_Maker,
+                    GtShCliSnapshotDeltaCmd_Maker,
+                    GtShCliStatusBackfillCmd_Maker,
                 ],
                 message_payload_discriminator=ScadaMessageDecoder,
-            )
+            ),
+            payload_encoding=payload_encoding,
+            max_routes=max_routes,
         )
 
     def validate_source_alias(self, source_alias: str):
@@ -124,7 +245,7 @@ class GridworksMQTTCodec(ScadaMQTTCodec):
 
 class LocalMQTTCodec(ScadaMQTTCodec):
 
-    def __init__(self, hardware_layout: HardwareLayout):
+    def __init__(self, hardware_layout: HardwareLayout, max_routes: int = ScadaMQTTCodec.DEFAULT_MAX_ROUTES):
         super().__init__(
             hardware_layout,
             decoders=DecoderExtractor().from_objects(
@@ -134,7 +255,8 @@ class LocalMQTTCodec(ScadaMQTTCodec):
                     GtTelemetry_Maker,
                 ],
                 message_payload_discriminator=ScadaMessageDecoder,
-            )
+            ),
+            max_routes=max_routes,
         )
 
     def validate_source_alias(self, source_alias: str):
@@ -142,6 +264,30 @@ class LocalMQTTCodec(ScadaMQTTCodec):
             raise Exception(f"alias {source_alias} not in ShNode.by_alias keys!")
 
 
+def scada_lane_key(item: Any) -> str:
+    """Receive queue lane key. MQTT receipts are keyed by the type alias at the end of their topic, so that, for
+    example, dispatch commands from the AtomicTNode share a lane with local dispatch."""
+    key = message_type_key(item)
+    if key == MessageType.mqtt_message.value:
+        key = gw_mqtt_topic_decode(item.payload.message.topic.split("/")[-1])
+    return key
+
+
+class EncodedPublish(NamedTuple):
+    """A message encoded for one MQTT client, ready to publish."""
+    client: str
+    topic: str
+    message: Message
+    payload: bytes
+
+
+class StatusPublication(NamedTuple):
+    """What Scada2 publishes at a report boundary, built and encoded by _build_status_publication()."""
+    status: GtShStatus
+    publishes: list[EncodedPublish]
+    build_s: float
+
+
 class Scada2(ScadaInterface, Proactor):
     GS_PWR_MULTIPLIER = 1
     ASYNC_POWER_REPORT_THRESHOLD = 0.05
@@ -155,6 +301,10 @@ class Scada2(ScadaInterface, Proactor):
     _data: ScadaData
     _last_status_second: int
     _scada_atn_fast_dispatch_contract_is_alive_stub: bool
+    _message_handlers: DispatchTable
+    _mqtt_handlers: DispatchTable
+    _gridworks_outbound: Optional[StoreAndForward]
+    _status_executor: ThreadPoolExecutor
 
     def __init__(
         self,
@@ -165,31 +315,74 @@ class Scada2(ScadaInterface, Proactor):
     ):
         super().__init__(
             name=name,
-            logger=ProactorLogger(**settings.logging.qualified_logger_names())
+            logger=ProactorLogger(**settings.logging.qualified_logger_names()),
+            receive_lanes=[
+                Lane(lane.name, tuple(lane.message_types), lane.max_skips) for lane in settings.receive_lanes
+            ],
+            lane_key=scada_lane_key,
+            batching=ProcessBatching(
+                max_messages=settings.process_batch.max_messages,
+                max_batch_s=settings.process_batch.max_batch_ms / 1000,
+            ),
+            mqtt_backend=settings.mqtt_backend,
         )
         self._node = hardware_layout.node(name)
         self._settings = settings
         self._layout = hardware_layout
         self._data = ScadaData(settings, hardware_layout)
+        self._status_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{name}.status")
+        self._message_handlers = DispatchTable("scada.message")
+        self._mqtt_handlers = DispatchTable("scada.mqtt")
+        self._register_handlers()
         self._add_mqtt_client(
             Scada2.LOCAL_MQTT, self.settings.local_mqtt, LocalMQTTCodec(self._layout)
         )
         self._add_mqtt_client(
             Scada2.GRIDWORKS_MQTT,
             self.settings.gridworks_mqtt,
-            GridworksMQTTCodec(self._layout),
+            GridworksMQTTCodec(self._layout, self.settings.gridworks_payload_encoding),
         )
+        outbound = self.settings.gridworks_outbound
+        if outbound.enabled:
+            self._gridworks_outbound = StoreAndForward(
+                Scada2.GRIDWORKS_MQTT,
+                self._mqtt_clients,
+                AsyncPersister(
+                    TimedRollingFilePersister(
+                        self.settings.paths.data_dir / "outbound" / Scada2.GRIDWORKS_MQTT,
+                        max_bytes=outbound.max_bytes,
+                    ),
+                    name=f"{self.name}.outbound",
+                ),
+                policies=outbound.policies,
+                default_policy=outbound.default_policy,
+                drain_messages_per_s=outbound.drain_messages_per_s,
+                max_in_flight=outbound.max_in_flight,
+                logger=self._logger,
+            )
+        else:
+            self._gridworks_outbound = None
         # TODO: take care of subscriptions better. They should be registered here and only subscribed on connect.
-        self._mqtt_clients.subscribe(
+        self._subscribe(
             Scada2.GRIDWORKS_MQTT,
             gw_mqtt_topic_encode(f"{self._layout.atn_g_node_alias}/{GtDispatchBoolean_Maker.type_alias}"),
             QOS.AtMostOnce,
         )
-        self._mqtt_clients.subscribe(
+        self._subscribe(
             Scada2.GRIDWORKS_MQTT,
             gw_mqtt_topic_encode(f"{self._layout.atn_g_node_alias}/{GtShCliAtnCmd_Maker.type_alias}"),
             QOS.AtMostOnce,
         )
+        self._subscribe(
+            Scada2.GRIDWORKS_MQTT,
+            gw_mqtt_topic_encode(f"{self._layout.atn_g_node_alias}/{GtShCliSnapshotDeltaCmd_Maker.type_alias}"),
+            QOS.AtMostOnce,
+        )
+        self._subscribe(
+            Scada2.GRIDWORKS_MQTT,
+            gw_mqtt_topic_encode(f"{self._layout.atn_g_node_alias}/{GtShCliStatusBackfillCmd_Maker.type_alias}"),
+            QOS.AtMostOnce,
+        )
         # TODO: clean this up
         self.log_subscriptions("construction")
         now = int(time.time())
@@ -206,25 +399,91 @@ class Scada2(ScadaInterface, Proactor):
                     )
                 )
 
+    def stop(self):
+        super().stop()
+        # Wait out a status being built, since it writes to the status history closed below.
+        self._status_executor.shutdown(wait=True, cancel_futures=True)
+        self._data.close()
+        if self._gridworks_outbound is not None:
+            self._gridworks_outbound.stop()
+
+    async def join(self):
+        await super().join()
+        if self._gridworks_outbound is not None:
+            await self._gridworks_outbound.join()
+
     def _start_derived_tasks(self):
         self._tasks.append(
             asyncio.create_task(self.update_status(), name="update_status")
         )
+        if self._gridworks_outbound is not None:
+            self._gridworks_outbound.start()
+            self._tasks.append(
+                asyncio.create_task(self._gridworks_outbound.run(), name="gridworks_outbound")
+            )
 
     async def update_status(self):
         while not self._stop_requested:
             if self.time_to_send_status():
-                self.send_status()
+                await self.send_status_from_executor()
                 self._last_status_second = int(time.time())
             await asyncio.sleep(self.seconds_until_next_status())
 
     def send_status(self):
-        status = self._data.make_status(self._last_status_second)
-        self._data.status_to_store[status.StatusUid] = status
-        self._publish_to_gridworks(status.asdict())
-        self._publish_to_local(self._node, status)
-        self._publish_to_gridworks(self._data.make_snaphsot_payload())
-        self._data.flush_latest_readings()
+        readings = self._data.flush_latest_readings()
+        self._publish_status(
+            self._build_status_publication(self._last_status_second, readings, self._data.make_snapshot())
+        )
+
+    async def send_status_from_executor(self):
+        """Like send_status(), but only the swap of the reading buffers, taking the (cached) snapshot and the
+        publishing happen on the event loop. The status is built and stored, and the status and snapshot encoded, on
+        the status executor thread, from the readings the swap retired, which nothing else touches until the next
+        swap."""
+        readings = self._data.flush_latest_readings()
+        publication = await asyncio.get_running_loop().run_in_executor(
+            self._status_executor,
+            self._build_status_publication,
+            self._last_status_second,
+            readings,
+            self._data.make_snapshot(),
+        )
+        self._publish_status(publication)
+
+    def _build_status_publication(
+        self, slot_start_seconds: int, readings: RecentReadings, snapshot: SnapshotSpaceheat
+    ) -> StatusPublication:
+        start_s = time.perf_counter()
+        status = self._data.make_status(slot_start_seconds, readings)
+        if self._data.status_history is not None:
+            match self._data.status_history.add(status):
+                case Err(problems):
+                    self._logger.error(f"Status history add of slot {status.SlotStartUnixS} failed: {problems}")
+        publishes = []
+        compact = self.settings.compact_status
+        if compact.send_full_status or not compact.enabled:
+            publishes.append(self._encode_for_gridworks(status.asdict()))
+        if compact.enabled:
+            compact_status = self._data.make_compact_status(slot_start_seconds, readings, status.StatusUid)
+            publishes.append(self._encode_for_gridworks(compact_status.asdict()))
+        publishes.append(self._encode_for_local(self._node, status))
+        publishes.append(self._encode_for_gridworks(snapshot.asdict()))
+        return StatusPublication(status, publishes, time.perf_counter() - start_s)
+
+    def _publish_status(self, publication: StatusPublication):
+        for encoded in publication.publishes:
+            if encoded.client == Scada2.GRIDWORKS_MQTT:
+                qos = self._gridworks_status_qos(encoded.message.header.message_type)
+                self._publish_encoded_to_gridworks(encoded, qos)
+            else:
+                self._publish_encoded(encoded, QOS.AtMostOnce)
+
+    def _gridworks_status_qos(self, message_type: str) -> QOS:
+        """AtLeastOnce for a message type store-and-forward keeps while the link is down, else AtMostOnce, as without
+        store-and-forward."""
+        if self._gridworks_outbound is None or self._gridworks_outbound.policy(message_type) == ForwardPolicy.never:
+            return QOS.AtMostOnce
+        return QOS.AtLeastOnce
 
     def next_status_second(self) -> int:
         last_status_second_nominal = int(
@@ -257,77 +516,142 @@ class Scada2(ScadaInterface, Proactor):
     # TODO: gw_mqtt_topic_encode belongs in a better place
     def _publish_to_gridworks(
         self, payload, qos: QOS = QOS.AtMostOnce
-    ) -> MQTTMessageInfo:
+    ) -> Optional[MQTTMessageInfo]:
+        """Publish to the gridworks broker. With store-and-forward enabled, QoS >= 1 payloads published while the
+        link is down, or while older ones wait, are persisted and published after reconnect, in which case None is
+        returned."""
+        return self._publish_encoded_to_gridworks(self._encode_for_gridworks(payload), qos)
+
+    def _encode_for_gridworks(self, payload) -> EncodedPublish:
         message = Message(src=self._layout.scada_g_node_alias, payload=payload)
-        return self._encode_and_publish(
-            Scada2.GRIDWORKS_MQTT,
+        return EncodedPublish(
+            client=Scada2.GRIDWORKS_MQTT,
             topic=gw_mqtt_topic_encode(message.mqtt_topic()),
-            payload=message,
-            qos=qos,
+            message=message,
+            payload=self._mqtt_codecs[Scada2.GRIDWORKS_MQTT].encode(message),
         )
 
-    def _publish_to_local(self, from_node: ShNode, payload, qos: QOS = QOS.AtMostOnce):
+    def _encode_for_local(self, from_node: ShNode, payload) -> EncodedPublish:
         message = Message(src=from_node.alias, payload=payload)
-        return self._encode_and_publish(
-            Scada2.LOCAL_MQTT,
+        return EncodedPublish(
+            client=Scada2.LOCAL_MQTT,
             topic=message.mqtt_topic(),
-            payload=message,
-            qos=qos,
+            message=message,
+            payload=self._mqtt_codecs[Scada2.LOCAL_MQTT].encode(message),
         )
 
+    def _publish_encoded_to_gridworks(self, encoded: EncodedPublish, qos: QOS) -> Optional[MQTTMessageInfo]:
+        if self._gridworks_outbound is None:
+            return self._publish_encoded(encoded, qos)
+        self._logger.message_summary("OUTq", encoded.client, encoded.topic, encoded.message)
+        return self._gridworks_outbound.publish(
+            encoded.topic,
+            encoded.payload,
+            qos,
+            encoded.message.header.message_type,
+        )
+
+    def _publish_encoded(self, encoded: EncodedPublish, qos: QOS) -> MQTTMessageInfo:
+        self._logger.message_summary("OUTq", encoded.client, encoded.topic, encoded.message)
+        return self._mqtt_clients.publish(encoded.client, encoded.topic, encoded.payload, qos)
+
+    @property
+    def gridworks_outbound(self) -> Optional[StoreAndForward]:
+        return self._gridworks_outbound
+
+    @property
+    def status_history(self) -> Optional[StatusHistory]:
+        return self._data.status_history
+
+    def _publish_to_local(self, from_node: ShNode, payload, qos: QOS = QOS.AtMostOnce):
+        return self._publish_encoded(self._encode_for_local(from_node, payload), qos)
+
+    def register_message_handler(
+        self, payload_type: type, handler: Callable[[Message], Any], replace: bool = False
+    ) -> None:
+        """Handle messages sent to the Scada whose payload is a payload_type with handler, which may be a coroutine
+        function."""
+        self._message_handlers.register(payload_type, handler, replace=replace)
+
+    def register_mqtt_handler(
+        self, payload_type: type, handler: Callable[[Message[MQTTReceiptPayload], Any], Any], replace: bool = False
+    ) -> None:
+        """Handle decoded gridworks MQTT payloads of payload_type with handler(message, decoded), which may be a
+        coroutine function."""
+        self._mqtt_handlers.register(payload_type, handler, replace=replace)
+
+    def handler_stats(self) -> dict[str, HandlerStats]:
+        stats = super().handler_stats()
+        stats.update(self._message_handlers.stats())
+        stats.update(self._mqtt_handlers.stats())
+        return stats
+
+    def _register_handlers(self):
+        self.register_message_handler(GsPwr, self._gs_pwr_message_received)
+        self.register_message_handler(GtDispatchBooleanLocal, self._local_boolean_dispatch_message_received)
+        self.register_message_handler(GtTelemetry, self._gt_telemetry_message_received)
+        self.register_message_handler(
+            GtShTelemetryFromMultipurposeSensor, self._gt_sh_telemetry_from_multipurpose_sensor_message_received
+        )
+        self.register_message_handler(
+            GtDriverBooleanactuatorCmd, self._gt_driver_booleanactuator_cmd_message_received
+        )
+        self.register_message_handler(ScadaDBG, self._scada_dbg_message_received)
+        self.register_mqtt_handler(GtDispatchBoolean, self._gt_dispatch_boolean_mqtt_received)
+        self.register_mqtt_handler(GtShCliAtnCmd, self._gt_sh_cli_atn_cmd_mqtt_received)
+        self.register_mqtt_handler(GtShCliSnapshotDeltaCmd, self._gt_sh_cli_snapshot_delta_cmd_mqtt_received)
+        self.register_mqtt_handler(GtShCliStatusBackfillCmd, self._gt_sh_cli_status_backfill_cmd_mqtt_received)
+        self.register_mqtt_handler(GtTelemetry, self._process_telemetry)
+
     async def _derived_process_message(self, message: Message):
         self._logger.path("++Scada2._derived_process_message %s/%s", message.header.src, message.header.message_type)
-        path_dbg = 0
-        from_node = self._layout.node(message.header.src, None)
-        if isinstance(message.payload, GsPwr):
-            path_dbg |= 0x00000001
-            if from_node is self._layout.power_meter_node:
-                path_dbg |= 0x00000002
-                self.gs_pwr_received(message.payload)
-            else:
-                raise Exception(
-                    f"message.header.src {message.header.src} must be from {self._layout.power_meter_node} for GsPwr message"
-                )
-        elif isinstance(message.payload, GtDispatchBooleanLocal):
-            path_dbg |= 0x00000004
-            if message.header.src == "a.home":
-                path_dbg |= 0x00000008
-                await self.local_boolean_dispatch_received(message.payload)
-            else:
-                raise Exception(
-                    "message.header.src must be a.home for GsDispatchBooleanLocal message"
-                )
-        elif isinstance(message.payload, GtTelemetry):
-            path_dbg |= 0x00000010
-            if from_node in self._layout.my_simple_sensors:
-                path_dbg |= 0x00000020
-                self.gt_telemetry_received(from_node, message.payload)
-        elif isinstance(message.payload, GtShTelemetryFromMultipurposeSensor):
-            path_dbg |= 0x00000040
-            if from_node in self._layout.my_multipurpose_sensors:
-                path_dbg |= 0x00000080
-                self.gt_sh_telemetry_from_multipurpose_sensor_received(
-                    from_node, message.payload
-                )
-        elif isinstance(message.payload, GtDriverBooleanactuatorCmd):
-            path_dbg |= 0x00000100
-            if from_node in self._layout.my_boolean_actuators:
-                path_dbg |= 0x00000200
-                self.gt_driver_booleanactuator_cmd_record_received(
-                    from_node, message.payload
-                )
-        elif isinstance(message.payload, ScadaDBG):
-            path_dbg |= 0x00000400
-            # TODO: mqtt????
-            match message.payload.command:
-                case ScadaDBGCommands.show_subscriptions:
-                    path_dbg |= 0x00000400
-                    self.log_subscriptions("message")
-        else:
+        handler = self._message_handlers.lookup(type(message.payload))
+        if handler is None:
             raise ValueError(
                 f"There is not handler for mqtt message payload type [{type(message.payload)}]"
             )
-        self._logger.path("--Scada2._derived_process_message  path:0x%08X", path_dbg)
+        await handler(message)
+        self._logger.path("--Scada2._derived_process_message  handler:%s", handler.name)
+
+    def _gs_pwr_message_received(self, message: Message[GsPwr]):
+        if self._layout.node(message.header.src, None) is self._layout.power_meter_node:
+            self.gs_pwr_received(message.payload)
+        else:
+            raise Exception(
+                f"message.header.src {message.header.src} must be from {self._layout.power_meter_node} "
+                "for GsPwr message"
+            )
+
+    async def _local_boolean_dispatch_message_received(self, message: Message[GtDispatchBooleanLocal]):
+        if message.header.src == "a.home":
+            await self.local_boolean_dispatch_received(message.payload)
+        else:
+            raise Exception(
+                "message.header.src must be a.home for GsDispatchBooleanLocal message"
+            )
+
+    def _gt_telemetry_message_received(self, message: Message[GtTelemetry]):
+        from_node = self._layout.node(message.header.src, None)
+        if from_node in self._layout.my_simple_sensors:
+            self.gt_telemetry_received(from_node, message.payload)
+
+    def _gt_sh_telemetry_from_multipurpose_sensor_message_received(
+        self, message: Message[GtShTelemetryFromMultipurposeSensor]
+    ):
+        from_node = self._layout.node(message.header.src, None)
+        if from_node in self._layout.my_multipurpose_sensors:
+            self.gt_sh_telemetry_from_multipurpose_sensor_received(from_node, message.payload)
+
+    def _gt_driver_booleanactuator_cmd_message_received(self, message: Message[GtDriverBooleanactuatorCmd]):
+        from_node = self._layout.node(message.header.src, None)
+        if from_node in self._layout.my_boolean_actuators:
+            self.gt_driver_booleanactuator_cmd_record_received(from_node, message.payload)
+
+    def _scada_dbg_message_received(self, message: Message[ScadaDBG]):
+        # TODO: mqtt????
+        match message.payload.command:
+            case ScadaDBGCommands.show_subscriptions:
+                self.log_subscriptions("message")
 
     # TODO: Clean this up
     # noinspection PyProtectedMember
@@ -344,36 +668,59 @@ class Scada2(ScadaInterface, Proactor):
         self, message: Message[MQTTReceiptPayload], decoded: Any
     ):
         self._logger.path("++Scada2._derived_process_mqtt_message %s", message.payload.message.topic)
-        path_dbg = 0
         if message.payload.client_name != self.GRIDWORKS_MQTT:
             raise ValueError(
                 f"There are no messages expected to be received from [{message.payload.client_name}] mqtt broker. "
                 f"Received\n\t topic: [{message.payload.message.topic}]"
             )
-        if isinstance(decoded, GtDispatchBoolean):
-            path_dbg |= 0x00000001
-            await self._boolean_dispatch_received(decoded)
-        elif isinstance(decoded, GtShCliAtnCmd):
-            path_dbg |= 0x00000002
-            self._gt_sh_cli_atn_cmd_received(decoded)
-        elif isinstance(decoded, GtTelemetry):
-            path_dbg |= 0x00000004
-            self._process_telemetry(message, decoded)
-        else:
+        handler = self._mqtt_handlers.lookup(type(decoded))
+        if handler is None:
             raise ValueError(
                 f"There is not handler for mqtt message payload type [{type(decoded)}]"
                 f"Received\n\t topic: [{message.payload.message.topic}]"
             )
-        self._logger.path("--Scada2._derived_process_mqtt_message  path:0x%08X", path_dbg)
+        await handler(message, decoded)
+        self._logger.path("--Scada2._derived_process_mqtt_message  handler:%s", handler.name)
+
+    async def _gt_dispatch_boolean_mqtt_received(self, message: Message, decoded: GtDispatchBoolean):
+        await self._boolean_dispatch_received(decoded)
+
+    def _gt_sh_cli_atn_cmd_mqtt_received(self, message: Message, decoded: GtShCliAtnCmd):
+        self._gt_sh_cli_atn_cmd_received(decoded)
+
+    def _gt_sh_cli_snapshot_delta_cmd_mqtt_received(self, message: Message, decoded: GtShCliSnapshotDeltaCmd):
+        self._publish_to_gridworks(self._data.make_snapshot_delta(decoded.AckedSeq).asdict())
+
+    async def _gt_sh_cli_status_backfill_cmd_mqtt_received(self, message: Message, decoded: GtShCliStatusBackfillCmd):
+        """Republish the stored statuses of the requested slots. They are read on the status executor, the only
+        thread that touches the status history."""
+        if self._data.status_history is None:
+            self._logger.warning("Status backfill requested but the status history is disabled")
+            return
+        statuses = await asyncio.get_running_loop().run_in_executor(
+            self._status_executor,
+            self._read_status_backfill,
+            decoded.StartUnixS,
+            decoded.EndUnixS,
+        )
+        qos = self._gridworks_status_qos(GtShStatus_Maker.type_alias)
+        for status in statuses:
+            self._publish_to_gridworks(status.asdict(), qos)
+
+    def _read_status_backfill(self, start_s: int, end_s: int) -> list[GtShStatus]:
+        history = self._data.status_history
+        slots = history.slots(start_s, end_s)[:self.settings.status_history.max_backfill_statuses]
+        if not slots:
+            return []
+        status_range = history.get_range(slots[0], slots[-1] + 1)
+        if status_range.problems:
+            self._logger.error(f"Status backfill of [{start_s}, {end_s}) read failed: {status_range.problems}")
+        return status_range.statuses
 
     def _process_telemetry(self, message: Message, decoded: GtTelemetry):
         from_node = self._layout.node(message.header.src)
         if from_node in self._layout.my_simple_sensors:
-            self._data.recent_simple_values[from_node].append(decoded.Value)
-            self._data.recent_simple_read_times_unix_ms[from_node].append(
-                decoded.ScadaReadTimeUnixMs
-            )
-            self._data.latest_simple_value[from_node] = decoded.Value
+            self._data.record_simple_reading(from_node, decoded.Value, decoded.ScadaReadTimeUnixMs)
 
     async def _boolean_dispatch_received(
         self, payload: GtDispatchBoolean
@@ -475,35 +822,26 @@ class Scada2(ScadaInterface, Proactor):
         self, from_node: ShNode, payload: GtShTelemetryFromMultipurposeSensor
     ):
         if from_node in self._layout.my_multipurpose_sensors:
-            about_node_alias_list = payload.AboutNodeAliasList
-            for idx, about_alias in enumerate(about_node_alias_list):
-                if about_alias not in self._layout.nodes:
-                    raise Exception(
-                        f"alias {about_alias} in payload.AboutNodeAliasList not a recognized ShNode!"
+            channels = self._layout.telemetry_channels
+            for about_alias, value, telemetry_name in zip(
+                payload.AboutNodeAliasList, payload.ValueList, payload.TelemetryNameList
+            ):
+                channel_id = channels.id(about_alias, from_node.alias, telemetry_name)
+                if channel_id is None:
+                    if about_alias not in self._layout.nodes:
+                        raise Exception(
+                            f"alias {about_alias} in payload.AboutNodeAliasList not a recognized ShNode!"
+                        )
+                    tt = TelemetryTuple(
+                        AboutNode=self._layout.node(about_alias),
+                        SensorNode=from_node,
+                        TelemetryName=telemetry_name,
                     )
-                tt = TelemetryTuple(
-                    AboutNode=self._layout.node(about_alias),
-                    SensorNode=from_node,
-                    TelemetryName=payload.TelemetryNameList[idx],
-                )
-                if tt not in self._layout.my_telemetry_tuples:
                     raise Exception(f"Scada not tracking telemetry tuple {tt}!")
-                self._data.recent_values_from_multipurpose_sensor[tt].append(
-                    payload.ValueList[idx]
-                )
-                self._data.recent_read_times_unix_ms_from_multipurpose_sensor[
-                    tt
-                ].append(payload.ScadaReadTimeUnixMs)
-                self._data.latest_value_from_multipurpose_sensor[
-                    tt
-                ] = payload.ValueList[idx]
+                self._data.record_multipurpose_reading(channel_id, value, payload.ScadaReadTimeUnixMs)
 
     def gt_telemetry_received(self, from_node: ShNode, payload: GtTelemetry):
-        self._data.recent_simple_values[from_node].append(payload.Value)
-        self._data.recent_simple_read_times_unix_ms[from_node].append(
-            payload.ScadaReadTimeUnixMs
-        )
-        self._data.latest_simple_value[from_node] = payload.Value
+        self._data.record_simple_reading(from_node, payload.Value, payload.ScadaReadTimeUnixMs)
 
     def gt_driver_booleanactuator_cmd_record_received(
         self, from_node: ShNode, payload: GtDriverBooleanactuatorCmd
@@ -532,10 +870,7 @@ class Scada2(ScadaInterface, Proactor):
             )
         if from_node.alias != payload.ShNodeAlias:
             raise Exception("Command record must come from the boolean actuator actor")
-        self._data.recent_ba_cmds[from_node].append(payload.RelayState)
-        self._data.recent_ba_cmd_times_unix_ms[from_node].append(
-            payload.CommandTimeUnixMs
-        )
+        self._data.record_ba_cmd(from_node, payload.RelayState, payload.CommandTimeUnixMs)
 
     async def local_boolean_dispatch_received(
         self, payload: GtDispatchBooleanLocal
@@ -1,18 +1,31 @@
 """Container for data Scada uses in building status and snapshot messages, separated from Scada2 for clarity,
 not necessarily re-use. """
 
-import time
 import uuid
 from typing import Dict
-from typing import List
+from typing import NamedTuple
 from typing import Optional
+from typing import Union
 
+from actors2.snapshot_cache import SnapshotCache
+from actors2.snapshot_cache import SnapshotChannel
+from actors2.status_history import StatusHistory
+from actors2.telemetry_aggregate import TelemetryAggregate
+from actors2.telemetry_aggregate import pick_samples
+from actors2.telemetry_compression import CompressionStats
+from actors2.telemetry_compression import TelemetryCompressor
+from actors2.telemetry_buffer import DEFAULT_CAPACITY
+from actors2.telemetry_buffer import ChannelMemory
+from actors2.telemetry_buffer import TelemetryBuffer
 from config import ScadaSettings
 from data_classes.hardware_layout import HardwareLayout
 from data_classes.node_config import NodeConfig
 from data_classes.sh_node import ShNode
+from data_classes.telemetry_channels import ChannelMap
 from named_tuples.telemetry_tuple import TelemetryTuple
+from proactor.persister import TimedRollingFilePersister
 from schema.enums import TelemetryName
+from schema.gt.gt_sensor_reporting_config.gt_sensor_reporting_config import GtSensorReportingConfig
 from schema.messages import GtShBooleanactuatorCmdStatus
 from schema.messages import GtShBooleanactuatorCmdStatus_Maker
 from schema.messages import GtShMultipurposeTelemetryStatus
@@ -21,155 +34,308 @@ from schema.messages import GtShSimpleTelemetryStatus
 from schema.messages import GtShSimpleTelemetryStatus_Maker
 from schema.messages import GtShStatus
 from schema.messages import GtShStatus_Maker
+from schema.messages import GtShStatusCompact
+from schema.messages import GtShStatusCompact_Maker
+from schema.messages import GtShTelemetryAggregate
+from schema.messages import GtShTelemetryAggregate_Maker
 from schema.messages import SnapshotSpaceheat
 from schema.messages import SnapshotSpaceheat_Maker
+from schema.messages import SnapshotSpaceheatDelta
+from schema.messages import SnapshotSpaceheatDelta_Maker
 from schema.messages import TelemetrySnapshotSpaceheat
-from schema.messages import TelemetrySnapshotSpaceheat_Maker
+
+
+class RecentReadings(NamedTuple):
+    """The readings of one reporting period, by channel, and the aggregates of the simple and multipurpose ones."""
+
+    simple_values: Dict[ShNode, TelemetryBuffer]
+    simple_read_times_unix_ms: Dict[ShNode, TelemetryBuffer]
+    multipurpose_values: ChannelMap[TelemetryBuffer]
+    multipurpose_read_times_unix_ms: ChannelMap[TelemetryBuffer]
+    ba_cmds: Dict[ShNode, TelemetryBuffer]
+    ba_cmd_times_unix_ms: Dict[ShNode, TelemetryBuffer]
+    simple_aggregates: Dict[ShNode, TelemetryAggregate]
+    multipurpose_aggregates: ChannelMap[TelemetryAggregate]
+
+    @classmethod
+    def for_layout(cls, hardware_layout: HardwareLayout, capacity: int = DEFAULT_CAPACITY) -> "RecentReadings":
+        def buffers(channels) -> dict:
+            return {channel: TelemetryBuffer(capacity) for channel in channels}
+
+        return cls(
+            simple_values=buffers(hardware_layout.my_simple_sensors),
+            simple_read_times_unix_ms=buffers(hardware_layout.my_simple_sensors),
+            multipurpose_values=hardware_layout.telemetry_channels.map(lambda tt: TelemetryBuffer(capacity)),
+            multipurpose_read_times_unix_ms=hardware_layout.telemetry_channels.map(
+                lambda tt: TelemetryBuffer(capacity)
+            ),
+            ba_cmds=buffers(hardware_layout.my_boolean_actuators),
+            ba_cmd_times_unix_ms=buffers(hardware_layout.my_boolean_actuators),
+            simple_aggregates={node: TelemetryAggregate() for node in hardware_layout.my_simple_sensors},
+            multipurpose_aggregates=hardware_layout.telemetry_channels.map(lambda tt: TelemetryAggregate()),
+        )
+
+    def buffer_maps(self) -> tuple:
+        return (
+            self.simple_values,
+            self.simple_read_times_unix_ms,
+            self.multipurpose_values,
+            self.multipurpose_read_times_unix_ms,
+            self.ba_cmds,
+            self.ba_cmd_times_unix_ms,
+        )
+
+    def clear(self) -> None:
+        for buffers in self.buffer_maps():
+            for buffer in buffers.values():
+                buffer.clear()
+        for aggregates in [self.simple_aggregates, self.multipurpose_aggregates]:
+            for aggregate in aggregates.values():
+                aggregate.clear()
+
+
+def channel_name(channel: Union[ShNode, TelemetryTuple]) -> str:
+    if isinstance(channel, TelemetryTuple):
+        return f"{channel.AboutNode.alias}/{channel.SensorNode.alias}/{channel.TelemetryName.value}"
+    return channel.alias
 
 
 class ScadaData:
     latest_total_power_w: Optional[int]
-    status_to_store: Dict[str, GtShStatus]
+    status_history: Optional[StatusHistory]
     latest_simple_value: Dict[ShNode, int]
-    recent_simple_values: Dict[ShNode, List]
-    recent_simple_read_times_unix_ms: Dict[ShNode, List]
-    latest_value_from_multipurpose_sensor: Dict[TelemetryTuple, int]
-    recent_values_from_multipurpose_sensor: Dict[TelemetryTuple, List]
-    recent_read_times_unix_ms_from_multipurpose_sensor: Dict[TelemetryTuple, List]
-    recent_ba_cmds: Dict[ShNode, List]
-    recent_ba_cmd_times_unix_ms: Dict[ShNode, List]
+    latest_value_from_multipurpose_sensor: ChannelMap[Optional[int]]
+    snapshot_cache: SnapshotCache
+    reporting_configs: Dict[ShNode, GtSensorReportingConfig]
     telemetry_names: Dict[ShNode, TelemetryName]
+    compressors: Dict[ShNode, TelemetryCompressor]
     settings: ScadaSettings
     hardware_layout: HardwareLayout
+    _readings: RecentReadings
+    _retired_readings: RecentReadings
+    _simple_snapshot_ids: Dict[ShNode, int]
 
     def __init__(self, settings: ScadaSettings, hardware_layout: HardwareLayout):
         self.latest_total_power_w: Optional[int] = None
 
-        # status_to_store is a placeholder Dict of GtShStatus
-        # objects by StatusUid key that we want to store
-        # (probably about 3 weeks worth) and access on restart
-        self.latest_total_power_w: Optional[int] = None
-        self.status_to_store: Dict[str:GtShStatus] = {}
+        history = settings.status_history
+        if history.enabled:
+            self.status_history = StatusHistory(
+                TimedRollingFilePersister(settings.paths.data_dir / "status_history", max_bytes=history.max_bytes),
+                retention_s=history.retention_s,
+                max_cached=history.max_cached,
+                reporting_period_s=settings.seconds_per_report,
+            )
+        else:
+            self.status_history = None
 
         self.settings = settings
         self.hardware_layout = hardware_layout
-        self.telemetry_names = {
-            node: NodeConfig(node, self.settings).reporting.TelemetryName
-            for node in hardware_layout.my_simple_sensors
+        self.reporting_configs = {
+            node: NodeConfig(node, self.settings).reporting for node in hardware_layout.my_simple_sensors
         }
+        self.telemetry_names = {node: config.TelemetryName for node, config in self.reporting_configs.items()}
+        self.compressors = self._make_compressors()
 
         self.latest_simple_value: Dict[ShNode, int] = {
             node: None for node in hardware_layout.my_simple_sensors
         }
-        self.recent_simple_values: Dict[ShNode, List] = {
-            node: [] for node in hardware_layout.my_simple_sensors
-        }
-        self.recent_simple_read_times_unix_ms: Dict[ShNode, List] = {
-            node: [] for node in hardware_layout.my_simple_sensors
-        }
+        self.latest_value_from_multipurpose_sensor = hardware_layout.telemetry_channels.map(lambda tt: None)
 
-        self.latest_value_from_multipurpose_sensor: Dict[TelemetryTuple, int] = {
-            tt: None for tt in hardware_layout.my_telemetry_tuples
-        }
-        self.recent_values_from_multipurpose_sensor: Dict[TelemetryTuple, List] = {
-            tt: [] for tt in hardware_layout.my_telemetry_tuples
-        }
-        self.recent_read_times_unix_ms_from_multipurpose_sensor: Dict[
-            TelemetryTuple, List
-        ] = {tt: [] for tt in hardware_layout.my_telemetry_tuples}
-        self.recent_ba_cmds: Dict[ShNode, List] = {
-            node: [] for node in hardware_layout.my_boolean_actuators
-        }
+        # Snapshot channels are the simple sensors followed by the multipurpose telemetry channels, in channel id
+        # order. The latest values above must be updated through record_*_reading() for snapshots to see them.
+        self._simple_snapshot_ids = {node: i for i, node in enumerate(hardware_layout.my_simple_sensors)}
+        self.snapshot_cache = SnapshotCache(
+            [SnapshotChannel(node.alias, self.telemetry_names[node]) for node in hardware_layout.my_simple_sensors]
+            + [SnapshotChannel(tt.AboutNode.alias, tt.TelemetryName) for tt in hardware_layout.telemetry_channels]
+        )
 
-        self.recent_ba_cmd_times_unix_ms: Dict[ShNode, List] = {
-            node: [] for node in hardware_layout.my_boolean_actuators
-        }
+        # Readings accumulate in _readings. Flushing swaps it with _retired_readings, which is cleared (keeping its
+        # storage) to receive the next period while the flushed period stays readable until the following flush.
+        self._readings = RecentReadings.for_layout(hardware_layout)
+        self._retired_readings = RecentReadings.for_layout(hardware_layout)
 
-        self.flush_latest_readings()
+    def _make_compressors(self) -> Dict[ShNode, TelemetryCompressor]:
+        """A compressor for each simple sensor whose TelemetryName has an error bound, converted from the Unit of its
+        reporting config to the integers it reports."""
+        compression = self.settings.telemetry_compression
+        if not compression.enabled:
+            return dict()
+        compressors = dict()
+        for node, config in self.reporting_configs.items():
+            error_bound = compression.error_bounds.get(config.TelemetryName.value)
+            if error_bound is not None:
+                compressors[node] = TelemetryCompressor(compression.method, error_bound * 10 ** -config.Exponent)
+        return compressors
 
-    def flush_latest_readings(self):
-        self.recent_simple_values = {node: [] for node in self.hardware_layout.my_simple_sensors}
-        self.recent_simple_read_times_unix_ms = {
-            node: [] for node in self.hardware_layout.my_simple_sensors
-        }
+    @property
+    def recent_simple_values(self) -> Dict[ShNode, TelemetryBuffer]:
+        return self._readings.simple_values
 
-        self.recent_values_from_multipurpose_sensor = {
-            tt: [] for tt in self.hardware_layout.my_telemetry_tuples
-        }
-        self.recent_read_times_unix_ms_from_multipurpose_sensor = {
-            tt: [] for tt in self.hardware_layout.my_telemetry_tuples
-        }
+    @property
+    def recent_simple_read_times_unix_ms(self) -> Dict[ShNode, TelemetryBuffer]:
+        return self._readings.simple_read_times_unix_ms
 
-        self.recent_ba_cmds = {node: [] for node in self.hardware_layout.my_boolean_actuators}
-        self.recent_ba_cmd_times_unix_ms = {
-            node: [] for node in self.hardware_layout.my_boolean_actuators
-        }
+    @property
+    def recent_values_from_multipurpose_sensor(self) -> ChannelMap[TelemetryBuffer]:
+        return self._readings.multipurpose_values
+
+    @property
+    def recent_read_times_unix_ms_from_multipurpose_sensor(self) -> ChannelMap[TelemetryBuffer]:
+        return self._readings.multipurpose_read_times_unix_ms
+
+    @property
+    def recent_ba_cmds(self) -> Dict[ShNode, TelemetryBuffer]:
+        return self._readings.ba_cmds
+
+    @property
+    def recent_ba_cmd_times_unix_ms(self) -> Dict[ShNode, TelemetryBuffer]:
+        return self._readings.ba_cmd_times_unix_ms
+
+    @property
+    def readings(self) -> RecentReadings:
+        return self._readings
+
+    def record_simple_reading(self, node: ShNode, value: int, read_time_unix_ms: int) -> None:
+        compressor = self.compressors.get(node)
+        if compressor is None:
+            self._readings.simple_values[node].append(value)
+            self._readings.simple_read_times_unix_ms[node].append(read_time_unix_ms)
+        else:
+            for kept_value, kept_read_time_unix_ms in compressor.add(value, read_time_unix_ms):
+                self._readings.simple_values[node].append(kept_value)
+                self._readings.simple_read_times_unix_ms[node].append(kept_read_time_unix_ms)
+        self._readings.simple_aggregates[node].add(value, read_time_unix_ms)
+        self.latest_simple_value[node] = value
+        self.snapshot_cache.update(self._simple_snapshot_ids[node], value)
+
+    def record_multipurpose_reading(self, channel_id: int, value: int, read_time_unix_ms: int) -> None:
+        self._readings.multipurpose_values.by_id[channel_id].append(value)
+        self._readings.multipurpose_read_times_unix_ms.by_id[channel_id].append(read_time_unix_ms)
+        self._readings.multipurpose_aggregates.by_id[channel_id].add(value, read_time_unix_ms)
+        self.latest_value_from_multipurpose_sensor.by_id[channel_id] = value
+        self.snapshot_cache.update(len(self._simple_snapshot_ids) + channel_id, value)
+
+    def record_ba_cmd(self, node: ShNode, relay_state: int, command_time_unix_ms: int) -> None:
+        self._readings.ba_cmds[node].append(relay_state)
+        self._readings.ba_cmd_times_unix_ms[node].append(command_time_unix_ms)
+
+    def flush_latest_readings(self) -> RecentReadings:
+        """Start a new reporting period. Returns the readings of the period just ended, which are valid until the
+        next flush."""
+        for node, compressor in self.compressors.items():
+            pending = compressor.flush()
+            if pending is not None:
+                self._readings.simple_values[node].append(pending[0])
+                self._readings.simple_read_times_unix_ms[node].append(pending[1])
+        retired = self._readings
+        self._retired_readings.clear()
+        self._readings = self._retired_readings
+        self._retired_readings = retired
+        return retired
+
+    def memory_by_channel(self) -> Dict[str, ChannelMemory]:
+        """Buffer memory of each channel, over the current and the retired period, and its current reading count."""
+        memory: Dict[str, ChannelMemory] = dict()
+        for readings in [self._readings, self._retired_readings]:
+            for buffers in readings.buffer_maps():
+                for channel, buffer in buffers.items():
+                    name = channel_name(channel)
+                    if name not in memory:
+                        memory[name] = ChannelMemory()
+                    memory[name].add(buffer)
+        for buffers in [self.recent_simple_values, self.recent_values_from_multipurpose_sensor, self.recent_ba_cmds]:
+            for channel, buffer in buffers.items():
+                memory[channel_name(channel)].readings = len(buffer)
+        return memory
+
+    def compression_by_channel(self) -> Dict[str, CompressionStats]:
+        """Readings received and kept by each compressed channel since startup."""
+        return {channel_name(node): compressor.stats for node, compressor in self.compressors.items()}
 
     def make_simple_telemetry_status(
-        self, node: ShNode
+        self, node: ShNode, readings: Optional[RecentReadings] = None
     ) -> Optional[GtShSimpleTelemetryStatus]:
+        if readings is None:
+            readings = self._readings
         if node in self.hardware_layout.my_simple_sensors:
-            if len(self.recent_simple_values[node]) == 0:
+            if len(readings.simple_values[node]) == 0:
                 return None
-            read_time_unix_ms_list = self.recent_simple_read_times_unix_ms[node]
-            value_list = self.recent_simple_values[node]
+            read_time_unix_ms_list = readings.simple_read_times_unix_ms[node].tolist()
+            value_list = readings.simple_values[node].tolist()
             telemetry_name = self.telemetry_names[node]
+            # The compression, if any, goes with the readings, so they can be reconstructed without the Scada's
+            # settings.
+            compressor = self.compressors.get(node)
             return GtShSimpleTelemetryStatus_Maker(
                 sh_node_alias=node.alias,
                 telemetry_name=telemetry_name,
                 value_list=value_list,
                 read_time_unix_ms_list=read_time_unix_ms_list,
+                compression_method=None if compressor is None else compressor.method.value,
+                compression_error_bound=None if compressor is None else compressor.error_bound,
             ).tuple
         else:
             return None
 
     def make_multipurpose_telemetry_status(
-        self, tt: TelemetryTuple
+        self, tt: TelemetryTuple, readings: Optional[RecentReadings] = None
     ) -> Optional[GtShMultipurposeTelemetryStatus]:
-        if tt in self.hardware_layout.my_telemetry_tuples:
-            if len(self.recent_values_from_multipurpose_sensor[tt]) == 0:
-                return None
-            read_time_unix_ms_list = (
-                self.recent_read_times_unix_ms_from_multipurpose_sensor[tt]
-            )
-            value_list = self.recent_values_from_multipurpose_sensor[tt]
-            return GtShMultipurposeTelemetryStatus_Maker(
-                about_node_alias=tt.AboutNode.alias,
-                sensor_node_alias=tt.SensorNode.alias,
-                telemetry_name=tt.TelemetryName,
-                value_list=value_list,
-                read_time_unix_ms_list=read_time_unix_ms_list,
-            ).tuple
-        else:
+        if readings is None:
+            readings = self._readings
+        channel_id = self.hardware_layout.telemetry_channels.ids.get(tt)
+        if channel_id is None:
             return None
+        return self._make_multipurpose_telemetry_status(channel_id, readings)
+
+    def _make_multipurpose_telemetry_status(
+        self, channel_id: int, readings: RecentReadings
+    ) -> Optional[GtShMultipurposeTelemetryStatus]:
+        values = readings.multipurpose_values.by_id[channel_id]
+        if len(values) == 0:
+            return None
+        tt = self.hardware_layout.telemetry_channels.tuples[channel_id]
+        return GtShMultipurposeTelemetryStatus_Maker(
+            about_node_alias=tt.AboutNode.alias,
+            sensor_node_alias=tt.SensorNode.alias,
+            telemetry_name=tt.TelemetryName,
+            value_list=values.tolist(),
+            read_time_unix_ms_list=readings.multipurpose_read_times_unix_ms.by_id[channel_id].tolist(),
+        ).tuple
 
     def make_booleanactuator_cmd_status(
-        self, node: ShNode
+        self, node: ShNode, readings: Optional[RecentReadings] = None
     ) -> Optional[GtShBooleanactuatorCmdStatus]:
+        if readings is None:
+            readings = self._readings
         if node not in self.hardware_layout.my_boolean_actuators:
             return None
-        if len(self.recent_ba_cmds[node]) == 0:
+        if len(readings.ba_cmds[node]) == 0:
             return None
         return GtShBooleanactuatorCmdStatus_Maker(
             sh_node_alias=node.alias,
-            relay_state_command_list=self.recent_ba_cmds[node],
-            command_time_unix_ms_list=self.recent_ba_cmd_times_unix_ms[node],
+            relay_state_command_list=readings.ba_cmds[node].tolist(),
+            command_time_unix_ms_list=readings.ba_cmd_times_unix_ms[node].tolist(),
         ).tuple
 
-    def make_status(self, slot_start_seconds: int) -> GtShStatus:
+    def make_status(self, slot_start_seconds: int, readings: Optional[RecentReadings] = None) -> GtShStatus:
+        """Build the status of the current period or, if given, of the period whose readings were returned by
+        flush_latest_readings()."""
+        if readings is None:
+            readings = self._readings
         simple_telemetry_list = []
         multipurpose_telemetry_list = []
         booleanactuator_cmd_list = []
         for node in self.hardware_layout.my_simple_sensors:
-            status = self.make_simple_telemetry_status(node)
+            status = self.make_simple_telemetry_status(node, readings)
             if status:
                 simple_telemetry_list.append(status)
-        for tt in self.hardware_layout.my_telemetry_tuples:
-            status = self.make_multipurpose_telemetry_status(tt)
+        for channel_id in range(len(self.hardware_layout.telemetry_channels)):
+            status = self._make_multipurpose_telemetry_status(channel_id, readings)
             if status:
                 multipurpose_telemetry_list.append(status)
         for node in self.hardware_layout.my_boolean_actuators:
-            status = self.make_booleanactuator_cmd_status(node)
+            status = self.make_booleanactuator_cmd_status(node, readings)
             if status:
                 booleanactuator_cmd_list.append(status)
         return GtShStatus_Maker(
@@ -184,27 +350,89 @@ class ScadaData:
             simple_telemetry_list=simple_telemetry_list,
         ).tuple
 
-    def make_telemetry_snapshot(self) -> TelemetrySnapshotSpaceheat:
-        about_node_alias_list = []
-        value_list = []
-        telemetry_name_list = []
+    def _make_telemetry_aggregate(
+        self,
+        about_node_alias: str,
+        sensor_node_alias: str,
+        telemetry_name: TelemetryName,
+        aggregate: TelemetryAggregate,
+        values,
+        read_times_unix_ms,
+    ) -> Optional[GtShTelemetryAggregate]:
+        if len(values) == 0:
+            return None
+        compact = self.settings.compact_status
+        samples = pick_samples(
+            values, compact.sample_rule, compact.max_samples, compact.deadband_fraction, aggregate
+        )
+        return GtShTelemetryAggregate_Maker(
+            about_node_alias=about_node_alias,
+            sensor_node_alias=sensor_node_alias,
+            telemetry_name=telemetry_name,
+            count=aggregate.count,
+            min=aggregate.min,
+            max=aggregate.max,
+            mean=aggregate.mean,
+            last=aggregate.last,
+            first_read_time_unix_ms=aggregate.first_read_time_unix_ms,
+            last_read_time_unix_ms=aggregate.last_read_time_unix_ms,
+            value_list=[values[i] for i in samples],
+            read_time_unix_ms_list=[read_times_unix_ms[i] for i in samples],
+        ).tuple
+
+    def make_compact_status(
+        self,
+        slot_start_seconds: int,
+        readings: Optional[RecentReadings] = None,
+        status_uid: Optional[str] = None,
+    ) -> GtShStatusCompact:
+        """Like make_status(), but with the aggregates of each channel and the readings picked by the
+        compact_status settings in place of all of them. Pass the full status's uid to tie the two together."""
+        if readings is None:
+            readings = self._readings
+        aggregate_list = []
         for node in self.hardware_layout.my_simple_sensors:
-            if self.latest_simple_value[node] is not None:
-                about_node_alias_list.append(node.alias)
-                value_list.append(self.latest_simple_value[node])
-                telemetry_name_list.append(self.telemetry_names[node])
-        for tt in self.hardware_layout.my_telemetry_tuples:
-            if self.latest_value_from_multipurpose_sensor[tt] is not None:
-                about_node_alias_list.append(tt.AboutNode.alias)
-                value_list.append(self.latest_value_from_multipurpose_sensor[tt])
-                telemetry_name_list.append(tt.TelemetryName)
-        return TelemetrySnapshotSpaceheat_Maker(
-            about_node_alias_list=about_node_alias_list,
-            report_time_unix_ms=int(1000 * time.time()),
-            value_list=value_list,
-            telemetry_name_list=telemetry_name_list,
+            aggregate = self._make_telemetry_aggregate(
+                node.alias,
+                node.alias,
+                self.telemetry_names[node],
+                readings.simple_aggregates[node],
+                readings.simple_values[node],
+                readings.simple_read_times_unix_ms[node],
+            )
+            if aggregate:
+                aggregate_list.append(aggregate)
+        for channel_id, tt in enumerate(self.hardware_layout.telemetry_channels.tuples):
+            aggregate = self._make_telemetry_aggregate(
+                tt.AboutNode.alias,
+                tt.SensorNode.alias,
+                tt.TelemetryName,
+                readings.multipurpose_aggregates.by_id[channel_id],
+                readings.multipurpose_values.by_id[channel_id],
+                readings.multipurpose_read_times_unix_ms.by_id[channel_id],
+            )
+            if aggregate:
+                aggregate_list.append(aggregate)
+        booleanactuator_cmd_list = []
+        for node in self.hardware_layout.my_boolean_actuators:
+            status = self.make_booleanactuator_cmd_status(node, readings)
+            if status:
+                booleanactuator_cmd_list.append(status)
+        return GtShStatusCompact_Maker(
+            from_g_node_alias=self.hardware_layout.scada_g_node_alias,
+            from_g_node_id=self.hardware_layout.scada_g_node_id,
+            status_uid=status_uid or str(uuid.uuid4()),
+            about_g_node_alias=self.hardware_layout.terminal_asset_g_node_alias,
+            slot_start_unix_s=slot_start_seconds,
+            reporting_period_s=self.settings.seconds_per_report,
+            telemetry_aggregate_list=aggregate_list,
+            booleanactuator_cmd_list=booleanactuator_cmd_list,
+            sample_rule=self.settings.compact_status.sample_rule.value,
         ).tuple
 
+    def make_telemetry_snapshot(self) -> TelemetrySnapshotSpaceheat:
+        return self.snapshot_cache.snapshot()
+
     def make_snapshot(self) -> SnapshotSpaceheat:
         return SnapshotSpaceheat_Maker(
             from_g_node_alias=self.hardware_layout.scada_g_node_alias,
@@ -214,3 +442,19 @@ class ScadaData:
 
     def make_snaphsot_payload(self) -> dict:
         return self.make_snapshot().asdict()
+
+    def make_snapshot_delta(self, acked_seq: int) -> SnapshotSpaceheatDelta:
+        """The channels changed since acked_seq, the Seq of the last delta the Atn applied."""
+        delta = self.snapshot_cache.delta(acked_seq)
+        return SnapshotSpaceheatDelta_Maker(
+            from_g_node_alias=self.hardware_layout.scada_g_node_alias,
+            from_g_node_instance_id=self.hardware_layout.scada_g_node_id,
+            from_seq=delta.from_seq,
+            seq=delta.seq,
+            snapshot=delta.snapshot,
+        ).tuple
+
+    def close(self) -> None:
+        """Release the status history's files."""
+        if self.status_history is not None:
+            self.status_history.close()
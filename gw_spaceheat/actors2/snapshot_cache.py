@@ -0,0 +1,147 @@
+"""Latest value of each channel the Scada reports in snapshots, with change tracking.
+
+The snapshot is rebuilt, and validated through TelemetrySnapshotSpaceheat_Maker, only when a value has changed since
+the last build; otherwise the cached one is returned with a new report time. Each change is stamped with a sequence
+number, so that a delta holding only the channels changed since a sequence number the Atn acknowledged can be sent
+instead of a full snapshot. Sequence numbers strictly increase and are at least the change time in unix ms, so the
+numbering of a restarted Scada continues above anything the Atn acknowledged before.
+"""
+
+import time
+from typing import Iterable
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+
+from schema.enums import TelemetryName
+from schema.messages import TelemetrySnapshotSpaceheat
+from schema.messages import TelemetrySnapshotSpaceheat_Maker
+
+
+class SnapshotChannel(NamedTuple):
+    about_node_alias: str
+    telemetry_name: TelemetryName
+
+
+class SnapshotDelta(NamedTuple):
+    """The channels changed after from_seq, as of seq. A from_seq of 0 means every channel with a value."""
+
+    from_seq: int
+    seq: int
+    snapshot: TelemetrySnapshotSpaceheat
+
+
+class SnapshotCacheStats:
+    num_updates: int = 0
+    num_changes: int = 0
+    num_rebuilds: int = 0
+    num_cache_hits: int = 0
+    num_deltas: int = 0
+    num_full_deltas: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return dict(
+            num_updates=self.num_updates,
+            num_changes=self.num_changes,
+            num_rebuilds=self.num_rebuilds,
+            num_cache_hits=self.num_cache_hits,
+            num_deltas=self.num_deltas,
+            num_full_deltas=self.num_full_deltas,
+        )
+
+
+class SnapshotCache:
+    stats: SnapshotCacheStats
+    _channels: list[SnapshotChannel]
+    _values: list[Optional[int]]
+    _change_seqs: list[int]
+    _seq: int
+    _dirty: set[int]
+    _snapshot: Optional[TelemetrySnapshotSpaceheat]
+
+    def __init__(self, channels: Sequence[SnapshotChannel]):
+        self.stats = SnapshotCacheStats()
+        self._channels = list(channels)
+        self._values = [None] * len(self._channels)
+        self._change_seqs = [0] * len(self._channels)
+        self._seq = 0
+        self._dirty = set()
+        self._snapshot = None
+
+    @property
+    def channels(self) -> list[SnapshotChannel]:
+        return self._channels
+
+    @property
+    def seq(self) -> int:
+        """The sequence number of the latest change, or 0 if there has been none."""
+        return self._seq
+
+    @property
+    def num_dirty(self) -> int:
+        """The number of channels changed since the snapshot was last built."""
+        return len(self._dirty)
+
+    def value(self, channel_id: int) -> Optional[int]:
+        return self._values[channel_id]
+
+    def update(self, channel_id: int, value: int, now_unix_ms: Optional[int] = None) -> bool:
+        """Record value as the latest of the channel. Returns whether that changed it."""
+        self.stats.num_updates += 1
+        if value == self._values[channel_id]:
+            return False
+        if now_unix_ms is None:
+            now_unix_ms = int(time.time() * 1000)
+        self._seq = max(self._seq + 1, now_unix_ms)
+        self._values[channel_id] = value
+        self._change_seqs[channel_id] = self._seq
+        self._dirty.add(channel_id)
+        self.stats.num_changes += 1
+        return True
+
+    def snapshot(self, report_time_unix_ms: Optional[int] = None) -> TelemetrySnapshotSpaceheat:
+        """Every channel with a value, in channel order, reported at report_time_unix_ms (by default, now)."""
+        if report_time_unix_ms is None:
+            report_time_unix_ms = int(time.time() * 1000)
+        if self._snapshot is None or self._dirty:
+            self._snapshot = self._make(range(len(self._channels)), report_time_unix_ms)
+            self._dirty.clear()
+            self.stats.num_rebuilds += 1
+            return self._snapshot
+        self.stats.num_cache_hits += 1
+        return self._snapshot._replace(ReportTimeUnixMs=report_time_unix_ms)
+
+    def delta(self, acked_seq: int, report_time_unix_ms: Optional[int] = None) -> SnapshotDelta:
+        """The channels changed after acked_seq. An acked_seq this cache did not issue, being ahead of its numbering,
+        gets every channel, as does 0."""
+        if report_time_unix_ms is None:
+            report_time_unix_ms = int(time.time() * 1000)
+        self.stats.num_deltas += 1
+        if acked_seq > self._seq or acked_seq <= 0:
+            acked_seq = 0
+            self.stats.num_full_deltas += 1
+        if acked_seq == self._seq:
+            channel_ids = []
+        else:
+            channel_ids = [
+                channel_id for channel_id, change_seq in enumerate(self._change_seqs) if change_seq > acked_seq
+            ]
+        return SnapshotDelta(acked_seq, self._seq, self._make(channel_ids, report_time_unix_ms))
+
+    def _make(self, channel_ids: Iterable[int], report_time_unix_ms: int) -> TelemetrySnapshotSpaceheat:
+        about_node_alias_list = []
+        value_list = []
+        telemetry_name_list = []
+        for channel_id in channel_ids:
+            value = self._values[channel_id]
+            if value is not None:
+                channel = self._channels[channel_id]
+                about_node_alias_list.append(channel.about_node_alias)
+                value_list.append(value)
+                telemetry_name_list.append(channel.telemetry_name)
+        return TelemetrySnapshotSpaceheat_Maker(
+            about_node_alias_list=about_node_alias_list,
+            report_time_unix_ms=report_time_unix_ms,
+            value_list=value_list,
+            telemetry_name_list=telemetry_name_list,
+        ).tuple
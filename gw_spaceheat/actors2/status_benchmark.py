@@ -0,0 +1,145 @@
+"""Measure how long building and encoding the report-boundary status stalls the Scada2 event loop.
+
+Run, for example:
+
+    python -m actors2.status_benchmark --layout tests/config/hardware-layout.json --multipurpose-samples 7500
+
+A Scada2 is built for the layout, with its data and store-and-forward directories under --data-dir (a temporary
+directory by default), and is not connected to any broker. Before each of --iterations status sends its reading
+buffers are filled with --multipurpose-samples readings per multipurpose telemetry channel (7500 being 300 s of 40 ms
+power meter polls) and --simple-samples per simple sensor. While the statuses are sent, a ticker task standing in
+for GsPwr forwarding wakes every --tick-ms and records how late it woke. This is done with the status built inline on
+the loop (send_status) and in the status executor (send_status_from_executor). The report, written as JSON to stdout
+or --output, gives for each the ticker lateness percentiles and the status build time.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+
+from actors2.scada2 import Scada2
+from config import Paths
+from config import ScadaSettings
+from data_classes.hardware_layout import HardwareLayout
+from proactor.persister_benchmark import percentiles
+
+START_MS = 1_656_945_300_000
+
+
+class StatusBenchmarkConfig(NamedTuple):
+    multipurpose_samples: int = 7500
+    simple_samples: int = 60
+    iterations: int = 5
+    tick_ms: float = 1.0
+
+
+def fill_readings(scada: Scada2, cfg: StatusBenchmarkConfig) -> None:
+    data = scada._data
+    for node in data.hardware_layout.my_simple_sensors:
+        for i in range(cfg.simple_samples):
+            data.record_simple_reading(node, 1000 + i % 100, START_MS + 40 * i)
+    for channel_id in range(len(data.hardware_layout.telemetry_channels.tuples)):
+        for i in range(cfg.multipurpose_samples):
+            data.record_multipurpose_reading(channel_id, 1000 + i % 100, START_MS + 40 * i)
+
+
+async def _ticker(tick_s: float, lateness_s: list[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        expected_s = time.perf_counter() + tick_s
+        await asyncio.sleep(tick_s)
+        lateness_s.append(max(0.0, time.perf_counter() - expected_s))
+
+
+async def measure(scada: Scada2, cfg: StatusBenchmarkConfig, from_executor: bool) -> dict[str, Any]:
+    lateness_s: list[float] = []
+    send_s: list[float] = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(_ticker(cfg.tick_ms / 1000, lateness_s, stop))
+    try:
+        for _ in range(cfg.iterations):
+            fill_readings(scada, cfg)
+            await asyncio.sleep(0.05)
+            start_s = time.perf_counter()
+            if from_executor:
+                await scada.send_status_from_executor()
+            else:
+                scada.send_status()
+            send_s.append(time.perf_counter() - start_s)
+            await asyncio.sleep(0.05)
+    finally:
+        stop.set()
+        await ticker
+    return dict(
+        mode="executor" if from_executor else "inline",
+        send_s=percentiles(send_s),
+        tick_lateness_s=percentiles(lateness_s),
+    )
+
+
+def run(
+    layout_path: Path | str,
+    cfg: StatusBenchmarkConfig = StatusBenchmarkConfig(),
+    data_dir: Optional[Path | str] = None,
+) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        settings = ScadaSettings(paths=Paths(data_dir=Path(data_dir or tmp_dir), hardware_layout=layout_path))
+        layout = HardwareLayout.load(settings.paths.hardware_layout)
+        # Scada2 binds to the current event loop when constructed.
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        scada = Scada2(layout.scada_node.alias, settings, layout)
+        try:
+            results = [loop.run_until_complete(measure(scada, cfg, from_executor)) for from_executor in [False, True]]
+        finally:
+            scada.stop()
+            asyncio.set_event_loop(None)
+            loop.close()
+    channels = dict(
+        simple=len(layout.my_simple_sensors),
+        multipurpose=len(layout.my_telemetry_tuples),
+    )
+    return dict(config=cfg._asdict(), channels=channels, results=results)
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure the event loop stall of building Scada2 statuses.")
+    parser.add_argument("-l", "--layout", default=str(ScadaSettings().paths.hardware_layout))
+    parser.add_argument("-m", "--multipurpose-samples", type=int, default=StatusBenchmarkConfig().multipurpose_samples)
+    parser.add_argument("-s", "--simple-samples", type=int, default=StatusBenchmarkConfig().simple_samples)
+    parser.add_argument("-n", "--iterations", type=int, default=StatusBenchmarkConfig().iterations)
+    parser.add_argument("--tick-ms", type=float, default=StatusBenchmarkConfig().tick_ms)
+    parser.add_argument("-d", "--data-dir", default="", help="Defaults to a temporary directory.")
+    parser.add_argument("-o", "--output", default="", help="JSON report path. Defaults to stdout.")
+    return parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> dict[str, Any]:
+    args = parse_args(argv)
+    report = run(
+        args.layout,
+        StatusBenchmarkConfig(
+            multipurpose_samples=args.multipurpose_samples,
+            simple_samples=args.simple_samples,
+            iterations=args.iterations,
+            tick_ms=args.tick_ms,
+        ),
+        data_dir=args.data_dir or None,
+    )
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text)
+    else:
+        print(text)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""History of the status messages the Scada has sent, kept on disk through a persister and indexed by slot.
+
+Each status is persisted under the uid "<SlotStartUnixS>.<StatusUid>", so the slot index is rebuilt from the
+persister's uids on restart without reading any status. The newest max_cached statuses are also kept decoded in
+memory. Statuses more than retention_s older than the newest slot are cleared as new ones are added, and the
+persister's own max_bytes trimming, which drops the oldest first, is reflected in the index after each add.
+"""
+
+import bisect
+import re
+from collections import OrderedDict
+from typing import NamedTuple
+from typing import Optional
+
+from result import Err
+from result import Ok
+from result import Result
+
+from proactor.persister import PersisterInterface
+from proactor.persister import Problems
+from proactor.persister import ReadFailed
+from proactor.persister import TrimEvent
+from schema.messages import GtShStatus
+from schema.messages import GtShStatus_Maker
+
+
+class StatusHistoryStats:
+    num_added: int = 0
+    num_replaced: int = 0
+    num_expired: int = 0
+    num_trimmed: int = 0
+    num_cache_hits: int = 0
+    num_disk_reads: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return dict(
+            num_added=self.num_added,
+            num_replaced=self.num_replaced,
+            num_expired=self.num_expired,
+            num_trimmed=self.num_trimmed,
+            num_cache_hits=self.num_cache_hits,
+            num_disk_reads=self.num_disk_reads,
+        )
+
+
+class StatusRange(NamedTuple):
+    """The statuses found for a range of slots, oldest first, and any problems reading the others."""
+
+    statuses: list[GtShStatus]
+    problems: Problems
+
+
+class StatusHistory:
+    DEFAULT_RETENTION_S = 21 * 24 * 60 * 60
+    DEFAULT_MAX_CACHED = 12
+    DEFAULT_REPORTING_PERIOD_S = 300
+    UID_RGX: re.Pattern = re.compile(r"^(?P<slot>\d+)\.(?P<status_uid>.+)$")
+
+    stats: StatusHistoryStats
+    _persister: PersisterInterface
+    _retention_s: int
+    _max_cached: int
+    _reporting_period_s: int
+    _slots: list[int]
+    _uids: dict[int, str]
+    _cache: OrderedDict[str, GtShStatus]
+    _last_trim: Optional[TrimEvent]
+
+    def __init__(
+        self,
+        persister: PersisterInterface,
+        retention_s: int = DEFAULT_RETENTION_S,
+        max_cached: int = DEFAULT_MAX_CACHED,
+        reporting_period_s: int = DEFAULT_REPORTING_PERIOD_S,
+    ):
+        self.stats = StatusHistoryStats()
+        self._persister = persister
+        self._retention_s = retention_s
+        self._max_cached = max(0, max_cached)
+        self._reporting_period_s = reporting_period_s
+        self._cache = OrderedDict()
+        self._last_trim = persister.last_trim
+        self._load_index()
+
+    @classmethod
+    def uid(cls, status: GtShStatus) -> str:
+        return f"{status.SlotStartUnixS}.{status.StatusUid}"
+
+    @property
+    def persister(self) -> PersisterInterface:
+        return self._persister
+
+    @property
+    def num_cached(self) -> int:
+        return len(self._cache)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, slot_start_unix_s: int) -> bool:
+        return slot_start_unix_s in self._uids
+
+    def add(self, status: GtShStatus) -> Result[bool, Problems]:
+        """Persist status as the status of its slot, replacing any earlier status of that slot."""
+        problems = Problems()
+        slot = status.SlotStartUnixS
+        uid = self.uid(status)
+        match self._persister.persist(uid, status.as_type().encode()):
+            case Err(persist_problems):
+                problems.add_problems(persist_problems)
+                if problems.errors:
+                    return Err(problems)
+        previous = self._uids.get(slot)
+        if previous is None:
+            bisect.insort(self._slots, slot)
+        elif previous != uid:
+            self._cache.pop(previous, None)
+            self._clear(previous, problems)
+            self.stats.num_replaced += 1
+        self._uids[slot] = uid
+        self._cache_put(uid, status)
+        self.stats.num_added += 1
+        self._expire(problems)
+        self._reconcile_trims()
+        if problems:
+            return Err(problems)
+        return Ok(True)
+
+    def get(self, slot_start_unix_s: int) -> Result[Optional[GtShStatus], Problems]:
+        uid = self._uids.get(slot_start_unix_s)
+        if uid is None:
+            return Ok(None)
+        return self._read(uid)
+
+    def slots(self, start_s: Optional[int] = None, end_s: Optional[int] = None) -> list[int]:
+        """The slots with a stored status such that start_s <= SlotStartUnixS < end_s, oldest first. Answered from the
+        index alone."""
+        lo = 0 if start_s is None else bisect.bisect_left(self._slots, start_s)
+        hi = len(self._slots) if end_s is None else bisect.bisect_left(self._slots, end_s)
+        return self._slots[lo:hi]
+
+    def get_range(self, start_s: int, end_s: int) -> StatusRange:
+        """The stored statuses with start_s <= SlotStartUnixS < end_s, oldest first. Statuses read from disk are not
+        cached, so that a long range does not evict the recent statuses."""
+        problems = Problems()
+        statuses = []
+        for slot in self.slots(start_s, end_s):
+            match self._read(self._uids[slot], cache=False):
+                case Ok(status):
+                    if status is not None:
+                        statuses.append(status)
+                case Err(read_problems):
+                    problems.add_problems(read_problems)
+        return StatusRange(statuses, problems)
+
+    def gaps(self, start_s: int, end_s: int) -> list[tuple[int, int]]:
+        """The (start, end) intervals within [start_s, end_s) not covered by a stored status, where each status covers
+        reporting_period_s from its slot start. These are the periods a backfill request would ask for."""
+        gaps = []
+        covered_to = start_s
+        lo = max(0, bisect.bisect_left(self._slots, start_s - self._reporting_period_s + 1))
+        for slot in self._slots[lo:]:
+            if slot >= end_s:
+                break
+            if slot > covered_to:
+                gaps.append((covered_to, slot))
+            covered_to = max(covered_to, slot + self._reporting_period_s)
+        if covered_to < end_s:
+            gaps.append((covered_to, end_s))
+        return gaps
+
+    def close(self) -> None:
+        self._persister.close()
+
+    def _load_index(self) -> None:
+        self._slots = []
+        self._uids = dict()
+        duplicates = []
+        # In persisted order, so that of two uids for one slot the later one is kept.
+        for uid in self._persister.pending_in_order():
+            parsed = self.UID_RGX.match(uid)
+            if parsed is None:
+                continue
+            slot = int(parsed.group("slot"))
+            if slot in self._uids:
+                # Left by a stop between persisting a slot's new status and clearing its old one.
+                duplicates.append(self._uids[slot])
+            else:
+                self._slots.append(slot)
+            self._uids[slot] = uid
+        self._slots.sort()
+        for uid in duplicates:
+            self._persister.clear(uid)
+
+    def _read(self, uid: str, cache: bool = True) -> Result[Optional[GtShStatus], Problems]:
+        status = self._cache.get(uid)
+        if status is not None:
+            self._cache.move_to_end(uid)
+            self.stats.num_cache_hits += 1
+            return Ok(status)
+        self.stats.num_disk_reads += 1
+        match self._persister.retrieve(uid):
+            case Ok(content):
+                if content is None:
+                    self._forget(uid)
+                    return Ok(None)
+                try:
+                    status = GtShStatus_Maker.type_to_tuple(content)
+                except BaseException as e:
+                    return Err(Problems().add_error(e).add_error(ReadFailed("Status decode failed", uid=uid)))
+                if cache:
+                    self._cache_put(uid, status)
+                return Ok(status)
+            case Err(problems):
+                return Err(problems)
+
+    def _cache_put(self, uid: str, status: GtShStatus) -> None:
+        if self._max_cached:
+            self._cache[uid] = status
+            self._cache.move_to_end(uid)
+            while len(self._cache) > self._max_cached:
+                self._cache.popitem(last=False)
+
+    def _forget(self, uid: str) -> None:
+        self._cache.pop(uid, None)
+        parsed = self.UID_RGX.match(uid)
+        if parsed is not None:
+            slot = int(parsed.group("slot"))
+            if self._uids.get(slot) == uid:
+                del self._uids[slot]
+                del self._slots[bisect.bisect_left(self._slots, slot)]
+
+    def _clear(self, uid: str, problems: Problems) -> None:
+        match self._persister.clear(uid):
+            case Err(clear_problems):
+                problems.add_problems(clear_problems)
+
+    def _expire(self, problems: Problems) -> None:
+        if not self._slots:
+            return
+        cutoff = self._slots[-1] - self._retention_s
+        num_expired = bisect.bisect_left(self._slots, cutoff)
+        for slot in self._slots[:num_expired]:
+            uid = self._uids.pop(slot)
+            self._cache.pop(uid, None)
+            self._clear(uid, problems)
+        del self._slots[:num_expired]
+        self.stats.num_expired += num_expired
+
+    def _reconcile_trims(self) -> None:
+        last_trim = self._persister.last_trim
+        if last_trim is self._last_trim:
+            return
+        self._last_trim = last_trim
+        pending = self._persister.pending()
+        for slot, uid in list(self._uids.items()):
+            if uid not in pending:
+                self._forget(uid)
+                self.stats.num_trimmed += 1
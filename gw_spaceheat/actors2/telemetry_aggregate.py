@@ -0,0 +1,130 @@
+"""Streaming per-period aggregates of a telemetry channel, and the rules for picking the raw readings a compact status
+carries alongside them.
+
+A TelemetryAggregate is updated in O(1) as each reading is recorded, so the compact status needs no pass over the
+period's readings for its count, min, max, mean and last. Picking samples does pass over them once, on the status
+executor at the report boundary.
+"""
+
+from typing import Optional
+from typing import Sequence
+
+from config import SampleRule
+
+
+class TelemetryAggregate:
+    __slots__ = ("count", "min", "max", "total", "last", "first_read_time_unix_ms", "last_read_time_unix_ms")
+
+    count: int
+    min: Optional[int]
+    max: Optional[int]
+    total: int
+    last: Optional[int]
+    first_read_time_unix_ms: Optional[int]
+    last_read_time_unix_ms: Optional[int]
+
+    def __init__(self):
+        self.clear()
+
+    def add(self, value: int, read_time_unix_ms: int) -> None:
+        if self.count:
+            if value < self.min:
+                self.min = value
+            elif value > self.max:
+                self.max = value
+        else:
+            self.min = self.max = value
+            self.first_read_time_unix_ms = read_time_unix_ms
+        self.count += 1
+        self.total += value
+        self.last = value
+        self.last_read_time_unix_ms = read_time_unix_ms
+
+    def clear(self) -> None:
+        self.count = 0
+        self.min = None
+        self.max = None
+        self.total = 0
+        self.last = None
+        self.first_read_time_unix_ms = None
+        self.last_read_time_unix_ms = None
+
+    @property
+    def mean(self) -> Optional[float]:
+        if not self.count:
+            return None
+        return self.total / self.count
+
+    def as_dict(self) -> dict:
+        return dict(
+            count=self.count,
+            min=self.min,
+            max=self.max,
+            mean=self.mean,
+            last=self.last,
+            first_read_time_unix_ms=self.first_read_time_unix_ms,
+            last_read_time_unix_ms=self.last_read_time_unix_ms,
+        )
+
+    def __repr__(self) -> str:
+        return f"TelemetryAggregate({self.as_dict()})"
+
+
+def extrema_samples(values: Sequence[int], max_samples: int, indices: Optional[Sequence[int]] = None) -> list[int]:
+    """Indices of the lowest and highest reading of each of max_samples // 2 equal runs of values (or of the given
+    indices into values), in order. All of them if there are no more than max_samples."""
+    if indices is None:
+        indices = range(len(values))
+    if len(indices) <= max_samples:
+        return list(indices)
+    num_runs = max(1, max_samples // 2)
+    picked = []
+    for run in range(num_runs):
+        start = run * len(indices) // num_runs
+        end = (run + 1) * len(indices) // num_runs
+        lowest = highest = indices[start]
+        for i in indices[start + 1:end]:
+            if values[i] < values[lowest]:
+                lowest = i
+            elif values[i] > values[highest]:
+                highest = i
+        picked.append(min(lowest, highest))
+        if highest != lowest and len(picked) < max_samples:
+            picked.append(max(lowest, highest))
+    return picked
+
+
+def deadband_samples(values: Sequence[int], max_samples: int, deadband: float) -> list[int]:
+    """Indices of the first and last readings and of each reading that moved more than deadband from the last one
+    kept, thinned with extrema_samples() if there are more than max_samples."""
+    if not values:
+        return []
+    kept = [0]
+    kept_value = values[0]
+    for i in range(1, len(values)):
+        if abs(values[i] - kept_value) > deadband:
+            kept.append(i)
+            kept_value = values[i]
+    if kept[-1] != len(values) - 1:
+        kept.append(len(values) - 1)
+    return extrema_samples(values, max_samples, kept)
+
+
+def pick_samples(
+    values: Sequence[int],
+    rule: SampleRule,
+    max_samples: int,
+    deadband_fraction: float = 0.0,
+    aggregate: Optional[TelemetryAggregate] = None,
+) -> list[int]:
+    """Indices of at most max_samples of values, picked by rule. The deadband is deadband_fraction of the range of
+    values, taken from aggregate when given."""
+    if max_samples <= 0 or not values:
+        return []
+    if rule == SampleRule.deadband:
+        if aggregate is not None and aggregate.count:
+            value_range = aggregate.max - aggregate.min
+        else:
+            value_range = max(values) - min(values)
+        return deadband_samples(values, max_samples, deadband_fraction * value_range)
+    return extrema_samples(values, max_samples)
@@ -0,0 +1,95 @@
+"""Typed, reusable storage for the readings Scada accumulates between status reports."""
+
+from array import array
+from typing import Iterator
+from typing import List
+
+DEFAULT_CAPACITY = 64
+ITEM_SIZE = array("q").itemsize
+
+
+class TelemetryBuffer:
+    """Growable buffer of 64 bit integers backed by a preallocated array('q').
+
+    Readings are stored unboxed. Clearing the buffer keeps its storage, so a buffer that is cleared at the end of
+    every reporting period stops allocating once it has grown to the largest period seen. Storage grows by doubling
+    when it is full.
+    """
+
+    __slots__ = ("_values", "_len", "_capacity")
+
+    _values: array
+    _len: int
+    _capacity: int
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self._capacity = max(1, capacity)
+        self._values = array("q", bytes(ITEM_SIZE * self._capacity))
+        self._len = 0
+
+    def append(self, value: int) -> None:
+        n = self._len
+        if n == self._capacity:
+            self._values.frombytes(bytes(ITEM_SIZE * n))
+            self._capacity = 2 * n
+        self._values[n] = value
+        self._len = n + 1
+
+    def clear(self) -> None:
+        self._len = 0
+
+    def tolist(self) -> List[int]:
+        return self._values[: self._len].tolist()
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def nbytes(self) -> int:
+        return ITEM_SIZE * self._capacity
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[int]:
+        values = self._values
+        for i in range(self._len):
+            yield values[i]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._values[: self._len][index].tolist()
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("TelemetryBuffer index out of range")
+        return self._values[index]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, TelemetryBuffer):
+            return NotImplemented
+        return self.tolist() == other.tolist()
+
+    def __repr__(self) -> str:
+        return f"TelemetryBuffer({self.tolist()}, capacity={self.capacity})"
+
+
+class ChannelMemory:
+    readings: int = 0
+    buffers: int = 0
+    capacity: int = 0
+    nbytes: int = 0
+
+    def add(self, buffer: TelemetryBuffer) -> None:
+        self.buffers += 1
+        self.capacity += buffer.capacity
+        self.nbytes += buffer.nbytes
+
+    def as_dict(self) -> dict[str, int]:
+        return dict(
+            readings=self.readings,
+            buffers=self.buffers,
+            capacity=self.capacity,
+            nbytes=self.nbytes,
+        )
@@ -0,0 +1,147 @@
+"""Lossy-bounded compression of a channel's readings before they enter the status, and the reconstruction of the
+series from the readings kept.
+
+A compressor sees each reading as it arrives and returns the readings to keep, so the status buffers only ever hold
+those. Each reporting period is compressed on its own: the first reading of a period is always kept, and flush() at
+the end of the period returns the last reading received if it was not already kept, so each status reconstructs its
+period without the ones before it.
+
+With error bound E, every reading dropped is within E of the series reconstructed by reconstruct():
+- deadband keeps a reading when it is more than E from the last one kept, and reconstructs by holding the last kept
+  value.
+- swinging_door keeps a reading when the straight line from the last one kept can no longer pass within E of every
+  reading since, and reconstructs by linear interpolation between the readings kept.
+"""
+
+import bisect
+import math
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from config import CompressionMethod
+
+Reading = Tuple[int, int]
+"""A (value, read_time_unix_ms) pair."""
+
+
+class CompressionStats:
+    num_received: int = 0
+    num_kept: int = 0
+
+    @property
+    def ratio(self) -> float:
+        """Readings received per reading kept; 1.0 before any reading."""
+        if not self.num_kept:
+            return 1.0
+        return self.num_received / self.num_kept
+
+    def as_dict(self) -> dict:
+        return dict(num_received=self.num_received, num_kept=self.num_kept, ratio=self.ratio)
+
+
+class TelemetryCompressor:
+    method: CompressionMethod
+    error_bound: float
+    stats: CompressionStats
+    _kept: Optional[Reading]
+    _last: Optional[Reading]
+    _last_was_kept: bool
+    _slope_low: float
+    _slope_high: float
+
+    def __init__(self, method: CompressionMethod, error_bound: float):
+        self.method = method
+        self.error_bound = error_bound
+        self.stats = CompressionStats()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._kept = None
+        self._last = None
+        self._last_was_kept = False
+        self._slope_low = -math.inf
+        self._slope_high = math.inf
+
+    def _keep(self, reading: Reading) -> Reading:
+        self._kept = reading
+        self._slope_low = -math.inf
+        self._slope_high = math.inf
+        self.stats.num_kept += 1
+        return reading
+
+    def add(self, value: int, read_time_unix_ms: int) -> List[Reading]:
+        """Readings to keep, in order, now that this one has been received."""
+        self.stats.num_received += 1
+        reading = (value, read_time_unix_ms)
+        if self._kept is None:
+            kept = [self._keep(reading)]
+        elif self.method == CompressionMethod.deadband:
+            kept = self._add_deadband(reading)
+        else:
+            kept = self._add_swinging_door(reading)
+        self._last = reading
+        self._last_was_kept = bool(kept) and kept[-1] is reading
+        return kept
+
+    def _add_deadband(self, reading: Reading) -> List[Reading]:
+        if abs(reading[0] - self._kept[0]) > self.error_bound:
+            return [self._keep(reading)]
+        return []
+
+    def _add_swinging_door(self, reading: Reading) -> List[Reading]:
+        kept = []
+        if not self._fits_door(reading):
+            # The line from the kept reading to the last one passed within the bound of every reading between them.
+            if not self._last_was_kept:
+                kept.append(self._keep(self._last))
+            if not self._fits_door(reading):
+                kept.append(self._keep(reading))
+        return kept
+
+    def _fits_door(self, reading: Reading) -> bool:
+        """Narrow the door to the slopes of lines from the kept reading that pass within the bound of this one, and
+        return whether the line to this reading itself is still among them."""
+        value, read_time_unix_ms = reading
+        kept_value, kept_time_unix_ms = self._kept
+        dt = read_time_unix_ms - kept_time_unix_ms
+        if dt <= 0:
+            return abs(value - kept_value) <= self.error_bound
+        slope_low = max(self._slope_low, (value - self.error_bound - kept_value) / dt)
+        slope_high = min(self._slope_high, (value + self.error_bound - kept_value) / dt)
+        if not slope_low <= (value - kept_value) / dt <= slope_high:
+            return False
+        self._slope_low = slope_low
+        self._slope_high = slope_high
+        return True
+
+    def flush(self) -> Optional[Reading]:
+        """End the period. Returns the last reading received, if it was not kept, and starts the next period afresh."""
+        pending = None
+        if self._last is not None and not self._last_was_kept:
+            pending = self._keep(self._last)
+        self._reset()
+        return pending
+
+
+def reconstruct(
+    method: CompressionMethod,
+    values: Sequence[int],
+    read_times_unix_ms: Sequence[int],
+    at_times_unix_ms: Sequence[int],
+) -> List[Optional[float]]:
+    """The series compressed by method, from the readings kept, at each of at_times_unix_ms. Times before the first
+    reading kept get None; times after the last get its value."""
+    series: List[Optional[float]] = []
+    for t in at_times_unix_ms:
+        i = bisect.bisect_right(read_times_unix_ms, t)
+        if i == 0:
+            series.append(None)
+        elif i == len(values) or method == CompressionMethod.deadband:
+            series.append(float(values[i - 1]))
+        else:
+            t0, t1 = read_times_unix_ms[i - 1], read_times_unix_ms[i]
+            v0, v1 = values[i - 1], values[i]
+            series.append(v0 + (v1 - v0) * (t - t0) / (t1 - t0))
+    return series
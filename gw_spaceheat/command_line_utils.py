@@ -12,6 +12,7 @@ from actors2 import Scada2
 from config import ScadaSettings
 from data_classes.hardware_layout import HardwareLayout
 from data_classes.sh_node import ShNode
+from schema import validation
 from schema.enums import Role
 
 LOGGING_FORMAT = "%(asctime)s %(message)s"
@@ -100,6 +101,7 @@ def run_nodes_main(
     )
     settings.paths.mkdirs()
     setup_logging(args, settings)
+    validation.configure(settings.schema_validation)
     run_nodes(args.nodes, settings, load_house.load_all(settings), dbg=dbg)
 
 
@@ -147,6 +149,7 @@ async def run_async_actors_main(
     settings = ScadaSettings(_env_file=dotenv.find_dotenv(args.env_file))
     settings.paths.mkdirs()
     setup_logging(args, settings)
+    validation.configure(settings.schema_validation)
     layout = load_house.load_all(settings)
     if not args.nodes:
         args.nodes = [
@@ -1,4 +1,5 @@
 """Settings for the GridWorks Scada, readable from environment and/or from env files."""
+from enum import Enum
 from pathlib import Path
 from typing import Optional, Dict
 
@@ -25,6 +26,18 @@ class MQTTClient(BaseModel):
     password: SecretStr = SecretStr("")
 
 
+class MQTTBackend(str, Enum):
+    """How MQTT clients are driven: by a paho network thread per client, or by the asyncio event loop."""
+    threaded = "threaded"
+    asyncio = "asyncio"
+
+
+class PayloadEncoding(str, Enum):
+    """How payloads published to the gridworks broker are encoded. Receivers accept either, by content."""
+    json = "json"
+    cbor = "cbor"
+
+
 class Paths(BaseModel):
     # Relative offsets used under home directories
     base: Path | str = DEFAULT_BASE_DIR
@@ -89,6 +102,138 @@ class Paths(BaseModel):
         self.config_dir.mkdir(mode=mode, parents=parents, exist_ok=exist_ok)
         self.log_dir.mkdir(mode=mode, parents=parents, exist_ok=exist_ok)
 
+class ReceiveLane(BaseModel):
+    """A lane of the proactor receive queue. Lanes are listed highest priority first. A lane with max_skips is served
+    ahead of higher-priority lanes once it has been passed over that many times while holding messages. Message types
+    not listed in any lane go to the last lane."""
+    name: str
+    message_types: list[str] = []
+    max_skips: Optional[int] = None
+
+
+DEFAULT_RECEIVE_LANES = [
+    ReceiveLane(
+        name="power",
+        message_types=["p", "gt.dispatch.boolean.100", "gt.dispatch.boolean.local.100", "gt.sh.cli.atn.cmd.110"],
+    ),
+    ReceiveLane(
+        name="control",
+        message_types=["mqtt_connected", "mqtt_disconnected", "mqtt_connect_failed", "mqtt_suback"],
+    ),
+    ReceiveLane(
+        name="telemetry",
+        message_types=[
+            "gt.telemetry.110",
+            "gt.sh.telemetry.from.multipurpose.sensor.100",
+            "gt.driver.booleanactuator.cmd.100",
+        ],
+        max_skips=8,
+    ),
+    ReceiveLane(name="default", max_skips=8),
+]
+
+
+class ProcessBatch(BaseModel):
+    """How many ready messages the Scada processes per event loop wakeup, and for how long."""
+    max_messages: int = 32
+    max_batch_ms: float = 5.0
+
+
+class ForwardPolicy(str, Enum):
+    """What store-and-forward keeps of a message class while it cannot be sent."""
+    keep_all = "keep_all"
+    keep_latest = "keep_latest"
+    never = "never"
+
+
+DEFAULT_GRIDWORKS_FORWARD_POLICIES = {
+    "snapshot.spaceheat.100": ForwardPolicy.keep_latest,
+    "gt.sh.status.110": ForwardPolicy.keep_all,
+    "gt.sh.status.compact.100": ForwardPolicy.keep_all,
+    "p": ForwardPolicy.never,
+}
+
+
+class StoreAndForwardSettings(BaseModel):
+    """Store-and-forward of QoS >= 1 publishes to an MQTT broker. Policies are keyed by message type.
+
+    Enabling it for the gridworks broker also raises the statuses and snapshots the Scada publishes there, and any
+    other message type whose policy is not 'never', from QoS 0 to QoS 1, so that they are kept while the link is down.
+    """
+    enabled: bool = False
+    max_bytes: int = 50 * 1024 * 1024
+    drain_messages_per_s: float = 10.0
+    max_in_flight: int = 10
+    default_policy: ForwardPolicy = ForwardPolicy.keep_all
+    policies: dict[str, ForwardPolicy] = DEFAULT_GRIDWORKS_FORWARD_POLICIES
+
+
+class StatusHistorySettings(BaseModel):
+    """History of the status messages the Scada has sent, from which it answers the Atn's status backfill requests.
+    retention_s is measured back from the newest slot; max_cached statuses are also kept decoded in memory. A backfill
+    request is answered with at most max_backfill_statuses statuses, the oldest in its range first."""
+    enabled: bool = True
+    retention_s: int = 21 * 24 * 60 * 60
+    max_bytes: int = 100 * 1024 * 1024
+    max_cached: int = 12
+    max_backfill_statuses: int = 288
+
+
+class SampleRule(str, Enum):
+    """How the compact status picks the raw readings it carries of a channel. 'extrema' keeps the lowest and highest
+    reading of each of max_samples / 2 equal runs of readings; 'deadband' keeps readings that moved more than
+    deadband_fraction of the period's range from the last one kept."""
+    extrema = "extrema"
+    deadband = "deadband"
+
+
+class CompactStatusSettings(BaseModel):
+    """A compact status, carrying each channel's count, min, max, mean and last reading for the period plus at most
+    max_samples of its readings, sent alongside the full status or, with send_full_status False, instead of it."""
+    enabled: bool = False
+    send_full_status: bool = True
+    max_samples: int = 16
+    sample_rule: SampleRule = SampleRule.extrema
+    deadband_fraction: float = 0.05
+
+
+class CompressionMethod(str, Enum):
+    """How telemetry compression picks the readings that enter the status. 'deadband' keeps a reading more than the
+    error bound from the last one kept; 'swinging_door' keeps the readings needed for straight lines between kept
+    readings to pass within the error bound of every reading dropped."""
+    deadband = "deadband"
+    swinging_door = "swinging_door"
+
+
+DEFAULT_COMPRESSION_ERROR_BOUNDS = {
+    "WaterTempFTimes1000": 0.05,
+    "WaterTempCTimes1000": 0.03,
+}
+
+
+class TelemetryCompressionSettings(BaseModel):
+    """Compression of simple sensor readings before they enter the status. error_bounds are keyed by TelemetryName
+    value and given in the Unit of the channel's reporting config; channels without one are not compressed."""
+    enabled: bool = False
+    method: CompressionMethod = CompressionMethod.swinging_door
+    error_bounds: dict[str, float] = DEFAULT_COMPRESSION_ERROR_BOUNDS
+
+
+class ValidationPolicy(str, Enum):
+    """How much schema Makers check the messages this process constructs. Decoded messages are always checked."""
+    full = "full"
+    sampled = "sampled"
+    trusted = "trusted"
+
+
+class SchemaValidation(BaseModel):
+    """Validation of locally constructed schema messages. Policies are keyed by type alias; 'sampled' checks the
+    first and then every sample_every-th message of a type."""
+    default_policy: ValidationPolicy = ValidationPolicy.full
+    sample_every: int = 100
+    policies: dict[str, ValidationPolicy] = {}
+
+
 class ScadaSettings(BaseSettings):
     """Settings for the GridWorks scada."""
     local_mqtt: MQTTClient = MQTTClient()
@@ -97,6 +242,15 @@ class ScadaSettings(BaseSettings):
     seconds_per_report: int = 300
     async_power_reporting_threshold = 0.02
     logging: LoggingSettings = LoggingSettings()
+    receive_lanes: list[ReceiveLane] = DEFAULT_RECEIVE_LANES
+    process_batch: ProcessBatch = ProcessBatch()
+    mqtt_backend: MQTTBackend = MQTTBackend.threaded
+    gridworks_outbound: StoreAndForwardSettings = StoreAndForwardSettings()
+    status_history: StatusHistorySettings = StatusHistorySettings()
+    compact_status: CompactStatusSettings = CompactStatusSettings()
+    telemetry_compression: TelemetryCompressionSettings = TelemetryCompressionSettings()
+    gridworks_payload_encoding: PayloadEncoding = PayloadEncoding.json
+    schema_validation: SchemaValidation = SchemaValidation()
 
     class Config:
         env_prefix = "SCADA_"
@@ -15,6 +15,7 @@ from data_classes.cacs.electric_meter_cac import ElectricMeterCac
 from data_classes.components.electric_meter_component import ElectricMeterComponent
 from data_classes.errors import DataClassLoadingError
 from data_classes.sh_node import ShNode
+from data_classes.telemetry_channels import TelemetryChannels
 from drivers.power_meter.gridworks_sim_pm1__power_meter_driver import (
     GridworksSimPm1_PowerMeterDriver,
 )
@@ -307,3 +308,13 @@ class HardwareLayout:
         """This will include telemetry tuples from all the multipurpose sensors, the most
         important of which is the power meter."""
         return self.all_power_meter_telemetry_tuples
+
+    @cached_property
+    def telemetry_channels(self) -> TelemetryChannels:
+        """Channel ids for my_telemetry_tuples, in that order."""
+        return TelemetryChannels(self.my_telemetry_tuples)
+
+    def telemetry_channel_id(
+        self, about_alias: str, sensor_alias: str, telemetry_name: TelemetryName
+    ) -> Optional[int]:
+        return self.telemetry_channels.id(about_alias, sensor_alias, telemetry_name)
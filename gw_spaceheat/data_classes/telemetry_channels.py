@@ -0,0 +1,93 @@
+"""Dense integer ids for the telemetry tuples of a hardware layout.
+
+Code on the Scada hot path keeps per-channel state in flat lists indexed by channel id rather than in dicts keyed by
+TelemetryTuple, whose hash covers two ShNodes and a TelemetryName. A ChannelMap wraps such a list so that it can
+still be read and written by TelemetryTuple where speed does not matter.
+"""
+
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import MutableMapping
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import TypeVar
+
+from named_tuples.telemetry_tuple import TelemetryTuple
+from schema.enums import TelemetryName
+
+T = TypeVar("T")
+
+
+class TelemetryChannels:
+    """Assigns channel ids 0..n-1 to telemetry tuples, in the order given."""
+
+    tuples: List[TelemetryTuple]
+    ids: Dict[TelemetryTuple, int]
+    _ids_by_alias: Dict[Tuple[str, str, TelemetryName], int]
+
+    def __init__(self, tuples: Sequence[TelemetryTuple]):
+        self.tuples = list(tuples)
+        self.ids = {tt: channel_id for channel_id, tt in enumerate(self.tuples)}
+        if len(self.ids) != len(self.tuples):
+            raise ValueError(f"Duplicate telemetry tuples in {self.tuples}")
+        self._ids_by_alias = {
+            (tt.AboutNode.alias, tt.SensorNode.alias, tt.TelemetryName): channel_id
+            for channel_id, tt in enumerate(self.tuples)
+        }
+
+    def id(self, about_alias: str, sensor_alias: str, telemetry_name: TelemetryName) -> Optional[int]:
+        """The channel id for these aliases and telemetry name, or None if there is no such channel."""
+        return self._ids_by_alias.get((about_alias, sensor_alias, telemetry_name))
+
+    def map(self, value: Callable[[TelemetryTuple], T]) -> "ChannelMap[T]":
+        """A ChannelMap holding value(tt) for each channel."""
+        return ChannelMap(self, [value(tt) for tt in self.tuples])
+
+    def __len__(self) -> int:
+        return len(self.tuples)
+
+    def __iter__(self) -> Iterator[TelemetryTuple]:
+        return iter(self.tuples)
+
+    def __contains__(self, tt) -> bool:
+        return tt in self.ids
+
+
+class ChannelMap(MutableMapping[TelemetryTuple, T]):
+    """A value per channel, stored in the list by_id and also accessible by TelemetryTuple.
+
+    Channels cannot be added or removed.
+    """
+
+    channels: TelemetryChannels
+    by_id: List[T]
+
+    def __init__(self, channels: TelemetryChannels, by_id: List[T]):
+        if len(by_id) != len(channels):
+            raise ValueError(f"Expected {len(channels)} values, got {len(by_id)}")
+        self.channels = channels
+        self.by_id = by_id
+
+    def __getitem__(self, tt: TelemetryTuple) -> T:
+        return self.by_id[self.channels.ids[tt]]
+
+    def __setitem__(self, tt: TelemetryTuple, value: T) -> None:
+        self.by_id[self.channels.ids[tt]] = value
+
+    def __delitem__(self, tt: TelemetryTuple) -> None:
+        raise TypeError("Channels cannot be removed from a ChannelMap")
+
+    def __iter__(self) -> Iterator[TelemetryTuple]:
+        return iter(self.channels.tuples)
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def __contains__(self, tt) -> bool:
+        return tt in self.channels.ids
+
+    def __repr__(self) -> str:
+        return f"ChannelMap({dict(self.items())})"
@@ -0,0 +1,260 @@
+"""Asyncio facade over a PersisterInterface which performs all storage I/O on a single writer thread."""
+
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any
+from typing import AsyncIterator
+from typing import Callable
+from typing import NamedTuple
+from typing import Optional
+
+from result import Err
+from result import Ok
+from result import Result
+
+from proactor.persister import PendingBatch
+from proactor.persister import PendingCursor
+from proactor.persister import PersisterError
+from proactor.persister import PersisterInterface
+from proactor.persister import Problems
+from proactor.proactor_interface import Runnable
+
+
+class PersisterStopped(PersisterError):
+    ...
+
+
+class AsyncPersisterStats:
+    """Counters maintained by the writer thread. Latency is time spent in the underlying persister; wait is time a
+    request spent queued behind others."""
+
+    num_requests: int = 0
+    num_errors: int = 0
+    num_cancelled: int = 0
+    num_commit_errors: int = 0
+    max_queue_depth: int = 0
+    last_latency_s: float = 0.0
+    max_latency_s: float = 0.0
+    total_latency_s: float = 0.0
+    last_wait_s: float = 0.0
+    max_wait_s: float = 0.0
+
+    @property
+    def mean_latency_s(self) -> float:
+        return self.total_latency_s / self.num_requests if self.num_requests else 0.0
+
+    def record(self, wait_s: float, latency_s: float, ok: bool) -> None:
+        self.num_requests += 1
+        if not ok:
+            self.num_errors += 1
+        self.last_wait_s = wait_s
+        self.max_wait_s = max(self.max_wait_s, wait_s)
+        self.last_latency_s = latency_s
+        self.max_latency_s = max(self.max_latency_s, latency_s)
+        self.total_latency_s += latency_s
+
+    def as_dict(self) -> dict[str, int | float]:
+        return dict(
+            num_requests=self.num_requests,
+            num_errors=self.num_errors,
+            num_cancelled=self.num_cancelled,
+            num_commit_errors=self.num_commit_errors,
+            max_queue_depth=self.max_queue_depth,
+            last_latency_s=self.last_latency_s,
+            max_latency_s=self.max_latency_s,
+            mean_latency_s=self.mean_latency_s,
+            last_wait_s=self.last_wait_s,
+            max_wait_s=self.max_wait_s,
+        )
+
+
+class _Request(NamedTuple):
+    func: Callable[..., Any]
+    args: tuple
+    future: Future
+    enqueued_s: float
+
+
+class AsyncPersister(Runnable):
+    """Provide awaitable persist/retrieve/clear over a synchronous PersisterInterface.
+
+    Requests are executed one at a time, in submission order, by a dedicated writer thread, so a slow disk delays only
+    the awaiting coroutine, never the event loop. At most max_queue_depth requests may be outstanding; further
+    submitters wait for room. While idle, the writer thread calls the persister's commit_if_due() every
+    commit_interval_s so group-commit writes become durable during quiet periods.
+    """
+
+    DEFAULT_MAX_QUEUE_DEPTH = 1024
+    DEFAULT_COMMIT_INTERVAL_S = 0.05
+
+    stats: AsyncPersisterStats
+    _persister: PersisterInterface
+    _requests: queue.Queue
+    _room: Optional[asyncio.Semaphore]
+    _loop: Optional[asyncio.AbstractEventLoop]
+    _thread: threading.Thread
+    _commit_interval_s: float
+    _max_queue_depth: int
+    _stop_future: Optional[Future]
+    _outstanding: int
+
+    def __init__(
+        self,
+        persister: PersisterInterface,
+        max_queue_depth: int = DEFAULT_MAX_QUEUE_DEPTH,
+        commit_interval_s: float = DEFAULT_COMMIT_INTERVAL_S,
+        name: str = "AsyncPersister",
+    ):
+        self.stats = AsyncPersisterStats()
+        self._persister = persister
+        # Depth is bounded by _room on the loop side, so the thread-side queue itself never blocks the loop.
+        self._requests = queue.Queue()
+        self._room = None
+        self._loop = None
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._commit_interval_s = commit_interval_s
+        self._max_queue_depth = max_queue_depth
+        self._stop_future = None
+        self._outstanding = 0
+
+    @property
+    def persister(self) -> PersisterInterface:
+        return self._persister
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of requests submitted and not yet finished by the writer thread."""
+        return self._outstanding
+
+    def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._room = asyncio.Semaphore(self._max_queue_depth)
+        self._thread.start()
+
+    def stop(self):
+        """Request that the writer thread finish queued requests, close the persister and exit. If the thread was
+        never started, the queued requests and the close are run here instead."""
+        if self._stop_future is None:
+            self._stop_future = Future()
+            self._requests.put(_Request(self._persister.close, (), self._stop_future, time.perf_counter()))
+            if self._thread.ident is None:
+                self._run()
+
+    async def join(self):
+        if self._stop_future is not None:
+            await asyncio.wrap_future(self._stop_future)
+
+    async def persist(self, uid: str, content: bytes, wait_durable: bool = False) -> Result[Future, Problems]:
+        """Persist content. With wait_durable, do not return until the write is durable under the underlying
+        persister's DurabilityMode."""
+        result = await self._submit(self._persister.persist, uid, content)
+        if wait_durable:
+            match result:
+                case Ok(durable):
+                    await asyncio.wrap_future(durable)
+        return result
+
+    async def clear(self, uid: str) -> Result[bool, Problems]:
+        return await self._submit(self._persister.clear, uid)
+
+    async def retrieve(self, uid: str) -> Result[Optional[bytes], Problems]:
+        return await self._submit(self._persister.retrieve, uid)
+
+    async def pending(self) -> set[str]:
+        return await self._submit(self._persister.pending)
+
+    async def reindex(self) -> Result[Optional[bool], Problems]:
+        return await self._submit(self._persister.reindex)
+
+    async def commit(self) -> Result[bool, Problems]:
+        return await self._submit(self._persister.commit)
+
+    def persist_nowait(self, uid: str, content: bytes) -> Future:
+        """Queue a persist without waiting for room or for its result, for callers which cannot await, such as one
+        which is stopping. Returns the Future of its Result."""
+        return self._submit_nowait(self._persister.persist, uid, content)
+
+    def clear_nowait(self, uid: str) -> Future:
+        """Like persist_nowait(), for clear()."""
+        return self._submit_nowait(self._persister.clear, uid)
+
+    async def iter_pending(
+        self,
+        batch_bytes: int = PersisterInterface.DEFAULT_BATCH_BYTES,
+        since: Optional[PendingCursor] = None,
+    ) -> AsyncIterator[PendingBatch]:
+        """Asynchronous form of PersisterInterface.iter_pending(); each batch is read on the writer thread."""
+        batches = self._persister.iter_pending(batch_bytes=batch_bytes, since=since)
+        while isinstance(batch := await self._submit(next, batches, None), PendingBatch):
+            yield batch
+
+    async def _submit(self, func: Callable[..., Any], *args: Any) -> Any:
+        if self._stop_future is not None or self._room is None:
+            return Err(Problems(errors=[PersisterStopped("AsyncPersister is not running")]))
+        await self._room.acquire()
+        self._outstanding += 1
+        self.stats.max_queue_depth = max(self.stats.max_queue_depth, self._outstanding)
+        future = Future()
+        future.add_done_callback(lambda _: self._loop.call_soon_threadsafe(self._request_done))
+        self._requests.put(_Request(func, args, future, time.perf_counter()))
+        return await asyncio.wrap_future(future)
+
+    def _submit_nowait(self, func: Callable[..., Any], *args: Any) -> Future:
+        future = Future()
+        if self._stop_future is not None:
+            future.set_result(Err(Problems(errors=[PersisterStopped("AsyncPersister is not running")])))
+        else:
+            self._requests.put(_Request(func, args, future, time.perf_counter()))
+        return future
+
+    def _request_done(self) -> None:
+        self._outstanding -= 1
+        self._room.release()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                request = self._requests.get(timeout=self._commit_interval_s)
+            except queue.Empty:
+                self._commit_if_due()
+                continue
+            # noinspection PyBroadException
+            try:
+                self._execute(request)
+            except BaseException:
+                self.stats.num_errors += 1
+            if request.future is self._stop_future:
+                return
+            if self._requests.empty():
+                self._commit_if_due()
+
+    def _execute(self, request: _Request) -> None:
+        # A request whose awaiting coroutine was cancelled is skipped. The stop request always runs, so the persister
+        # is closed even if join() was cancelled.
+        if not request.future.set_running_or_notify_cancel() and request.future is not self._stop_future:
+            self.stats.num_cancelled += 1
+            return
+        start_s = time.perf_counter()
+        ok = True
+        # noinspection PyBroadException
+        try:
+            result = request.func(*request.args)
+            if isinstance(result, Err):
+                ok = False
+        except BaseException as e:
+            ok = False
+            result = Err(Problems(errors=[e]))
+        self.stats.record(start_s - request.enqueued_s, time.perf_counter() - start_s, ok)
+        if not request.future.done():
+            request.future.set_result(result)
+
+    def _commit_if_due(self) -> None:
+        # noinspection PyBroadException
+        try:
+            if self._persister.commit_if_due().is_err():
+                self.stats.num_commit_errors += 1
+        except BaseException:
+            self.stats.num_commit_errors += 1
@@ -0,0 +1,119 @@
+"""Table-driven message dispatch, with per-handler call counts and cumulative time."""
+
+import inspect
+import time
+from typing import Any
+from typing import Callable
+from typing import Hashable
+from typing import Optional
+
+
+class HandlerStats:
+    """Calls, errors and time spent in one handler. For coroutine handlers, time includes time spent awaiting."""
+
+    num_calls: int = 0
+    num_errors: int = 0
+    total_s: float = 0.0
+    max_s: float = 0.0
+
+    @property
+    def mean_s(self) -> float:
+        return self.total_s / self.num_calls if self.num_calls else 0.0
+
+    def record(self, elapsed_s: float) -> None:
+        self.num_calls += 1
+        self.total_s += elapsed_s
+        self.max_s = max(self.max_s, elapsed_s)
+
+    def as_dict(self) -> dict[str, int | float]:
+        return dict(
+            num_calls=self.num_calls,
+            num_errors=self.num_errors,
+            total_s=self.total_s,
+            max_s=self.max_s,
+            mean_s=self.mean_s,
+        )
+
+
+class Handler:
+    """A registered handler. Calling it awaits the handler function if it returns an awaitable, and records stats."""
+
+    name: str
+    func: Callable[..., Any]
+    stats: HandlerStats
+
+    def __init__(self, name: str, func: Callable[..., Any]):
+        self.name = name
+        self.func = func
+        self.stats = HandlerStats()
+
+    async def __call__(self, *args: Any) -> Any:
+        start_s = time.perf_counter()
+        try:
+            result = self.func(*args)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+        except BaseException:
+            self.stats.num_errors += 1
+            raise
+        finally:
+            self.stats.record(time.perf_counter() - start_s)
+
+
+def key_name(key: Hashable) -> str:
+    return key.__name__ if isinstance(key, type) else str(key)
+
+
+class DispatchTable:
+    """Handlers keyed by message type or payload type, found with one dict lookup.
+
+    A type key which has no handler of its own is resolved, once, to the handler of its nearest registered base class,
+    so subclasses of a registered payload type are dispatched as an isinstance() chain would dispatch them.
+    """
+
+    name: str
+    _handlers: dict[Hashable, Handler]
+    _resolved: dict[Hashable, Optional[Handler]]
+
+    def __init__(self, name: str):
+        self.name = name
+        self._handlers = dict()
+        self._resolved = dict()
+
+    def register(
+        self,
+        key: Hashable,
+        func: Callable[..., Any],
+        name: Optional[str] = None,
+        replace: bool = False,
+    ) -> Handler:
+        if key in self._handlers and not replace:
+            raise ValueError(f"ERROR. {self.name} already has a handler for [{key_name(key)}]")
+        handler = Handler(name if name is not None else f"{self.name}/{key_name(key)}", func)
+        self._handlers[key] = handler
+        self._resolved.clear()
+        return handler
+
+    def unregister(self, key: Hashable) -> Optional[Handler]:
+        handler = self._handlers.pop(key, None)
+        self._resolved.clear()
+        return handler
+
+    def lookup(self, key: Hashable) -> Optional[Handler]:
+        handler = self._handlers.get(key)
+        if handler is None and isinstance(key, type):
+            if key in self._resolved:
+                return self._resolved[key]
+            handler = next((self._handlers[base] for base in key.__mro__[1:] if base in self._handlers), None)
+            self._resolved[key] = handler
+        return handler
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.lookup(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._handlers)
+
+    def stats(self) -> dict[str, HandlerStats]:
+        return {handler.name: handler.stats for handler in self._handlers.values()}
@@ -1,19 +1,29 @@
 """MQTT infrastructure providing support for multiple MTQTT clients
 
-TODO: Replace synchronous use of Paho MQTT Client with asyncio usage, per Paho documentation or external library
+Two backends are available, selected by config.MQTTBackend:
 
-Main current limitation: each interaction between asyncio code and the mqtt clients must either have thread locking
-(as is provided inside paho for certain functions such as publish()) or an explicit message based API.
+* threaded: each client runs its own paho network thread (loop_start()) and its callbacks cross threads into the
+  event loop. Each interaction between asyncio code and the mqtt clients must either have thread locking (as is
+  provided inside paho for certain functions such as publish()) or an explicit message based API.
+* asyncio: paho's socket is driven by the event loop through add_reader()/add_writer() and loop_read()/loop_write()/
+  loop_misc(), so callbacks run on the loop thread and are queued without a thread hop. Only the blocking TCP
+  connect is run in the default executor.
 
 """
 
+import asyncio
+import logging
+import threading
 import uuid
+from typing import Any
+from typing import Callable
 from typing import Dict
 from typing import List
 from typing import Optional
 from typing import Set
 from typing import Tuple
 
+from paho.mqtt.client import MQTT_ERR_NO_CONN
 from paho.mqtt.client import MQTT_ERR_SUCCESS
 from paho.mqtt.client import Client as PahoMQTTClient
 from paho.mqtt.client import MQTTMessageInfo
@@ -26,6 +36,8 @@ from proactor.message import MQTTReceiptMessage
 from proactor.message import MQTTSubackMessage
 from proactor.sync_thread import AsyncQueueWriter
 
+logger = logging.getLogger(__name__)
+
 
 class MQTTClientWrapper:
     _name: str
@@ -59,6 +71,9 @@ class MQTTClientWrapper:
         self._pending_subscriptions = set()
         self._pending_subacks = dict()
 
+    def _put(self, message: Any) -> None:
+        self._receive_queue.put(message)
+
     def start(self):
         self._client.connect(self._client_config.host, port=self._client_config.port)
         self._client.loop_start()
@@ -111,7 +126,7 @@ class MQTTClientWrapper:
         )
 
     def on_message(self, _, userdata, message):
-        self._receive_queue.put(
+        self._put(
             MQTTReceiptMessage(
                 client_name=self.name,
                 userdata=userdata,
@@ -124,7 +139,7 @@ class MQTTClientWrapper:
         if topics:
             for topic in topics:
                 self._pending_subscriptions.remove(topic)
-            self._receive_queue.put(
+            self._put(
                 MQTTSubackMessage(
                     client_name=self.name,
                     userdata=userdata,
@@ -135,7 +150,7 @@ class MQTTClientWrapper:
             )
 
     def on_connect(self, _, userdata, flags, rc):
-        self._receive_queue.put(
+        self._put(
             MQTTConnectMessage(
                 client_name=self.name,
                 userdata=userdata,
@@ -145,7 +160,7 @@ class MQTTClientWrapper:
         )
 
     def on_connect_fail(self, _, userdata):
-        self._receive_queue.put(
+        self._put(
             MQTTConnectFailMessage(
                 client_name=self.name,
                 userdata=userdata,
@@ -154,7 +169,7 @@ class MQTTClientWrapper:
 
     def on_disconnect(self, _, userdata, rc):
         self._pending_subscriptions = set(self._subscriptions.keys())
-        self._receive_queue.put(
+        self._put(
             MQTTDisconnectMessage(
                 client_name=self.name,
                 userdata=userdata,
@@ -163,13 +178,135 @@ class MQTTClientWrapper:
         )
 
 
+class AsyncioMQTTClientWrapper(MQTTClientWrapper):
+    """An MQTTClientWrapper whose paho socket is driven by the asyncio event loop rather than a paho thread.
+
+    Must be started from the event loop thread. Reads and writes happen in add_reader()/add_writer() callbacks,
+    loop_misc() (keepalive, timeouts) runs every MISC_INTERVAL_S in a task, and after a disconnect the same task
+    reconnects with an exponential backoff, as paho's own network thread would.
+    """
+
+    MISC_INTERVAL_S = 1.0
+    RECONNECT_MIN_DELAY_S = 1.0
+    RECONNECT_MAX_DELAY_S = 120.0
+
+    _loop: asyncio.AbstractEventLoop
+    _loop_thread_id: Optional[int]
+    _misc_task: Optional[asyncio.Task]
+    _stopping: bool
+    last_connect_error: Optional[Exception]
+
+    def __init__(
+        self,
+        name: str,
+        client_config: config.MQTTClient,
+        receive_queue: AsyncQueueWriter,
+        loop: asyncio.AbstractEventLoop,
+    ):
+        super().__init__(name, client_config, receive_queue)
+        self._loop = loop
+        self._loop_thread_id = None
+        self._misc_task = None
+        self._stopping = False
+        self.last_connect_error = None
+        self._client.on_socket_open = self._on_socket_open
+        self._client.on_socket_close = self._on_socket_close
+        self._client.on_socket_register_write = self._on_socket_register_write
+        self._client.on_socket_unregister_write = self._on_socket_unregister_write
+
+    def _put(self, message: Any) -> None:
+        self._receive_queue.put_local(message)
+
+    def start(self):
+        self._loop_thread_id = threading.get_ident()
+        self._stopping = False
+        self._client.connect_async(self._client_config.host, port=self._client_config.port)
+        self._misc_task = self._loop.create_task(self._run_misc(), name=f"{self.name}.mqtt_misc")
+
+    def stop(self):
+        self._stopping = True
+        self._client.disconnect()
+        if self._misc_task is not None and not self._misc_task.done():
+            self._misc_task.cancel()
+
+    async def _run_misc(self):
+        reconnect_delay_s = self.RECONNECT_MIN_DELAY_S
+        while not self._stopping:
+            if self._client.socket() is None:
+                connecting = self._loop.run_in_executor(None, self._client.reconnect)
+                try:
+                    await connecting
+                    reconnect_delay_s = self.RECONNECT_MIN_DELAY_S
+                except asyncio.CancelledError:
+                    # stop() during a connect: close the connection once the executor finishes making it.
+                    connecting.add_done_callback(lambda _: self._client.disconnect())
+                    raise
+                except Exception as e:
+                    # Not only OSError: paho raises ValueError for an invalid host, and WebsocketConnectionError.
+                    self.last_connect_error = e
+                    logger.error(f"{self.name} reconnect failed, retrying in {reconnect_delay_s} s: {e!r}")
+                    self.on_connect_fail(self._client, None)
+                    await asyncio.sleep(reconnect_delay_s)
+                    reconnect_delay_s = min(2 * reconnect_delay_s, self.RECONNECT_MAX_DELAY_S)
+                    continue
+            if self._client.loop_misc() == MQTT_ERR_NO_CONN:
+                continue
+            await asyncio.sleep(self.MISC_INTERVAL_S)
+
+    def _on_loop(self, func: Callable[..., Any], *args: Any) -> None:
+        """Socket callbacks arrive on the loop thread, except during a connect running in the executor."""
+        if threading.get_ident() == self._loop_thread_id:
+            func(*args)
+        else:
+            self._loop.call_soon_threadsafe(func, *args)
+
+    def _on_socket_open(self, client, _userdata, sock):
+        self._on_loop(self._add_reader, client, sock)
+
+    def _on_socket_close(self, _client, _userdata, sock):
+        self._on_loop(self._remove_socket, sock)
+
+    def _on_socket_register_write(self, client, _userdata, sock):
+        self._on_loop(self._add_writer, client, sock)
+
+    def _on_socket_unregister_write(self, _client, _userdata, sock):
+        self._on_loop(self._loop.remove_writer, sock)
+
+    def _add_reader(self, client: PahoMQTTClient, sock) -> None:
+        if sock.fileno() != -1:
+            self._loop.add_reader(sock, client.loop_read)
+
+    def _add_writer(self, client: PahoMQTTClient, sock) -> None:
+        if sock.fileno() != -1:
+            self._loop.add_writer(sock, client.loop_write)
+
+    def _remove_socket(self, sock) -> None:
+        self._loop.remove_reader(sock)
+        self._loop.remove_writer(sock)
+
+
 class MQTTClients:
     _clients: Dict[str, MQTTClientWrapper]
     _send_queue: AsyncQueueWriter
+    _backend: config.MQTTBackend
+    _loop: Optional[asyncio.AbstractEventLoop]
 
-    def __init__(self, async_queue_writer: AsyncQueueWriter):
+    def __init__(
+        self,
+        async_queue_writer: AsyncQueueWriter,
+        backend: config.MQTTBackend = config.MQTTBackend.threaded,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ):
         self._send_queue = async_queue_writer
         self._clients = dict()
+        self._backend = backend
+        self._loop = loop
+        if backend == config.MQTTBackend.asyncio and loop is None:
+            raise ValueError("ERROR. The asyncio MQTT backend requires an event loop")
+
+    @property
+    def backend(self) -> config.MQTTBackend:
+        return self._backend
 
     def add_client(
         self,
@@ -178,7 +315,10 @@ class MQTTClients:
     ):
         if name in self._clients:
             raise ValueError(f"ERROR. MQTT client named {name} already exists")
-        self._clients[name] = MQTTClientWrapper(name, client_config, self._send_queue)
+        if self._backend == config.MQTTBackend.asyncio:
+            self._clients[name] = AsyncioMQTTClientWrapper(name, client_config, self._send_queue, self._loop)
+        else:
+            self._clients[name] = MQTTClientWrapper(name, client_config, self._send_queue)
 
     def publish(
         self, client: str, topic: str, payload: bytes, qos: int
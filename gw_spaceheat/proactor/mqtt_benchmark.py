@@ -0,0 +1,189 @@
+"""Benchmark the threaded and asyncio MQTTClients backends against a local broker (e.g. mosquitto).
+
+Run, for example:
+
+    python -m proactor.mqtt_benchmark --host localhost --port 1883 --messages 10000
+
+For each backend, one client subscribes to a unique topic and then publishes --messages messages to it, yielding to
+the event loop every --burst messages. The report, written as JSON to stdout or --output, contains per-backend
+round-trip throughput, publish-to-receipt latency percentiles (receipt being the moment the message is taken from the
+asyncio queue), the number of threads running and the event loop wakeups used by receipts.
+"""
+
+import argparse
+import asyncio
+import json
+import struct
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+
+from pydantic import SecretStr
+
+import config
+from proactor.message import MessageType
+from proactor.mqtt import MQTTClients
+from proactor.persister_benchmark import percentiles
+from proactor.sync_thread import AsyncQueueWriter
+
+CLIENT_NAME = "benchmark"
+TIMESTAMP = struct.Struct("!Q")
+
+
+class MQTTBenchmarkConfig(NamedTuple):
+    messages: int = 10_000
+    payload_bytes: int = 200
+    qos: int = 0
+    burst: int = 100
+    timeout_s: float = 60.0
+
+
+def make_payload(payload_bytes: int) -> bytes:
+    return TIMESTAMP.pack(time.perf_counter_ns()) + b"x" * max(0, payload_bytes - TIMESTAMP.size)
+
+
+async def _connect_and_subscribe(clients: MQTTClients, received: asyncio.Queue, timeout_s: float) -> None:
+    end_s = time.monotonic() + timeout_s
+    while not clients.subscribed(CLIENT_NAME):
+        message = await asyncio.wait_for(received.get(), max(0.0, end_s - time.monotonic()))
+        if message.header.message_type == MessageType.mqtt_connected.value:
+            clients.subscribe_all(CLIENT_NAME)
+
+
+async def benchmark(
+    backend: config.MQTTBackend,
+    client_config: config.MQTTClient,
+    benchmark_config: MQTTBenchmarkConfig = MQTTBenchmarkConfig(),
+) -> dict[str, Any]:
+    loop = asyncio.get_running_loop()
+    received = asyncio.Queue()
+    writer = AsyncQueueWriter(loop, received)
+    clients = MQTTClients(writer, backend=backend, loop=loop)
+    clients.add_client(CLIENT_NAME, client_config)
+    topic = f"gw/benchmark/{uuid.uuid4().hex}"
+    clients.subscribe(CLIENT_NAME, topic, benchmark_config.qos)
+    threads_before = threading.active_count()
+    clients.start()
+    try:
+        await _connect_and_subscribe(clients, received, benchmark_config.timeout_s)
+        threads = threading.active_count() - threads_before
+        wakeups_before = writer.wakeup_stats.as_dict()
+        latency_s = []
+
+        async def publish():
+            for i in range(benchmark_config.messages):
+                clients.publish(CLIENT_NAME, topic, make_payload(benchmark_config.payload_bytes), benchmark_config.qos)
+                if (i + 1) % benchmark_config.burst == 0:
+                    await asyncio.sleep(0)
+
+        start_s = time.perf_counter()
+        publisher = asyncio.create_task(publish())
+        end_s = time.monotonic() + benchmark_config.timeout_s
+        try:
+            while len(latency_s) < benchmark_config.messages:
+                message = await asyncio.wait_for(received.get(), max(0.0, end_s - time.monotonic()))
+                if (
+                    message.header.message_type == MessageType.mqtt_message.value
+                    and message.payload.message.topic == topic
+                ):
+                    sent_ns = TIMESTAMP.unpack_from(message.payload.message.payload)[0]
+                    latency_s.append((time.perf_counter_ns() - sent_ns) / 1e9)
+        except asyncio.TimeoutError:
+            pass
+        elapsed_s = time.perf_counter() - start_s
+        await publisher
+        wakeups = {
+            key: value - wakeups_before[key] if key != "max_burst" else value
+            for key, value in writer.wakeup_stats.as_dict().items()
+        }
+    finally:
+        clients.stop()
+    return dict(
+        backend=backend.value,
+        messages=benchmark_config.messages,
+        received=len(latency_s),
+        elapsed_s=elapsed_s,
+        messages_per_s=len(latency_s) / elapsed_s if elapsed_s else 0.0,
+        latency_s=percentiles(latency_s),
+        threads=threads,
+        wakeups=wakeups,
+    )
+
+
+async def run(
+    backends: Sequence[config.MQTTBackend],
+    client_config: config.MQTTClient,
+    benchmark_config: MQTTBenchmarkConfig = MQTTBenchmarkConfig(),
+) -> dict[str, Any]:
+    report: dict[str, Any] = dict(
+        config=benchmark_config._asdict(),
+        broker=f"{client_config.host}:{client_config.port}",
+        benchmarks=[],
+    )
+    for backend in backends:
+        report["benchmarks"].append(await benchmark(backend, client_config, benchmark_config))
+    return report
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the MQTTClients backends against a broker.")
+    parser.add_argument(
+        "-b",
+        "--backends",
+        nargs="*",
+        default=[backend.value for backend in config.MQTTBackend],
+        choices=[backend.value for backend in config.MQTTBackend],
+        help="Backends to run. Defaults to all.",
+    )
+    parser.add_argument("--host", default=config.MQTTClient().host)
+    parser.add_argument("--port", type=int, default=config.MQTTClient().port)
+    parser.add_argument("--username", default=None)
+    parser.add_argument("--password", default="")
+    parser.add_argument("-n", "--messages", type=int, default=MQTTBenchmarkConfig().messages)
+    parser.add_argument("--payload-bytes", type=int, default=MQTTBenchmarkConfig().payload_bytes)
+    parser.add_argument("--qos", type=int, default=MQTTBenchmarkConfig().qos, choices=[0, 1, 2])
+    parser.add_argument(
+        "--burst",
+        type=int,
+        default=MQTTBenchmarkConfig().burst,
+        help="Messages published between yields to the event loop.",
+    )
+    parser.add_argument("--timeout", type=float, default=MQTTBenchmarkConfig().timeout_s)
+    parser.add_argument("-o", "--output", default="", help="JSON report path. Defaults to stdout.")
+    return parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> dict[str, Any]:
+    args = parse_args(argv)
+    client_config = config.MQTTClient(
+        host=args.host,
+        port=args.port,
+        username=args.username,
+        password=SecretStr(args.password),
+    )
+    benchmark_config = MQTTBenchmarkConfig(
+        messages=args.messages,
+        payload_bytes=args.payload_bytes,
+        qos=args.qos,
+        burst=args.burst,
+        timeout_s=args.timeout,
+    )
+    report = asyncio.run(
+        run([config.MQTTBackend(backend) for backend in args.backends], client_config, benchmark_config)
+    )
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text)
+    else:
+        print(text)
+    return report
+
+
+if __name__ == "__main__":
+    main()
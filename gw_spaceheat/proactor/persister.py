@@ -1,10 +1,21 @@
 import abc
+import json
+import os
 import re
 import shutil
+import struct
+import time
+import zlib
 from abc import abstractmethod
+from collections import deque
+from concurrent.futures import Future
+from enum import Enum
 from pathlib import Path
+from typing import Callable
+from typing import Iterator
 from typing import NamedTuple
 from typing import Optional
+from typing import TextIO
 
 import pendulum
 from pendulum import DateTime
@@ -97,6 +108,10 @@ class ReindexError(PersisterError):
     ...
 
 
+class DictionaryMissing(PersisterError):
+    ...
+
+
 class UIDExistedWarning(PersisterWarning):
     ...
 
@@ -105,6 +120,10 @@ class FileExistedWarning(PersisterWarning):
     ...
 
 
+class ManifestWriteWarning(PersisterWarning):
+    ...
+
+
 class FileMissingWarning(PersisterWarning):
     ...
 
@@ -113,11 +132,263 @@ class UIDMissingWarning(PersisterWarning):
     ...
 
 
+class CommitFailed(PersisterError):
+    ...
+
+
+class DurabilityMode(Enum):
+    """When a persisted write is considered durable.
+
+    none: Written to the OS; never explicitly synced. Handles resolve immediately.
+    fsync: Every write is fsync()ed before persist() returns.
+    group: Writes are fsync()ed together once group_bytes have accumulated or group_ms have elapsed since the oldest
+      unsynced write. Handles resolve at that commit.
+    """
+    none = "none"
+    fsync = "fsync"
+    group = "group"
+
+
+class Durability(NamedTuple):
+    mode: DurabilityMode = DurabilityMode.none
+    group_ms: int = 50
+    group_bytes: int = 256 * 1024
+
+
+class TrimEvent(NamedTuple):
+    """Record of one trim of old storage. units_dropped counts whole day directories or segments removed at once."""
+
+    freed_bytes: int
+    num_cleared: int
+    units_dropped: int
+    duration_s: float
+
+
+TrimCallback = Callable[[TrimEvent], None]
+
+
+def durable_future(result: bool = True) -> Future:
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+class _GroupCommit:
+    """Bookkeeping for writes awaiting a group commit."""
+
+    durability: Durability
+    unsynced_bytes: int
+    _first_unsynced_s: Optional[float]
+    _futures: list[Future]
+
+    def __init__(self, durability: Durability):
+        self.durability = durability
+        self.unsynced_bytes = 0
+        self._first_unsynced_s = None
+        self._futures = []
+
+    def add(self, num_bytes: int) -> Future:
+        future = Future()
+        self._futures.append(future)
+        self.unsynced_bytes += num_bytes
+        if self._first_unsynced_s is None:
+            self._first_unsynced_s = time.monotonic()
+        return future
+
+    @property
+    def num_unsynced(self) -> int:
+        return len(self._futures)
+
+    def due(self) -> bool:
+        return bool(self._futures) and (
+            self.unsynced_bytes >= self.durability.group_bytes
+            or (time.monotonic() - self._first_unsynced_s) * 1000 >= self.durability.group_ms
+        )
+
+    def complete(self, exception: Optional[BaseException] = None) -> None:
+        futures = self._futures
+        self._futures = []
+        self.unsynced_bytes = 0
+        self._first_unsynced_s = None
+        for future in futures:
+            if exception is None:
+                future.set_result(True)
+            else:
+                future.set_exception(exception)
+
+
+class Compression(NamedTuple):
+    """Payload compression settings.
+
+    With enabled, payloads are stored zlib-compressed with a preset dictionary. The dictionary is either supplied, or
+    learned from the first learn_samples payloads (which are compressed without one). Dictionaries are saved next to
+    the data so records remain readable after the configuration changes. Records are stored raw when compression would
+    not shrink them, and raw records (including any written before compression was enabled) are always readable.
+    """
+
+    enabled: bool = False
+    level: int = 6
+    dictionary: Optional[bytes] = None
+    learn_samples: int = 64
+    dictionary_bytes: int = 32 * 1024
+
+
+class CodecId(Enum):
+    zlib = 1
+    zlib_dictionary = 2
+
+
+class EncodedPayload(NamedTuple):
+    """A payload as stored, and whether it was compressed. Persisters record compressed with each record, and pass it
+    back to PayloadCodec.decode()."""
+
+    content: bytes
+    compressed: bool = False
+
+
+class PayloadCodec:
+    """Encode and decode stored payloads according to Compression settings.
+
+    A compressed payload starts with a header carrying the codec and dictionary id, so codec choice is per record.
+    Whether a record is compressed is recorded by its persister, not inferred from the payload, so any payload,
+    including one which happens to start with the header, is stored and read back unchanged.
+    """
+
+    MAGIC: bytes = b"\x00gwz"
+    HEADER: struct.Struct = struct.Struct("<4sBI")
+    DICTIONARY_NAME_FORMAT: str = "dictionary-{:08x}.zdict"
+
+    compression: Compression
+    raw_bytes: int
+    stored_bytes: int
+    _dictionary_dir: Path
+    _dictionaries: dict[int, bytes]
+    _dictionary_id: Optional[int]
+    _samples: list[bytes]
+
+    def __init__(self, dictionary_dir: Path, compression: Compression = Compression()):
+        self.compression = compression
+        self.raw_bytes = 0
+        self.stored_bytes = 0
+        self._dictionary_dir = dictionary_dir
+        self._dictionaries = dict()
+        self._dictionary_id = None
+        self._samples = []
+        if compression.enabled and compression.dictionary:
+            self._dictionary_id = self.add_dictionary(compression.dictionary)
+
+    @property
+    def ratio(self) -> float:
+        """Raw bytes per stored byte over the payloads encoded so far."""
+        return self.raw_bytes / self.stored_bytes if self.stored_bytes else 1.0
+
+    @property
+    def dictionary_id(self) -> Optional[int]:
+        return self._dictionary_id
+
+    def add_dictionary(self, dictionary: bytes) -> int:
+        """Make a dictionary available to encode and decode, saving it if it is not already saved. Returns its id."""
+        dictionary_id = zlib.crc32(dictionary)
+        path = self._dictionary_path(dictionary_id)
+        if not path.exists():
+            self._dictionary_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_bytes(dictionary)
+            os.replace(tmp_path, path)
+        self._dictionaries[dictionary_id] = dictionary
+        return dictionary_id
+
+    def encode(self, content: bytes) -> EncodedPayload:
+        if not self.compression.enabled:
+            return EncodedPayload(content)
+        if self._dictionary_id is not None:
+            compressor = zlib.compressobj(self.compression.level, zdict=self._dictionaries[self._dictionary_id])
+            codec_id = CodecId.zlib_dictionary
+            dictionary_id = self._dictionary_id
+        else:
+            compressor = zlib.compressobj(self.compression.level)
+            codec_id = CodecId.zlib
+            dictionary_id = 0
+            self._learn(content)
+        encoded = self.HEADER.pack(self.MAGIC, codec_id.value, dictionary_id) + compressor.compress(content) + (
+            compressor.flush()
+        )
+        compressed = len(encoded) < len(content)
+        if not compressed:
+            encoded = content
+        self.raw_bytes += len(content)
+        self.stored_bytes += len(encoded)
+        return EncodedPayload(encoded, compressed)
+
+    def decode(self, stored: bytes, compressed: bool) -> bytes:
+        if not compressed:
+            return stored
+        magic, codec_id, dictionary_id = self.HEADER.unpack_from(stored)
+        if magic != self.MAGIC:
+            raise ReadFailed("Compressed payload has no compression header")
+        match CodecId(codec_id):
+            case CodecId.zlib:
+                return zlib.decompress(stored[self.HEADER.size:])
+            case CodecId.zlib_dictionary:
+                decompressor = zlib.decompressobj(zdict=self._get_dictionary(dictionary_id))
+                return decompressor.decompress(stored[self.HEADER.size:]) + decompressor.flush()
+
+    def _learn(self, content: bytes) -> None:
+        if self.compression.learn_samples <= 0:
+            return
+        self._samples.append(content)
+        if len(self._samples) >= self.compression.learn_samples:
+            # zlib uses a preset dictionary as already-seen history, which favours its tail, so put the most recent
+            # samples last.
+            dictionary = b"".join(self._samples)[-self.compression.dictionary_bytes:]
+            self._samples = []
+            self._dictionary_id = self.add_dictionary(dictionary)
+
+    def _get_dictionary(self, dictionary_id: int) -> bytes:
+        if dictionary_id not in self._dictionaries:
+            path = self._dictionary_path(dictionary_id)
+            if not path.exists():
+                raise DictionaryMissing(f"Compression dictionary {dictionary_id:08x} missing", path=path)
+            self._dictionaries[dictionary_id] = path.read_bytes()
+        return self._dictionaries[dictionary_id]
+
+    def _dictionary_path(self, dictionary_id: int) -> Path:
+        return self._dictionary_dir / self.DICTIONARY_NAME_FORMAT.format(dictionary_id)
+
+
+def fsync_dir(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class PendingCursor(NamedTuple):
+    """Position in a persister's persisted-time order, used to resume iter_pending(). position is only meaningful to
+    the kind of persister that produced it."""
+
+    position: str
+    uid: str
+
+
+class PendingBatch(NamedTuple):
+    items: list[tuple[str, bytes]]
+    cursor: PendingCursor
+    problems: Problems
+
+
 class PersisterInterface(abc.ABC):
+    DEFAULT_BATCH_BYTES: int = 256 * 1024
+    MAX_TRIM_EVENTS: int = 100
+
+    trims: deque[TrimEvent]
+    _on_trim: Optional[TrimCallback] = None
 
     @abstractmethod
-    def persist(self, uid: str, content: bytes) -> Result[bool, Problems]:
-        ...
+    def persist(self, uid: str, content: bytes) -> Result[Future, Problems]:
+        """Persist content under uid. On success the Ok value is a concurrent.futures.Future which resolves to True
+        once the write is durable under the persister's DurabilityMode."""
 
     @abstractmethod
     def clear(self, uid: str) -> Result[bool, Problems]:
@@ -140,35 +411,249 @@ class PersisterInterface(abc.ABC):
     def reindex(self) -> Result[Optional[bool], Problems]:
         ...
 
+    def commit(self) -> Result[bool, Problems]:
+        """Make every write so far durable and resolve outstanding persist() handles."""
+        return Ok()
+
+    def commit_if_due(self) -> Result[bool, Problems]:
+        """Commit if the group commit byte or time threshold has been reached. Owners of a group-commit persister
+        should call this periodically so that a quiet period does not leave writes unsynced."""
+        return Ok()
+
+    def close(self) -> None:
+        """Commit outstanding writes and release any open files."""
+        self.commit()
+
+    def iter_pending(
+        self,
+        batch_bytes: int = DEFAULT_BATCH_BYTES,
+        since: Optional[PendingCursor] = None,
+    ) -> Iterator[PendingBatch]:
+        """Yield pending (uid, content) pairs in persisted-time order, in batches of about batch_bytes of content.
+
+        Only items persisted after since, and present when iteration starts, are yielded. Items cleared while
+        iterating are skipped. Each batch carries the cursor of its last item; passing that cursor as since resumes
+        after it, including in a later process. Items that cannot be read are reported in the batch's problems.
+        """
+        batch: list[tuple[PendingCursor, str]] = []
+        num_bytes = 0
+        for cursor, uid, size in self._pending_in_order(since):
+            batch.append((cursor, uid))
+            num_bytes += size
+            if num_bytes >= batch_bytes:
+                yield self._read_batch(batch)
+                batch = []
+                num_bytes = 0
+        if batch:
+            yield self._read_batch(batch)
+
+    @property
+    def last_trim(self) -> Optional[TrimEvent]:
+        return self.trims[-1] if self.trims else None
+
+    def _record_trim(self, event: TrimEvent) -> None:
+        self.trims.append(event)
+        if self._on_trim is not None:
+            self._on_trim(event)
+
+    def pending_in_order(self) -> list[str]:
+        """Pending uids in persisted-time order, read from the index alone."""
+        return [uid for _, uid, _ in self._pending_in_order(None)]
+
+    @abstractmethod
+    def _pending_in_order(self, since: Optional[PendingCursor]) -> list[tuple[PendingCursor, str, int]]:
+        """(cursor, uid, size) of each pending item after since, in persisted-time order."""
+
+    def _read_batch(self, batch: list[tuple[PendingCursor, str]]) -> PendingBatch:
+        problems = Problems()
+        items = []
+        for _, uid in batch:
+            match self.retrieve(uid):
+                case Ok(content):
+                    if content is not None:
+                        items.append((uid, content))
+                case Err(retrieve_problems):
+                    problems.add_problems(retrieve_problems)
+        return PendingBatch(items, batch[-1][0], problems)
+
 
 class _PersistedItem(NamedTuple):
     uid: str
     path: Path
+    size: int = 0
+
+
+class _Manifest:
+    """On-disk index of a TimedRollingFilePersister, so startup does not need to re-walk and re-parse every file.
+
+    The manifest is a JSON snapshot of (uid, path relative to base dir, size), stamped with a generation number, plus
+    an append-only journal of persist/clear operations made since that snapshot. The snapshot is replaced atomically
+    (write to a temporary file, then os.replace()) and the journal is restarted with the new generation. Journal lines
+    from a different generation, or a torn final line, are ignored.
+    """
+
+    SNAPSHOT_NAME = "manifest.json"
+    JOURNAL_NAME = "manifest.journal"
+    DEFAULT_MAX_JOURNAL_ENTRIES = 10_000
+
+    generation: int
+    journal_entries: int
+    max_journal_entries: int
+    _base_dir: Path
+    _journal: Optional[TextIO]
+    _journal_matches: bool
+
+    def __init__(self, base_dir: Path, max_journal_entries: int = DEFAULT_MAX_JOURNAL_ENTRIES):
+        self._base_dir = base_dir
+        self.max_journal_entries = max_journal_entries
+        self.generation = 0
+        self.journal_entries = 0
+        self._journal = None
+        self._journal_matches = False
+
+    @property
+    def snapshot_path(self) -> Path:
+        return self._base_dir / self.SNAPSHOT_NAME
+
+    @property
+    def journal_path(self) -> Path:
+        return self._base_dir / self.JOURNAL_NAME
+
+    def load(self) -> Optional[dict[str, _PersistedItem]]:
+        """Return the items recorded by snapshot and journal, or None if there is no usable snapshot."""
+        self.journal_entries = 0
+        self._journal_matches = False
+        # noinspection PyBroadException
+        try:
+            with self.snapshot_path.open() as f:
+                snapshot = json.load(f)
+            self.generation = int(snapshot["generation"])
+            items = {
+                uid: _PersistedItem(uid, self._base_dir / rel_path, size)
+                for uid, rel_path, size in snapshot["items"]
+            }
+        except:
+            return None
+        if self.journal_path.exists():
+            with self.journal_path.open() as f:
+                lines = iter(f)
+                # noinspection PyBroadException
+                try:
+                    if json.loads(next(lines))["generation"] == self.generation:
+                        self._journal_matches = True
+                        for line in lines:
+                            entry = json.loads(line)
+                            if entry[0] == "+":
+                                items[entry[1]] = _PersistedItem(entry[1], self._base_dir / entry[2], entry[3])
+                            else:
+                                items.pop(entry[1], None)
+                            self.journal_entries += 1
+                except:
+                    pass
+        return items
+
+    def reopen(self) -> None:
+        """Continue appending to the journal of the loaded generation, restarting it if it was missing or stale."""
+        self.close()
+        if self._journal_matches:
+            self._journal = self.journal_path.open("a")
+        else:
+            self._journal = self.journal_path.open("w")
+            self._write_journal({"generation": self.generation})
+            self.journal_entries = 0
+            self._journal_matches = True
+
+    def save(self, items: dict[str, _PersistedItem]) -> None:
+        """Atomically replace the snapshot with items, advance the generation and restart the journal."""
+        self.close()
+        generation = self.generation + 1
+        tmp_path = self.snapshot_path.with_suffix(".tmp")
+        with tmp_path.open("w") as f:
+            json.dump(
+                {
+                    "generation": generation,
+                    "items": [
+                        [item.uid, str(item.path.relative_to(self._base_dir)), item.size]
+                        for item in items.values()
+                    ],
+                },
+                f,
+            )
+        os.replace(tmp_path, self.snapshot_path)
+        self.generation = generation
+        self._journal = self.journal_path.open("w")
+        self._write_journal({"generation": self.generation})
+        self.journal_entries = 0
+        self._journal_matches = True
+
+    def record_persist(self, item: _PersistedItem) -> None:
+        self._write_journal(["+", item.uid, str(item.path.relative_to(self._base_dir)), item.size])
+        self.journal_entries += 1
+
+    def record_clear(self, uid: str) -> None:
+        self._write_journal(["-", uid])
+        self.journal_entries += 1
+
+    @property
+    def needs_save(self) -> bool:
+        return self.journal_entries >= self.max_journal_entries
+
+    def close(self) -> None:
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def _write_journal(self, entry: dict | list) -> None:
+        if self._journal is not None:
+            self._journal.write(json.dumps(entry) + "\n")
+            self._journal.flush()
 
 
 class TimedRollingFilePersister(PersisterInterface):
     DEFAULT_MAX_BYTES: int = 500 * 1024 * 1024
-    FILENAME_RGX: re.Pattern = re.compile("(?P<dt>.*)\.uid\[(?P<uid>.*)].(?i)json")
+    FILENAME_RGX: re.Pattern = re.compile(r"(?i)(?P<dt>.*)\.uid\[(?P<uid>.*)]\.(?:json|gwz)$")
+    # Compressed payloads are stored under this suffix in place of .json.
+    COMPRESSED_SUFFIX: str = ".gwz"
 
     _base_dir: Path
     _max_bytes: int = DEFAULT_MAX_BYTES
     _pending: dict[str, Path]
+    _sizes: dict[str, int]
+    _day_bytes: dict[Path, int]
     _curr_dir: Path
     _curr_bytes: int
+    _manifest: Optional[_Manifest]
+    _durability: Durability
+    _group_commit: _GroupCommit
+    _unsynced_paths: list[Path]
+    _codec: PayloadCodec
 
     def __init__(
         self,
         base_dir: Path | str,
-        max_bytes: int = DEFAULT_MAX_BYTES
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        use_manifest: bool = True,
+        durability: Durability = Durability(),
+        on_trim: Optional[TrimCallback] = None,
+        compression: Compression = Compression(),
     ):
+        self.trims = deque(maxlen=self.MAX_TRIM_EVENTS)
+        self._on_trim = on_trim
         self._base_dir = Path(base_dir).resolve()
+        self._codec = PayloadCodec(self._base_dir, compression)
         self._max_bytes = max_bytes
+        self._manifest = _Manifest(self._base_dir) if use_manifest else None
+        self._durability = durability
+        self._group_commit = _GroupCommit(durability)
+        self._unsynced_paths = []
         self._curr_dir = self._today_dir()
+        self._curr_dir.mkdir(parents=True, exist_ok=True)
         self.reindex()
 
-    def persist(self, uid: str, content: bytes) -> Result[bool, Problems]:
+    def persist(self, uid: str, content: bytes) -> Result[Future, Problems]:
         problems = Problems()
         try:
+            content, compressed = self._codec.encode(content)
             if len(content) > self._max_bytes:
                 return Err(
                     problems.add_error(
@@ -185,74 +670,219 @@ class TimedRollingFilePersister(PersisterInterface):
                         problems.add_problems(trim_problems)
                         if problems.errors:
                             return Err(problems.add_error(TrimFailed(uid=uid)))
-            existing_path = self._pending.pop(uid, None)
-            if existing_path is not None:
-                problems.add_warning(UIDExistedWarning(uid=uid, path=existing_path))
-                if existing_path.exists():
-                    self._curr_bytes -= existing_path.stat().st_size
-                    problems.add_warning(FileExistedWarning(uid=uid, path=existing_path))
-                else:
-                    problems.add_warning(FileMissingWarning(uid=uid, path=existing_path))
+            self._remove_existing(uid, problems)
             self._roll_curr_dir()
-            self._pending[uid] = self._curr_dir / self._make_name(pendulum.now("utc"), uid)
-            try:
-                with self._pending[uid].open("wb") as f:
-                    f.write(content)
-                self._curr_bytes += len(content)
-            except BaseException as e:
-                return Err(
-                    problems.add_error(e).add_error(
-                        WriteFailed(f"Open or write failed", uid=uid, path=existing_path)
-                    )
-                )
+            path = self._curr_dir / self._make_name(pendulum.now("utc"), uid, compressed)
+            match self._write_file(uid, path, content):
+                case Err(write_problems):
+                    return Err(problems.add_problems(write_problems))
+            future = self._record_write(uid, path, len(content), problems)
         except BaseException as e:
             return Err(problems.add_error(e).add_error(PersisterError(
                 f"Unexpected error", uid=uid
             )))
+        match self.commit_if_due():
+            case Err(commit_problems):
+                problems.add_problems(commit_problems)
+        if problems:
+            return Err(problems)
+        else:
+            return Ok(future)
+
+    def _remove_existing(self, uid: str, problems: Problems) -> None:
+        existing_path = self._pending.pop(uid, None)
+        if existing_path is not None:
+            problems.add_warning(UIDExistedWarning(uid=uid, path=existing_path))
+            self._unaccount(uid, existing_path)
+            if existing_path.exists():
+                existing_path.unlink()
+                problems.add_warning(FileExistedWarning(uid=uid, path=existing_path))
+            else:
+                problems.add_warning(FileMissingWarning(uid=uid, path=existing_path))
+
+    def _write_file(self, uid: str, path: Path, content: bytes) -> Result[bool, Problems]:
+        try:
+            with path.open("wb") as f:
+                f.write(content)
+                if self._durability.mode == DurabilityMode.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            if self._durability.mode == DurabilityMode.fsync:
+                fsync_dir(self._curr_dir)
+        except BaseException as e:
+            # Do not leave a partial file behind to be found by a later reindex.
+            # noinspection PyBroadException
+            try:
+                path.unlink(missing_ok=True)
+            except BaseException:
+                pass
+            return Err(Problems().add_error(e).add_error(WriteFailed(f"Open or write failed", uid=uid, path=path)))
+        return Ok()
+
+    def _record_write(self, uid: str, path: Path, size: int, problems: Problems) -> Future:
+        """Index a written item and return the handle which resolves once it is durable."""
+        self._pending[uid] = path
+        self._account(uid, path, size)
+        if self._durability.mode == DurabilityMode.group:
+            self._unsynced_paths.append(path)
+            future = self._group_commit.add(size)
+        else:
+            future = durable_future()
+        if self._manifest is not None:
+            # The item itself is safely written. A manifest which misses it is detected, and the day rescanned,
+            # at the next reindex.
+            # noinspection PyBroadException
+            try:
+                self._manifest.record_persist(_PersistedItem(uid, path, size))
+                if self._manifest.needs_save:
+                    self._save_manifest()
+            except BaseException as e:
+                problems.add_warning(e).add_warning(ManifestWriteWarning(uid=uid, path=self._manifest.journal_path))
+        return future
+
+    def commit(self) -> Result[bool, Problems]:
+        problems = Problems()
+        if self._group_commit.num_unsynced:
+            paths = self._unsynced_paths
+            self._unsynced_paths = []
+            try:
+                for path in paths:
+                    # Files cleared or trimmed before the commit need no syncing.
+                    if path.exists():
+                        fd = os.open(path, os.O_RDONLY)
+                        try:
+                            os.fsync(fd)
+                        finally:
+                            os.close(fd)
+                for day_dir in {path.parent for path in paths}:
+                    if day_dir.exists():
+                        fsync_dir(day_dir)
+                self._group_commit.complete()
+            except BaseException as e:
+                problems.add_error(e).add_error(CommitFailed(path=self._curr_dir))
+                self._group_commit.complete(CommitFailed(str(e), path=self._curr_dir))
         if problems:
             return Err(problems)
         else:
             return Ok()
 
+    def commit_if_due(self) -> Result[bool, Problems]:
+        if self._group_commit.due():
+            return self.commit()
+        return Ok()
+
+    @property
+    def num_unsynced(self) -> int:
+        return self._group_commit.num_unsynced
+
     def _trim_old_storage(self, needed_bytes: int) -> Result[bool, Problems]:
+        """Free space, oldest first. Day directories which can go entirely are removed with one rmtree, using the
+        in-memory per-day totals; only the boundary day is trimmed file by file."""
         problems = Problems()
-        last_day_dir: Optional[Path] = None
-        items = list(self._pending.items())
-        for uid, path in items:
+        start_s = time.perf_counter()
+        start_bytes = self._curr_bytes
+        num_cleared = 0
+        days_dropped = 0
+        target_bytes = self._max_bytes - needed_bytes
+        for day_dir, day_bytes in list(self._day_bytes.items()):
+            if self._curr_bytes <= target_bytes:
+                break
+            # noinspection PyBroadException
             try:
-                match self.clear(uid):
-                    case Err(other):
-                        problems.add_problems(other)
-                day_dir = path.parent
-                if last_day_dir is not None and last_day_dir != day_dir:
-                    shutil.rmtree(last_day_dir, ignore_errors=True)
-                last_day_dir = day_dir
+                if day_dir != self._curr_dir and self._curr_bytes - day_bytes >= target_bytes:
+                    num_cleared += self._drop_day(day_dir)
+                    days_dropped += 1
+                else:
+                    day_cleared, day_dropped = self._trim_day(day_dir, target_bytes, problems)
+                    num_cleared += day_cleared
+                    days_dropped += day_dropped
             except BaseException as e:
-                problems.add_error(e)
-                problems.add_error(PersisterError("Unexpected error", uid=uid, path=path))
-            if self._curr_bytes <= self._max_bytes - needed_bytes:
-                break
-        try:
-            if last_day_dir is not None:
-                if not self._pending or next(iter(self._pending.values())) != last_day_dir:
-                    shutil.rmtree(last_day_dir, ignore_errors=True)
-        except BaseException as e:
-            problems.add_error(e)
-            problems.add_error(PersisterError("Unexpected error"))
+                problems.add_error(e).add_error(PersisterError("Unexpected error", path=day_dir))
+        if days_dropped and self._manifest is not None:
+            # One snapshot rather than a journal entry per dropped item.
+            # noinspection PyBroadException
+            try:
+                self._save_manifest()
+            except BaseException as e:
+                problems.add_error(e).add_error(TrimFailed("Manifest save failed", path=self._manifest.snapshot_path))
+        self._record_trim(
+            TrimEvent(
+                freed_bytes=start_bytes - self._curr_bytes,
+                num_cleared=num_cleared,
+                units_dropped=days_dropped,
+                duration_s=time.perf_counter() - start_s,
+            )
+        )
         if problems:
             return Err(problems)
         else:
             return Ok()
 
+    def _drop_day(self, day_dir: Path) -> int:
+        """Remove a whole day directory; returns the number of items cleared."""
+        day_uids = self._day_uids(day_dir)
+        for uid in day_uids:
+            self._pending.pop(uid)
+            self._sizes.pop(uid, None)
+        self._curr_bytes -= self._day_bytes.pop(day_dir)
+        shutil.rmtree(day_dir, ignore_errors=True)
+        return len(day_uids)
+
+    def _trim_day(self, day_dir: Path, target_bytes: int, problems: Problems) -> tuple[int, bool]:
+        """Clear a day's items, oldest first, until target_bytes is reached; returns the number cleared and whether
+        the day directory was emptied and removed."""
+        num_cleared = 0
+        for uid in self._day_uids(day_dir):
+            if self._curr_bytes <= target_bytes:
+                break
+            match self.clear(uid):
+                case Err(other):
+                    problems.add_problems(other)
+            num_cleared += 1
+        if day_dir != self._curr_dir and not self._day_uids(day_dir):
+            self._day_bytes.pop(day_dir, None)
+            shutil.rmtree(day_dir, ignore_errors=True)
+            return num_cleared, True
+        return num_cleared, False
+
+    def _day_uids(self, day_dir: Path) -> list[str]:
+        # _pending is in path order, so the oldest day's uids are at its front.
+        uids = []
+        for uid, path in self._pending.items():
+            if path.parent != day_dir:
+                if uids or path.parent > day_dir:
+                    break
+                continue
+            uids.append(uid)
+        return uids
+
+    def _account(self, uid: str, path: Path, size: int) -> None:
+        self._sizes[uid] = size
+        self._curr_bytes += size
+        self._day_bytes[path.parent] = self._day_bytes.get(path.parent, 0) + size
+
+    def _unaccount(self, uid: str, path: Path) -> None:
+        size = self._sizes.pop(uid, 0)
+        self._curr_bytes -= size
+        if path.parent in self._day_bytes:
+            self._day_bytes[path.parent] -= size
+
     def clear(self, uid: str) -> Result[bool, Problems]:
         problems = Problems()
         path = self._pending.pop(uid, None)
+        if path is not None:
+            self._unaccount(uid, path)
+            if self._manifest is not None:
+                # noinspection PyBroadException
+                try:
+                    self._manifest.record_clear(uid)
+                except BaseException as e:
+                    problems.add_warning(e).add_warning(ManifestWriteWarning(uid=uid, path=self._manifest.journal_path))
         if path and path.exists():
-            if path.exists():
-                self._curr_bytes -= path.stat().st_size
+            try:
                 path.unlink()
-            else:
-                problems.add_warning(UIDMissingWarning(uid=uid, path=path))
+            except BaseException as e:
+                problems.add_error(e).add_error(PersisterError("Unlink failed", uid=uid, path=path))
         else:
             problems.add_warning(FileMissingWarning(uid=uid, path=path))
         if problems:
@@ -274,8 +904,8 @@ class TimedRollingFilePersister(PersisterInterface):
         if path:
             if path.exists():
                 try:
-                    with path.open("b") as f:
-                        content: bytes = f.read()
+                    with path.open("rb") as f:
+                        content: bytes = self._codec.decode(f.read(), path.suffix == self.COMPRESSED_SUFFIX)
                 except BaseException as e:
                     problems.add_error(e).add_error(
                         ReadFailed(f"Open or read failed", uid=uid, path=path)
@@ -287,30 +917,106 @@ class TimedRollingFilePersister(PersisterInterface):
         else:
             return Ok(content)
 
+    def _pending_in_order(self, since: Optional[PendingCursor]) -> list[tuple[PendingCursor, str, int]]:
+        # _pending is kept in path order, and paths are named by day and persisted time.
+        items = []
+        for uid, path in self._pending.items():
+            cursor = PendingCursor(path.relative_to(self._base_dir).as_posix(), uid)
+            if since is None or cursor > since:
+                items.append((cursor, uid, self._sizes.get(uid, 0)))
+        return items
+
     def reindex(self) -> Result[bool, Problems]:
+        """Rebuild the in-memory index.
+
+        If a manifest is present it is trusted for every day directory whose file names are exactly those the manifest
+        lists for it; only day directories that are new or whose names differ are rescanned. Without a manifest every
+        day directory is scanned. A fresh manifest snapshot is written afterwards.
+        """
         problems = Problems()
-        self._curr_bytes = 0
-        paths: list[_PersistedItem] = []
-        for base_dir_entry in self._base_dir.iterdir():
+        manifest_items = self._manifest.load() if self._manifest is not None else None
+        by_day_dir: dict[Path, list[_PersistedItem]] = dict()
+        if manifest_items is not None:
+            for item in manifest_items.values():
+                by_day_dir.setdefault(item.path.parent, []).append(item)
+        items, trusted_day_dirs = self._collect_items(by_day_dir, problems)
+        self._index_items(items)
+        if self._manifest is not None:
             # noinspection PyBroadException
             try:
-                if base_dir_entry.is_dir() and self._is_iso_parseable(base_dir_entry):
-                    for day_dir_entry in base_dir_entry.iterdir():
-                        # noinspection PyBroadException
-                        try:
-                            if persisted_item := self._persisted_item_from_file_path(day_dir_entry):
-                                self._curr_bytes += persisted_item.path.stat().st_size
-                                paths.append(persisted_item)
-                        except BaseException as e:
-                            problems.add_error(e).add_error(ReindexError(path=day_dir_entry))
+                if manifest_items is not None and trusted_day_dirs.issuperset(by_day_dir):
+                    self._manifest.reopen()
+                else:
+                    self._save_manifest()
             except BaseException as e:
-                problems.add_error(e).add_error(ReindexError())
-        self._pending = dict(sorted(paths, key=lambda item: item.path))
+                problems.add_error(e).add_error(ReindexError("Manifest save failed", path=self._manifest.snapshot_path))
         if problems:
             return Err(problems)
         else:
             return Ok()
 
+    def _collect_items(
+        self, by_day_dir: dict[Path, list[_PersistedItem]], problems: Problems
+    ) -> tuple[list[_PersistedItem], set[Path]]:
+        """Items of every day directory, from the manifest where it lists exactly the directory's file names, else
+        from a scan of the directory. Also returns the day directories whose manifest entries were trusted."""
+        items: list[_PersistedItem] = []
+        trusted_day_dirs = set()
+        for base_dir_entry in self._base_dir.iterdir():
+            # noinspection PyBroadException
+            try:
+                if base_dir_entry.is_dir() and self._is_iso_parseable(base_dir_entry):
+                    manifest_day_items = by_day_dir.get(base_dir_entry, [])
+                    if set(os.listdir(base_dir_entry)) == {item.path.name for item in manifest_day_items}:
+                        items.extend(manifest_day_items)
+                        trusted_day_dirs.add(base_dir_entry)
+                    else:
+                        items.extend(self._scan_day_dir(base_dir_entry, problems))
+            except BaseException as e:
+                problems.add_error(e).add_error(ReindexError())
+        return items, trusted_day_dirs
+
+    def _index_items(self, items: list[_PersistedItem]) -> None:
+        items.sort(key=lambda item: item.path)
+        self._pending = {item.uid: item.path for item in items}
+        self._sizes = {item.uid: item.size for item in items}
+        self._curr_bytes = sum(self._sizes.values())
+        self._day_bytes = dict()
+        for item in items:
+            self._day_bytes[item.path.parent] = self._day_bytes.get(item.path.parent, 0) + item.size
+
+    @property
+    def codec(self) -> PayloadCodec:
+        return self._codec
+
+    @property
+    def manifest_generation(self) -> Optional[int]:
+        return self._manifest.generation if self._manifest is not None else None
+
+    def close(self) -> None:
+        self.commit()
+        if self._manifest is not None:
+            self._manifest.close()
+
+    def _save_manifest(self) -> None:
+        self._manifest.save(
+            {
+                uid: _PersistedItem(uid, path, self._sizes.get(uid, 0))
+                for uid, path in self._pending.items()
+            }
+        )
+
+    def _scan_day_dir(self, day_dir: Path, problems: Problems) -> list[_PersistedItem]:
+        items = []
+        for day_dir_entry in day_dir.iterdir():
+            # noinspection PyBroadException
+            try:
+                if persisted_item := self._persisted_item_from_file_path(day_dir_entry):
+                    items.append(persisted_item._replace(size=persisted_item.path.stat().st_size))
+            except BaseException as e:
+                problems.add_error(e).add_error(ReindexError(path=day_dir_entry))
+        return items
+
     def _today_dir(self) -> Path:
         return self._base_dir / pendulum.today("utc").isoformat()
 
@@ -321,8 +1027,8 @@ class TimedRollingFilePersister(PersisterInterface):
             self._curr_dir.mkdir(parents=True, exist_ok=True)
 
     @classmethod
-    def _make_name(cls, dt: DateTime, uid: str) -> str:
-        return f"{dt.isoformat()}.uid[{uid}].json"
+    def _make_name(cls, dt: DateTime, uid: str, compressed: bool = False) -> str:
+        return f"{dt.isoformat()}.uid[{uid}]{cls.COMPRESSED_SUFFIX if compressed else '.json'}"
 
     @classmethod
     def _persisted_item_from_file_path(cls, filepath: Path) -> Optional[_PersistedItem]:
@@ -0,0 +1,491 @@
+"""Benchmark and fault-injection runs of PersisterInterface implementations.
+
+Run, for example:
+
+    python -m proactor.persister_benchmark --counts 10000 100000 --payload-bytes 1000 --dir /dev/shm/bench
+
+The report, written as JSON to stdout or --output, contains per-persister, per-count persist latency percentiles, open
+and reindex times, trim stall statistics and retrieve / replay throughput. With --faults, each persister is also run
+with injected ENOSPC errors, partial writes and files deleted underneath it, and the report records whether any
+exception escaped, whether Problems stayed within their bounds, and how many items were lost or misread.
+"""
+
+import argparse
+import errno
+import json
+import random
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Iterator
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+from unittest import mock
+
+from result import Err
+from result import Ok
+from result import Result
+
+from proactor.persister import PersisterInterface
+from proactor.persister import Problems
+from proactor.persister import TimedRollingFilePersister
+from proactor.persister import TrimEvent
+from proactor.segmented_persister import SegmentedLogPersister
+from proactor.sqlite_persister import SqlitePersister
+
+PersisterFactory = Callable[..., PersisterInterface]
+
+PERSISTERS: dict[str, PersisterFactory] = {
+    "TimedRollingFilePersister": TimedRollingFilePersister,
+    "SegmentedLogPersister": SegmentedLogPersister,
+    "SqlitePersister": SqlitePersister,
+}
+
+
+class BenchmarkConfig(NamedTuple):
+    counts: Sequence[int] = (10_000, 100_000)
+    payload_bytes: int = 1000
+    # Storage cap as a fraction of count * payload_bytes. Below 1.0 the later persists trim.
+    max_bytes_fraction: float = 0.5
+    retrieve_samples: int = 1000
+    seed: int = 0
+
+
+class FaultConfig(NamedTuple):
+    operations: int = 2000
+    payload_bytes: int = 1000
+    enospc_probability: float = 0.02
+    partial_write_probability: float = 0.02
+    delete_probability: float = 0.01
+    seed: int = 0
+
+
+def make_payload(i: int, payload_bytes: int) -> bytes:
+    prefix = f'{{"Header": {{"MessageType": "benchmark", "MessageId": {i}}}, "Pad": "'.encode()
+    suffix = b'"}'
+    return prefix + b"x" * max(0, payload_bytes - len(prefix) - len(suffix)) + suffix
+
+
+def percentiles(values: list[float]) -> dict[str, float]:
+    if not values:
+        return dict()
+    values = sorted(values)
+
+    def at(fraction: float) -> float:
+        return values[min(len(values) - 1, int(fraction * len(values)))]
+
+    return dict(
+        p50=at(0.5),
+        p90=at(0.9),
+        p99=at(0.99),
+        p999=at(0.999),
+        max=values[-1],
+        mean=sum(values) / len(values),
+    )
+
+
+def benchmark(
+    name: str,
+    factory: PersisterFactory,
+    base_dir: Path,
+    count: int,
+    config: BenchmarkConfig = BenchmarkConfig(),
+) -> dict[str, Any]:
+    """Fill a fresh persister with count items and measure persist, open, reindex, trim, retrieve and replay."""
+    rng = random.Random(config.seed)
+    if base_dir.exists():
+        shutil.rmtree(base_dir)
+    max_bytes = max(config.payload_bytes, int(count * config.payload_bytes * config.max_bytes_fraction))
+    trims: list[TrimEvent] = []
+    persister = factory(base_dir, max_bytes=max_bytes, on_trim=trims.append)
+    uids = [str(uuid.uuid4()) for _ in range(count)]
+    persist_s = []
+    persist_errors = 0
+    start = time.perf_counter()
+    for i, uid in enumerate(uids):
+        payload = make_payload(i, config.payload_bytes)
+        op_start = time.perf_counter()
+        result = persister.persist(uid, payload)
+        persist_s.append(time.perf_counter() - op_start)
+        if result.is_err():
+            persist_errors += 1
+    persist_total_s = time.perf_counter() - start
+    num_pending = persister.num_pending
+    persister.close()
+
+    start = time.perf_counter()
+    persister = factory(base_dir, max_bytes=max_bytes)
+    open_s = time.perf_counter() - start
+    start = time.perf_counter()
+    reindex_ok = persister.reindex().is_ok()
+    reindex_s = time.perf_counter() - start
+
+    pending = list(persister.pending())
+    samples = rng.sample(pending, min(config.retrieve_samples, len(pending)))
+    start = time.perf_counter()
+    retrieved_bytes = 0
+    for uid in samples:
+        match persister.retrieve(uid):
+            case Ok(content):
+                retrieved_bytes += len(content or b"")
+    retrieve_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    replayed = 0
+    replayed_bytes = 0
+    for batch in persister.iter_pending():
+        replayed += len(batch.items)
+        replayed_bytes += sum(len(content) for _, content in batch.items)
+    replay_s = time.perf_counter() - start
+    persister.close()
+
+    return dict(
+        persister=name,
+        count=count,
+        payload_bytes=config.payload_bytes,
+        max_bytes=max_bytes,
+        persist=dict(
+            total_s=persist_total_s,
+            per_s=count / persist_total_s if persist_total_s else None,
+            errors=persist_errors,
+            latency_s=percentiles(persist_s),
+        ),
+        num_pending=num_pending,
+        open_s=open_s,
+        reindex=dict(s=reindex_s, ok=reindex_ok),
+        trim=dict(
+            count=len(trims),
+            items_cleared=sum(trim.num_cleared for trim in trims),
+            stall_s=percentiles([trim.duration_s for trim in trims]),
+        ),
+        retrieve=dict(
+            samples=len(samples),
+            total_s=retrieve_s,
+            per_s=len(samples) / retrieve_s if retrieve_s else None,
+            bytes_per_s=retrieved_bytes / retrieve_s if retrieve_s else None,
+        ),
+        replay=dict(
+            items=replayed,
+            total_s=replay_s,
+            per_s=replayed / replay_s if replay_s else None,
+            bytes_per_s=replayed_bytes / replay_s if replay_s else None,
+        ),
+    )
+
+
+class _FaultyFile:
+    """Wrap a file opened for writing, failing some writes with ENOSPC and tearing others part way."""
+
+    def __init__(self, f, injector: "FaultInjector"):
+        self._f = f
+        self._injector = injector
+
+    def write(self, data: bytes) -> int:
+        if self._injector.roll(self._injector.config.enospc_probability):
+            self._injector.injected["enospc"] += 1
+            raise OSError(errno.ENOSPC, "No space left on device (injected)")
+        if self._injector.roll(self._injector.config.partial_write_probability):
+            self._injector.injected["partial_write"] += 1
+            self._f.write(data[: len(data) // 2])
+            self._f.flush()
+            raise OSError(errno.EIO, "Partial write (injected)")
+        return self._f.write(data)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return self._f.__exit__(*args)
+
+    def __getattr__(self, item):
+        return getattr(self._f, item)
+
+
+class FaultInjector:
+    """Inject storage faults into persisters which write through pathlib.Path.open()."""
+
+    config: FaultConfig
+    injected: dict[str, int]
+    active: bool
+
+    def __init__(self, config: FaultConfig):
+        self.config = config
+        self.injected = dict(enospc=0, partial_write=0, deleted=0)
+        self.active = False
+        self._rng = random.Random(config.seed)
+
+    def roll(self, probability: float) -> bool:
+        return self.active and self._rng.random() < probability
+
+    @contextmanager
+    def patched(self) -> Iterator["FaultInjector"]:
+        original_open = Path.open
+        injector = self
+
+        def faulty_open(path: Path, mode: str = "r", *args, **kwargs):
+            f = original_open(path, mode, *args, **kwargs)
+            if "w" in mode or "a" in mode:
+                return _FaultyFile(f, injector)
+            return f
+
+        with mock.patch.object(Path, "open", faulty_open):
+            self.active = True
+            try:
+                yield self
+            finally:
+                self.active = False
+
+    def delete_something(self, base_dir: Path) -> None:
+        """Delete one random data file from underneath the persister."""
+        if not self.roll(self.config.delete_probability):
+            return
+        candidates = [
+            path
+            for path in base_dir.rglob("*")
+            if path.is_file() and not path.name.startswith("manifest") and not path.name.startswith("dictionary")
+        ]
+        if candidates:
+            self._rng.choice(candidates).unlink(missing_ok=True)
+            self.injected["deleted"] += 1
+
+
+class _OutcomeCounter:
+    def __init__(self):
+        self.ok = 0
+        self.err = 0
+        self.raised = 0
+        self.unbounded_problems = 0
+        self.exceptions: list[str] = []
+
+    def call(self, func: Callable[..., Result], *args) -> Optional[Result]:
+        # noinspection PyBroadException
+        try:
+            result = func(*args)
+        except BaseException as e:
+            self.raised += 1
+            if len(self.exceptions) < 10:
+                self.exceptions.append(f"{func.__name__}: {type(e).__name__}: {e}")
+            return None
+        match result:
+            case Ok():
+                self.ok += 1
+            case Err(problems):
+                self.err += 1
+                if not isinstance(problems, Problems) or (
+                    len(problems.errors) > problems.max_problems or len(problems.warnings) > problems.max_problems
+                ):
+                    self.unbounded_problems += 1
+        return result
+
+    def as_dict(self) -> dict[str, Any]:
+        return dict(
+            ok=self.ok,
+            err=self.err,
+            raised=self.raised,
+            unbounded_problems=self.unbounded_problems,
+            exceptions=self.exceptions,
+        )
+
+
+def _succeeded(result: Optional[Result]) -> bool:
+    """Ok, or Err carrying only warnings."""
+    match result:
+        case Ok():
+            return True
+        case Err(problems):
+            return not problems.errors
+    return False
+
+
+def _exercise(
+    persister: PersisterInterface,
+    base_dir: Path,
+    injector: FaultInjector,
+    outcomes: _OutcomeCounter,
+    expected: dict[str, bytes],
+    rng: random.Random,
+    delete_files: bool,
+) -> None:
+    for i in range(injector.config.operations):
+        if delete_files:
+            injector.delete_something(base_dir)
+        action = rng.random()
+        if action < 0.7 or not expected:
+            uid = str(uuid.uuid4())
+            payload = make_payload(i, injector.config.payload_bytes)
+            if _succeeded(outcomes.call(persister.persist, uid, payload)):
+                expected[uid] = payload
+        elif action < 0.85:
+            outcomes.call(persister.retrieve, rng.choice(list(expected)))
+        else:
+            uid = rng.choice(list(expected))
+            if _succeeded(outcomes.call(persister.clear, uid)):
+                expected.pop(uid, None)
+    # noinspection PyBroadException
+    try:
+        persister.close()
+    except BaseException as e:
+        outcomes.raised += 1
+        outcomes.exceptions.append(f"close: {type(e).__name__}: {e}")
+
+
+def _check_reopened(
+    factory: PersisterFactory,
+    base_dir: Path,
+    outcomes: _OutcomeCounter,
+    expected: dict[str, bytes],
+) -> dict[str, Any]:
+    # noinspection PyBroadException
+    try:
+        persister = factory(base_dir)
+    except BaseException as e:
+        return dict(outcomes=outcomes.as_dict(), reopen_error=repr(e))
+    pending = persister.pending()
+    misread = 0
+    unreadable = 0
+    for uid in pending:
+        match outcomes.call(persister.retrieve, uid):
+            case Ok(content):
+                if uid in expected and content != expected[uid]:
+                    misread += 1
+            case Err():
+                unreadable += 1
+    persister.close()
+    return dict(
+        outcomes=outcomes.as_dict(),
+        expected=len(expected),
+        pending_after_reopen=len(pending),
+        lost=len(set(expected) - pending),
+        misread=misread,
+        unreadable=unreadable,
+        unexpected=len(pending - set(expected)),
+    )
+
+
+def fault_injection(
+    name: str,
+    factory: PersisterFactory,
+    base_dir: Path,
+    config: FaultConfig = FaultConfig(),
+) -> dict[str, Any]:
+    """Persist, retrieve and clear under injected faults, reopening after each phase to check what survived.
+
+    write_faults: some writes fail with ENOSPC and some are torn part way. Every persist() which succeeded must survive
+    reopen with its content intact (lost == misread == unexpected == 0).
+
+    deleted_files: files are deleted from underneath the persister. Items may be lost, but no exception may escape,
+    and every item pending after reopen must read back either its original content or a Problem (misread == 0).
+
+    Faults are injected through pathlib.Path.open(), so write faults do not reach SqlitePersister, whose I/O is inside
+    SQLite.
+    """
+    rng = random.Random(config.seed)
+    if base_dir.exists():
+        shutil.rmtree(base_dir)
+    injector = FaultInjector(config)
+    expected: dict[str, bytes] = dict()
+    report: dict[str, Any] = dict(persister=name, operations=config.operations)
+
+    outcomes = _OutcomeCounter()
+    with injector.patched():
+        persister = factory(base_dir)
+        _exercise(persister, base_dir, injector, outcomes, expected, rng, delete_files=False)
+    report["write_faults"] = _check_reopened(factory, base_dir, outcomes, expected)
+
+    outcomes = _OutcomeCounter()
+    persister = factory(base_dir)
+    injector.active = True
+    _exercise(persister, base_dir, injector, outcomes, expected, rng, delete_files=True)
+    injector.active = False
+    report["deleted_files"] = _check_reopened(factory, base_dir, outcomes, expected)
+    report["injected"] = injector.injected
+    return report
+
+
+def run(
+    persisters: Sequence[str],
+    base_dir: Path,
+    config: BenchmarkConfig = BenchmarkConfig(),
+    faults: Optional[FaultConfig] = None,
+) -> dict[str, Any]:
+    report: dict[str, Any] = dict(config=config._asdict(), benchmarks=[], faults=[])
+    for name in persisters:
+        for count in config.counts:
+            report["benchmarks"].append(benchmark(name, PERSISTERS[name], base_dir / name / str(count), count, config))
+        if faults is not None:
+            report["faults"].append(fault_injection(name, PERSISTERS[name], base_dir / name / "faults", faults))
+    if faults is not None:
+        report["fault_config"] = faults._asdict()
+    return report
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark PersisterInterface implementations.")
+    parser.add_argument(
+        "-p",
+        "--persisters",
+        nargs="*",
+        default=list(PERSISTERS.keys()),
+        choices=list(PERSISTERS.keys()),
+        help="Persisters to run. Defaults to all.",
+    )
+    parser.add_argument(
+        "-c", "--counts", nargs="*", type=int, default=list(BenchmarkConfig().counts), help="Pending item counts."
+    )
+    parser.add_argument("-b", "--payload-bytes", type=int, default=BenchmarkConfig().payload_bytes)
+    parser.add_argument(
+        "--max-bytes-fraction",
+        type=float,
+        default=BenchmarkConfig().max_bytes_fraction,
+        help="Storage cap as a fraction of count * payload bytes.",
+    )
+    parser.add_argument("--retrieve-samples", type=int, default=BenchmarkConfig().retrieve_samples)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--faults", action="store_true", help="Also run fault injection.")
+    parser.add_argument("--fault-operations", type=int, default=FaultConfig().operations)
+    parser.add_argument(
+        "-d",
+        "--dir",
+        default="",
+        help="Directory to run in, e.g. on tmpfs or the real storage device. Defaults to a temporary directory.",
+    )
+    parser.add_argument("-o", "--output", default="", help="JSON report path. Defaults to stdout.")
+    return parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> dict[str, Any]:
+    args = parse_args(argv)
+    config = BenchmarkConfig(
+        counts=args.counts,
+        payload_bytes=args.payload_bytes,
+        max_bytes_fraction=args.max_bytes_fraction,
+        retrieve_samples=args.retrieve_samples,
+        seed=args.seed,
+    )
+    faults = (
+        FaultConfig(operations=args.fault_operations, payload_bytes=args.payload_bytes, seed=args.seed)
+        if args.faults
+        else None
+    )
+    if args.dir:
+        report = run(args.persisters, Path(args.dir), config, faults)
+    else:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            report = run(args.persisters, Path(tmp_dir), config, faults)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text)
+    else:
+        print(text)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,27 @@
 """Proactor implementation"""
 
 import asyncio
+import time
 import traceback
 from abc import ABC
 from abc import abstractmethod
 from typing import Any
 from typing import Awaitable
+from typing import Callable
 from typing import Dict
 from typing import Iterable
 from typing import List
+from typing import NamedTuple
 from typing import Optional
+from typing import Sequence
+from typing import Tuple
 
 from paho.mqtt.client import MQTTMessageInfo
 
 import config
+from proactor.dispatch import DispatchTable
+from proactor.dispatch import Handler
+from proactor.dispatch import HandlerStats
 from proactor.logger import ProactorLogger
 from proactor.message import Message
 from proactor.message import MessageType
@@ -26,7 +34,12 @@ from proactor.mqtt import MQTTClients
 from proactor.proactor_interface import CommunicatorInterface
 from proactor.proactor_interface import Runnable
 from proactor.proactor_interface import ServicesInterface
+from proactor.receive_queue import Lane
+from proactor.receive_queue import LaneStats
+from proactor.receive_queue import ReceiveQueue
+from proactor.receive_queue import message_type_key
 from proactor.sync_thread import AsyncQueueWriter
+from proactor.sync_thread import WakeupStats
 
 
 class MQTTCodec(ABC):
@@ -38,32 +51,110 @@ class MQTTCodec(ABC):
     def decode(self, receipt_payload: MQTTReceiptPayload) -> Any:
         pass
 
+    def invalidate_routes(self) -> None:
+        """Forget anything decode() has cached per topic. Called when the client's subscriptions change."""
+
+
+class ProcessBatching(NamedTuple):
+    """How process_messages() drains the receive queue.
+
+    Each wakeup processes, in order, up to max_messages ready messages, stopping early once max_batch_s of work has
+    been done, and then yields to the event loop. max_messages=1 processes one message per wakeup.
+    """
+
+    max_messages: int = 1
+    max_batch_s: float = 0.005
+
+
+class ProcessStats:
+    """Throughput and latency of process_messages(). Latency is time spent processing, per message and per batch."""
+
+    num_messages: int = 0
+    num_batches: int = 0
+    max_batch_size: int = 0
+    last_batch_s: float = 0.0
+    max_batch_s: float = 0.0
+    total_busy_s: float = 0.0
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.num_messages / self.num_batches if self.num_batches else 0.0
+
+    @property
+    def mean_message_s(self) -> float:
+        return self.total_busy_s / self.num_messages if self.num_messages else 0.0
+
+    @property
+    def messages_per_s(self) -> float:
+        return self.num_messages / self.total_busy_s if self.total_busy_s else 0.0
+
+    def record(self, batch_size: int, batch_s: float) -> None:
+        self.num_messages += batch_size
+        self.num_batches += 1
+        self.max_batch_size = max(self.max_batch_size, batch_size)
+        self.last_batch_s = batch_s
+        self.max_batch_s = max(self.max_batch_s, batch_s)
+        self.total_busy_s += batch_s
+
+    def as_dict(self) -> dict[str, int | float]:
+        return dict(
+            num_messages=self.num_messages,
+            num_batches=self.num_batches,
+            max_batch_size=self.max_batch_size,
+            mean_batch_size=self.mean_batch_size,
+            last_batch_s=self.last_batch_s,
+            max_batch_s=self.max_batch_s,
+            mean_message_s=self.mean_message_s,
+            messages_per_s=self.messages_per_s,
+        )
+
 
 class Proactor(ServicesInterface, Runnable):
     _name: str
     _loop: asyncio.AbstractEventLoop
-    _receive_queue: asyncio.Queue
+    _receive_queue: ReceiveQueue
+    _threadsafe_writer: AsyncQueueWriter
     _mqtt_clients: MQTTClients
     _mqtt_codecs: Dict[str, MQTTCodec]
     _communicators: Dict[str, CommunicatorInterface]
     _stop_requested: bool
     _tasks: List[asyncio.Task]
     _logger: ProactorLogger
+    _batching: ProcessBatching
+    _process_stats: ProcessStats
+    _handlers: DispatchTable
+    _derived_handler: Handler
 
     # TODO: Clean up loop control
-    def __init__(self, name: str, logger: ProactorLogger):
+    def __init__(
+        self,
+        name: str,
+        logger: ProactorLogger,
+        receive_lanes: Optional[Sequence[Lane]] = None,
+        lane_key: Callable[[Any], str] = message_type_key,
+        batching: Optional[ProcessBatching] = None,
+        mqtt_backend: config.MQTTBackend = config.MQTTBackend.threaded,
+    ):
         self._name = name
         self._logger = logger
         # TODO: Figure out and remove the deprecation warning this produces.
         self._loop = asyncio.get_event_loop()
-        self._receive_queue = asyncio.Queue()
-        self._mqtt_clients = MQTTClients(
-            AsyncQueueWriter(self._loop, self._receive_queue)
-        )
+        self._receive_queue = ReceiveQueue(receive_lanes, key=lane_key)
+        self._threadsafe_writer = AsyncQueueWriter(self._loop, self._receive_queue)
+        self._mqtt_clients = MQTTClients(self._threadsafe_writer, backend=mqtt_backend, loop=self._loop)
         self._mqtt_codecs = dict()
         self._communicators = dict()
         self._tasks = []
         self._stop_requested = False
+        self._batching = ProcessBatching() if batching is None else batching
+        self._process_stats = ProcessStats()
+        self._handlers = DispatchTable("proactor")
+        self._handlers.register(MessageType.mqtt_message.value, self._process_mqtt_message)
+        self._handlers.register(MessageType.mqtt_connected.value, self._process_mqtt_connected)
+        self._handlers.register(MessageType.mqtt_disconnected.value, self._process_mqtt_disconnected)
+        self._handlers.register(MessageType.mqtt_connect_failed.value, self._process_mqtt_connect_fail)
+        self._handlers.register(MessageType.mqtt_suback.value, self._process_mqtt_suback)
+        self._derived_handler = Handler("proactor/derived", self._derived_process_message)
 
     def _add_mqtt_client(
         self,
@@ -75,6 +166,21 @@ class Proactor(ServicesInterface, Runnable):
         if codec is not None:
             self._mqtt_codecs[name] = codec
 
+    def _subscribe(self, client: str, topic: str, qos: int) -> Tuple[int, Optional[int]]:
+        result = self._mqtt_clients.subscribe(client, topic, qos)
+        self._invalidate_routes(client)
+        return result
+
+    def _unsubscribe(self, client: str, topic: str) -> Tuple[int, Optional[int]]:
+        result = self._mqtt_clients.unsubscribe(client, topic)
+        self._invalidate_routes(client)
+        return result
+
+    def _invalidate_routes(self, client: str) -> None:
+        codec = self._mqtt_codecs.get(client, None)
+        if codec is not None:
+            codec.invalidate_routes()
+
     def _encode_and_publish(
         self, client: str, topic: str, payload: Any, qos: int
     ) -> MQTTMessageInfo:
@@ -96,17 +202,40 @@ class Proactor(ServicesInterface, Runnable):
         self._communicators[communicator.name] = communicator
 
     @property
-    def async_receive_queue(self):
+    def async_receive_queue(self) -> ReceiveQueue:
         return self._receive_queue
 
+    def receive_lane_stats(self) -> dict[str, LaneStats]:
+        return self._receive_queue.lane_stats()
+
+    @property
+    def process_stats(self) -> ProcessStats:
+        return self._process_stats
+
+    def register_handler(self, message_type: str, handler: Callable[[Message], Any], replace: bool = False):
+        """Handle messages of message_type with handler, which may be a coroutine function. Messages with no
+        registered handler go to _derived_process_message()."""
+        self._handlers.register(message_type, handler, replace=replace)
+
+    @property
+    def wakeup_stats(self) -> WakeupStats:
+        """Event loop wakeups used, and saved, by MQTT client threads and send_threadsafe()."""
+        return self._threadsafe_writer.wakeup_stats
+
+    def handler_stats(self) -> dict[str, HandlerStats]:
+        stats = self._handlers.stats()
+        stats[self._derived_handler.name] = self._derived_handler.stats
+        return stats
+
     async def process_messages(self):
         # noinspection PyBroadException
         try:
+            max_messages = max(1, self._batching.max_messages)
             while not self._stop_requested:
                 message = await self._receive_queue.get()
-                if not self._stop_requested:
-                    await self.process_message(message)
-                self._receive_queue.task_done()
+                await self._process_batch(message, max_messages)
+                if max_messages > 1:
+                    await asyncio.sleep(0)
         # TODO: Clean this up
         except BaseException as e:
             if not isinstance(e, asyncio.exceptions.CancelledError):
@@ -118,6 +247,27 @@ class Proactor(ServicesInterface, Runnable):
             except:
                 self._logger.exception(f"ERROR stopping proactor")
 
+    async def _process_batch(self, message: Message, max_messages: int) -> None:
+        """Process message, then drain the receive queue without awaiting it until it is empty, or max_messages or
+        the batch time limit is reached."""
+        batch_start_s = time.perf_counter()
+        batch_size = 0
+        while True:
+            if not self._stop_requested:
+                await self.process_message(message)
+                batch_size += 1
+            self._receive_queue.task_done()
+            if (
+                self._stop_requested
+                or batch_size >= max_messages
+                or self._receive_queue.empty()
+                or time.perf_counter() - batch_start_s >= self._batching.max_batch_s
+            ):
+                break
+            message = self._receive_queue.get_nowait()
+        if batch_size:
+            self._process_stats.record(batch_size, time.perf_counter() - batch_start_s)
+
     def start_tasks(self):
         self._tasks = [
             asyncio.create_task(self.process_messages(), name="process_messages")
@@ -137,46 +287,27 @@ class Proactor(ServicesInterface, Runnable):
 
     async def process_message(self, message: Message):
         self._logger.path("++Proactor.process_message %s/%s", message.header.src, message.header.message_type)
-        path_dbg = 0
-        self._logger.message_summary(
-            "INx ",
-            self.name,
-            f"{message.header.src}/{message.header.message_type}",
-            message.payload,
-        )
-        # TODO: be easier on the eyes
-        if message.header.message_type == MessageType.mqtt_message.value:
-            path_dbg |= 0x00000001
-            await self._process_mqtt_message(message)
-        elif message.header.message_type == MessageType.mqtt_connected.value:
-            path_dbg |= 0x00000002
-            self._process_mqtt_connected(message)
-        elif message.header.message_type == MessageType.mqtt_disconnected.value:
-            path_dbg |= 0x00000004
-            self._process_mqtt_disconnected(message)
-        elif message.header.message_type == MessageType.mqtt_connect_failed.value:
-            path_dbg |= 0x00000008
-            self._process_mqtt_connect_fail(message)
-        elif message.header.message_type == MessageType.mqtt_suback.value:
-            self._process_mqtt_suback(message)
-        else:
-            path_dbg |= 0x00000010
-            await self._derived_process_message(message)
-        self._logger.path("--Proactor.process_message  path:0x%08X", path_dbg)
+        if self._logger.message_summary_enabled:
+            self._logger.message_summary(
+                "INx ",
+                self.name,
+                f"{message.header.src}/{message.header.message_type}",
+                message.payload,
+            )
+        handler = self._handlers.lookup(message.header.message_type) or self._derived_handler
+        await handler(message)
+        self._logger.path("--Proactor.process_message  handler:%s", handler.name)
 
     async def _process_mqtt_message(self, message: Message[MQTTReceiptPayload]):
         self._logger.path("++Proactor._process_mqtt_message %s/%s", message.header.src, message.header.message_type)
-        path_dbg = 0
         decoder = self._mqtt_codecs.get(message.payload.client_name, None)
         if decoder is not None:
-            path_dbg |= 0x00000001
             decoded = decoder.decode(message.payload)
         else:
-            path_dbg |= 0x00000002
             decoded = message.payload
         self._logger.message_summary("INq ", self.name, message.payload.message.topic, decoded)
         await self._derived_process_mqtt_message(message, decoded)
-        self._logger.path("--Proactor._process_mqtt_message  path:0x%08X", path_dbg)
+        self._logger.path("--Proactor._process_mqtt_message")
 
     def _process_mqtt_connected(self, message: Message[MQTTConnectPayload]):
         self._mqtt_clients.subscribe_all(message.payload.client_name)
@@ -260,7 +391,7 @@ class Proactor(ServicesInterface, Runnable):
         self._receive_queue.put_nowait(message)
 
     def send_threadsafe(self, message: Message) -> None:
-        self._loop.call_soon_threadsafe(self._receive_queue.put_nowait, message)
+        self._threadsafe_writer.put(message)
 
     def get_communicator(self, name: str) -> CommunicatorInterface:
         return self._communicators[name]
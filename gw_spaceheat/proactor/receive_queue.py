@@ -0,0 +1,185 @@
+"""An asyncio.Queue with priority lanes, used as the Proactor receive queue."""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any
+from typing import Callable
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+
+from proactor.message import Message
+from proactor.message import MessageType
+
+
+class Lane(NamedTuple):
+    """A receive queue lane.
+
+    keys: The lane keys (by default, message types) routed to this lane.
+    max_skips: Fairness limit. A waiting lane is served, ahead of higher-priority lanes, once it has been passed over
+      this many times. None means the lane is served only when every higher-priority lane is empty.
+    """
+
+    name: str
+    keys: tuple[str, ...] = ()
+    max_skips: Optional[int] = None
+
+
+class LaneStats:
+    """Depth and wait-time metrics for one lane. Wait is the time from put to get."""
+
+    num_put: int = 0
+    num_get: int = 0
+    num_fair_turns: int = 0
+    max_depth: int = 0
+    last_wait_s: float = 0.0
+    max_wait_s: float = 0.0
+    total_wait_s: float = 0.0
+
+    @property
+    def mean_wait_s(self) -> float:
+        return self.total_wait_s / self.num_get if self.num_get else 0.0
+
+    def as_dict(self) -> dict[str, int | float]:
+        return dict(
+            num_put=self.num_put,
+            num_get=self.num_get,
+            num_fair_turns=self.num_fair_turns,
+            max_depth=self.max_depth,
+            last_wait_s=self.last_wait_s,
+            max_wait_s=self.max_wait_s,
+            mean_wait_s=self.mean_wait_s,
+        )
+
+
+class _LaneQueue:
+    lane: Lane
+    items: deque[tuple[float, Any]]
+    skips: int
+    stats: LaneStats
+
+    def __init__(self, lane: Lane):
+        self.lane = lane
+        self.items = deque()
+        self.skips = 0
+        self.stats = LaneStats()
+
+
+class _Lanes:
+    """The container behind ReceiveQueue. Sized so asyncio.Queue's empty()/qsize()/full() work unchanged."""
+
+    queues: list[_LaneQueue]
+    by_key: dict[str, _LaneQueue]
+    default: _LaneQueue
+    size: int
+
+    def __init__(self, lanes: Sequence[Lane], default_lane: Optional[str]):
+        self.queues = [_LaneQueue(lane) for lane in lanes]
+        self.by_key = {key: queue for queue in self.queues for key in queue.lane.keys}
+        if default_lane is None:
+            self.default = self.queues[-1]
+        else:
+            self.default = next(queue for queue in self.queues if queue.lane.name == default_lane)
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+
+def message_type_key(item: Any) -> str:
+    """The default lane key: the message type of a proactor Message."""
+    if isinstance(item, Message):
+        return item.header.message_type
+    return ""
+
+
+class ReceiveQueue(asyncio.Queue):
+    """An asyncio.Queue which holds items in lanes.
+
+    get() returns the oldest item of the highest-priority non-empty lane, except that a lane with a max_skips
+    fairness limit which has been passed over that many times while non-empty is served first. Lanes are given highest
+    priority first. An item's lane is found by looking up key(item) in the lanes' keys; items with no matching lane go
+    to default_lane, or to the last lane if default_lane is None.
+
+    It is written like any asyncio.Queue: MQTT client threads write through a sync_thread.CoalescingWriter, which
+    wakes the event loop once per burst and moves the burst into the queue in put order, and callbacks on the event
+    loop thread write through its put_local().
+    """
+
+    DEFAULT_LANES: tuple[Lane, ...] = (
+        Lane(
+            "control",
+            (
+                MessageType.mqtt_connected.value,
+                MessageType.mqtt_disconnected.value,
+                MessageType.mqtt_connect_failed.value,
+                MessageType.mqtt_suback.value,
+            ),
+        ),
+        Lane("default", max_skips=16),
+    )
+
+    _queue: _Lanes
+    _key: Callable[[Any], str]
+
+    def __init__(
+        self,
+        lanes: Optional[Sequence[Lane]] = None,
+        key: Callable[[Any], str] = message_type_key,
+        default_lane: Optional[str] = None,
+        maxsize: int = 0,
+    ):
+        self._lanes_config = tuple(lanes) if lanes else self.DEFAULT_LANES
+        self._default_lane = default_lane
+        self._key = key
+        super().__init__(maxsize)
+
+    @property
+    def lanes(self) -> list[Lane]:
+        return [queue.lane for queue in self._queue.queues]
+
+    def lane_depths(self) -> dict[str, int]:
+        return {queue.lane.name: len(queue.items) for queue in self._queue.queues}
+
+    def lane_stats(self) -> dict[str, LaneStats]:
+        return {queue.lane.name: queue.stats for queue in self._queue.queues}
+
+    def lane_of(self, item: Any) -> Lane:
+        return self._queue.by_key.get(self._key(item), self._queue.default).lane
+
+    def _init(self, maxsize: int) -> None:
+        self._queue = _Lanes(self._lanes_config, self._default_lane)
+
+    def _put(self, item: Any) -> None:
+        queue = self._queue.by_key.get(self._key(item), self._queue.default)
+        queue.items.append((time.monotonic(), item))
+        queue.stats.num_put += 1
+        queue.stats.max_depth = max(queue.stats.max_depth, len(queue.items))
+        self._queue.size += 1
+
+    def _get(self) -> Any:
+        chosen: Optional[_LaneQueue] = None
+        fair_turn = False
+        for queue in self._queue.queues:
+            if queue.items and queue.lane.max_skips is not None and queue.skips >= queue.lane.max_skips:
+                chosen = queue
+                fair_turn = True
+                break
+        if chosen is None:
+            chosen = next(queue for queue in self._queue.queues if queue.items)
+        for queue in self._queue.queues:
+            if queue is chosen:
+                queue.skips = 0
+            elif queue.items:
+                queue.skips += 1
+        put_s, item = chosen.items.popleft()
+        self._queue.size -= 1
+        stats = chosen.stats
+        stats.num_get += 1
+        if fair_turn:
+            stats.num_fair_turns += 1
+        stats.last_wait_s = time.monotonic() - put_s
+        stats.max_wait_s = max(stats.max_wait_s, stats.last_wait_s)
+        stats.total_wait_s += stats.last_wait_s
+        return item
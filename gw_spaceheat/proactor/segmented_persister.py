@@ -0,0 +1,655 @@
+"""A log-structured PersisterInterface implementation.
+
+SegmentedLogPersister appends length-prefixed, CRC-checked records to rolling segment files instead of writing one file
+per persisted item. An in-memory map from uid to record location provides persist/clear/retrieve/pending semantics
+identical to TimedRollingFilePersister.
+
+Pending items are ordered by a sequence number which every appended record takes, rather than by the wall clock, so
+that order survives the clock being stepped back. Each segment starts with a header holding the sequence number its
+first record takes, so the sequence carries on across restarts even once every record has been cleared.
+
+clear() never rewrites a segment in place. It appends a tombstone record naming the uid and the segment that held it.
+A segment whose records are all dead is unlinked once no other segment needs it, and mostly-dead closed segments are
+compacted by copying their live records (and still-needed tombstones) into the current segment.
+"""
+
+import re
+import struct
+import os
+import time
+import zlib
+from collections import deque
+from concurrent.futures import Future
+from enum import Enum
+from pathlib import Path
+from typing import BinaryIO
+from typing import Iterator
+from typing import NamedTuple
+from typing import Optional
+
+from result import Err
+from result import Ok
+from result import Result
+
+from proactor.persister import CommitFailed
+from proactor.persister import Compression
+from proactor.persister import ContentTooLarge
+from proactor.persister import Durability
+from proactor.persister import DurabilityMode
+from proactor.persister import FileMissingWarning
+from proactor.persister import PendingBatch
+from proactor.persister import PendingCursor
+from proactor.persister import PersisterError
+from proactor.persister import PayloadCodec
+from proactor.persister import PersisterInterface
+from proactor.persister import Problems
+from proactor.persister import ReadFailed
+from proactor.persister import ReindexError
+from proactor.persister import TrimCallback
+from proactor.persister import TrimEvent
+from proactor.persister import TrimFailed
+from proactor.persister import UIDExistedWarning
+from proactor.persister import WriteFailed
+from proactor.persister import _GroupCommit
+from proactor.persister import durable_future
+from proactor.persister import fsync_dir
+
+
+class CorruptRecord(PersisterError):
+    ...
+
+
+class CompactionFailed(PersisterError):
+    ...
+
+
+class RecordKind(Enum):
+    put = 1
+    tombstone = 2
+
+
+# magic, sequence number of the first record appended to the segment.
+_SEGMENT_MAGIC = b"GWSL"
+_SEGMENT_HEADER = struct.Struct("<4sQ")
+# kind, uid length, content length, sequence number, persisted time (ns), crc32 of the preceding header fields, uid
+# and content. The kind byte carries _COMPRESSED_FLAG when the content is compressed.
+_COMPRESSED_FLAG = 0x80
+_RECORD_HEADER = struct.Struct("<BHIQqI")
+_RECORD_PREFIX = struct.Struct("<BHIQq")
+_TOMBSTONE_CONTENT = struct.Struct("<Q")
+
+
+class _Record(NamedTuple):
+    kind: RecordKind
+    uid: str
+    content: bytes
+    seq: int
+    time_ns: int
+    offset: int
+    size: int
+    compressed: bool = False
+
+
+class _LogLocation(NamedTuple):
+    segment: int
+    offset: int
+    size: int
+    seq: int
+    time_ns: int
+
+
+class _Segment:
+    id: int
+    path: Path
+    total_bytes: int
+    live_bytes: int
+    tombstone_targets: set[int]
+    first_seq: int
+
+    def __init__(self, id_: int, path: Path, total_bytes: int = 0, first_seq: int = 0):
+        self.id = id_
+        self.path = path
+        self.total_bytes = total_bytes
+        self.first_seq = first_seq
+        self.live_bytes = 0
+        self.tombstone_targets = set()
+
+    @property
+    def live_ratio(self) -> float:
+        return self.live_bytes / self.total_bytes if self.total_bytes else 0.0
+
+
+class SegmentedLogPersister(PersisterInterface):
+    DEFAULT_MAX_BYTES: int = 500 * 1024 * 1024
+    DEFAULT_SEGMENT_BYTES: int = 4 * 1024 * 1024
+    DEFAULT_COMPACT_RATIO: float = 0.25
+    SEGMENT_NAME_FORMAT: str = "segment-{:010d}.log"
+    SEGMENT_NAME_RGX: re.Pattern = re.compile(r"segment-(?P<id>\d{10})\.log")
+
+    _base_dir: Path
+    _max_bytes: int = DEFAULT_MAX_BYTES
+    _segment_bytes: int = DEFAULT_SEGMENT_BYTES
+    _compact_ratio: float = DEFAULT_COMPACT_RATIO
+    _compacting: bool = False
+    _pending: dict[str, _LogLocation]
+    _segments: dict[int, _Segment]
+    _curr_segment: Optional[_Segment]
+    _writer: Optional[BinaryIO]
+    _curr_bytes: int
+    _next_seq: int
+    _durability: Durability
+    _group_commit: _GroupCommit
+    _codec: PayloadCodec
+
+    def __init__(
+        self,
+        base_dir: Path | str,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        compact_ratio: float = DEFAULT_COMPACT_RATIO,
+        durability: Durability = Durability(),
+        on_trim: Optional[TrimCallback] = None,
+        compression: Compression = Compression(),
+    ):
+        self.trims = deque(maxlen=self.MAX_TRIM_EVENTS)
+        self._on_trim = on_trim
+        self._base_dir = Path(base_dir).resolve()
+        self._base_dir.mkdir(parents=True, exist_ok=True)
+        self._codec = PayloadCodec(self._base_dir, compression)
+        self._max_bytes = max_bytes
+        self._segment_bytes = min(segment_bytes, max_bytes)
+        self._compact_ratio = compact_ratio
+        self._durability = durability
+        self._group_commit = _GroupCommit(durability)
+        self._curr_segment = None
+        self._writer = None
+        self.reindex()
+
+    def persist(self, uid: str, content: bytes) -> Result[Future, Problems]:
+        problems = Problems()
+        try:
+            content, compressed = self._codec.encode(content)
+            record_size = self._record_size(uid, content)
+            if record_size > self._max_bytes:
+                return Err(
+                    problems.add_error(
+                        ContentTooLarge(
+                            f"content bytes ({len(content)} > max bytes {self._max_bytes}",
+                            uid=uid,
+                        )
+                    )
+                )
+            if record_size + self._curr_bytes > self._max_bytes:
+                match self._trim_old_storage(record_size):
+                    case Err(trim_problems):
+                        problems.add_problems(trim_problems)
+                        if problems.errors:
+                            return Err(problems.add_error(TrimFailed(uid=uid)))
+            existing = self._pending.pop(uid, None)
+            if existing is not None:
+                problems.add_warning(UIDExistedWarning(uid=uid, path=self._segment_path(existing.segment)))
+                self._release(existing)
+            try:
+                future = self._append_put(uid, content, compressed)
+            except BaseException as e:
+                return Err(
+                    problems.add_error(e).add_error(
+                        WriteFailed("Append failed", uid=uid, path=self._curr_segment.path)
+                    )
+                )
+            self._reclaim_dead_segments()
+            if self._compaction_needed():
+                match self.compact():
+                    case Err(compact_problems):
+                        problems.add_problems(compact_problems)
+        except BaseException as e:
+            return Err(problems.add_error(e).add_error(PersisterError("Unexpected error", uid=uid)))
+        match self.commit_if_due():
+            case Err(commit_problems):
+                problems.add_problems(commit_problems)
+        if problems:
+            return Err(problems)
+        else:
+            return Ok(future)
+
+    def _append_put(self, uid: str, content: bytes, compressed: bool) -> Future:
+        """Append uid's put record and return the handle which resolves once it is durable."""
+        self._pending[uid] = self._append(RecordKind.put, uid, content, time.time_ns(), compressed=compressed)
+        if self._durability.mode == DurabilityMode.fsync:
+            os.fsync(self._writer.fileno())
+        elif self._durability.mode == DurabilityMode.group:
+            return self._group_commit.add(self._pending[uid].size)
+        return durable_future()
+
+    def clear(self, uid: str) -> Result[bool, Problems]:
+        problems = Problems()
+        location = self._pending.get(uid, None)
+        if location is None:
+            problems.add_warning(FileMissingWarning(uid=uid))
+        else:
+            try:
+                self._append(
+                    RecordKind.tombstone,
+                    uid,
+                    _TOMBSTONE_CONTENT.pack(location.segment),
+                    time.time_ns(),
+                    tombstone_target=location.segment,
+                )
+                # Only forget the item once its tombstone is written; otherwise it would reappear at reindex.
+                self._pending.pop(uid)
+                self._release(location)
+                self._reclaim_dead_segments()
+            except BaseException as e:
+                problems.add_error(e).add_error(
+                    WriteFailed("Tombstone append failed", uid=uid, path=self._segment_path(location.segment))
+                )
+        if problems:
+            return Err(problems)
+        else:
+            return Ok()
+
+    def pending(self) -> set[str]:
+        return set(self._pending.keys())
+
+    @property
+    def num_pending(self) -> int:
+        return len(self._pending)
+
+    @property
+    def curr_bytes(self) -> int:
+        return self._curr_bytes
+
+    @property
+    def codec(self) -> PayloadCodec:
+        return self._codec
+
+    @property
+    def num_segments(self) -> int:
+        return len(self._segments)
+
+    def retrieve(self, uid: str) -> Result[Optional[bytes], Problems]:
+        problems = Problems()
+        content: Optional[bytes] = None
+        location = self._pending.get(uid, None)
+        if location is not None:
+            path = self._segment_path(location.segment)
+            try:
+                with path.open("rb") as f:
+                    f.seek(location.offset)
+                    record = self._read_record(f, location.offset)
+                if record is None or record.uid != uid:
+                    problems.add_error(CorruptRecord(f"Bad record at offset {location.offset}", uid=uid, path=path))
+                else:
+                    content = self._codec.decode(record.content, record.compressed)
+            except BaseException as e:
+                problems.add_error(e).add_error(ReadFailed("Open or read failed", uid=uid, path=path))
+        if problems:
+            return Err(problems)
+        else:
+            return Ok(content)
+
+    def _pending_in_order(self, since: Optional[PendingCursor]) -> list[tuple[PendingCursor, str, int]]:
+        # _pending is kept in sequence order by reindex() and by persist() re-inserting replaced uids.
+        items = []
+        for uid, location in self._pending.items():
+            cursor = PendingCursor(f"{location.seq:020d}", uid)
+            if since is None or cursor > since:
+                items.append((cursor, uid, location.size))
+        return items
+
+    def _read_batch(self, batch: list[tuple[PendingCursor, str]]) -> PendingBatch:
+        """Read a batch with one open and one forward pass per segment rather than one open per item."""
+        problems = Problems()
+        contents: dict[str, bytes] = dict()
+        by_segment: dict[int, list[tuple[_LogLocation, str]]] = dict()
+        for _, uid in batch:
+            if (location := self._pending.get(uid, None)) is not None:
+                by_segment.setdefault(location.segment, []).append((location, uid))
+        for segment_id, locations in by_segment.items():
+            path = self._segment_path(segment_id)
+            try:
+                with path.open("rb") as f:
+                    for location, uid in sorted(locations):
+                        f.seek(location.offset)
+                        record = self._read_record(f, location.offset)
+                        if record is None or record.uid != uid:
+                            problems.add_error(
+                                CorruptRecord(f"Bad record at offset {location.offset}", uid=uid, path=path)
+                            )
+                        else:
+                            try:
+                                contents[uid] = self._codec.decode(record.content, record.compressed)
+                            except BaseException as e:
+                                problems.add_error(e).add_error(ReadFailed("Decode failed", uid=uid, path=path))
+            except BaseException as e:
+                problems.add_error(e).add_error(ReadFailed("Open or read failed", path=path))
+        return PendingBatch(
+            [(uid, contents[uid]) for _, uid in batch if uid in contents],
+            batch[-1][0],
+            problems,
+        )
+
+    def reindex(self) -> Result[Optional[bool], Problems]:
+        problems = Problems()
+        self._close_writer()
+        self._pending = dict()
+        self._segments = dict()
+        self._curr_segment = None
+        self._curr_bytes = 0
+        self._next_seq = 0
+        for path in sorted(self._base_dir.iterdir()):
+            if match := self.SEGMENT_NAME_RGX.fullmatch(path.name):
+                segment_id = int(match.group("id"))
+                self._segments[segment_id] = _Segment(segment_id, path)
+        for segment in self._segments.values():
+            # noinspection PyBroadException
+            try:
+                segment.total_bytes = segment.path.stat().st_size
+                self._curr_bytes += segment.total_bytes
+                for record in self._iter_segment(segment, problems):
+                    self._apply_record(segment, record)
+                    self._next_seq = max(self._next_seq, record.seq + 1)
+                self._next_seq = max(self._next_seq, segment.first_seq)
+            except BaseException as e:
+                problems.add_error(e).add_error(ReindexError(path=segment.path))
+        self._pending = dict(sorted(self._pending.items(), key=lambda item: item[1].seq))
+        # Never append after a possibly torn tail: every open starts a fresh segment.
+        self._open_segment()
+        self._reclaim_dead_segments()
+        if problems:
+            return Err(problems)
+        else:
+            return Ok()
+
+    def compact(self, compact_ratio: Optional[float] = None) -> Result[bool, Problems]:
+        """Copy the live records of mostly-dead closed segments into the current segment and unlink them."""
+        problems = Problems()
+        if compact_ratio is None:
+            compact_ratio = self._compact_ratio
+        if not self._compacting:
+            self._compacting = True
+            try:
+                for segment in list(self._segments.values()):
+                    if segment is self._curr_segment or segment.id not in self._segments:
+                        continue
+                    if segment.live_bytes == 0 or segment.live_ratio >= compact_ratio:
+                        continue
+                    # noinspection PyBroadException
+                    try:
+                        self._compact_segment(segment, problems)
+                    except BaseException as e:
+                        problems.add_error(e).add_error(CompactionFailed(path=segment.path))
+                self._reclaim_dead_segments()
+            finally:
+                self._compacting = False
+        if problems:
+            return Err(problems)
+        else:
+            return Ok()
+
+    def commit(self) -> Result[bool, Problems]:
+        problems = Problems()
+        if self._group_commit.num_unsynced:
+            try:
+                # Segments closed since the last commit were synced as they were closed.
+                os.fsync(self._writer.fileno())
+                self._group_commit.complete()
+            except BaseException as e:
+                problems.add_error(e).add_error(CommitFailed(path=self._curr_segment.path))
+                self._group_commit.complete(CommitFailed(str(e), path=self._curr_segment.path))
+        if problems:
+            return Err(problems)
+        else:
+            return Ok()
+
+    def commit_if_due(self) -> Result[bool, Problems]:
+        if self._group_commit.due():
+            return self.commit()
+        return Ok()
+
+    @property
+    def num_unsynced(self) -> int:
+        return self._group_commit.num_unsynced
+
+    def close(self) -> None:
+        self.commit()
+        self._close_writer()
+
+    def _compact_segment(self, segment: _Segment, problems: Problems) -> None:
+        for record in self._iter_segment(segment, problems):
+            if record.kind == RecordKind.put:
+                location = self._pending.get(record.uid, None)
+                if location is not None and location.segment == segment.id and location.offset == record.offset:
+                    self._pending[record.uid] = self._append(
+                        RecordKind.put,
+                        record.uid,
+                        record.content,
+                        record.time_ns,
+                        compressed=record.compressed,
+                        seq=record.seq,
+                    )
+                    segment.live_bytes -= location.size
+            else:
+                target = _TOMBSTONE_CONTENT.unpack(record.content)[0]
+                if target != segment.id and target in self._segments:
+                    self._append(
+                        RecordKind.tombstone, record.uid, record.content, record.time_ns, target, seq=record.seq
+                    )
+        self._unlink_segment(segment)
+
+    def _trim_old_storage(self, needed_bytes: int) -> Result[bool, Problems]:
+        """Drop whole segments, oldest first, until needed_bytes fit."""
+        problems = Problems()
+        start_s = time.perf_counter()
+        start_bytes = self._curr_bytes
+        dropped: set[int] = set()
+        num_pending = len(self._pending)
+        for segment in list(self._segments.values()):
+            if self._curr_bytes <= self._max_bytes - needed_bytes:
+                break
+            if segment is self._curr_segment:
+                self._roll_segment()
+            # noinspection PyBroadException
+            try:
+                self._unlink_segment(segment)
+                dropped.add(segment.id)
+            except BaseException as e:
+                problems.add_error(e).add_error(PersisterError("Unexpected error", path=segment.path))
+        if dropped:
+            self._pending = {
+                uid: location for uid, location in self._pending.items() if location.segment not in dropped
+            }
+        self._record_trim(
+            TrimEvent(
+                freed_bytes=start_bytes - self._curr_bytes,
+                num_cleared=num_pending - len(self._pending),
+                units_dropped=len(dropped),
+                duration_s=time.perf_counter() - start_s,
+            )
+        )
+        if problems:
+            return Err(problems)
+        else:
+            return Ok()
+
+    def _append(
+        self,
+        kind: RecordKind,
+        uid: str,
+        content: bytes,
+        time_ns: int,
+        tombstone_target: Optional[int] = None,
+        compressed: bool = False,
+        seq: Optional[int] = None,
+    ) -> _LogLocation:
+        """Append a record. It takes the next sequence number unless seq, the one of the record it copies, is given."""
+        if self._curr_segment.total_bytes >= self._segment_bytes:
+            self._roll_segment()
+        if seq is None:
+            seq = self._next_seq
+        uid_bytes = uid.encode()
+        kind_byte = kind.value | (_COMPRESSED_FLAG if compressed else 0)
+        prefix = _RECORD_PREFIX.pack(kind_byte, len(uid_bytes), len(content), seq, time_ns)
+        crc = zlib.crc32(content, zlib.crc32(uid_bytes, zlib.crc32(prefix)))
+        record = b"".join(
+            [_RECORD_HEADER.pack(kind_byte, len(uid_bytes), len(content), seq, time_ns, crc), uid_bytes, content]
+        )
+        segment = self._curr_segment
+        offset = segment.total_bytes
+        try:
+            self._writer.write(record)
+            self._writer.flush()
+        except BaseException:
+            self._discard_torn_tail(segment, offset)
+            raise
+        segment.total_bytes += len(record)
+        self._curr_bytes += len(record)
+        self._next_seq = max(self._next_seq, seq + 1)
+        if kind == RecordKind.put:
+            segment.live_bytes += len(record)
+        elif tombstone_target is not None:
+            segment.tombstone_targets.add(tombstone_target)
+        return _LogLocation(segment.id, offset, len(record), seq, time_ns)
+
+    def _apply_record(self, segment: _Segment, record: _Record) -> None:
+        if record.kind == RecordKind.put:
+            if (existing := self._pending.get(record.uid, None)) is not None:
+                self._release(existing)
+            self._pending[record.uid] = _LogLocation(
+                segment.id, record.offset, record.size, record.seq, record.time_ns
+            )
+            segment.live_bytes += record.size
+        elif record.kind == RecordKind.tombstone:
+            target = _TOMBSTONE_CONTENT.unpack(record.content)[0]
+            segment.tombstone_targets.add(target)
+            existing = self._pending.get(record.uid, None)
+            if existing is not None and existing.segment == target:
+                self._pending.pop(record.uid)
+                self._release(existing)
+
+    def _release(self, location: _LogLocation) -> None:
+        if (segment := self._segments.get(location.segment, None)) is not None:
+            segment.live_bytes -= location.size
+
+    def _reclaim_dead_segments(self) -> None:
+        """Unlink closed segments with no live records and whose tombstones no longer shadow anything."""
+        reclaimed = True
+        while reclaimed:
+            reclaimed = False
+            for segment in list(self._segments.values()):
+                if segment is self._curr_segment or segment.live_bytes > 0:
+                    continue
+                if any(target in self._segments for target in segment.tombstone_targets if target != segment.id):
+                    continue
+                self._unlink_segment(segment)
+                reclaimed = True
+
+    def _compaction_needed(self) -> bool:
+        return any(
+            segment is not self._curr_segment and 0 < segment.live_ratio < self._compact_ratio
+            for segment in self._segments.values()
+        )
+
+    def _unlink_segment(self, segment: _Segment) -> None:
+        self._segments.pop(segment.id, None)
+        self._curr_bytes -= segment.total_bytes
+        segment.path.unlink(missing_ok=True)
+
+    def _roll_segment(self) -> None:
+        self._close_writer()
+        self._open_segment()
+
+    def _open_segment(self) -> None:
+        segment_id = max(self._segments.keys(), default=0) + 1
+        segment = _Segment(segment_id, self._segment_path(segment_id), first_seq=self._next_seq)
+        self._segments[segment_id] = segment
+        self._curr_segment = segment
+        self._writer = segment.path.open("ab")
+        self._writer.write(_SEGMENT_HEADER.pack(_SEGMENT_MAGIC, segment.first_seq))
+        self._writer.flush()
+        segment.total_bytes = _SEGMENT_HEADER.size
+        self._curr_bytes += _SEGMENT_HEADER.size
+        if self._durability.mode != DurabilityMode.none:
+            fsync_dir(self._base_dir)
+
+    def _close_writer(self) -> None:
+        if self._writer is not None:
+            if self._durability.mode != DurabilityMode.none:
+                self._writer.flush()
+                os.fsync(self._writer.fileno())
+            self._writer.close()
+            self._writer = None
+
+    def _discard_torn_tail(self, segment: _Segment, offset: int) -> None:
+        """After a failed append, cut the segment back to its last whole record so later appends remain readable. If
+        that fails, continue in a new segment; reindex ignores a torn tail at the end of a segment."""
+        # noinspection PyBroadException
+        try:
+            self._writer.close()
+        except BaseException:
+            pass
+        self._writer = None
+        # noinspection PyBroadException
+        try:
+            os.truncate(segment.path, offset)
+            self._writer = segment.path.open("ab")
+        except BaseException:
+            if segment.path.exists():
+                torn_bytes = segment.path.stat().st_size - segment.total_bytes
+                segment.total_bytes += torn_bytes
+                self._curr_bytes += torn_bytes
+            self._open_segment()
+
+    def _segment_path(self, segment_id: int) -> Path:
+        return self._base_dir / self.SEGMENT_NAME_FORMAT.format(segment_id)
+
+    @classmethod
+    def _record_size(cls, uid: str, content: bytes) -> int:
+        return _RECORD_HEADER.size + len(uid.encode()) + len(content)
+
+    @classmethod
+    def _read_record(cls, f: BinaryIO, offset: int) -> Optional[_Record]:
+        header = f.read(_RECORD_HEADER.size)
+        if len(header) < _RECORD_HEADER.size:
+            return None
+        kind, uid_len, content_len, seq, time_ns, crc = _RECORD_HEADER.unpack(header)
+        uid_bytes = f.read(uid_len)
+        content = f.read(content_len)
+        if len(uid_bytes) < uid_len or len(content) < content_len:
+            return None
+        prefix = _RECORD_PREFIX.pack(kind, uid_len, content_len, seq, time_ns)
+        if zlib.crc32(content, zlib.crc32(uid_bytes, zlib.crc32(prefix))) != crc:
+            return None
+        return _Record(
+            RecordKind(kind & ~_COMPRESSED_FLAG),
+            uid_bytes.decode(),
+            content,
+            seq,
+            time_ns,
+            offset,
+            _RECORD_HEADER.size + uid_len + content_len,
+            bool(kind & _COMPRESSED_FLAG),
+        )
+
+    @classmethod
+    def _iter_segment(cls, segment: _Segment, problems: Problems) -> Iterator[_Record]:
+        """Read the segment's header into its first_seq, then yield its records up to any torn tail."""
+        with segment.path.open("rb") as f:
+            header = f.read(_SEGMENT_HEADER.size)
+            if len(header) < _SEGMENT_HEADER.size:
+                # Created, but its header never fully written: nothing was appended to it.
+                problems.add_warning(CorruptRecord("Torn segment header; ignoring segment", path=segment.path))
+                return
+            magic, segment.first_seq = _SEGMENT_HEADER.unpack(header)
+            if magic != _SEGMENT_MAGIC:
+                raise CorruptRecord("Bad segment header", path=segment.path)
+            offset = _SEGMENT_HEADER.size
+            while offset < segment.total_bytes:
+                record = cls._read_record(f, offset)
+                if record is None:
+                    problems.add_warning(
+                        CorruptRecord(f"Torn or corrupt record at offset {offset}; ignoring tail", path=segment.path)
+                    )
+                    break
+                yield record
+                offset += record.size
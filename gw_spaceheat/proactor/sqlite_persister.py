@@ -0,0 +1,412 @@
+"""A PersisterInterface implementation storing all items in one WAL-mode SQLite database.
+
+Items are rows indexed by uid, persisted time and message type, which allows time range and message type queries
+without walking the file system. Writes are made in transactions which are committed per the persister's Durability:
+immediately for DurabilityMode none and fsync, or in groups for DurabilityMode group. batch() groups the writes made
+inside it into one transaction regardless of mode.
+"""
+
+import re
+import sqlite3
+import time
+from collections import deque
+from concurrent.futures import Future
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+from typing import NamedTuple
+from typing import Optional
+
+from result import Err
+from result import Ok
+from result import Result
+
+from proactor.persister import CommitFailed
+from proactor.persister import Compression
+from proactor.persister import ContentTooLarge
+from proactor.persister import Durability
+from proactor.persister import DurabilityMode
+from proactor.persister import FileMissingWarning
+from proactor.persister import PayloadCodec
+from proactor.persister import PendingBatch
+from proactor.persister import PendingCursor
+from proactor.persister import PersisterError
+from proactor.persister import PersisterInterface
+from proactor.persister import Problems
+from proactor.persister import ReadFailed
+from proactor.persister import ReindexError
+from proactor.persister import TrimCallback
+from proactor.persister import TrimEvent
+from proactor.persister import TrimFailed
+from proactor.persister import UIDExistedWarning
+from proactor.persister import WriteFailed
+from proactor.persister import _GroupCommit
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    uid TEXT NOT NULL UNIQUE,
+    persisted_ns INTEGER NOT NULL,
+    message_type TEXT,
+    size INTEGER NOT NULL,
+    content BLOB NOT NULL,
+    compressed INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS items_persisted_ns ON items (persisted_ns);
+CREATE INDEX IF NOT EXISTS items_message_type ON items (message_type, persisted_ns);
+"""
+
+# Delete the oldest rows whose cumulative size first reaches the number of bytes to be freed.
+_TRIM = """
+DELETE FROM items WHERE seq <= (
+    SELECT seq FROM (SELECT seq, SUM(size) OVER (ORDER BY seq) AS freed FROM items)
+    WHERE freed >= ? ORDER BY seq LIMIT 1
+)
+"""
+
+_MESSAGE_TYPE_RGX = re.compile(rb'"(?:MessageType|TypeAlias)"\s*:\s*"(?P<message_type>[^"]*)"')
+
+
+class _SqliteItem(NamedTuple):
+    seq: int
+    size: int
+
+
+class SqlitePersister(PersisterInterface):
+    DEFAULT_MAX_BYTES: int = 500 * 1024 * 1024
+    DATABASE_NAME: str = "persister.sqlite3"
+    # Uids per SELECT of a batch read, well within SQLite's limit on the number of bound parameters.
+    MAX_UIDS_PER_SELECT: int = 500
+
+    _base_dir: Path
+    _max_bytes: int = DEFAULT_MAX_BYTES
+    _connection: Optional[sqlite3.Connection]
+    _pending: dict[str, _SqliteItem]
+    _curr_bytes: int
+    _durability: Durability
+    _group_commit: _GroupCommit
+    _codec: PayloadCodec
+    _batch_depth: int
+
+    def __init__(
+        self,
+        base_dir: Path | str,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        durability: Durability = Durability(),
+        on_trim: Optional[TrimCallback] = None,
+        compression: Compression = Compression(),
+    ):
+        self.trims = deque(maxlen=self.MAX_TRIM_EVENTS)
+        self._on_trim = on_trim
+        self._base_dir = Path(base_dir).resolve()
+        self._base_dir.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = max_bytes
+        self._durability = durability
+        self._group_commit = _GroupCommit(durability)
+        self._codec = PayloadCodec(self._base_dir, compression)
+        self._batch_depth = 0
+        # Transactions are managed explicitly. The connection may be used from a writer thread (see AsyncPersister),
+        # but only from one thread at a time.
+        self._connection = sqlite3.connect(self.database_path, isolation_level=None, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            f"PRAGMA synchronous={'OFF' if durability.mode == DurabilityMode.none else 'FULL'}"
+        )
+        self._connection.executescript(_SCHEMA)
+        self._add_compressed_column()
+        self.reindex()
+
+    @property
+    def database_path(self) -> Path:
+        return self._base_dir / self.DATABASE_NAME
+
+    @property
+    def curr_bytes(self) -> int:
+        return self._curr_bytes
+
+    @property
+    def codec(self) -> PayloadCodec:
+        return self._codec
+
+    def persist(self, uid: str, content: bytes) -> Result[Future, Problems]:
+        problems = Problems()
+        try:
+            message_type = self._message_type(content)
+            content, compressed = self._codec.encode(content)
+            if len(content) > self._max_bytes:
+                return Err(
+                    problems.add_error(
+                        ContentTooLarge(
+                            f"content bytes ({len(content)} > max bytes {self._max_bytes}",
+                            uid=uid,
+                        )
+                    )
+                )
+            # The savepoint lets a failed persist be undone without discarding other writes of the open transaction.
+            self._begin()
+            self._connection.execute("SAVEPOINT persist")
+            match self._write(uid, content, compressed, message_type, problems):
+                case Ok(future):
+                    self._connection.execute("RELEASE persist")
+                case Err(problems):
+                    return Err(self._undo_write(problems))
+        except BaseException as e:
+            return Err(problems.add_error(e).add_error(PersisterError("Unexpected error", uid=uid)))
+        match self._commit_after_write():
+            case Err(commit_problems):
+                problems.add_problems(commit_problems)
+        if problems:
+            return Err(problems)
+        else:
+            return Ok(future)
+
+    def _write(
+        self, uid: str, content: bytes, compressed: bool, message_type: Optional[str], problems: Problems
+    ) -> Result[Future, Problems]:
+        """Replace any existing item uid, trim and insert, inside the persist savepoint."""
+        existing = self._pending.pop(uid, None)
+        if existing is not None:
+            problems.add_warning(UIDExistedWarning(uid=uid, path=self.database_path))
+            self._curr_bytes -= existing.size
+        try:
+            if existing is not None:
+                self._connection.execute("DELETE FROM items WHERE uid = ?", (uid,))
+            if len(content) + self._curr_bytes > self._max_bytes:
+                match self._trim_old_storage(len(content)):
+                    case Err(trim_problems):
+                        problems.add_problems(trim_problems)
+                        if problems.errors:
+                            return Err(problems.add_error(TrimFailed(uid=uid)))
+            cursor = self._connection.execute(
+                "INSERT INTO items (uid, persisted_ns, message_type, size, content, compressed)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (uid, time.time_ns(), message_type, len(content), content, compressed),
+            )
+        except BaseException as e:
+            return Err(problems.add_error(e).add_error(WriteFailed("Insert failed", uid=uid)))
+        self._pending[uid] = _SqliteItem(cursor.lastrowid, len(content))
+        self._curr_bytes += len(content)
+        return Ok(self._group_commit.add(len(content)))
+
+    def _undo_write(self, problems: Problems) -> Problems:
+        """Roll back the persist savepoint, and rebuild the index, which the failed write may have changed, from the
+        rolled back database."""
+        try:
+            self._connection.execute("ROLLBACK TO persist")
+            self._connection.execute("RELEASE persist")
+        except BaseException as e:
+            problems.add_error(e).add_error(PersisterError("Rollback failed", path=self.database_path))
+        match self.reindex():
+            case Err(reindex_problems):
+                problems.add_problems(reindex_problems)
+        return problems
+
+    def clear(self, uid: str) -> Result[bool, Problems]:
+        problems = Problems()
+        item = self._pending.get(uid, None)
+        if item is None:
+            problems.add_warning(FileMissingWarning(uid=uid))
+        else:
+            try:
+                self._begin()
+                self._connection.execute("DELETE FROM items WHERE seq = ?", (item.seq,))
+            except BaseException as e:
+                problems.add_error(e).add_error(WriteFailed("Delete failed", uid=uid))
+            match self._commit_after_write():
+                case Err(commit_problems):
+                    problems.add_problems(commit_problems)
+            # Forget the item only once its delete is committed, or queued for a deferred commit (group mode or
+            # batch()), so that a failed delete leaves it pending, as it still is in the database.
+            if not problems.errors:
+                self._pending.pop(uid)
+                self._curr_bytes -= item.size
+        if problems:
+            return Err(problems)
+        else:
+            return Ok()
+
+    def pending(self) -> set[str]:
+        return set(self._pending.keys())
+
+    @property
+    def num_pending(self) -> int:
+        return len(self._pending)
+
+    def retrieve(self, uid: str) -> Result[Optional[bytes], Problems]:
+        problems = Problems()
+        content: Optional[bytes] = None
+        if uid in self._pending:
+            try:
+                row = self._connection.execute(
+                    "SELECT content, compressed FROM items WHERE uid = ?", (uid,)
+                ).fetchone()
+                if row is not None:
+                    content = self._codec.decode(row[0], bool(row[1]))
+            except BaseException as e:
+                problems.add_error(e).add_error(ReadFailed("Select failed", uid=uid, path=self.database_path))
+        if problems:
+            return Err(problems)
+        else:
+            return Ok(content)
+
+    def retrieve_range(
+        self,
+        start_s: Optional[float] = None,
+        end_s: Optional[float] = None,
+        message_type: Optional[str] = None,
+    ) -> Result[list[tuple[str, bytes]], Problems]:
+        """Return (uid, content) of pending items persisted in [start_s, end_s), optionally of only one message type,
+        in persisted-time order."""
+        problems = Problems()
+        items = []
+        conditions = []
+        parameters = []
+        if start_s is not None:
+            conditions.append("persisted_ns >= ?")
+            parameters.append(int(start_s * 1_000_000_000))
+        if end_s is not None:
+            conditions.append("persisted_ns < ?")
+            parameters.append(int(end_s * 1_000_000_000))
+        if message_type is not None:
+            conditions.append("message_type = ?")
+            parameters.append(message_type)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        try:
+            for uid, content, compressed in self._connection.execute(
+                f"SELECT uid, content, compressed FROM items {where} ORDER BY persisted_ns, seq", parameters
+            ):
+                items.append((uid, self._codec.decode(content, bool(compressed))))
+        except BaseException as e:
+            problems.add_error(e).add_error(ReadFailed("Range select failed", path=self.database_path))
+        if problems:
+            return Err(problems)
+        else:
+            return Ok(items)
+
+    def reindex(self) -> Result[Optional[bool], Problems]:
+        problems = Problems()
+        self._pending = dict()
+        self._curr_bytes = 0
+        try:
+            for uid, seq, size in self._connection.execute("SELECT uid, seq, size FROM items ORDER BY seq"):
+                self._pending[uid] = _SqliteItem(seq, size)
+                self._curr_bytes += size
+        except BaseException as e:
+            problems.add_error(e).add_error(ReindexError(path=self.database_path))
+        if problems:
+            return Err(problems)
+        else:
+            return Ok()
+
+    @contextmanager
+    def batch(self) -> Iterator["SqlitePersister"]:
+        """Make the writes within this context one transaction, committed on exit (or later, for group mode)."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            self._commit_after_write()
+
+    def commit(self) -> Result[bool, Problems]:
+        problems = Problems()
+        if self._connection is not None and self._connection.in_transaction:
+            try:
+                self._connection.execute("COMMIT")
+                self._group_commit.complete()
+            except BaseException as e:
+                problems.add_error(e).add_error(CommitFailed(path=self.database_path))
+                self._group_commit.complete(CommitFailed(str(e), path=self.database_path))
+        if problems:
+            return Err(problems)
+        else:
+            return Ok()
+
+    def commit_if_due(self) -> Result[bool, Problems]:
+        if self._batch_depth == 0 and self._group_commit.due():
+            return self.commit()
+        return Ok()
+
+    @property
+    def num_unsynced(self) -> int:
+        return self._group_commit.num_unsynced
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self.commit()
+            self._connection.close()
+            self._connection = None
+
+    def _pending_in_order(self, since: Optional[PendingCursor]) -> list[tuple[PendingCursor, str, int]]:
+        items = []
+        for uid, item in self._pending.items():
+            cursor = PendingCursor(f"{item.seq:020d}", uid)
+            if since is None or cursor > since:
+                items.append((cursor, uid, item.size))
+        return items
+
+    def _read_batch(self, batch: list[tuple[PendingCursor, str]]) -> PendingBatch:
+        problems = Problems()
+        contents: dict[str, bytes] = dict()
+        uids = [uid for _, uid in batch if uid in self._pending]
+        for start in range(0, len(uids), self.MAX_UIDS_PER_SELECT):
+            chunk = uids[start:start + self.MAX_UIDS_PER_SELECT]
+            try:
+                for uid, content, compressed in self._connection.execute(
+                    f"SELECT uid, content, compressed FROM items WHERE uid IN ({','.join('?' * len(chunk))})", chunk
+                ):
+                    contents[uid] = self._codec.decode(content, bool(compressed))
+            except BaseException as e:
+                problems.add_error(e).add_error(ReadFailed("Batch select failed", path=self.database_path))
+        return PendingBatch([(uid, contents[uid]) for uid in uids if uid in contents], batch[-1][0], problems)
+
+    def _trim_old_storage(self, needed_bytes: int) -> Result[bool, Problems]:
+        """Delete the oldest items, in one statement, until needed_bytes fit."""
+        problems = Problems()
+        start_s = time.perf_counter()
+        start_bytes = self._curr_bytes
+        num_pending = len(self._pending)
+        try:
+            self._connection.execute(_TRIM, (self._curr_bytes - (self._max_bytes - needed_bytes),))
+            row = self._connection.execute("SELECT MIN(seq) FROM items").fetchone()
+            first_seq = row[0] if row[0] is not None else None
+            for uid, item in list(self._pending.items()):
+                if first_seq is not None and item.seq >= first_seq:
+                    break
+                self._pending.pop(uid)
+                self._curr_bytes -= item.size
+        except BaseException as e:
+            problems.add_error(e).add_error(PersisterError("Trim delete failed", path=self.database_path))
+        self._record_trim(
+            TrimEvent(
+                freed_bytes=start_bytes - self._curr_bytes,
+                num_cleared=num_pending - len(self._pending),
+                units_dropped=0,
+                duration_s=time.perf_counter() - start_s,
+            )
+        )
+        if problems:
+            return Err(problems)
+        else:
+            return Ok()
+
+    def _add_compressed_column(self) -> None:
+        """Add the compressed column to a database created before it existed. Its rows were stored raw."""
+        columns = [row[1] for row in self._connection.execute("PRAGMA table_info(items)")]
+        if "compressed" not in columns:
+            self._connection.execute("ALTER TABLE items ADD COLUMN compressed INTEGER NOT NULL DEFAULT 0")
+
+    def _begin(self) -> None:
+        if not self._connection.in_transaction:
+            self._connection.execute("BEGIN")
+
+    def _commit_after_write(self) -> Result[bool, Problems]:
+        if self._batch_depth == 0 and self._durability.mode != DurabilityMode.group:
+            return self.commit()
+        return self.commit_if_due()
+
+    @classmethod
+    def _message_type(cls, content: bytes) -> Optional[str]:
+        if match := _MESSAGE_TYPE_RGX.search(content):
+            return match.group("message_type").decode()
+        return None
@@ -0,0 +1,335 @@
+"""Store-and-forward publishing for one MQTT client, backed by a PersisterInterface run through an AsyncPersister."""
+
+import asyncio
+import json
+import time
+import uuid
+from collections import deque
+from typing import Mapping
+from typing import NamedTuple
+from typing import Optional
+
+from paho.mqtt.client import MQTTMessageInfo
+from result import Err
+from result import Ok
+
+import config
+from proactor.async_persister import AsyncPersister
+from proactor.logger import ProactorLogger
+from proactor.mqtt import MQTTClients
+from proactor.persister import Problems
+from proactor.proactor_interface import Runnable
+
+
+class ForwardStats:
+    """Counters for one StoreAndForward. Forwarded messages were sent from storage by the drain task; direct ones
+    were sent by publish() itself."""
+
+    num_direct: int = 0
+    num_persisted: int = 0
+    num_forwarded: int = 0
+    num_cleared: int = 0
+    num_dropped: int = 0
+    num_superseded: int = 0
+    num_resent: int = 0
+    num_lost: int = 0
+    num_persist_errors: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return dict(
+            num_direct=self.num_direct,
+            num_persisted=self.num_persisted,
+            num_forwarded=self.num_forwarded,
+            num_cleared=self.num_cleared,
+            num_dropped=self.num_dropped,
+            num_superseded=self.num_superseded,
+            num_resent=self.num_resent,
+            num_lost=self.num_lost,
+            num_persist_errors=self.num_persist_errors,
+        )
+
+
+class OutboundRecord(NamedTuple):
+    message_type: str
+    topic: str
+    qos: int
+    payload: bytes
+
+    def encode(self) -> bytes:
+        header = json.dumps(dict(MessageType=self.message_type, Topic=self.topic, Qos=self.qos)).encode()
+        return header + b"\n" + self.payload
+
+    @classmethod
+    def decode(cls, content: bytes) -> "OutboundRecord":
+        header, _, payload = content.partition(b"\n")
+        fields = json.loads(header)
+        return OutboundRecord(fields["MessageType"], fields["Topic"], fields["Qos"], payload)
+
+
+class _InFlight(NamedTuple):
+    info: MQTTMessageInfo
+    sent_s: float
+
+
+class StoreAndForward(Runnable):
+    """Publish through one MQTT client such that QoS >= 1 messages survive the link, or the process, going down.
+
+    While the client is connected and nothing is waiting to be forwarded, every publish goes straight to paho. While
+    it is disconnected, or older messages are still waiting, each QoS >= 1 publish whose ForwardPolicy is not 'never'
+    is stored instead, so that it comes after them; the run() task forwards stored messages in stored order at no
+    more than drain_messages_per_s, with at most max_in_flight unacknowledged, and clears each once its
+    MQTTMessageInfo reports it published. A 'keep_latest' message class keeps only its newest unsent message. QoS 0
+    messages and 'never' messages are published only while connected, else dropped. Delivery of forwarded messages
+    is at least once: one in flight when the link or process goes down may be sent again.
+
+    All storage I/O is made by the run() task through an AsyncPersister, so none of it blocks the event loop. A
+    stored message is held in memory until run() has persisted it (or for good, if its persist fails), and stop()
+    hands any not yet persisted to the persister before closing it. run() first loads the messages stored by an
+    earlier process; until then nothing is published directly, so that none overtakes them.
+    """
+
+    TICK_S = 0.1
+    IN_FLIGHT_TIMEOUT_S = 60.0
+    DEFAULT_DRAIN_MESSAGES_PER_S = 10.0
+    DEFAULT_MAX_IN_FLIGHT = 10
+
+    stats: ForwardStats
+    _client: str
+    _mqtt_clients: MQTTClients
+    _persister: AsyncPersister
+    _policies: Mapping[str, config.ForwardPolicy]
+    _default_policy: config.ForwardPolicy
+    _drain_messages_per_s: float
+    _max_in_flight: int
+    _logger: Optional[ProactorLogger]
+    _loaded: bool
+    _stored_while_loading: list[tuple[str, str]]
+    _contents: dict[str, bytes]
+    _to_persist: deque[str]
+    _to_clear: deque[str]
+    _message_types: dict[str, str]
+    _latest: dict[str, str]
+    _unsent: dict[str, None]
+    _in_flight: dict[str, _InFlight]
+
+    def __init__(
+        self,
+        client: str,
+        mqtt_clients: MQTTClients,
+        persister: AsyncPersister,
+        policies: Optional[Mapping[str, config.ForwardPolicy]] = None,
+        default_policy: config.ForwardPolicy = config.ForwardPolicy.keep_all,
+        drain_messages_per_s: float = DEFAULT_DRAIN_MESSAGES_PER_S,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        logger: Optional[ProactorLogger] = None,
+    ):
+        self.stats = ForwardStats()
+        self._client = client
+        self._mqtt_clients = mqtt_clients
+        self._persister = persister
+        self._policies = dict(policies) if policies else dict()
+        self._default_policy = default_policy
+        self._drain_messages_per_s = drain_messages_per_s
+        self._max_in_flight = max(1, max_in_flight)
+        self._logger = logger
+        self._loaded = False
+        self._stored_while_loading = []
+        # Encoded records not in storage: not yet persisted, or whose persist failed.
+        self._contents = dict()
+        self._to_persist = deque()
+        self._to_clear = deque()
+        self._message_types = dict()
+        self._latest = dict()
+        self._unsent = dict()
+        self._in_flight = dict()
+
+    @property
+    def persister(self) -> AsyncPersister:
+        return self._persister
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    @property
+    def num_unsent(self) -> int:
+        return len(self._unsent)
+
+    @property
+    def num_in_flight(self) -> int:
+        return len(self._in_flight)
+
+    @property
+    def num_unpersisted(self) -> int:
+        """Stored messages held only in memory."""
+        return len(self._contents)
+
+    def policy(self, message_type: str) -> config.ForwardPolicy:
+        return self._policies.get(message_type, self._default_policy)
+
+    def publish(self, topic: str, payload: bytes, qos: int, message_type: str) -> Optional[MQTTMessageInfo]:
+        """Publish, or store for forwarding. Returns the MQTTMessageInfo if the message was handed to paho now."""
+        connected = self._mqtt_clients.connected(self._client)
+        if qos == 0 or self.policy(message_type) == config.ForwardPolicy.never or (
+            connected and self._loaded and not self._unsent
+        ):
+            if connected:
+                self.stats.num_direct += 1
+                return self._mqtt_clients.publish(self._client, topic, payload, qos)
+            self.stats.num_dropped += 1
+            return None
+        uid = str(uuid.uuid4())
+        self._contents[uid] = OutboundRecord(message_type, topic, qos, payload).encode()
+        self._to_persist.append(uid)
+        if self._loaded:
+            self._add_entry(uid, message_type)
+        else:
+            self._stored_while_loading.append((uid, message_type))
+        return None
+
+    def start(self):
+        self._persister.start()
+
+    def stop(self):
+        """Hand the messages not yet persisted, and the clears not yet made, to the persister, and stop it."""
+        for uid in self._to_persist:
+            if (content := self._contents.get(uid)) is not None:
+                self._persister.persist_nowait(uid, content)
+        for uid in self._to_clear:
+            self._persister.clear_nowait(uid)
+        self._to_persist.clear()
+        self._to_clear.clear()
+        self._persister.stop()
+
+    async def join(self):
+        await self._persister.join()
+
+    async def run(self):
+        """Load the stored messages, then forward them while connected, persist those stored since, and clear them
+        as they are acknowledged."""
+        await self._load_pending()
+        tokens = 0.0
+        burst = max(1.0, self._drain_messages_per_s * self.TICK_S)
+        while True:
+            await asyncio.sleep(self.TICK_S)
+            await self._persist_stored()
+            connected = self._mqtt_clients.connected(self._client)
+            self._poll_in_flight(connected)
+            if connected:
+                tokens = min(tokens + self._drain_messages_per_s * self.TICK_S, burst)
+                while self._unsent and tokens >= 1 and len(self._in_flight) < self._max_in_flight:
+                    await self._forward(next(iter(self._unsent)))
+                    tokens -= 1
+            else:
+                tokens = 0.0
+            await self._clear_acknowledged()
+
+    async def _load_pending(self) -> None:
+        """Load the messages stored by an earlier process, ahead of those stored since this one started."""
+        async for batch in self._persister.iter_pending():
+            for uid, content in batch.items:
+                try:
+                    message_type = OutboundRecord.decode(content).message_type
+                except (ValueError, KeyError):
+                    self._clear(uid)
+                    self.stats.num_lost += 1
+                    continue
+                self._add_entry(uid, message_type)
+        for uid, message_type in self._stored_while_loading:
+            self._add_entry(uid, message_type)
+        self._stored_while_loading = []
+        self._loaded = True
+
+    async def _persist_stored(self) -> None:
+        while self._to_persist:
+            # Left at the head of the queue until persisted, so that stop() persists it if run() is cancelled.
+            uid = self._to_persist[0]
+            if (content := self._contents.get(uid)) is not None:
+                match await self._persister.persist(uid, content):
+                    case Err(problems) if problems.errors:
+                        # Kept in memory, and forwarded from there.
+                        self.stats.num_persist_errors += 1
+                        self._log_problems(f"persist of {uid}", problems)
+                    case _:
+                        self.stats.num_persisted += 1
+                        if self._contents.pop(uid, None) is None:
+                            # Superseded, or acknowledged, while being persisted.
+                            self._to_clear.append(uid)
+            self._to_persist.popleft()
+
+    async def _clear_acknowledged(self) -> None:
+        while self._to_clear:
+            match await self._persister.clear(self._to_clear[0]):
+                case Err(problems) if problems.errors:
+                    self._log_problems(f"clear of {self._to_clear[0]}", problems)
+            self._to_clear.popleft()
+
+    def _add_entry(self, uid: str, message_type: str) -> None:
+        if self.policy(message_type) == config.ForwardPolicy.keep_latest:
+            previous = self._latest.get(message_type)
+            if previous is not None and previous in self._unsent:
+                self._unsent.pop(previous)
+                self._message_types.pop(previous)
+                self._clear(previous)
+                self.stats.num_superseded += 1
+            self._latest[message_type] = uid
+        self._message_types[uid] = message_type
+        self._unsent[uid] = None
+
+    def _send(self, uid: str, topic: str, payload: bytes, qos: int) -> MQTTMessageInfo:
+        info = self._mqtt_clients.publish(self._client, topic, payload, qos)
+        self._in_flight[uid] = _InFlight(info, time.monotonic())
+        return info
+
+    async def _forward(self, uid: str) -> None:
+        self._unsent.pop(uid)
+        content = self._contents.get(uid)
+        if content is None:
+            match await self._persister.retrieve(uid):
+                case Ok(content):
+                    pass
+                case Err(problems):
+                    self._log_problems(f"retrieve of {uid}", problems)
+        if content is not None:
+            try:
+                record = OutboundRecord.decode(content)
+            except (ValueError, KeyError):
+                pass
+            else:
+                self.stats.num_forwarded += 1
+                self._send(uid, record.topic, record.payload, record.qos)
+                return
+        self._forget(uid)
+        self._clear(uid)
+        self.stats.num_lost += 1
+
+    def _poll_in_flight(self, connected: bool) -> None:
+        now = time.monotonic()
+        resend = []
+        for uid, in_flight in list(self._in_flight.items()):
+            if in_flight.info.is_published():
+                self._in_flight.pop(uid)
+                self._forget(uid)
+                self._clear(uid)
+                self.stats.num_cleared += 1
+            elif connected and now - in_flight.sent_s > self.IN_FLIGHT_TIMEOUT_S:
+                self._in_flight.pop(uid)
+                resend.append(uid)
+        if resend:
+            # Unacknowledged for too long: forward again, ahead of anything not yet sent.
+            self.stats.num_resent += len(resend)
+            self._unsent = {**dict.fromkeys(resend), **self._unsent}
+
+    def _forget(self, uid: str) -> None:
+        message_type = self._message_types.pop(uid, None)
+        if message_type is not None and self._latest.get(message_type) == uid:
+            self._latest.pop(message_type)
+
+    def _clear(self, uid: str) -> None:
+        """Drop uid's message, from memory if it was never persisted, else from storage by the run() task."""
+        if self._contents.pop(uid, None) is None:
+            self._to_clear.append(uid)
+
+    def _log_problems(self, what: str, problems: Problems) -> None:
+        if self._logger is not None:
+            self._logger.error(f"StoreAndForward[{self._client}] {what} failed: {problems}")
@@ -10,22 +10,101 @@ from typing import Optional
 from actors.utils import responsive_sleep
 
 
-class AsyncQueueWriter:
-    """Allow synchronous code to write to an asyncio Queue.
-
-    It is assumed the asynchronous reader has access to the asyncio Queue "await get()" from directly from it.
+class WakeupStats:
+    """Cross-thread puts, and the event loop wakeups they needed. Every put beyond the first of a burst rides on the
+    burst's single wakeup. Puts from the event loop thread itself need no wakeup and are counted apart."""
+
+    num_items: int = 0
+    num_wakeups: int = 0
+    max_burst: int = 0
+    num_local_items: int = 0
+
+    @property
+    def wakeups_saved(self) -> int:
+        return self.num_items - self.num_wakeups
+
+    def as_dict(self) -> dict[str, int]:
+        return dict(
+            num_items=self.num_items,
+            num_wakeups=self.num_wakeups,
+            wakeups_saved=self.wakeups_saved,
+            max_burst=self.max_burst,
+            num_local_items=self.num_local_items,
+        )
+
+
+class CoalescingWriter:
+    """Write items from any thread to an asyncio Queue, waking the event loop once per burst.
+
+    Items are appended to a thread-side buffer. Only the put which finds the buffer empty schedules a drain with
+    call_soon_threadsafe(); the drain moves everything buffered by then into the queue, in put order.
     """
 
+    stats: WakeupStats
     _loop: asyncio.AbstractEventLoop
     _async_queue: asyncio.Queue
+    _lock: threading.Lock
+    _pending: list[Any]
 
     def __init__(self, loop: asyncio.AbstractEventLoop, async_queue: asyncio.Queue):
+        self.stats = WakeupStats()
         self._loop = loop
         self._async_queue = async_queue
+        self._lock = threading.Lock()
+        self._pending = []
+
+    def put(self, item: Any) -> None:
+        with self._lock:
+            self._pending.append(item)
+            self.stats.num_items += 1
+            if len(self._pending) > 1:
+                return
+            self.stats.num_wakeups += 1
+            # Scheduled under the lock so that a failure (e.g. a closed loop) cannot leave the buffer waiting for a
+            # drain which will never run.
+            try:
+                self._loop.call_soon_threadsafe(self._drain)
+            except BaseException:
+                self._pending.clear()
+                raise
+
+    def put_local(self, item: Any) -> None:
+        """Write from the event loop thread itself, which needs no wakeup. Anything other threads have buffered is
+        moved to the queue first, so order is preserved."""
+        self._drain()
+        self.stats.num_local_items += 1
+        self._async_queue.put_nowait(item)
+
+    def _drain(self) -> None:
+        with self._lock:
+            items, self._pending = self._pending, []
+        self.stats.max_burst = max(self.stats.max_burst, len(items))
+        for item in items:
+            self._async_queue.put_nowait(item)
+
+
+class AsyncQueueWriter:
+    """Allow synchronous code to write to an asyncio Queue.
+
+    It is assumed the asynchronous reader has access to the asyncio Queue "await get()" from directly from it.
+    """
+
+    _writer: CoalescingWriter
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, async_queue: asyncio.Queue):
+        self._writer = CoalescingWriter(loop, async_queue)
+
+    @property
+    def wakeup_stats(self) -> WakeupStats:
+        return self._writer.stats
 
     def put(self, item: Any) -> None:
         """Write to asyncio queue in a threadsafe way."""
-        self._loop.call_soon_threadsafe(self._async_queue.put_nowait, item)
+        self._writer.put(item)
+
+    def put_local(self, item: Any) -> None:
+        """Write to asyncio queue from the event loop thread."""
+        self._writer.put_local(item)
 
 
 class SyncAsyncQueueWriter:
@@ -34,8 +113,7 @@ class SyncAsyncQueueWriter:
     It is assumed the asynchronous reader has access to the asyncio Queue "await get()" from directly from it.
     """
 
-    _loop: asyncio.AbstractEventLoop
-    _async_queue: asyncio.Queue
+    _writer: CoalescingWriter
     sync_queue: Optional[queue.Queue]
 
     def __init__(
@@ -44,10 +122,13 @@ class SyncAsyncQueueWriter:
         async_queue: asyncio.Queue,
         sync_queue: Optional[queue.Queue] = None,
     ):
-        self._loop = loop
-        self._async_queue = async_queue
+        self._writer = CoalescingWriter(loop, async_queue)
         self.sync_queue = sync_queue
 
+    @property
+    def wakeup_stats(self) -> WakeupStats:
+        return self._writer.stats
+
     def put_to_sync_queue(
         self, item: Any, block: bool = True, timeout: Optional[float] = None
     ):
@@ -56,7 +137,7 @@ class SyncAsyncQueueWriter:
 
     def put_to_async_queue(self, item: Any):
         """Write to asynchronous queue in a threadsafe way."""
-        self._loop.call_soon_threadsafe(self._async_queue.put_nowait, item)
+        self._writer.put(item)
 
     def get_from_sync_queue(
         self, block: bool = True, timeout: Optional[float] = None
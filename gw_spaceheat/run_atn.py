@@ -9,6 +9,7 @@ from actors.atn import Atn
 from command_line_utils import parse_args, setup_logging
 from config import ScadaSettings, Paths
 from logging_config import LoggingSettings
+from schema import validation
 
 
 def get_atn(argv: Optional[Sequence[str]] = None, start: bool = True) -> Atn:
@@ -28,6 +29,7 @@ def get_atn(argv: Optional[Sequence[str]] = None, start: bool = True) -> Atn:
     )
     settings.paths.mkdirs()
     setup_logging(args, settings)
+    validation.configure(settings.schema_validation)
     logger = logging.getLogger(settings.logging.base_log_name)
     logger.info(f"Env file: {env_path}")
     import rich
@@ -0,0 +1,369 @@
+"""A compact binary encoding for gridworks payloads, as an alternative to JSON.
+
+Payloads are CBOR (RFC 8949) restricted to the types JSON can carry, so that loads(dumps(x)) produces what
+json.loads(json.dumps(x)) would. Three things make them smaller than JSON:
+
+  - Map keys that are field names of the schema messages are sent as small integers. The table of names is
+    generated from schema.messages, and every payload carries a checksum of it so that peers built from different
+    schemas fail loudly instead of decoding the wrong keys.
+  - Lists of integers, such as ValueList and ReadTimeUnixMsList, are packed as RFC 8746 typed arrays.
+  - Repeated strings (node aliases, type aliases, enum symbols) are sent once and then referenced by index, as in
+    the CBOR stringref extension (tags 256 and 25).
+
+Every payload starts with the CBOR self-describe tag, which a JSON document can never start with, so receivers can
+tell the two encodings apart by content alone (see is_binary()).
+"""
+
+import enum
+import struct
+import typing
+import zlib
+from typing import Any
+from typing import Iterable
+
+from pydantic import BaseModel
+from pydantic.json import pydantic_encoder
+
+import schema.messages
+from proactor.message import Header
+from proactor.message import Message
+
+SELF_DESCRIBE = b"\xd9\xd9\xf7"
+STRINGREF_NAMESPACE_TAG = 256
+STRINGREF_TAG = 25
+# Lists of at least this many non-negative ints are sent as a packed array of the narrowest unsigned type that
+# holds them all. Shorter lists are cheaper as plain CBOR arrays.
+TYPED_ARRAY_MIN_LENGTH = 8
+
+_UINT = 0
+_NEGINT = 1
+_BYTES = 2
+_TEXT = 3
+_ARRAY = 4
+_MAP = 5
+_TAG = 6
+_SIMPLE = 7
+
+# RFC 8746 typed array tags for big-endian unsigned integers, narrowest first.
+_TYPED_ARRAYS = ((64, "B"), (65, "H"), (66, "I"), (67, "Q"))
+_TYPED_ARRAY_FORMATS = dict(_TYPED_ARRAYS)
+
+_FALSE = b"\xf4"
+_TRUE = b"\xf5"
+_NULL = b"\xf6"
+_FLOAT32 = struct.Struct(">Bf")
+_FLOAT64 = struct.Struct(">Bd")
+_UINT16 = struct.Struct(">H")
+_UINT32 = struct.Struct(">I")
+_UINT64 = struct.Struct(">Q")
+_FLOAT32_VALUE = struct.Struct(">f")
+_FLOAT64_VALUE = struct.Struct(">d")
+
+
+class BinaryCodecError(ValueError):
+    pass
+
+
+def schema_field_names() -> list[str]:
+    """Field names that may appear as map keys in gridworks messages: the fields of every schema message, the
+    '<Field>GtEnumSymbol' keys their asdict() uses for enum fields, and the fields of Message and Header."""
+    names = set(Message.__fields__) | set(Header.__fields__)
+    for type_name in schema.messages.__all__:
+        if type_name.endswith("_Maker"):
+            continue
+        message_type = getattr(schema.messages, type_name)
+        hints = typing.get_type_hints(message_type)
+        for field_name in message_type._fields:
+            names.add(field_name)
+            hint = hints.get(field_name)
+            if isinstance(hint, type) and issubclass(hint, enum.Enum):
+                names.add(f"{field_name}GtEnumSymbol")
+    return sorted(names)
+
+
+def table_id(field_names: Iterable[str]) -> int:
+    return zlib.crc32("\n".join(field_names).encode())
+
+
+FIELD_NAMES: tuple[str, ...] = tuple(schema_field_names())
+FIELD_TAGS: dict[str, int] = {name: tag for tag, name in enumerate(FIELD_NAMES)}
+TABLE_ID: int = table_id(FIELD_NAMES)
+
+
+def is_binary(payload: bytes) -> bool:
+    return payload[:len(SELF_DESCRIBE)] == SELF_DESCRIBE
+
+
+_SMALL_HEADS = [[bytes((major << 5 | value,)) for value in range(24)] for major in range(8)]
+
+
+def _head(major: int, value: int) -> bytes:
+    if value < 24:
+        return _SMALL_HEADS[major][value]
+    if value < 0x100:
+        return bytes((major << 5 | 24, value))
+    if value < 0x10000:
+        return bytes((major << 5 | 25,)) + _UINT16.pack(value)
+    if value < 0x100000000:
+        return bytes((major << 5 | 26,)) + _UINT32.pack(value)
+    if value < 0x10000000000000000:
+        return bytes((major << 5 | 27,)) + _UINT64.pack(value)
+    raise BinaryCodecError(f"Integer {value} does not fit in 64 bits")
+
+
+def _is_referenced(num_bytes: int, next_index: int) -> bool:
+    """Whether a string of num_bytes gets a stringref index: only if a reference to it would be shorter."""
+    if next_index < 24:
+        return num_bytes >= 3
+    if next_index < 0x100:
+        return num_bytes >= 4
+    if next_index < 0x10000:
+        return num_bytes >= 5
+    if next_index < 0x100000000:
+        return num_bytes >= 7
+    return num_bytes >= 11
+
+
+class _Encoder:
+    def __init__(self):
+        self.out = bytearray()
+        self.strings: dict[str, int] = dict()
+
+    def text(self, value: str):
+        index = self.strings.get(value)
+        if index is not None:
+            self.out += _head(_TAG, STRINGREF_TAG)
+            self.out += _head(_UINT, index)
+            return
+        encoded = value.encode("utf-8")
+        if _is_referenced(len(encoded), len(self.strings)):
+            self.strings[value] = len(self.strings)
+        self.out += _head(_TEXT, len(encoded))
+        self.out += encoded
+
+    def typed_array(self, value: list[int]) -> bool:
+        low = min(value)
+        high = max(value)
+        if low < 0:
+            return False
+        for tag, item_format in _TYPED_ARRAYS:
+            if high < 1 << (8 * struct.calcsize(item_format)):
+                packed = struct.pack(f">{len(value)}{item_format}", *value)
+                self.out += _head(_TAG, tag)
+                self.out += _head(_BYTES, len(packed))
+                self.out += packed
+                return True
+        return False
+
+    def encode(self, value: Any):
+        out = self.out
+        # bool before int, since bool is an int.
+        if value is None:
+            out += _NULL
+        elif value is True:
+            out += _TRUE
+        elif value is False:
+            out += _FALSE
+        elif isinstance(value, str):
+            self.text(value)
+        elif isinstance(value, int):
+            if value >= 0:
+                out += _head(_UINT, value)
+            else:
+                out += _head(_NEGINT, -1 - value)
+        elif isinstance(value, float):
+            packed = _FLOAT32_VALUE.pack(value) if abs(value) < 3.4e38 else b""
+            if packed and _FLOAT32_VALUE.unpack(packed)[0] == value:
+                out += _FLOAT32.pack(0xFA, value)
+            else:
+                out += _FLOAT64.pack(0xFB, value)
+        elif isinstance(value, dict):
+            out += _head(_MAP, len(value))
+            for key, item in value.items():
+                if not isinstance(key, str):
+                    key = _json_key(key)
+                tag = FIELD_TAGS.get(key)
+                if tag is None:
+                    self.text(key)
+                else:
+                    out += _head(_UINT, tag)
+                self.encode(item)
+        elif isinstance(value, (list, tuple)):
+            if len(value) >= TYPED_ARRAY_MIN_LENGTH and set(map(type, value)) == {int}:
+                if self.typed_array(value):
+                    return
+            out += _head(_ARRAY, len(value))
+            for item in value:
+                self.encode(item)
+        elif isinstance(value, BaseModel):
+            # As value.dict() would produce, without first copying the whole tree.
+            self.encode({name: getattr(value, name) for name in value.__fields__})
+        else:
+            self.encode(pydantic_encoder(value))
+
+
+def _json_key(key: Any) -> str:
+    """Non-string map keys become strings, as json.dumps makes them."""
+    if key is True:
+        return "true"
+    if key is False:
+        return "false"
+    if key is None:
+        return "null"
+    if isinstance(key, (int, float)):
+        return repr(key)
+    raise BinaryCodecError(f"Map keys must be str, int, float, bool or None, not {type(key)}")
+
+
+def dumps(value: Any) -> bytes:
+    encoder = _Encoder()
+    encoder.out += SELF_DESCRIBE
+    encoder.out += _head(_ARRAY, 2)
+    encoder.out += _head(_UINT, TABLE_ID)
+    encoder.out += _head(_TAG, STRINGREF_NAMESPACE_TAG)
+    encoder.encode(value)
+    return bytes(encoder.out)
+
+
+class _Decoder:
+    def __init__(self, payload: bytes):
+        self.payload = payload
+        self.pos = 0
+        self.strings: list[str] = []
+
+    def head(self) -> tuple[int, int]:
+        try:
+            initial = self.payload[self.pos]
+        except IndexError:
+            raise BinaryCodecError("Truncated payload")
+        self.pos += 1
+        major = initial >> 5
+        info = initial & 0x1F
+        if info < 24:
+            return major, info
+        if major == _SIMPLE:
+            return major, info
+        if info == 24:
+            value = self.payload[self.pos]
+            self.pos += 1
+        elif info == 25:
+            value = _UINT16.unpack_from(self.payload, self.pos)[0]
+            self.pos += 2
+        elif info == 26:
+            value = _UINT32.unpack_from(self.payload, self.pos)[0]
+            self.pos += 4
+        elif info == 27:
+            value = _UINT64.unpack_from(self.payload, self.pos)[0]
+            self.pos += 8
+        else:
+            raise BinaryCodecError(f"Unsupported additional information {info} for major type {major}")
+        return major, value
+
+    def uint(self) -> int:
+        major, value = self.head()
+        if major != _UINT:
+            raise BinaryCodecError(f"Expected an unsigned integer at {self.pos - 1}, found major type {major}")
+        return value
+
+    def text(self, length: int) -> str:
+        end = self.pos + length
+        if end > len(self.payload):
+            raise BinaryCodecError("Truncated payload")
+        value = self.payload[self.pos:end].decode("utf-8")
+        self.pos = end
+        if _is_referenced(length, len(self.strings)):
+            self.strings.append(value)
+        return value
+
+    def key(self) -> str:
+        major, value = self.head()
+        if major == _UINT:
+            try:
+                return FIELD_NAMES[value]
+            except IndexError:
+                raise BinaryCodecError(f"Unknown field tag {value}")
+        if major == _TEXT:
+            return self.text(value)
+        if major == _TAG and value == STRINGREF_TAG:
+            return self.stringref()
+        raise BinaryCodecError(f"Unsupported map key of major type {major}")
+
+    def typed_array(self, item_format: str) -> list[int]:
+        major, length = self.head()
+        item_size = struct.calcsize(item_format)
+        if major != _BYTES or length % item_size:
+            raise BinaryCodecError(f"Typed array of {item_format} must be a byte string of whole items")
+        end = self.pos + length
+        if end > len(self.payload):
+            raise BinaryCodecError("Truncated payload")
+        values = list(struct.unpack_from(f">{length // item_size}{item_format}", self.payload, self.pos))
+        self.pos = end
+        return values
+
+    def stringref(self) -> str:
+        index = self.uint()
+        try:
+            return self.strings[index]
+        except IndexError:
+            raise BinaryCodecError(f"Unknown string reference {index}")
+
+    def decode(self) -> Any:
+        major, value = self.head()
+        if major == _UINT:
+            return value
+        if major == _NEGINT:
+            return -1 - value
+        if major == _TEXT:
+            return self.text(value)
+        if major == _ARRAY:
+            return [self.decode() for _ in range(value)]
+        if major == _MAP:
+            d = dict()
+            for _ in range(value):
+                key = self.key()
+                d[key] = self.decode()
+            return d
+        if major == _TAG and value == STRINGREF_TAG:
+            return self.stringref()
+        if major == _TAG and value in _TYPED_ARRAY_FORMATS:
+            return self.typed_array(_TYPED_ARRAY_FORMATS[value])
+        if major == _SIMPLE:
+            if value == 20:
+                return False
+            if value == 21:
+                return True
+            if value == 22:
+                return None
+            if value == 26:
+                decoded = _FLOAT32_VALUE.unpack_from(self.payload, self.pos)[0]
+                self.pos += 4
+                return decoded
+            if value == 27:
+                decoded = _FLOAT64_VALUE.unpack_from(self.payload, self.pos)[0]
+                self.pos += 8
+                return decoded
+        raise BinaryCodecError(f"Unsupported item of major type {major} ({value}) at {self.pos - 1}")
+
+
+def loads(payload: bytes) -> Any:
+    if not is_binary(payload):
+        raise BinaryCodecError("Payload does not start with the CBOR self-describe tag")
+    decoder = _Decoder(payload)
+    decoder.pos = len(SELF_DESCRIBE)
+    try:
+        major, length = decoder.head()
+        if major != _ARRAY or length != 2:
+            raise BinaryCodecError("Payload must be an array of [table id, value]")
+        payload_table_id = decoder.uint()
+        if payload_table_id != TABLE_ID:
+            raise BinaryCodecError(
+                f"Payload field table {payload_table_id} does not match this schema's field table {TABLE_ID}"
+            )
+        if decoder.head() != (_TAG, STRINGREF_NAMESPACE_TAG):
+            raise BinaryCodecError("Payload value must be in a stringref namespace")
+        value = decoder.decode()
+    except (IndexError, struct.error, UnicodeDecodeError) as e:
+        raise BinaryCodecError(f"Malformed payload: {e}") from e
+    if decoder.pos != len(payload):
+        raise BinaryCodecError(f"{len(payload) - decoder.pos} trailing bytes after payload")
+    return value
@@ -0,0 +1,199 @@
+"""Compare the JSON and binary encodings of gridworks status and snapshot messages.
+
+Run, for example:
+
+    python -m schema.codec_benchmark --samples 60 --simple 8 --multipurpose 6 --iterations 200
+
+Messages are built the way Scada2 publishes them: a gt.sh.status.110 with --simple simple telemetry channels and
+--multipurpose multipurpose telemetry channels of --samples readings each (60 being 300 s of 5 s reads) plus
+--actuators boolean actuator command lists, and a snapshot.spaceheat.100 of the same channels, each wrapped in a
+gridworks Message. The report, written as JSON to stdout or --output, gives per message and encoding the payload
+bytes, the zlib-compressed bytes for reference, and encode and decode time percentiles. Decode time is the time to
+turn the payload back into a dict, which is the part that differs between the encodings.
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+import uuid
+import zlib
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+
+from config import PayloadEncoding
+from proactor.message import Message
+from proactor.persister_benchmark import percentiles
+from schema import binary_codec
+from schema.enums import TelemetryName
+from schema.messages import GtShBooleanactuatorCmdStatus_Maker
+from schema.messages import GtShMultipurposeTelemetryStatus_Maker
+from schema.messages import GtShSimpleTelemetryStatus_Maker
+from schema.messages import GtShStatus_Maker
+from schema.messages import SnapshotSpaceheat_Maker
+from schema.messages import TelemetrySnapshotSpaceheat_Maker
+
+SCADA_ALIAS = "dw1.isone.ct.newhaven.orange1.ta.scada"
+TERMINAL_ASSET_ALIAS = "dw1.isone.ct.newhaven.orange1.ta"
+SCADA_ID = "0384ef21-648b-4455-b917-58a1172d7fc1"
+START_MS = 1_656_945_300_000
+
+
+class CodecBenchmarkConfig(NamedTuple):
+    samples: int = 60
+    simple: int = 8
+    multipurpose: int = 6
+    actuators: int = 3
+    iterations: int = 200
+    seed: int = 0
+
+
+def make_status(cfg: CodecBenchmarkConfig) -> dict:
+    rng = random.Random(cfg.seed)
+    read_times = [START_MS + 5_000 * i + rng.randrange(100) for i in range(cfg.samples)]
+    simple = [
+        GtShSimpleTelemetryStatus_Maker(
+            value_list=[rng.randrange(60_000, 160_000) for _ in range(cfg.samples)],
+            read_time_unix_ms_list=read_times,
+            telemetry_name=TelemetryName.WATER_TEMP_F_TIMES1000,
+            sh_node_alias=f"a.tank.temp{i}",
+        ).tuple
+        for i in range(cfg.simple)
+    ]
+    multipurpose = [
+        GtShMultipurposeTelemetryStatus_Maker(
+            about_node_alias=f"a.elt{i}",
+            telemetry_name=TelemetryName.CURRENT_RMS_MICRO_AMPS,
+            value_list=[rng.randrange(0, 20_000_000) for _ in range(cfg.samples)],
+            read_time_unix_ms_list=read_times,
+            sensor_node_alias="a.m",
+        ).tuple
+        for i in range(cfg.multipurpose)
+    ]
+    actuators = [
+        GtShBooleanactuatorCmdStatus_Maker(
+            sh_node_alias=f"a.elt{i}.relay",
+            relay_state_command_list=[1, 0],
+            command_time_unix_ms_list=[START_MS + 60_000, START_MS + 240_000],
+        ).tuple
+        for i in range(cfg.actuators)
+    ]
+    return GtShStatus_Maker(
+        from_g_node_alias=SCADA_ALIAS,
+        from_g_node_id=SCADA_ID,
+        status_uid=str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+        about_g_node_alias=TERMINAL_ASSET_ALIAS,
+        slot_start_unix_s=START_MS // 1000,
+        reporting_period_s=300,
+        booleanactuator_cmd_list=actuators,
+        multipurpose_telemetry_list=multipurpose,
+        simple_telemetry_list=simple,
+    ).tuple.asdict()
+
+
+def make_snapshot(status: dict) -> dict:
+    channels = status["SimpleTelemetryList"] + status["MultipurposeTelemetryList"]
+    return SnapshotSpaceheat_Maker(
+        from_g_node_alias=SCADA_ALIAS,
+        from_g_node_instance_id=SCADA_ID,
+        snapshot=TelemetrySnapshotSpaceheat_Maker(
+            about_node_alias_list=[channel.get("ShNodeAlias", channel.get("AboutNodeAlias")) for channel in channels],
+            value_list=[channel["ValueList"][-1] for channel in channels],
+            telemetry_name_list=[
+                TelemetryName.WATER_TEMP_F_TIMES1000 if "ShNodeAlias" in channel
+                else TelemetryName.CURRENT_RMS_MICRO_AMPS
+                for channel in channels
+            ],
+            report_time_unix_ms=channels[0]["ReadTimeUnixMsList"][-1] if channels else START_MS,
+        ).tuple,
+    ).tuple.asdict()
+
+
+ENCODERS: dict[PayloadEncoding, Callable[[Message], bytes]] = {
+    PayloadEncoding.json: lambda message: message.json().encode(),
+    PayloadEncoding.cbor: binary_codec.dumps,
+}
+
+DECODERS: dict[PayloadEncoding, Callable[[bytes], Any]] = {
+    PayloadEncoding.json: json.loads,
+    PayloadEncoding.cbor: binary_codec.loads,
+}
+
+
+def _timed(func: Callable, arg: Any, iterations: int) -> list[float]:
+    times_s = []
+    for _ in range(iterations):
+        start_s = time.perf_counter()
+        func(arg)
+        times_s.append(time.perf_counter() - start_s)
+    return times_s
+
+
+def benchmark(message: Message, encoding: PayloadEncoding, iterations: int) -> dict[str, Any]:
+    encoded = ENCODERS[encoding](message)
+    decoded = DECODERS[encoding](encoded)
+    return dict(
+        encoding=encoding.value,
+        bytes=len(encoded),
+        zlib_bytes=len(zlib.compress(encoded)),
+        round_trip_ok=decoded == json.loads(message.json()),
+        encode_s=percentiles(_timed(ENCODERS[encoding], message, iterations)),
+        decode_s=percentiles(_timed(DECODERS[encoding], encoded, iterations)),
+    )
+
+
+def run(cfg: CodecBenchmarkConfig = CodecBenchmarkConfig()) -> dict[str, Any]:
+    status = make_status(cfg)
+    messages = {
+        "gt.sh.status.110": Message(src=SCADA_ALIAS, payload=status),
+        "snapshot.spaceheat.100": Message(src=SCADA_ALIAS, payload=make_snapshot(status)),
+    }
+    report: dict[str, Any] = dict(config=cfg._asdict(), benchmarks=[])
+    for message_type, message in messages.items():
+        results = [benchmark(message, encoding, cfg.iterations) for encoding in PayloadEncoding]
+        json_bytes = results[0]["bytes"]
+        for result in results:
+            result["bytes_vs_json"] = result["bytes"] / json_bytes
+        report["benchmarks"].append(dict(message_type=message_type, results=results))
+    return report
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare the JSON and binary encodings of gridworks messages.")
+    parser.add_argument("-s", "--samples", type=int, default=CodecBenchmarkConfig().samples)
+    parser.add_argument("--simple", type=int, default=CodecBenchmarkConfig().simple)
+    parser.add_argument("--multipurpose", type=int, default=CodecBenchmarkConfig().multipurpose)
+    parser.add_argument("--actuators", type=int, default=CodecBenchmarkConfig().actuators)
+    parser.add_argument("-n", "--iterations", type=int, default=CodecBenchmarkConfig().iterations)
+    parser.add_argument("--seed", type=int, default=CodecBenchmarkConfig().seed)
+    parser.add_argument("-o", "--output", default="", help="JSON report path. Defaults to stdout.")
+    return parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> dict[str, Any]:
+    args = parse_args(argv)
+    report = run(
+        CodecBenchmarkConfig(
+            samples=args.samples,
+            simple=args.simple,
+            multipurpose=args.multipurpose,
+            actuators=args.actuators,
+            iterations=args.iterations,
+            seed=args.seed,
+        )
+    )
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text)
+    else:
+        print(text)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 """Makes GridWorksSerial protocol GsDispatch with MpAlias d"""
 import struct
 from schema.gs.gs_dispatch import GsDispatch
+from schema import validation
 
 
 class GsDispatch_Maker:
@@ -8,7 +9,8 @@ class GsDispatch_Maker:
 
     def __init__(self, relay_state):
         tuple = GsDispatch(RelayState=relay_state)
-        tuple.check_for_errors()
+        if validation.should_check(self.type_alias):
+            tuple.check_for_errors()
         self.tuple = tuple
 
     @classmethod
@@ -20,5 +22,5 @@ class GsDispatch_Maker:
     def type_to_tuple(cls, b: bytes) -> GsDispatch:
         (relay_state,) = struct.unpack("<h", b)
         tuple = GsDispatch(RelayState=relay_state)
-        tuple.check_for_errors
+        tuple.check_for_errors()
         return tuple
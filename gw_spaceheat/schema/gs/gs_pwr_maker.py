@@ -1,6 +1,7 @@
 """Makes GridWorksSerial protocol gs.pwr.100 with MpAlias p"""
 import struct
 from schema.gs.gs_pwr import GsPwr
+from schema import validation
 
 
 class GsPwr_Maker:
@@ -8,7 +9,8 @@ class GsPwr_Maker:
 
     def __init__(self, power):
         tuple = GsPwr(Power=power)
-        tuple.check_for_errors()
+        if validation.should_check(self.type_alias):
+            tuple.check_for_errors()
         self.tuple = tuple
 
     @classmethod
@@ -20,5 +22,5 @@ class GsPwr_Maker:
     def type_to_tuple(cls, b: bytes) -> GsPwr:
         (power,) = struct.unpack("<h", b)
         tuple = GsPwr(Power=power)
-        tuple.check_for_errors
+        tuple.check_for_errors()
         return tuple
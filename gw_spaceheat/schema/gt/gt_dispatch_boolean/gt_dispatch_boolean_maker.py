@@ -3,6 +3,7 @@ import json
 
 from schema.gt.gt_dispatch_boolean.gt_dispatch_boolean import GtDispatchBoolean
 from schema.errors import MpSchemaError
+from schema import validation
 
 
 class GtDispatchBoolean_Maker:
@@ -25,7 +26,8 @@ class GtDispatchBoolean_Maker:
             SendTimeUnixMs=send_time_unix_ms,
             #
         )
-        gw_tuple.check_for_errors()
+        if validation.should_check(self.type_alias):
+            gw_tuple.check_for_errors()
         self.tuple = gw_tuple
 
     @classmethod
@@ -3,6 +3,7 @@ import json
 
 from schema.gt.gt_dispatch_boolean_local.gt_dispatch_boolean_local import GtDispatchBooleanLocal
 from schema.errors import MpSchemaError
+from schema import validation
 
 
 class GtDispatchBooleanLocal_Maker:
@@ -21,7 +22,8 @@ class GtDispatchBooleanLocal_Maker:
             RelayState=relay_state,
             #
         )
-        gw_tuple.check_for_errors()
+        if validation.should_check(self.type_alias):
+            gw_tuple.check_for_errors()
         self.tuple = gw_tuple
 
     @classmethod
@@ -3,6 +3,7 @@ import json
 
 from schema.gt.gt_driver_booleanactuator_cmd.gt_driver_booleanactuator_cmd import GtDriverBooleanactuatorCmd
 from schema.errors import MpSchemaError
+from schema import validation
 
 
 class GtDriverBooleanactuatorCmd_Maker:
@@ -19,7 +20,8 @@ class GtDriverBooleanactuatorCmd_Maker:
             CommandTimeUnixMs=command_time_unix_ms,
             #
         )
-        gw_tuple.check_for_errors()
+        if validation.should_check(self.type_alias):
+            gw_tuple.check_for_errors()
         self.tuple = gw_tuple
 
     @classmethod
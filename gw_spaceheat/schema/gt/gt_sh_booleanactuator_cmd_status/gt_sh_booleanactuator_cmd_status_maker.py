@@ -4,6 +4,7 @@ from typing import List
 
 from schema.gt.gt_sh_booleanactuator_cmd_status.gt_sh_booleanactuator_cmd_status import GtShBooleanactuatorCmdStatus
 from schema.errors import MpSchemaError
+from schema import validation
 
 
 class GtShBooleanactuatorCmdStatus_Maker:
@@ -20,7 +21,8 @@ class GtShBooleanactuatorCmdStatus_Maker:
             CommandTimeUnixMsList=command_time_unix_ms_list,
             #
         )
-        gw_tuple.check_for_errors()
+        if validation.should_check(self.type_alias):
+            gw_tuple.check_for_errors()
         self.tuple = gw_tuple
 
     @classmethod
@@ -3,6 +3,7 @@ import json
 
 from schema.gt.gt_sh_cli_atn_cmd.gt_sh_cli_atn_cmd import GtShCliAtnCmd
 from schema.errors import MpSchemaError
+from schema import validation
 
 
 class GtShCliAtnCmd_Maker:
@@ -19,7 +20,8 @@ class GtShCliAtnCmd_Maker:
             FromGNodeId=from_g_node_id,
             #
         )
-        gw_tuple.check_for_errors()
+        if validation.should_check(self.type_alias):
+            gw_tuple.check_for_errors()
         self.tuple = gw_tuple
 
     @classmethod
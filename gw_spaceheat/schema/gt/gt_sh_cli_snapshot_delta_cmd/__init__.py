@@ -0,0 +1,6 @@
+from .gt_sh_cli_snapshot_delta_cmd_maker import *
+            
+__all__ = [
+    "GtShCliSnapshotDeltaCmd",
+    "GtShCliSnapshotDeltaCmd_Maker",
+]
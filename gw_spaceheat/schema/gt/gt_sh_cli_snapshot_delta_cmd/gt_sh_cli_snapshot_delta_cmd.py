@@ -0,0 +1,16 @@
+"""gt.sh.cli.snapshot.delta.cmd.100 type"""
+
+from schema.errors import MpSchemaError
+from schema.gt.gt_sh_cli_snapshot_delta_cmd.gt_sh_cli_snapshot_delta_cmd_base import (
+    GtShCliSnapshotDeltaCmdBase,
+)
+
+
+class GtShCliSnapshotDeltaCmd(GtShCliSnapshotDeltaCmdBase):
+    def check_for_errors(self):
+        errors = self.derived_errors() + self.hand_coded_errors()
+        if len(errors) > 0:
+            raise MpSchemaError(f" Errors making making gt.sh.cli.snapshot.delta.cmd.100 for {self}: {errors}")
+
+    def hand_coded_errors(self):
+        return []
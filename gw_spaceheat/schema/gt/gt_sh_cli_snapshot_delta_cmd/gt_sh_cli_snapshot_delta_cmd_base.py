@@ -0,0 +1,53 @@
+"""Base for gt.sh.cli.snapshot.delta.cmd.100"""
+import json
+from typing import List, NamedTuple
+import schema.property_format as property_format
+
+
+class GtShCliSnapshotDeltaCmdBase(NamedTuple):
+    FromGNodeAlias: str  #
+    FromGNodeId: str  #
+    AckedSeq: int  #
+    TypeAlias: str = "gt.sh.cli.snapshot.delta.cmd.100"
+
+    def as_type(self):
+        return json.dumps(self.asdict())
+
+    def asdict(self):
+        d = self._asdict()
+        return d
+
+    def derived_errors(self) -> List[str]:
+        errors = []
+        if not isinstance(self.FromGNodeAlias, str):
+            errors.append(
+                f"FromGNodeAlias {self.FromGNodeAlias} must have type str."
+            )
+        if not property_format.is_lrd_alias_format(self.FromGNodeAlias):
+            errors.append(
+                f"FromGNodeAlias {self.FromGNodeAlias}"
+                " must have format LrdAliasFormat"
+            )
+        if not isinstance(self.FromGNodeId, str):
+            errors.append(
+                f"FromGNodeId {self.FromGNodeId} must have type str."
+            )
+        if not property_format.is_uuid_canonical_textual(self.FromGNodeId):
+            errors.append(
+                f"FromGNodeId {self.FromGNodeId}"
+                " must have format UuidCanonicalTextual"
+            )
+        if not isinstance(self.AckedSeq, int):
+            errors.append(
+                f"AckedSeq {self.AckedSeq} must have type int."
+            )
+        elif self.AckedSeq < 0:
+            errors.append(
+                f"AckedSeq {self.AckedSeq} must not be negative."
+            )
+        if self.TypeAlias != "gt.sh.cli.snapshot.delta.cmd.100":
+            errors.append(
+                f"Type requires TypeAlias of gt.sh.cli.snapshot.delta.cmd.100, not {self.TypeAlias}."
+            )
+
+        return errors
@@ -0,0 +1,64 @@
+"""Makes gt.sh.cli.snapshot.delta.cmd.100 type"""
+import json
+
+from schema.gt.gt_sh_cli_snapshot_delta_cmd.gt_sh_cli_snapshot_delta_cmd import GtShCliSnapshotDeltaCmd
+from schema.errors import MpSchemaError
+from schema import validation
+
+
+class GtShCliSnapshotDeltaCmd_Maker:
+    type_alias = "gt.sh.cli.snapshot.delta.cmd.100"
+
+    def __init__(self,
+                 from_g_node_alias: str,
+                 from_g_node_id: str,
+                 acked_seq: int):
+
+        gw_tuple = GtShCliSnapshotDeltaCmd(
+            FromGNodeAlias=from_g_node_alias,
+            FromGNodeId=from_g_node_id,
+            AckedSeq=acked_seq,
+            #
+        )
+        if validation.should_check(self.type_alias):
+            gw_tuple.check_for_errors()
+        self.tuple = gw_tuple
+
+    @classmethod
+    def tuple_to_type(cls, tuple: GtShCliSnapshotDeltaCmd) -> str:
+        tuple.check_for_errors()
+        return tuple.as_type()
+
+    @classmethod
+    def type_to_tuple(cls, t: str) -> GtShCliSnapshotDeltaCmd:
+        try:
+            d = json.loads(t)
+        except TypeError:
+            raise MpSchemaError("Type must be string or bytes!")
+        if not isinstance(d, dict):
+            raise MpSchemaError(f"Deserializing {t} must result in dict!")
+        return cls.dict_to_tuple(d)
+
+    @classmethod
+    def dict_to_tuple(cls, d: dict) -> GtShCliSnapshotDeltaCmd:
+        new_d = {}
+        for key in d.keys():
+            new_d[key] = d[key]
+        if "TypeAlias" not in new_d.keys():
+            raise MpSchemaError(f"dict {new_d} missing TypeAlias")
+        if "FromGNodeAlias" not in new_d.keys():
+            raise MpSchemaError(f"dict {new_d} missing FromGNodeAlias")
+        if "FromGNodeId" not in new_d.keys():
+            raise MpSchemaError(f"dict {new_d} missing FromGNodeId")
+        if "AckedSeq" not in new_d.keys():
+            raise MpSchemaError(f"dict {new_d} missing AckedSeq")
+
+        gw_tuple = GtShCliSnapshotDeltaCmd(
+            TypeAlias=new_d["TypeAlias"],
+            FromGNodeAlias=new_d["FromGNodeAlias"],
+            FromGNodeId=new_d["FromGNodeId"],
+            AckedSeq=new_d["AckedSeq"],
+            #
+        )
+        gw_tuple.check_for_errors()
+        return gw_tuple
@@ -0,0 +1,6 @@
+from .gt_sh_cli_status_backfill_cmd_maker import *
+            
+__all__ = [
+    "GtShCliStatusBackfillCmd",
+    "GtShCliStatusBackfillCmd_Maker",
+]
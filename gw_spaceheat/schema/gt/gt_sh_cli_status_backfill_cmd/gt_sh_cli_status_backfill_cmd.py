@@ -0,0 +1,19 @@
+"""gt.sh.cli.status.backfill.cmd.100 type"""
+
+from schema.errors import MpSchemaError
+from schema.gt.gt_sh_cli_status_backfill_cmd.gt_sh_cli_status_backfill_cmd_base import (
+    GtShCliStatusBackfillCmdBase,
+)
+
+
+class GtShCliStatusBackfillCmd(GtShCliStatusBackfillCmdBase):
+    def check_for_errors(self):
+        errors = self.derived_errors() + self.hand_coded_errors()
+        if len(errors) > 0:
+            raise MpSchemaError(f" Errors making making gt.sh.cli.status.backfill.cmd.100 for {self}: {errors}")
+
+    def hand_coded_errors(self):
+        errors = []
+        if isinstance(self.StartUnixS, int) and isinstance(self.EndUnixS, int) and self.EndUnixS < self.StartUnixS:
+            errors.append(f"EndUnixS {self.EndUnixS} must not be before StartUnixS {self.StartUnixS}.")
+        return errors
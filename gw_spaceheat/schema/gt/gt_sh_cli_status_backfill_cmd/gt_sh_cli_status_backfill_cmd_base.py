@@ -0,0 +1,62 @@
+"""Base for gt.sh.cli.status.backfill.cmd.100"""
+import json
+from typing import List, NamedTuple
+import schema.property_format as property_format
+
+
+class GtShCliStatusBackfillCmdBase(NamedTuple):
+    FromGNodeAlias: str  #
+    FromGNodeId: str  #
+    StartUnixS: int  #
+    EndUnixS: int  #
+    TypeAlias: str = "gt.sh.cli.status.backfill.cmd.100"
+
+    def as_type(self):
+        return json.dumps(self.asdict())
+
+    def asdict(self):
+        d = self._asdict()
+        return d
+
+    def derived_errors(self) -> List[str]:
+        errors = []
+        if not isinstance(self.FromGNodeAlias, str):
+            errors.append(
+                f"FromGNodeAlias {self.FromGNodeAlias} must have type str."
+            )
+        if not property_format.is_lrd_alias_format(self.FromGNodeAlias):
+            errors.append(
+                f"FromGNodeAlias {self.FromGNodeAlias}"
+                " must have format LrdAliasFormat"
+            )
+        if not isinstance(self.FromGNodeId, str):
+            errors.append(
+                f"FromGNodeId {self.FromGNodeId} must have type str."
+            )
+        if not property_format.is_uuid_canonical_textual(self.FromGNodeId):
+            errors.append(
+                f"FromGNodeId {self.FromGNodeId}"
+                " must have format UuidCanonicalTextual"
+            )
+        if not isinstance(self.StartUnixS, int):
+            errors.append(
+                f"StartUnixS {self.StartUnixS} must have type int."
+            )
+        elif self.StartUnixS < 0:
+            errors.append(
+                f"StartUnixS {self.StartUnixS} must not be negative."
+            )
+        if not isinstance(self.EndUnixS, int):
+            errors.append(
+                f"EndUnixS {self.EndUnixS} must have type int."
+            )
+        elif self.EndUnixS < 0:
+            errors.append(
+                f"EndUnixS {self.EndUnixS} must not be negative."
+            )
+        if self.TypeAlias != "gt.sh.cli.status.backfill.cmd.100":
+            errors.append(
+                f"Type requires TypeAlias of gt.sh.cli.status.backfill.cmd.100, not {self.TypeAlias}."
+            )
+
+        return errors
@@ -0,0 +1,69 @@
+"""Makes gt.sh.cli.status.backfill.cmd.100 type"""
+import json
+
+from schema.gt.gt_sh_cli_status_backfill_cmd.gt_sh_cli_status_backfill_cmd import GtShCliStatusBackfillCmd
+from schema.errors import MpSchemaError
+from schema import validation
+
+
+class GtShCliStatusBackfillCmd_Maker:
+    type_alias = "gt.sh.cli.status.backfill.cmd.100"
+
+    def __init__(self,
+                 from_g_node_alias: str,
+                 from_g_node_id: str,
+                 start_unix_s: int,
+                 end_unix_s: int):
+
+        gw_tuple = GtShCliStatusBackfillCmd(
+            FromGNodeAlias=from_g_node_alias,
+            FromGNodeId=from_g_node_id,
+            StartUnixS=start_unix_s,
+            EndUnixS=end_unix_s,
+            #
+        )
+        if validation.should_check(self.type_alias):
+            gw_tuple.check_for_errors()
+        self.tuple = gw_tuple
+
+    @classmethod
+    def tuple_to_type(cls, tuple: GtShCliStatusBackfillCmd) -> str:
+        tuple.check_for_errors()
+        return tuple.as_type()
+
+    @classmethod
+    def type_to_tuple(cls, t: str) -> GtShCliStatusBackfillCmd:
+        try:
+            d = json.loads(t)
+        except TypeError:
+            raise MpSchemaError("Type must be string or bytes!")
+        if not isinstance(d, dict):
+            raise MpSchemaError(f"Deserializing {t} must result in dict!")
+        return cls.dict_to_tuple(d)
+
+    @classmethod
+    def dict_to_tuple(cls, d: dict) -> GtShCliStatusBackfillCmd:
+        new_d = {}
+        for key in d.keys():
+            new_d[key] = d[key]
+        if "TypeAlias" not in new_d.keys():
+            raise MpSchemaError(f"dict {new_d} missing TypeAlias")
+        if "FromGNodeAlias" not in new_d.keys():
+            raise MpSchemaError(f"dict {new_d} missing FromGNodeAlias")
+        if "FromGNodeId" not in new_d.keys():
+            raise MpSchemaError(f"dict {new_d} missing FromGNodeId")
+        if "StartUnixS" not in new_d.keys():
+            raise MpSchemaError(f"dict {new_d} missing StartUnixS")
+        if "EndUnixS" not in new_d.keys():
+            raise MpSchemaError(f"dict {new_d} missing EndUnixS")
+
+        gw_tuple = GtShCliStatusBackfillCmd(
+            TypeAlias=new_d["TypeAlias"],
+            FromGNodeAlias=new_d["FromGNodeAlias"],
+            FromGNodeId=new_d["FromGNodeId"],
+            StartUnixS=new_d["StartUnixS"],
+            EndUnixS=new_d["EndUnixS"],
+            #
+        )
+        gw_tuple.check_for_errors()
+        return gw_tuple
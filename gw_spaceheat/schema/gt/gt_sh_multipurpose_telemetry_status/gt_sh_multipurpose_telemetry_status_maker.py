@@ -4,6 +4,7 @@ from typing import List
 
 from schema.gt.gt_sh_multipurpose_telemetry_status.gt_sh_multipurpose_telemetry_status import GtShMultipurposeTelemetryStatus
 from schema.errors import MpSchemaError
+from schema import validation
 from schema.enums import (
     TelemetryName,
     TelemetryNameMap,
@@ -28,7 +29,8 @@ class GtShMultipurposeTelemetryStatus_Maker:
             SensorNodeAlias=sensor_node_alias,
             #
         )
-        gw_tuple.check_for_errors()
+        if validation.should_check(self.type_alias):
+            gw_tuple.check_for_errors()
         self.tuple = gw_tuple
 
     @classmethod
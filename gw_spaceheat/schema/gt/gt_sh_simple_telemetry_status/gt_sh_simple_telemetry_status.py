@@ -1,4 +1,4 @@
-"""gt.sh.simple.telemetry.status.100 type"""
+"""gt.sh.simple.telemetry.status.100 and .101 type"""
 
 from schema.errors import MpSchemaError
 from schema.gt.gt_sh_simple_telemetry_status.gt_sh_simple_telemetry_status_base import (
@@ -11,8 +11,22 @@ class GtShSimpleTelemetryStatus(GtShSimpleTelemetryStatusBase):
         errors = self.derived_errors() + self.hand_coded_errors()
         if len(errors) > 0:
             raise MpSchemaError(
-                f" Errors making making gt.sh.simple.telemetry.status.100 for {self}: {errors}"
+                f" Errors making making {self.TypeAlias} for {self}: {errors}"
             )
 
     def hand_coded_errors(self):
-        return []
+        errors = []
+        if self.TypeAlias == "gt.sh.simple.telemetry.status.100":
+            if self.CompressionMethod is not None or self.CompressionErrorBound is not None:
+                errors.append(
+                    "CompressionMethod and CompressionErrorBound require TypeAlias"
+                    " gt.sh.simple.telemetry.status.101."
+                )
+        elif self.CompressionMethod is None or self.CompressionErrorBound is None:
+            errors.append(
+                f"{self.TypeAlias} requires both CompressionMethod {self.CompressionMethod}"
+                f" and CompressionErrorBound {self.CompressionErrorBound}."
+            )
+        if isinstance(self.CompressionErrorBound, float) and self.CompressionErrorBound < 0:
+            errors.append(f"CompressionErrorBound {self.CompressionErrorBound} must not be negative.")
+        return errors
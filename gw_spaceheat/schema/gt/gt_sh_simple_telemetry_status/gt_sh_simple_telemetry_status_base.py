@@ -1,6 +1,6 @@
-"""Base for gt.sh.simple.telemetry.status.100"""
+"""Base for gt.sh.simple.telemetry.status.100, and .101, which adds CompressionMethod and CompressionErrorBound"""
 import json
-from typing import List, NamedTuple
+from typing import List, NamedTuple, Optional
 import schema.property_format as property_format
 from schema.enums import (
     TelemetryName,
@@ -13,6 +13,8 @@ class GtShSimpleTelemetryStatusBase(NamedTuple):
     ReadTimeUnixMsList: List[int]
     TelemetryName: TelemetryName  #
     ShNodeAlias: str  #
+    CompressionMethod: Optional[str] = None
+    CompressionErrorBound: Optional[float] = None
     TypeAlias: str = "gt.sh.simple.telemetry.status.100"
 
     def as_type(self):
@@ -22,6 +24,10 @@ class GtShSimpleTelemetryStatusBase(NamedTuple):
         d = self._asdict()
         del d["TelemetryName"]
         d["TelemetryNameGtEnumSymbol"] = TelemetryNameMap.local_to_gt(self.TelemetryName)
+        if d["CompressionMethod"] is None:
+            del d["CompressionMethod"]
+        if d["CompressionErrorBound"] is None:
+            del d["CompressionErrorBound"]
         return d
 
     def derived_errors(self) -> List[str]:
@@ -63,9 +69,22 @@ class GtShSimpleTelemetryStatusBase(NamedTuple):
                 f"ShNodeAlias {self.ShNodeAlias}"
                 " must have format LrdAliasFormat"
             )
-        if self.TypeAlias != "gt.sh.simple.telemetry.status.100":
+        if self.CompressionMethod is not None:
+            if not isinstance(self.CompressionMethod, str):
+                errors.append(
+                    f"CompressionMethod {self.CompressionMethod} must have type str."
+                )
+        if self.CompressionErrorBound is not None:
+            if not isinstance(self.CompressionErrorBound, float):
+                errors.append(
+                    f"CompressionErrorBound {self.CompressionErrorBound} must have type float."
+                )
+        if self.TypeAlias not in (
+            "gt.sh.simple.telemetry.status.100",
+            "gt.sh.simple.telemetry.status.101",
+        ):
             errors.append(
-                f"Type requires TypeAlias of gt.sh.simple.telemetry.status.100, not {self.TypeAlias}."
+                f"Type requires TypeAlias of gt.sh.simple.telemetry.status.100 or .101, not {self.TypeAlias}."
             )
 
         return errors
@@ -1,32 +1,48 @@
-"""Makes gt.sh.simple.telemetry.status.100 type"""
+"""Makes gt.sh.simple.telemetry.status.100 and .101 types"""
 import json
-from typing import List
+from typing import List, Optional, Union
 
 from schema.gt.gt_sh_simple_telemetry_status.gt_sh_simple_telemetry_status import GtShSimpleTelemetryStatus
 from schema.errors import MpSchemaError
+from schema import validation
 from schema.enums import (
     TelemetryName,
     TelemetryNameMap,
 )
 
 
+def float_bound(bound):
+    """Accept an int CompressionErrorBound (e.g. 50 from a JSON encoder) as the float it stands for."""
+    if isinstance(bound, int) and not isinstance(bound, bool):
+        return float(bound)
+    return bound
+
+
 class GtShSimpleTelemetryStatus_Maker:
     type_alias = "gt.sh.simple.telemetry.status.100"
+    compressed_type_alias = "gt.sh.simple.telemetry.status.101"
 
     def __init__(self,
                  value_list: List[int],
                  read_time_unix_ms_list: List[int],
                  telemetry_name: TelemetryName,
-                 sh_node_alias: str):
+                 sh_node_alias: str,
+                 compression_method: Optional[str] = None,
+                 compression_error_bound: Optional[Union[int, float]] = None):
 
+        compressed = compression_method is not None or compression_error_bound is not None
         gw_tuple = GtShSimpleTelemetryStatus(
+            TypeAlias=self.compressed_type_alias if compressed else self.type_alias,
             ValueList=value_list,
             ReadTimeUnixMsList=read_time_unix_ms_list,
             TelemetryName=telemetry_name,
             ShNodeAlias=sh_node_alias,
+            CompressionMethod=compression_method,
+            CompressionErrorBound=float_bound(compression_error_bound),
             #
         )
-        gw_tuple.check_for_errors()
+        if validation.should_check(self.type_alias):
+            gw_tuple.check_for_errors()
         self.tuple = gw_tuple
 
     @classmethod
@@ -60,6 +76,11 @@ class GtShSimpleTelemetryStatus_Maker:
         new_d["TelemetryName"] = TelemetryNameMap.gt_to_local(new_d["TelemetryNameGtEnumSymbol"])
         if "ShNodeAlias" not in new_d.keys():
             raise MpSchemaError(f"dict {new_d} missing ShNodeAlias")
+        if "CompressionMethod" not in new_d.keys():
+            new_d["CompressionMethod"] = None
+        if "CompressionErrorBound" not in new_d.keys():
+            new_d["CompressionErrorBound"] = None
+        new_d["CompressionErrorBound"] = float_bound(new_d["CompressionErrorBound"])
 
         gw_tuple = GtShSimpleTelemetryStatus(
             TypeAlias=new_d["TypeAlias"],
@@ -67,6 +88,8 @@ class GtShSimpleTelemetryStatus_Maker:
             ReadTimeUnixMsList=new_d["ReadTimeUnixMsList"],
             TelemetryName=new_d["TelemetryName"],
             ShNodeAlias=new_d["ShNodeAlias"],
+            CompressionMethod=new_d["CompressionMethod"],
+            CompressionErrorBound=new_d["CompressionErrorBound"],
             #
         )
         gw_tuple.check_for_errors()
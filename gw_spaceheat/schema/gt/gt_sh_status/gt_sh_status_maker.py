@@ -4,6 +4,7 @@ from typing import List
 
 from schema.gt.gt_sh_status.gt_sh_status import GtShStatus
 from schema.errors import MpSchemaError
+from schema import validation
 from schema.gt.gt_sh_simple_telemetry_status.gt_sh_simple_telemetry_status_maker import (
     GtShSimpleTelemetryStatus,
     GtShSimpleTelemetryStatus_Maker,
@@ -44,7 +45,8 @@ class GtShStatus_Maker:
             ReportingPeriodS=reporting_period_s,
             #
         )
-        gw_tuple.check_for_errors()
+        if validation.should_check(self.type_alias):
+            gw_tuple.check_for_errors()
         self.tuple = gw_tuple
 
     @classmethod
@@ -0,0 +1,6 @@
+from .gt_sh_status_compact_maker import *
+            
+__all__ = [
+    "GtShStatusCompact",
+    "GtShStatusCompact_Maker",
+]
@@ -0,0 +1,120 @@
+"""Base for gt.sh.status.compact.100"""
+import json
+from typing import List, NamedTuple
+import schema.property_format as property_format
+from schema.gt.gt_sh_telemetry_aggregate.gt_sh_telemetry_aggregate_maker import GtShTelemetryAggregate
+from schema.gt.gt_sh_booleanactuator_cmd_status.gt_sh_booleanactuator_cmd_status_maker import GtShBooleanactuatorCmdStatus
+
+
+class GtShStatusCompactBase(NamedTuple):
+    SlotStartUnixS: int  #
+    TelemetryAggregateList: List[GtShTelemetryAggregate]
+    AboutGNodeAlias: str  #
+    BooleanactuatorCmdList: List[GtShBooleanactuatorCmdStatus]
+    FromGNodeAlias: str  #
+    FromGNodeId: str  #
+    StatusUid: str  #
+    ReportingPeriodS: int  #
+    SampleRule: str  #
+    TypeAlias: str = "gt.sh.status.compact.100"
+
+    def as_type(self):
+        return json.dumps(self.asdict())
+
+    def asdict(self):
+        d = self._asdict()
+
+        # Recursively call asdict() for the SubTypes
+        telemetry_aggregate_list = []
+        for elt in self.TelemetryAggregateList:
+            telemetry_aggregate_list.append(elt.asdict())
+        d["TelemetryAggregateList"] = telemetry_aggregate_list
+
+        # Recursively call asdict() for the SubTypes
+        booleanactuator_cmd_list = []
+        for elt in self.BooleanactuatorCmdList:
+            booleanactuator_cmd_list.append(elt.asdict())
+        d["BooleanactuatorCmdList"] = booleanactuator_cmd_list
+        return d
+
+    def derived_errors(self) -> List[str]:
+        errors = []
+        if not isinstance(self.SlotStartUnixS, int):
+            errors.append(
+                f"SlotStartUnixS {self.SlotStartUnixS} must have type int."
+            )
+        if not property_format.is_reasonable_unix_time_s(self.SlotStartUnixS):
+            errors.append(
+                f"SlotStartUnixS {self.SlotStartUnixS}"
+                " must have format ReasonableUnixTimeS"
+            )
+        if not isinstance(self.TelemetryAggregateList, list):
+            errors.append(
+                f"TelemetryAggregateList {self.TelemetryAggregateList} must have type list."
+            )
+        else:
+            for elt in self.TelemetryAggregateList:
+                if not isinstance(elt, GtShTelemetryAggregate):
+                    errors.append(
+                        f"elt {elt} of TelemetryAggregateList must have type GtShTelemetryAggregate."
+                    )
+        if not isinstance(self.AboutGNodeAlias, str):
+            errors.append(
+                f"AboutGNodeAlias {self.AboutGNodeAlias} must have type str."
+            )
+        if not property_format.is_lrd_alias_format(self.AboutGNodeAlias):
+            errors.append(
+                f"AboutGNodeAlias {self.AboutGNodeAlias}"
+                " must have format LrdAliasFormat"
+            )
+        if not isinstance(self.BooleanactuatorCmdList, list):
+            errors.append(
+                f"BooleanactuatorCmdList {self.BooleanactuatorCmdList} must have type list."
+            )
+        else:
+            for elt in self.BooleanactuatorCmdList:
+                if not isinstance(elt, GtShBooleanactuatorCmdStatus):
+                    errors.append(
+                        f"elt {elt} of BooleanactuatorCmdList must have type GtShBooleanactuatorCmdStatus."
+                    )
+        if not isinstance(self.FromGNodeAlias, str):
+            errors.append(
+                f"FromGNodeAlias {self.FromGNodeAlias} must have type str."
+            )
+        if not property_format.is_lrd_alias_format(self.FromGNodeAlias):
+            errors.append(
+                f"FromGNodeAlias {self.FromGNodeAlias}"
+                " must have format LrdAliasFormat"
+            )
+        if not isinstance(self.FromGNodeId, str):
+            errors.append(
+                f"FromGNodeId {self.FromGNodeId} must have type str."
+            )
+        if not property_format.is_uuid_canonical_textual(self.FromGNodeId):
+            errors.append(
+                f"FromGNodeId {self.FromGNodeId}"
+                " must have format UuidCanonicalTextual"
+            )
+        if not isinstance(self.StatusUid, str):
+            errors.append(
+                f"StatusUid {self.StatusUid} must have type str."
+            )
+        if not property_format.is_uuid_canonical_textual(self.StatusUid):
+            errors.append(
+                f"StatusUid {self.StatusUid}"
+                " must have format UuidCanonicalTextual"
+            )
+        if not isinstance(self.ReportingPeriodS, int):
+            errors.append(
+                f"ReportingPeriodS {self.ReportingPeriodS} must have type int."
+            )
+        if not isinstance(self.SampleRule, str):
+            errors.append(
+                f"SampleRule {self.SampleRule} must have type str."
+            )
+        if self.TypeAlias != "gt.sh.status.compact.100":
+            errors.append(
+                f"Type requires TypeAlias of gt.sh.status.compact.100, not {self.TypeAlias}."
+            )
+
+        return errors
@@ -0,0 +1,125 @@
+"""Makes gt.sh.status.compact.100 type"""
+import json
+from typing import List
+
+from schema.gt.gt_sh_status_compact.gt_sh_status_compact import GtShStatusCompact
+from schema.errors import MpSchemaError
+from schema import validation
+from schema.gt.gt_sh_telemetry_aggregate.gt_sh_telemetry_aggregate_maker import (
+    GtShTelemetryAggregate,
+    GtShTelemetryAggregate_Maker,
+)
+from schema.gt.gt_sh_booleanactuator_cmd_status.gt_sh_booleanactuator_cmd_status_maker import (
+    GtShBooleanactuatorCmdStatus,
+    GtShBooleanactuatorCmdStatus_Maker,
+)
+
+
+class GtShStatusCompact_Maker:
+    type_alias = "gt.sh.status.compact.100"
+
+    def __init__(self,
+                 slot_start_unix_s: int,
+                 telemetry_aggregate_list: List[GtShTelemetryAggregate],
+                 about_g_node_alias: str,
+                 booleanactuator_cmd_list: List[GtShBooleanactuatorCmdStatus],
+                 from_g_node_alias: str,
+                 from_g_node_id: str,
+                 status_uid: str,
+                 reporting_period_s: int,
+                 sample_rule: str):
+
+        gw_tuple = GtShStatusCompact(
+            SlotStartUnixS=slot_start_unix_s,
+            TelemetryAggregateList=telemetry_aggregate_list,
+            AboutGNodeAlias=about_g_node_alias,
+            BooleanactuatorCmdList=booleanactuator_cmd_list,
+            FromGNodeAlias=from_g_node_alias,
+            FromGNodeId=from_g_node_id,
+            StatusUid=status_uid,
+            ReportingPeriodS=reporting_period_s,
+            SampleRule=sample_rule,
+            #
+        )
+        if validation.should_check(self.type_alias):
+            gw_tuple.check_for_errors()
+        self.tuple = gw_tuple
+
+    @classmethod
+    def tuple_to_type(cls, tuple: GtShStatusCompact) -> str:
+        tuple.check_for_errors()
+        return tuple.as_type()
+
+    @classmethod
+    def type_to_tuple(cls, t: str) -> GtShStatusCompact:
+        try:
+            d = json.loads(t)
+        except TypeError:
+            raise MpSchemaError("Type must be string or bytes!")
+        if not isinstance(d, dict):
+            raise MpSchemaError(f"Deserializing {t} must result in dict!")
+        return cls.dict_to_tuple(d)
+
+    @classmethod
+    def dict_to_tuple(cls, d: dict) -> GtShStatusCompact:
+        new_d = {}
+        for key in d.keys():
+            new_d[key] = d[key]
+        if "TypeAlias" not in new_d.keys():
+            raise MpSchemaError(f"dict {new_d} missing TypeAlias")
+        if "SlotStartUnixS" not in new_d.keys():
+            raise MpSchemaError(f"dict {new_d} missing SlotStartUnixS")
+        if "TelemetryAggregateList" not in new_d.keys():
+            raise MpSchemaError(f"dict {new_d} missing TelemetryAggregateList")
+        telemetry_aggregate_list = []
+        for elt in new_d["TelemetryAggregateList"]:
+            if not isinstance(elt, dict):
+                raise MpSchemaError(
+                    f"elt {elt} of TelemetryAggregateList must be "
+                    "GtShTelemetryAggregate but not even a dict!"
+                )
+            telemetry_aggregate_list.append(
+                GtShTelemetryAggregate_Maker.dict_to_tuple(elt)
+            )
+        new_d["TelemetryAggregateList"] = telemetry_aggregate_list
+        if "AboutGNodeAlias" not in new_d.keys():
+            raise MpSchemaError(f"dict {new_d} missing AboutGNodeAlias")
+        if "BooleanactuatorCmdList" not in new_d.keys():
+            raise MpSchemaError(f"dict {new_d} missing BooleanactuatorCmdList")
+        booleanactuator_cmd_list = []
+        for elt in new_d["BooleanactuatorCmdList"]:
+            if not isinstance(elt, dict):
+                raise MpSchemaError(
+                    f"elt {elt} of BooleanactuatorCmdList must be "
+                    "GtShBooleanactuatorCmdStatus but not even a dict!"
+                )
+            booleanactuator_cmd_list.append(
+                GtShBooleanactuatorCmdStatus_Maker.dict_to_tuple(elt)
+            )
+        new_d["BooleanactuatorCmdList"] = booleanactuator_cmd_list
+        if "FromGNodeAlias" not in new_d.keys():
+            raise MpSchemaError(f"dict {new_d} missing FromGNodeAlias")
+        if "FromGNodeId" not in new_d.keys():
+            raise MpSchemaError(f"dict {new_d} missing FromGNodeId")
+        if "StatusUid" not in new_d.keys():
+            raise MpSchemaError(f"dict {new_d} missing StatusUid")
+        if "ReportingPeriodS" not in new_d.keys():
+            raise MpSchemaError(f"dict {new_d} missing ReportingPeriodS")
+        if "SampleRule" not in new_d.keys():
+            raise MpSchemaError(f"dict {new_d} missing SampleRule")
+
+        gw_tuple = GtShStatusCompact(
+            TypeAlias=new_d["TypeAlias"],
+            SlotStartUnixS=new_d["SlotStartUnixS"],
+            TelemetryAggregateList=new_d["TelemetryAggregateList"],
+            AboutGNodeAlias=new_d["AboutGNodeAlias"],
+            BooleanactuatorCmdList=new_d["BooleanactuatorCmdList"],
+            FromGNodeAlias=new_d["FromGNodeAlias"],
+            FromGNodeId=new_d["FromGNodeId"],
+            StatusUid=new_d["StatusUid"],
+            ReportingPeriodS=new_d["ReportingPeriodS"],
+            SampleRule=new_d["SampleRule"],
+            #
+        )
+        gw_tuple.check_for_errors()
+        return gw_tuple
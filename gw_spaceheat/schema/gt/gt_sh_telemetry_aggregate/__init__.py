@@ -0,0 +1,6 @@
+from .gt_sh_telemetry_aggregate_maker import *
+            
+__all__ = [
+    "GtShTelemetryAggregate",
+    "GtShTelemetryAggregate_Maker",
+]
@@ -0,0 +1,27 @@
+"""gt.sh.telemetry.aggregate.100 type"""
+
+from schema.errors import MpSchemaError
+from schema.gt.gt_sh_telemetry_aggregate.gt_sh_telemetry_aggregate_base import (
+    GtShTelemetryAggregateBase,
+)
+
+
+class GtShTelemetryAggregate(GtShTelemetryAggregateBase):
+    def check_for_errors(self):
+        errors = self.derived_errors() + self.hand_coded_errors()
+        if len(errors) > 0:
+            raise MpSchemaError(f" Errors making making gt.sh.telemetry.aggregate.100 for {self}: {errors}")
+
+    def hand_coded_errors(self):
+        errors = []
+        if isinstance(self.ValueList, list) and isinstance(self.ReadTimeUnixMsList, list):
+            if len(self.ValueList) != len(self.ReadTimeUnixMsList):
+                errors.append(
+                    f"ValueList and ReadTimeUnixMsList must have the same length, not "
+                    f"{len(self.ValueList)} and {len(self.ReadTimeUnixMsList)}."
+                )
+            if isinstance(self.Count, int) and len(self.ValueList) > self.Count:
+                errors.append(f"ValueList has {len(self.ValueList)} readings, more than Count {self.Count}.")
+        if isinstance(self.Min, int) and isinstance(self.Max, int) and self.Min > self.Max:
+            errors.append(f"Min {self.Min} must not be greater than Max {self.Max}.")
+        return errors
@@ -0,0 +1,116 @@
+"""Base for gt.sh.telemetry.aggregate.100"""
+import json
+from typing import List, NamedTuple
+import schema.property_format as property_format
+from schema.enums import (
+    TelemetryName,
+    TelemetryNameMap,
+)
+
+
+class GtShTelemetryAggregateBase(NamedTuple):
+    AboutNodeAlias: str  #
+    SensorNodeAlias: str  #
+    TelemetryName: TelemetryName  #
+    Count: int  #
+    Min: int  #
+    Max: int  #
+    Mean: float  #
+    Last: int  #
+    FirstReadTimeUnixMs: int  #
+    LastReadTimeUnixMs: int  #
+    ValueList: List[int]
+    ReadTimeUnixMsList: List[int]
+    TypeAlias: str = "gt.sh.telemetry.aggregate.100"
+
+    def as_type(self):
+        return json.dumps(self.asdict())
+
+    def asdict(self):
+        d = self._asdict()
+        del d["TelemetryName"]
+        d["TelemetryNameGtEnumSymbol"] = TelemetryNameMap.local_to_gt(self.TelemetryName)
+        return d
+
+    def derived_errors(self) -> List[str]:
+        errors = []
+        if not isinstance(self.AboutNodeAlias, str):
+            errors.append(
+                f"AboutNodeAlias {self.AboutNodeAlias} must have type str."
+            )
+        if not property_format.is_lrd_alias_format(self.AboutNodeAlias):
+            errors.append(
+                f"AboutNodeAlias {self.AboutNodeAlias}"
+                " must have format LrdAliasFormat"
+            )
+        if not isinstance(self.SensorNodeAlias, str):
+            errors.append(
+                f"SensorNodeAlias {self.SensorNodeAlias} must have type str."
+            )
+        if not property_format.is_lrd_alias_format(self.SensorNodeAlias):
+            errors.append(
+                f"SensorNodeAlias {self.SensorNodeAlias}"
+                " must have format LrdAliasFormat"
+            )
+        if not isinstance(self.TelemetryName, TelemetryName):
+            errors.append(
+                f"TelemetryName {self.TelemetryName} must have type {TelemetryName}."
+            )
+        if not isinstance(self.Count, int):
+            errors.append(
+                f"Count {self.Count} must have type int."
+            )
+        if not property_format.is_positive_integer(self.Count):
+            errors.append(
+                f"Count {self.Count}"
+                " must have format PositiveInteger"
+            )
+        for name in ["Min", "Max", "Last"]:
+            if not isinstance(getattr(self, name), int):
+                errors.append(
+                    f"{name} {getattr(self, name)} must have type int."
+                )
+        if not isinstance(self.Mean, (int, float)):
+            errors.append(
+                f"Mean {self.Mean} must have type float."
+            )
+        for name in ["FirstReadTimeUnixMs", "LastReadTimeUnixMs"]:
+            if not isinstance(getattr(self, name), int):
+                errors.append(
+                    f"{name} {getattr(self, name)} must have type int."
+                )
+            if not property_format.is_reasonable_unix_time_ms(getattr(self, name)):
+                errors.append(
+                    f"{name} {getattr(self, name)}"
+                    " must have format ReasonableUnixTimeMs"
+                )
+        if not isinstance(self.ValueList, list):
+            errors.append(
+                f"ValueList {self.ValueList} must have type list."
+            )
+        else:
+            for elt in self.ValueList:
+                if not isinstance(elt, int):
+                    errors.append(
+                        f"elt {elt} of ValueList must have type int."
+                    )
+        if not isinstance(self.ReadTimeUnixMsList, list):
+            errors.append(
+                f"ReadTimeUnixMsList {self.ReadTimeUnixMsList} must have type list."
+            )
+        else:
+            for elt in self.ReadTimeUnixMsList:
+                if not isinstance(elt, int):
+                    errors.append(
+                        f"elt {elt} of ReadTimeUnixMsList must have type int."
+                    )
+                if not property_format.is_reasonable_unix_time_ms(elt):
+                    errors.append(
+                        f"elt {elt} of ReadTimeUnixMsList must have format ReasonableUnixTimeMs"
+                    )
+        if self.TypeAlias != "gt.sh.telemetry.aggregate.100":
+            errors.append(
+                f"Type requires TypeAlias of gt.sh.telemetry.aggregate.100, not {self.TypeAlias}."
+            )
+
+        return errors
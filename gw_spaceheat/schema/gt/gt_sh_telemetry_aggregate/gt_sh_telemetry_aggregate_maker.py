@@ -0,0 +1,110 @@
+"""Makes gt.sh.telemetry.aggregate.100 type"""
+import json
+from typing import List
+
+from schema.gt.gt_sh_telemetry_aggregate.gt_sh_telemetry_aggregate import GtShTelemetryAggregate
+from schema.errors import MpSchemaError
+from schema import validation
+from schema.enums import (
+    TelemetryName,
+    TelemetryNameMap,
+)
+
+
+class GtShTelemetryAggregate_Maker:
+    type_alias = "gt.sh.telemetry.aggregate.100"
+
+    def __init__(self,
+                 about_node_alias: str,
+                 sensor_node_alias: str,
+                 telemetry_name: TelemetryName,
+                 count: int,
+                 min: int,
+                 max: int,
+                 mean: float,
+                 last: int,
+                 first_read_time_unix_ms: int,
+                 last_read_time_unix_ms: int,
+                 value_list: List[int],
+                 read_time_unix_ms_list: List[int]):
+
+        gw_tuple = GtShTelemetryAggregate(
+            AboutNodeAlias=about_node_alias,
+            SensorNodeAlias=sensor_node_alias,
+            TelemetryName=telemetry_name,
+            Count=count,
+            Min=min,
+            Max=max,
+            Mean=mean,
+            Last=last,
+            FirstReadTimeUnixMs=first_read_time_unix_ms,
+            LastReadTimeUnixMs=last_read_time_unix_ms,
+            ValueList=value_list,
+            ReadTimeUnixMsList=read_time_unix_ms_list,
+            #
+        )
+        if validation.should_check(self.type_alias):
+            gw_tuple.check_for_errors()
+        self.tuple = gw_tuple
+
+    @classmethod
+    def tuple_to_type(cls, tuple: GtShTelemetryAggregate) -> str:
+        tuple.check_for_errors()
+        return tuple.as_type()
+
+    @classmethod
+    def type_to_tuple(cls, t: str) -> GtShTelemetryAggregate:
+        try:
+            d = json.loads(t)
+        except TypeError:
+            raise MpSchemaError("Type must be string or bytes!")
+        if not isinstance(d, dict):
+            raise MpSchemaError(f"Deserializing {t} must result in dict!")
+        return cls.dict_to_tuple(d)
+
+    @classmethod
+    def dict_to_tuple(cls, d: dict) -> GtShTelemetryAggregate:
+        new_d = {}
+        for key in d.keys():
+            new_d[key] = d[key]
+        if "TypeAlias" not in new_d.keys():
+            raise MpSchemaError(f"dict {new_d} missing TypeAlias")
+        if "AboutNodeAlias" not in new_d.keys():
+            raise MpSchemaError(f"dict {new_d} missing AboutNodeAlias")
+        if "SensorNodeAlias" not in new_d.keys():
+            raise MpSchemaError(f"dict {new_d} missing SensorNodeAlias")
+        if "TelemetryNameGtEnumSymbol" not in new_d.keys():
+            raise MpSchemaError(f"dict {new_d} missing TelemetryNameGtEnumSymbol")
+        new_d["TelemetryName"] = TelemetryNameMap.gt_to_local(new_d["TelemetryNameGtEnumSymbol"])
+        for key in [
+            "Count",
+            "Min",
+            "Max",
+            "Mean",
+            "Last",
+            "FirstReadTimeUnixMs",
+            "LastReadTimeUnixMs",
+            "ValueList",
+            "ReadTimeUnixMsList",
+        ]:
+            if key not in new_d.keys():
+                raise MpSchemaError(f"dict {new_d} missing {key}")
+
+        gw_tuple = GtShTelemetryAggregate(
+            TypeAlias=new_d["TypeAlias"],
+            AboutNodeAlias=new_d["AboutNodeAlias"],
+            SensorNodeAlias=new_d["SensorNodeAlias"],
+            TelemetryName=new_d["TelemetryName"],
+            Count=new_d["Count"],
+            Min=new_d["Min"],
+            Max=new_d["Max"],
+            Mean=new_d["Mean"],
+            Last=new_d["Last"],
+            FirstReadTimeUnixMs=new_d["FirstReadTimeUnixMs"],
+            LastReadTimeUnixMs=new_d["LastReadTimeUnixMs"],
+            ValueList=new_d["ValueList"],
+            ReadTimeUnixMsList=new_d["ReadTimeUnixMsList"],
+            #
+        )
+        gw_tuple.check_for_errors()
+        return gw_tuple
@@ -4,6 +4,7 @@ from typing import List
 
 from schema.gt.gt_sh_telemetry_from_multipurpose_sensor.gt_sh_telemetry_from_multipurpose_sensor import GtShTelemetryFromMultipurposeSensor
 from schema.errors import MpSchemaError
+from schema import validation
 from schema.enums import (
     TelemetryName,
     TelemetryNameMap,
@@ -26,7 +27,8 @@ class GtShTelemetryFromMultipurposeSensor_Maker:
             TelemetryNameList=telemetry_name_list,
             #
         )
-        gw_tuple.check_for_errors()
+        if validation.should_check(self.type_alias):
+            gw_tuple.check_for_errors()
         self.tuple = gw_tuple
 
     @classmethod
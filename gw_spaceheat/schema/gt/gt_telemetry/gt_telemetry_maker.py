@@ -3,6 +3,7 @@ import json
 
 from schema.gt.gt_telemetry.gt_telemetry import GtTelemetry
 from schema.errors import MpSchemaError
+from schema import validation
 from schema.enums import (
     TelemetryName,
     TelemetryNameMap,
@@ -25,7 +26,8 @@ class GtTelemetry_Maker:
             Exponent=exponent,
             #
         )
-        gw_tuple.check_for_errors()
+        if validation.should_check(self.type_alias):
+            gw_tuple.check_for_errors()
         self.tuple = gw_tuple
 
     @classmethod
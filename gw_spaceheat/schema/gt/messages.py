@@ -3,12 +3,17 @@ from .gt_dispatch_boolean_local import *
 from .gt_driver_booleanactuator_cmd import *
 from .gt_sh_booleanactuator_cmd_status import *
 from .gt_sh_cli_atn_cmd import *
+from .gt_sh_cli_snapshot_delta_cmd import *
+from .gt_sh_cli_status_backfill_cmd import *
 from .gt_sh_multipurpose_telemetry_status import *
 from .gt_sh_simple_telemetry_status import *
 from .gt_sh_status import *
+from .gt_sh_status_compact import *
+from .gt_sh_telemetry_aggregate import *
 from .gt_sh_telemetry_from_multipurpose_sensor import *
 from .gt_telemetry import *
 from .snapshot_spaceheat import *
+from .snapshot_spaceheat_delta import *
 from .telemetry_snapshot_spaceheat import *
 
 __all__ = [
@@ -22,18 +27,28 @@ __all__ = [
     "GtShBooleanactuatorCmdStatus_Maker",
     "GtShCliAtnCmd",
     "GtShCliAtnCmd_Maker",
+    "GtShCliSnapshotDeltaCmd",
+    "GtShCliSnapshotDeltaCmd_Maker",
+    "GtShCliStatusBackfillCmd",
+    "GtShCliStatusBackfillCmd_Maker",
     "GtShMultipurposeTelemetryStatus",
     "GtShMultipurposeTelemetryStatus_Maker",
     "GtShSimpleTelemetryStatus",
     "GtShSimpleTelemetryStatus_Maker",
     "GtShStatus",
     "GtShStatus_Maker",
+    "GtShStatusCompact",
+    "GtShStatusCompact_Maker",
+    "GtShTelemetryAggregate",
+    "GtShTelemetryAggregate_Maker",
     "GtShTelemetryFromMultipurposeSensor",
     "GtShTelemetryFromMultipurposeSensor_Maker",
     "GtTelemetry",
     "GtTelemetry_Maker",
     "SnapshotSpaceheat",
     "SnapshotSpaceheat_Maker",
+    "SnapshotSpaceheatDelta",
+    "SnapshotSpaceheatDelta_Maker",
     "TelemetrySnapshotSpaceheat",
     "TelemetrySnapshotSpaceheat_Maker",
 ]
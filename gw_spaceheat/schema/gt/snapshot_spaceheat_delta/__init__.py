@@ -0,0 +1,6 @@
+from .snapshot_spaceheat_delta_maker import *
+            
+__all__ = [
+    "SnapshotSpaceheatDelta",
+    "SnapshotSpaceheatDelta_Maker",
+]
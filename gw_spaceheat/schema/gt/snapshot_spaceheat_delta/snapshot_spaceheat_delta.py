@@ -0,0 +1,21 @@
+"""snapshot.spaceheat.delta.100 type"""
+
+from schema.errors import MpSchemaError
+from schema.gt.snapshot_spaceheat_delta.snapshot_spaceheat_delta_base import (
+    SnapshotSpaceheatDeltaBase,
+)
+
+
+class SnapshotSpaceheatDelta(SnapshotSpaceheatDeltaBase):
+    def check_for_errors(self):
+        errors = self.derived_errors() + self.hand_coded_errors()
+        if len(errors) > 0:
+            raise MpSchemaError(
+                f" Errors making making snapshot.spaceheat.delta.100 for {self}: {errors}"
+            )
+
+    def hand_coded_errors(self):
+        errors = []
+        if isinstance(self.FromSeq, int) and isinstance(self.Seq, int) and self.FromSeq > self.Seq:
+            errors.append(f"FromSeq {self.FromSeq} must not be greater than Seq {self.Seq}.")
+        return errors
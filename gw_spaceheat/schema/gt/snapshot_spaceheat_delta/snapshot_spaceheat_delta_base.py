@@ -0,0 +1,61 @@
+"""Base for snapshot.spaceheat.delta.100"""
+import json
+from typing import List, NamedTuple
+import schema.property_format as property_format
+from schema.gt.telemetry_snapshot_spaceheat.telemetry_snapshot_spaceheat_maker import TelemetrySnapshotSpaceheat
+
+
+class SnapshotSpaceheatDeltaBase(NamedTuple):
+    FromGNodeAlias: str  #
+    FromGNodeInstanceId: str  #
+    FromSeq: int  #
+    Seq: int  #
+    Snapshot: TelemetrySnapshotSpaceheat  #
+    TypeAlias: str = "snapshot.spaceheat.delta.100"
+
+    def as_type(self):
+        return json.dumps(self.asdict())
+
+    def asdict(self):
+        d = self._asdict()
+        d["Snapshot"] = self.Snapshot.asdict()
+        return d
+
+    def derived_errors(self) -> List[str]:
+        errors = []
+        if not isinstance(self.FromGNodeAlias, str):
+            errors.append(
+                f"FromGNodeAlias {self.FromGNodeAlias} must have type str."
+            )
+        if not property_format.is_lrd_alias_format(self.FromGNodeAlias):
+            errors.append(
+                f"FromGNodeAlias {self.FromGNodeAlias}"
+                " must have format LrdAliasFormat"
+            )
+        if not isinstance(self.FromGNodeInstanceId, str):
+            errors.append(
+                f"FromGNodeInstanceId {self.FromGNodeInstanceId} must have type str."
+            )
+        if not property_format.is_uuid_canonical_textual(self.FromGNodeInstanceId):
+            errors.append(
+                f"FromGNodeInstanceId {self.FromGNodeInstanceId}"
+                " must have format UuidCanonicalTextual"
+            )
+        if not isinstance(self.FromSeq, int):
+            errors.append(
+                f"FromSeq {self.FromSeq} must have type int."
+            )
+        if not isinstance(self.Seq, int):
+            errors.append(
+                f"Seq {self.Seq} must have type int."
+            )
+        if not isinstance(self.Snapshot, TelemetrySnapshotSpaceheat):
+            errors.append(
+                f"Snapshot {self.Snapshot} must have typeTelemetrySnapshotSpaceheat."
+            )
+        if self.TypeAlias != "snapshot.spaceheat.delta.100":
+            errors.append(
+                f"Type requires TypeAlias of snapshot.spaceheat.delta.100, not {self.TypeAlias}."
+            )
+
+        return errors
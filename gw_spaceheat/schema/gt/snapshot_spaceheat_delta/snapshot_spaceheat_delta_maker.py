@@ -0,0 +1,82 @@
+"""Makes snapshot.spaceheat.delta.100 type"""
+import json
+
+from schema.gt.snapshot_spaceheat_delta.snapshot_spaceheat_delta import SnapshotSpaceheatDelta
+from schema.errors import MpSchemaError
+from schema import validation
+from schema.gt.telemetry_snapshot_spaceheat.telemetry_snapshot_spaceheat_maker import (
+    TelemetrySnapshotSpaceheat,
+    TelemetrySnapshotSpaceheat_Maker,
+)
+
+
+class SnapshotSpaceheatDelta_Maker:
+    type_alias = "snapshot.spaceheat.delta.100"
+
+    def __init__(self,
+                 from_g_node_alias: str,
+                 from_g_node_instance_id: str,
+                 from_seq: int,
+                 seq: int,
+                 snapshot: TelemetrySnapshotSpaceheat):
+
+        gw_tuple = SnapshotSpaceheatDelta(
+            FromGNodeAlias=from_g_node_alias,
+            FromGNodeInstanceId=from_g_node_instance_id,
+            FromSeq=from_seq,
+            Seq=seq,
+            Snapshot=snapshot,
+            #
+        )
+        if validation.should_check(self.type_alias):
+            gw_tuple.check_for_errors()
+        self.tuple = gw_tuple
+
+    @classmethod
+    def tuple_to_type(cls, tuple: SnapshotSpaceheatDelta) -> str:
+        tuple.check_for_errors()
+        return tuple.as_type()
+
+    @classmethod
+    def type_to_tuple(cls, t: str) -> SnapshotSpaceheatDelta:
+        try:
+            d = json.loads(t)
+        except TypeError:
+            raise MpSchemaError("Type must be string or bytes!")
+        if not isinstance(d, dict):
+            raise MpSchemaError(f"Deserializing {t} must result in dict!")
+        return cls.dict_to_tuple(d)
+
+    @classmethod
+    def dict_to_tuple(cls, d: dict) -> SnapshotSpaceheatDelta:
+        new_d = {}
+        for key in d.keys():
+            new_d[key] = d[key]
+        if "TypeAlias" not in new_d.keys():
+            raise MpSchemaError(f"dict {new_d} missing TypeAlias")
+        if "FromGNodeAlias" not in new_d.keys():
+            raise MpSchemaError(f"dict {new_d} missing FromGNodeAlias")
+        if "FromGNodeInstanceId" not in new_d.keys():
+            raise MpSchemaError(f"dict {new_d} missing FromGNodeInstanceId")
+        if "FromSeq" not in new_d.keys():
+            raise MpSchemaError(f"dict {new_d} missing FromSeq")
+        if "Seq" not in new_d.keys():
+            raise MpSchemaError(f"dict {new_d} missing Seq")
+        if "Snapshot" not in new_d.keys():
+            raise MpSchemaError(f"dict {new_d} missing Snapshot")
+        if not isinstance(new_d["Snapshot"], dict):
+            raise MpSchemaError(f"d['Snapshot'] {new_d['Snapshot']} must be a TelemetrySnapshotSpaceheat!")
+        snapshot = TelemetrySnapshotSpaceheat_Maker.dict_to_tuple(new_d["Snapshot"])
+        new_d["Snapshot"] = snapshot
+
+        gw_tuple = SnapshotSpaceheatDelta(
+            TypeAlias=new_d["TypeAlias"],
+            FromGNodeAlias=new_d["FromGNodeAlias"],
+            FromGNodeInstanceId=new_d["FromGNodeInstanceId"],
+            FromSeq=new_d["FromSeq"],
+            Seq=new_d["Seq"],
+            Snapshot=new_d["Snapshot"],
+            #
+        )
+        gw_tuple.check_for_errors()
+        return gw_tuple
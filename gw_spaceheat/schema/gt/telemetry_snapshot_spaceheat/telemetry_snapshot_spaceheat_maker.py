@@ -4,6 +4,7 @@ from typing import List
 
 from schema.gt.telemetry_snapshot_spaceheat.telemetry_snapshot_spaceheat import TelemetrySnapshotSpaceheat
 from schema.errors import MpSchemaError
+from schema import validation
 from schema.enums import (
     TelemetryName,
     TelemetryNameMap,
@@ -26,7 +27,8 @@ class TelemetrySnapshotSpaceheat_Maker:
             ReportTimeUnixMs=report_time_unix_ms,
             #
         )
-        gw_tuple.check_for_errors()
+        if validation.should_check(self.type_alias):
+            gw_tuple.check_for_errors()
         self.tuple = gw_tuple
 
     @classmethod
@@ -0,0 +1,151 @@
+"""Benchmark schema Maker construction throughput under each ValidationPolicy.
+
+Run, for example:
+
+    python -m schema.maker_benchmark --iterations 2000 --samples 60
+
+For the Makers on the Scada hot path (telemetry from sensors and meters) and the ones building a status, each
+policy is timed constructing --iterations messages, with status channels of --samples readings. Decoding the same
+messages with dict_to_tuple, which is always fully validated, is timed for reference. The report, written as JSON to
+stdout or --output, gives messages per second for each Maker and policy.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+
+from config import SchemaValidation
+from config import ValidationPolicy
+from schema import validation
+from schema.enums import TelemetryName
+from schema.messages import GtShSimpleTelemetryStatus_Maker
+from schema.messages import GtShStatus_Maker
+from schema.messages import GtShTelemetryFromMultipurposeSensor_Maker
+from schema.messages import GtTelemetry_Maker
+
+SCADA_ALIAS = "dw1.isone.ct.newhaven.orange1.ta.scada"
+TERMINAL_ASSET_ALIAS = "dw1.isone.ct.newhaven.orange1.ta"
+SCADA_ID = "0384ef21-648b-4455-b917-58a1172d7fc1"
+STATUS_UID = "6b0b2d2f-7a4e-4d1e-9a37-9c0b3c4f4a11"
+START_MS = 1_656_945_300_000
+
+
+class MakerBenchmarkConfig(NamedTuple):
+    iterations: int = 2000
+    samples: int = 60
+    sample_every: int = SchemaValidation().sample_every
+
+
+def makers(cfg: MakerBenchmarkConfig) -> dict[str, tuple[Any, Callable[[], Any]]]:
+    """Maker class and a function constructing one message with it, by type alias."""
+    read_times = [START_MS + 5_000 * i for i in range(cfg.samples)]
+    values = [60_000 + i for i in range(cfg.samples)]
+    simple = GtShSimpleTelemetryStatus_Maker(
+        value_list=values,
+        read_time_unix_ms_list=read_times,
+        telemetry_name=TelemetryName.WATER_TEMP_F_TIMES1000,
+        sh_node_alias="a.tank.temp0",
+    ).tuple
+    return {
+        GtTelemetry_Maker.type_alias: (
+            GtTelemetry_Maker,
+            lambda: GtTelemetry_Maker(
+                scada_read_time_unix_ms=START_MS,
+                value=63_000,
+                name=TelemetryName.WATER_TEMP_F_TIMES1000,
+                exponent=3,
+            ),
+        ),
+        GtShTelemetryFromMultipurposeSensor_Maker.type_alias: (
+            GtShTelemetryFromMultipurposeSensor_Maker,
+            lambda: GtShTelemetryFromMultipurposeSensor_Maker(
+                about_node_alias_list=["a.elt1", "a.elt2"],
+                value_list=[15_000_000, 0],
+                scada_read_time_unix_ms=START_MS,
+                telemetry_name_list=[TelemetryName.CURRENT_RMS_MICRO_AMPS, TelemetryName.CURRENT_RMS_MICRO_AMPS],
+            ),
+        ),
+        GtShSimpleTelemetryStatus_Maker.type_alias: (
+            GtShSimpleTelemetryStatus_Maker,
+            lambda: GtShSimpleTelemetryStatus_Maker(
+                value_list=values,
+                read_time_unix_ms_list=read_times,
+                telemetry_name=TelemetryName.WATER_TEMP_F_TIMES1000,
+                sh_node_alias="a.tank.temp0",
+            ),
+        ),
+        GtShStatus_Maker.type_alias: (
+            GtShStatus_Maker,
+            lambda: GtShStatus_Maker(
+                from_g_node_alias=SCADA_ALIAS,
+                from_g_node_id=SCADA_ID,
+                status_uid=STATUS_UID,
+                about_g_node_alias=TERMINAL_ASSET_ALIAS,
+                slot_start_unix_s=START_MS // 1000,
+                reporting_period_s=300,
+                booleanactuator_cmd_list=[],
+                multipurpose_telemetry_list=[],
+                simple_telemetry_list=[simple] * 8,
+            ),
+        ),
+    }
+
+
+def _messages_per_s(func: Callable[[], Any], iterations: int) -> float:
+    start_s = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed_s = time.perf_counter() - start_s
+    return iterations / elapsed_s if elapsed_s else 0.0
+
+
+def run(cfg: MakerBenchmarkConfig = MakerBenchmarkConfig()) -> dict[str, Any]:
+    report: dict[str, Any] = dict(config=cfg._asdict(), benchmarks=[])
+    previous = validation.validator().settings()
+    try:
+        for type_alias, (maker, construct) in makers(cfg).items():
+            result: dict[str, Any] = dict(type_alias=type_alias, messages_per_s=dict())
+            for policy in ValidationPolicy:
+                validation.configure(SchemaValidation(default_policy=policy, sample_every=cfg.sample_every))
+                result["messages_per_s"][policy.value] = _messages_per_s(construct, cfg.iterations)
+            as_dict = construct().tuple.asdict()
+            result["messages_per_s"]["dict_to_tuple"] = _messages_per_s(
+                lambda: maker.dict_to_tuple(as_dict), cfg.iterations
+            )
+            report["benchmarks"].append(result)
+    finally:
+        validation.configure(previous)
+    return report
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark schema Maker construction under each validation policy.")
+    parser.add_argument("-n", "--iterations", type=int, default=MakerBenchmarkConfig().iterations)
+    parser.add_argument("-s", "--samples", type=int, default=MakerBenchmarkConfig().samples)
+    parser.add_argument("--sample-every", type=int, default=MakerBenchmarkConfig().sample_every)
+    parser.add_argument("-o", "--output", default="", help="JSON report path. Defaults to stdout.")
+    return parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> dict[str, Any]:
+    args = parse_args(argv)
+    report = run(
+        MakerBenchmarkConfig(iterations=args.iterations, samples=args.samples, sample_every=args.sample_every)
+    )
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text)
+    else:
+        print(text)
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -19,18 +19,28 @@ __all__ = [
     "GtShBooleanactuatorCmdStatus_Maker",
     "GtShCliAtnCmd",
     "GtShCliAtnCmd_Maker",
+    "GtShCliSnapshotDeltaCmd",
+    "GtShCliSnapshotDeltaCmd_Maker",
+    "GtShCliStatusBackfillCmd",
+    "GtShCliStatusBackfillCmd_Maker",
     "GtShMultipurposeTelemetryStatus",
     "GtShMultipurposeTelemetryStatus_Maker",
     "GtShSimpleTelemetryStatus",
     "GtShSimpleTelemetryStatus_Maker",
     "GtShStatus",
     "GtShStatus_Maker",
+    "GtShStatusCompact",
+    "GtShStatusCompact_Maker",
+    "GtShTelemetryAggregate",
+    "GtShTelemetryAggregate_Maker",
     "GtShTelemetryFromMultipurposeSensor",
     "GtShTelemetryFromMultipurposeSensor_Maker",
     "GtTelemetry",
     "GtTelemetry_Maker",
     "SnapshotSpaceheat",
     "SnapshotSpaceheat_Maker",
+    "SnapshotSpaceheatDelta",
+    "SnapshotSpaceheatDelta_Maker",
     "TelemetrySnapshotSpaceheat",
     "TelemetrySnapshotSpaceheat_Maker",
 ]
\ No newline at end of file
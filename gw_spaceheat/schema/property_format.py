@@ -2,6 +2,12 @@ import pendulum
 import struct
 import string
 
+# Bounds of is_reasonable_unix_time_s/ms, computed once rather than parsed on every check.
+MIN_REASONABLE_UNIX_TIME_S = pendulum.parse("2000-01-01T00:00:00Z").int_timestamp
+MAX_REASONABLE_UNIX_TIME_S = pendulum.parse("3000-01-01T00:00:00Z").int_timestamp
+MIN_REASONABLE_UNIX_TIME_MS = MIN_REASONABLE_UNIX_TIME_S * 1000
+MAX_REASONABLE_UNIX_TIME_MS = MAX_REASONABLE_UNIX_TIME_S * 1000
+
 
 def is_bit(candidate):
     if candidate == 0:
@@ -41,17 +47,17 @@ def is_positive_integer(candidate):
 
 
 def is_reasonable_unix_time_ms(candidate):
-    if pendulum.parse("2000-01-01T00:00:00Z").int_timestamp * 1000 > candidate:
+    if MIN_REASONABLE_UNIX_TIME_MS > candidate:
         return False
-    if pendulum.parse("3000-01-01T00:00:00Z").int_timestamp * 1000 < candidate:
+    if MAX_REASONABLE_UNIX_TIME_MS < candidate:
         return False
     return True
 
 
 def is_reasonable_unix_time_s(candidate):
-    if pendulum.parse("2000-01-01T00:00:00Z").int_timestamp > candidate:
+    if MIN_REASONABLE_UNIX_TIME_S > candidate:
         return False
-    if pendulum.parse("3000-01-01T00:00:00Z").int_timestamp < candidate:
+    if MAX_REASONABLE_UNIX_TIME_S < candidate:
         return False
     return True
 
@@ -6,9 +6,13 @@ from schema.gt.messages import GtDispatchBoolean_Maker
 from schema.messages import GtDispatchBooleanLocal_Maker
 from schema.messages import GtDriverBooleanactuatorCmd_Maker
 from schema.messages import GtShCliAtnCmd_Maker
+from schema.messages import GtShCliSnapshotDeltaCmd_Maker
+from schema.messages import GtShCliStatusBackfillCmd_Maker
 from schema.messages import TelemetrySnapshotSpaceheat_Maker
 from schema.messages import GtShStatus_Maker
+from schema.messages import GtShStatusCompact_Maker
 from schema.messages import SnapshotSpaceheat_Maker
+from schema.messages import SnapshotSpaceheatDelta_Maker
 from schema.messages import GtShTelemetryFromMultipurposeSensor_Maker
 from schema.messages import GtTelemetry_Maker
 
@@ -20,9 +24,13 @@ schema_makers: List[GtTelemetry_Maker] = [
     GtDispatchBooleanLocal_Maker,
     GtDriverBooleanactuatorCmd_Maker,
     GtShCliAtnCmd_Maker,
+    GtShCliSnapshotDeltaCmd_Maker,
+    GtShCliStatusBackfillCmd_Maker,
     TelemetrySnapshotSpaceheat_Maker,
     GtShStatus_Maker,
+    GtShStatusCompact_Maker,
     SnapshotSpaceheat_Maker,
+    SnapshotSpaceheatDelta_Maker,
     GtShTelemetryFromMultipurposeSensor_Maker,
     GtTelemetry_Maker,
 ]
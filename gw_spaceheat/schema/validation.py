@@ -0,0 +1,117 @@
+"""Process-wide policy for how much the schema Makers validate the messages they construct.
+
+Makers build messages from two sources: arguments passed by code in this process (Maker.__init__), and dicts or
+payloads received from elsewhere (dict_to_tuple, type_to_tuple). The latter are untrusted and always get the full
+check_for_errors(). The former are checked according to the ValidationPolicy of their type alias:
+
+    full      every message is checked (the default)
+    sampled   the first message, then every sample_every-th message, is checked
+    trusted   no message is checked
+
+Set the policy globally with configure() or set_policy(), or per type with set_policy(policy, type_alias).
+"""
+
+import threading
+from typing import Optional
+
+from config import SchemaValidation
+from config import ValidationPolicy
+
+
+class ValidationStats:
+    num_constructed: int = 0
+    num_checked: int = 0
+
+    @property
+    def num_skipped(self) -> int:
+        return self.num_constructed - self.num_checked
+
+    def as_dict(self) -> dict[str, int]:
+        return dict(
+            num_constructed=self.num_constructed,
+            num_checked=self.num_checked,
+            num_skipped=self.num_skipped,
+        )
+
+
+class Validator:
+    _default_policy: ValidationPolicy
+    _policies: dict[str, ValidationPolicy]
+    _sample_every: int
+    _counts: dict[str, int]
+    _stats: dict[str, ValidationStats]
+    _lock: threading.Lock
+
+    def __init__(self, settings: Optional[SchemaValidation] = None):
+        self._lock = threading.Lock()
+        self.configure(settings or SchemaValidation())
+
+    def configure(self, settings: SchemaValidation) -> None:
+        with self._lock:
+            self._default_policy = settings.default_policy
+            self._policies = dict(settings.policies)
+            self._sample_every = max(1, settings.sample_every)
+            self._counts = dict()
+            self._stats = dict()
+
+    def settings(self) -> SchemaValidation:
+        with self._lock:
+            return SchemaValidation(
+                default_policy=self._default_policy,
+                sample_every=self._sample_every,
+                policies=dict(self._policies),
+            )
+
+    def set_policy(self, policy: ValidationPolicy, type_alias: Optional[str] = None) -> None:
+        """Set the policy for one type alias or, if type_alias is None, the default for all types without one."""
+        with self._lock:
+            if type_alias is None:
+                self._default_policy = policy
+            else:
+                self._policies[type_alias] = policy
+
+    def policy(self, type_alias: str) -> ValidationPolicy:
+        return self._policies.get(type_alias, self._default_policy)
+
+    def should_check(self, type_alias: str) -> bool:
+        """Whether a message of type_alias that was just constructed locally should be checked."""
+        policy = self._policies.get(type_alias, self._default_policy)
+        with self._lock:
+            stats = self._stats.get(type_alias)
+            if stats is None:
+                stats = self._stats[type_alias] = ValidationStats()
+            stats.num_constructed += 1
+            if policy == ValidationPolicy.full:
+                check = True
+            elif policy == ValidationPolicy.trusted:
+                check = False
+            else:
+                count = self._counts.get(type_alias, 0)
+                self._counts[type_alias] = count + 1
+                check = count % self._sample_every == 0
+            if check:
+                stats.num_checked += 1
+        return check
+
+    def stats(self) -> dict[str, ValidationStats]:
+        with self._lock:
+            return dict(self._stats)
+
+
+_validator = Validator()
+
+
+def validator() -> Validator:
+    return _validator
+
+
+def configure(settings: SchemaValidation) -> None:
+    _validator.configure(settings)
+
+
+def set_policy(policy: ValidationPolicy, type_alias: Optional[str] = None) -> None:
+    _validator.set_policy(policy, type_alias)
+
+
+def should_check(type_alias: str) -> bool:
+    return _validator.should_check(type_alias)
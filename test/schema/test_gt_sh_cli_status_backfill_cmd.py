@@ -0,0 +1,108 @@
+"""Tests gt.sh.cli.status.backfill.cmd.100 type"""
+import json
+
+import pytest
+from schema.errors import MpSchemaError
+from schema.messages import GtShCliStatusBackfillCmd_Maker as Maker
+
+
+def test_gt_sh_cli_status_backfill_cmd():
+
+    gw_dict = {
+        "FromGNodeAlias": "dw1.isone.ct.newhaven.orange1",
+        "FromGNodeId": "e7f7d6cc-08b0-4b36-bbbb-0a1f8447fd32",
+        "StartUnixS": 1656363000,
+        "EndUnixS": 1656366600,
+        "TypeAlias": "gt.sh.cli.status.backfill.cmd.100",
+    }
+
+    with pytest.raises(MpSchemaError):
+        Maker.type_to_tuple(gw_dict)
+
+    with pytest.raises(MpSchemaError):
+        Maker.type_to_tuple('"not a dict"')
+
+    # Test type_to_tuple
+    gw_type = json.dumps(gw_dict)
+    gw_tuple = Maker.type_to_tuple(gw_type)
+
+    # test type_to_tuple and tuple_to_type maps
+    assert Maker.type_to_tuple(Maker.tuple_to_type(gw_tuple)) == gw_tuple
+
+    # test Maker init
+    t = Maker(
+        from_g_node_alias=gw_tuple.FromGNodeAlias,
+        from_g_node_id=gw_tuple.FromGNodeId,
+        start_unix_s=gw_tuple.StartUnixS,
+        end_unix_s=gw_tuple.EndUnixS,
+        #
+    ).tuple
+    assert t == gw_tuple
+
+    ######################################
+    # MpSchemaError raised if missing a required attribute
+    ######################################
+
+    for key in ["TypeAlias", "FromGNodeAlias", "FromGNodeId", "StartUnixS", "EndUnixS"]:
+        orig_value = gw_dict[key]
+        del gw_dict[key]
+        with pytest.raises(MpSchemaError):
+            Maker.dict_to_tuple(gw_dict)
+        gw_dict[key] = orig_value
+
+    ######################################
+    # MpSchemaError raised if attributes have incorrect type
+    ######################################
+
+    for key in ["FromGNodeAlias", "FromGNodeId"]:
+        orig_value = gw_dict[key]
+        gw_dict[key] = 42
+        with pytest.raises(MpSchemaError):
+            Maker.dict_to_tuple(gw_dict)
+        gw_dict[key] = orig_value
+
+    for key in ["StartUnixS", "EndUnixS"]:
+        orig_value = gw_dict[key]
+        gw_dict[key] = 1.1
+        with pytest.raises(MpSchemaError):
+            Maker.dict_to_tuple(gw_dict)
+        gw_dict[key] = -1
+        with pytest.raises(MpSchemaError):
+            Maker.dict_to_tuple(gw_dict)
+        gw_dict[key] = orig_value
+
+    ######################################
+    # MpSchemaError raised if hand coded constraints are violated
+    ######################################
+
+    gw_dict["EndUnixS"] = gw_dict["StartUnixS"] - 1
+    with pytest.raises(MpSchemaError):
+        Maker.dict_to_tuple(gw_dict)
+    gw_dict["EndUnixS"] = gw_dict["StartUnixS"]
+    Maker.dict_to_tuple(gw_dict)
+    gw_dict["EndUnixS"] = 1656366600
+
+    ######################################
+    # MpSchemaError raised if TypeAlias is incorrect
+    ######################################
+
+    gw_dict["TypeAlias"] = "not the type alias"
+    with pytest.raises(MpSchemaError):
+        Maker.dict_to_tuple(gw_dict)
+    gw_dict["TypeAlias"] = "gt.sh.cli.status.backfill.cmd.100"
+
+    ######################################
+    # MpSchemaError raised if primitive attributes do not have appropriate property_format
+    ######################################
+
+    gw_dict["FromGNodeAlias"] = "a.b-h"
+    with pytest.raises(MpSchemaError):
+        Maker.dict_to_tuple(gw_dict)
+    gw_dict["FromGNodeAlias"] = "dw1.isone.ct.newhaven.orange1"
+
+    gw_dict["FromGNodeId"] = "d4be12d5-33ba-4f1f-b9e5"
+    with pytest.raises(MpSchemaError):
+        Maker.dict_to_tuple(gw_dict)
+    gw_dict["FromGNodeId"] = "e7f7d6cc-08b0-4b36-bbbb-0a1f8447fd32"
+
+    # End of Test
@@ -1,4 +1,4 @@
-"""Tests gt.sh.simple.telemetry.status.100 type"""
+"""Tests gt.sh.simple.telemetry.status.100 and .101 types"""
 import json
 
 import pytest
@@ -132,4 +132,55 @@ def test_gt_sh_simple_telemetry_status():
         Maker.dict_to_tuple(gw_dict)
     gw_dict["ShNodeAlias"] = "a.elt1.relay"
 
+    ######################################
+    # Optional compression attributes
+    ######################################
+
+    gw_dict["CompressionMethod"] = "swinging_door"
+    gw_dict["CompressionErrorBound"] = 50.0
+    with pytest.raises(MpSchemaError):
+        Maker.dict_to_tuple(gw_dict)
+
+    gw_dict["TypeAlias"] = "gt.sh.simple.telemetry.status.101"
+    gw_tuple = Maker.type_to_tuple(json.dumps(gw_dict))
+    assert (gw_tuple.CompressionMethod, gw_tuple.CompressionErrorBound) == ("swinging_door", 50.0)
+    assert Maker.type_to_tuple(Maker.tuple_to_type(gw_tuple)) == gw_tuple
+
+    gw_dict["CompressionErrorBound"] = 50
+    gw_tuple = Maker.dict_to_tuple(gw_dict)
+    assert isinstance(gw_tuple.CompressionErrorBound, float)
+    assert gw_tuple.CompressionErrorBound == 50.0
+
+    t = Maker(
+        value_list=gw_tuple.ValueList,
+        read_time_unix_ms_list=gw_tuple.ReadTimeUnixMsList,
+        telemetry_name=gw_tuple.TelemetryName,
+        sh_node_alias=gw_tuple.ShNodeAlias,
+        compression_method="swinging_door",
+        compression_error_bound=50,
+    ).tuple
+    assert t == gw_tuple
+
+    gw_dict["CompressionErrorBound"] = "50"
+    with pytest.raises(MpSchemaError):
+        Maker.dict_to_tuple(gw_dict)
+    gw_dict["CompressionErrorBound"] = True
+    with pytest.raises(MpSchemaError):
+        Maker.dict_to_tuple(gw_dict)
+    gw_dict["CompressionErrorBound"] = -1.0
+    with pytest.raises(MpSchemaError):
+        Maker.dict_to_tuple(gw_dict)
+    del gw_dict["CompressionErrorBound"]
+    with pytest.raises(MpSchemaError):
+        Maker.dict_to_tuple(gw_dict)
+    gw_dict["CompressionMethod"] = 42
+    gw_dict["CompressionErrorBound"] = 50.0
+    with pytest.raises(MpSchemaError):
+        Maker.dict_to_tuple(gw_dict)
+    del gw_dict["CompressionMethod"]
+    del gw_dict["CompressionErrorBound"]
+    with pytest.raises(MpSchemaError):
+        Maker.dict_to_tuple(gw_dict)
+    gw_dict["TypeAlias"] = "gt.sh.simple.telemetry.status.100"
+
     # End of Test
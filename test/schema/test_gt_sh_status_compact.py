@@ -0,0 +1,156 @@
+"""Tests gt.sh.status.compact.100 type"""
+import json
+
+import pytest
+from schema.errors import MpSchemaError
+from schema.messages import GtShStatusCompact_Maker as Maker
+
+
+def test_gt_sh_status_compact():
+
+    gw_dict = {
+        "SlotStartUnixS": 1656443700,
+        "TelemetryAggregateList": [
+            {
+                "AboutNodeAlias": "a.elt1",
+                "SensorNodeAlias": "a.m",
+                "TelemetryNameGtEnumSymbol": "af39eec9",
+                "Count": 8,
+                "Min": 900,
+                "Max": 5000,
+                "Mean": 2637.5,
+                "Last": 1000,
+                "FirstReadTimeUnixMs": 1656443705023,
+                "LastReadTimeUnixMs": 1656443705303,
+                "ValueList": [5000, 900],
+                "ReadTimeUnixMsList": [1656443705063, 1656443705143],
+                "TypeAlias": "gt.sh.telemetry.aggregate.100",
+            }
+        ],
+        "AboutGNodeAlias": "dw1.isone.ct.newhaven.orange1.ta",
+        "BooleanactuatorCmdList": [],
+        "FromGNodeAlias": "dw1.isone.ct.newhaven.orange1.ta.scada",
+        "FromGNodeId": "0384ef21-648b-4455-b917-58a1172d7fc1",
+        "StatusUid": "dedc25c2-8276-4b25-abd6-f53edc79b62b",
+        "ReportingPeriodS": 300,
+        "SampleRule": "extrema",
+        "TypeAlias": "gt.sh.status.compact.100",
+    }
+
+    with pytest.raises(MpSchemaError):
+        Maker.type_to_tuple(gw_dict)
+
+    with pytest.raises(MpSchemaError):
+        Maker.type_to_tuple('"not a dict"')
+
+    # Test type_to_tuple
+    gw_type = json.dumps(gw_dict)
+    gw_tuple = Maker.type_to_tuple(gw_type)
+
+    # test type_to_tuple and tuple_to_type maps
+    assert Maker.type_to_tuple(Maker.tuple_to_type(gw_tuple)) == gw_tuple
+
+    # test Maker init
+    t = Maker(
+        slot_start_unix_s=gw_tuple.SlotStartUnixS,
+        telemetry_aggregate_list=gw_tuple.TelemetryAggregateList,
+        about_g_node_alias=gw_tuple.AboutGNodeAlias,
+        booleanactuator_cmd_list=gw_tuple.BooleanactuatorCmdList,
+        from_g_node_alias=gw_tuple.FromGNodeAlias,
+        from_g_node_id=gw_tuple.FromGNodeId,
+        status_uid=gw_tuple.StatusUid,
+        reporting_period_s=gw_tuple.ReportingPeriodS,
+        sample_rule=gw_tuple.SampleRule,
+        #
+    ).tuple
+    assert t == gw_tuple
+
+    ######################################
+    # MpSchemaError raised if missing a required attribute
+    ######################################
+
+    for key in [
+        "TypeAlias",
+        "SlotStartUnixS",
+        "TelemetryAggregateList",
+        "AboutGNodeAlias",
+        "BooleanactuatorCmdList",
+        "FromGNodeAlias",
+        "FromGNodeId",
+        "StatusUid",
+        "ReportingPeriodS",
+        "SampleRule",
+    ]:
+        orig_value = gw_dict[key]
+        del gw_dict[key]
+        with pytest.raises(MpSchemaError):
+            Maker.dict_to_tuple(gw_dict)
+        gw_dict[key] = orig_value
+
+    ######################################
+    # MpSchemaError raised if attributes have incorrect type
+    ######################################
+
+    for key in ["SlotStartUnixS", "ReportingPeriodS"]:
+        orig_value = gw_dict[key]
+        gw_dict[key] = 1.1
+        with pytest.raises(MpSchemaError):
+            Maker.dict_to_tuple(gw_dict)
+        gw_dict[key] = orig_value
+
+    for key in ["AboutGNodeAlias", "FromGNodeAlias", "FromGNodeId", "StatusUid", "SampleRule"]:
+        orig_value = gw_dict[key]
+        gw_dict[key] = 42
+        with pytest.raises(MpSchemaError):
+            Maker.dict_to_tuple(gw_dict)
+        gw_dict[key] = orig_value
+
+    for key in ["TelemetryAggregateList", "BooleanactuatorCmdList"]:
+        orig_value = gw_dict[key]
+        gw_dict[key] = ["Not even a dict"]
+        with pytest.raises(MpSchemaError):
+            Maker.dict_to_tuple(gw_dict)
+        gw_dict[key] = orig_value
+
+    with pytest.raises(MpSchemaError):
+        Maker(
+            slot_start_unix_s=gw_tuple.SlotStartUnixS,
+            telemetry_aggregate_list=["Not a GtShTelemetryAggregate"],
+            about_g_node_alias=gw_tuple.AboutGNodeAlias,
+            booleanactuator_cmd_list=gw_tuple.BooleanactuatorCmdList,
+            from_g_node_alias=gw_tuple.FromGNodeAlias,
+            from_g_node_id=gw_tuple.FromGNodeId,
+            status_uid=gw_tuple.StatusUid,
+            reporting_period_s=gw_tuple.ReportingPeriodS,
+            sample_rule=gw_tuple.SampleRule,
+        )
+
+    ######################################
+    # MpSchemaError raised if TypeAlias is incorrect
+    ######################################
+
+    gw_dict["TypeAlias"] = "not the type alias"
+    with pytest.raises(MpSchemaError):
+        Maker.dict_to_tuple(gw_dict)
+    gw_dict["TypeAlias"] = "gt.sh.status.compact.100"
+
+    ######################################
+    # MpSchemaError raised if primitive attributes do not have appropriate property_format
+    ######################################
+
+    gw_dict["SlotStartUnixS"] = 32503683600
+    with pytest.raises(MpSchemaError):
+        Maker.dict_to_tuple(gw_dict)
+    gw_dict["SlotStartUnixS"] = 1656443700
+
+    gw_dict["AboutGNodeAlias"] = "a.b-h"
+    with pytest.raises(MpSchemaError):
+        Maker.dict_to_tuple(gw_dict)
+    gw_dict["AboutGNodeAlias"] = "dw1.isone.ct.newhaven.orange1.ta"
+
+    gw_dict["StatusUid"] = "d4be12d5-33ba-4f1f-b9e5"
+    with pytest.raises(MpSchemaError):
+        Maker.dict_to_tuple(gw_dict)
+    gw_dict["StatusUid"] = "dedc25c2-8276-4b25-abd6-f53edc79b62b"
+
+    # End of Test
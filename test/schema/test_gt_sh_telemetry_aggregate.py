@@ -0,0 +1,173 @@
+"""Tests gt.sh.telemetry.aggregate.100 type"""
+import json
+
+import pytest
+from schema.errors import MpSchemaError
+from schema.messages import GtShTelemetryAggregate_Maker as Maker
+
+
+def test_gt_sh_telemetry_aggregate():
+
+    gw_dict = {
+        "AboutNodeAlias": "a.elt1",
+        "SensorNodeAlias": "a.m",
+        "TelemetryNameGtEnumSymbol": "af39eec9",
+        "Count": 8,
+        "Min": 900,
+        "Max": 5000,
+        "Mean": 2637.5,
+        "Last": 1000,
+        "FirstReadTimeUnixMs": 1656443705023,
+        "LastReadTimeUnixMs": 1656443705303,
+        "ValueList": [5000, 900],
+        "ReadTimeUnixMsList": [1656443705063, 1656443705143],
+        "TypeAlias": "gt.sh.telemetry.aggregate.100",
+    }
+
+    with pytest.raises(MpSchemaError):
+        Maker.type_to_tuple(gw_dict)
+
+    with pytest.raises(MpSchemaError):
+        Maker.type_to_tuple('"not a dict"')
+
+    # Test type_to_tuple
+    gw_type = json.dumps(gw_dict)
+    gw_tuple = Maker.type_to_tuple(gw_type)
+
+    # test type_to_tuple and tuple_to_type maps
+    assert Maker.type_to_tuple(Maker.tuple_to_type(gw_tuple)) == gw_tuple
+
+    # test Maker init
+    t = Maker(
+        about_node_alias=gw_tuple.AboutNodeAlias,
+        sensor_node_alias=gw_tuple.SensorNodeAlias,
+        telemetry_name=gw_tuple.TelemetryName,
+        count=gw_tuple.Count,
+        min=gw_tuple.Min,
+        max=gw_tuple.Max,
+        mean=gw_tuple.Mean,
+        last=gw_tuple.Last,
+        first_read_time_unix_ms=gw_tuple.FirstReadTimeUnixMs,
+        last_read_time_unix_ms=gw_tuple.LastReadTimeUnixMs,
+        value_list=gw_tuple.ValueList,
+        read_time_unix_ms_list=gw_tuple.ReadTimeUnixMsList,
+        #
+    ).tuple
+    assert t == gw_tuple
+
+    ######################################
+    # MpSchemaError raised if missing a required attribute
+    ######################################
+
+    for key in [
+        "TypeAlias",
+        "AboutNodeAlias",
+        "SensorNodeAlias",
+        "TelemetryNameGtEnumSymbol",
+        "Count",
+        "Min",
+        "Max",
+        "Mean",
+        "Last",
+        "FirstReadTimeUnixMs",
+        "LastReadTimeUnixMs",
+        "ValueList",
+        "ReadTimeUnixMsList",
+    ]:
+        orig_value = gw_dict[key]
+        del gw_dict[key]
+        with pytest.raises(MpSchemaError):
+            Maker.dict_to_tuple(gw_dict)
+        gw_dict[key] = orig_value
+
+    ######################################
+    # MpSchemaError raised if attributes have incorrect type
+    ######################################
+
+    for key in [
+        "AboutNodeAlias",
+        "SensorNodeAlias",
+        "Count",
+        "Min",
+        "Max",
+        "Last",
+        "FirstReadTimeUnixMs",
+        "LastReadTimeUnixMs",
+        "ValueList",
+        "ReadTimeUnixMsList",
+    ]:
+        orig_value = gw_dict[key]
+        gw_dict[key] = 42 if key in ["AboutNodeAlias", "SensorNodeAlias", "ValueList", "ReadTimeUnixMsList"] else 1.1
+        with pytest.raises(MpSchemaError):
+            Maker.dict_to_tuple(gw_dict)
+        gw_dict[key] = orig_value
+
+    gw_dict["Mean"] = "42"
+    with pytest.raises(MpSchemaError):
+        Maker.dict_to_tuple(gw_dict)
+    gw_dict["Mean"] = 2637.5
+
+    with pytest.raises(MpSchemaError):
+        Maker(
+            about_node_alias=gw_tuple.AboutNodeAlias,
+            sensor_node_alias=gw_tuple.SensorNodeAlias,
+            telemetry_name="This is not a TelemetryName Enum.",
+            count=gw_tuple.Count,
+            min=gw_tuple.Min,
+            max=gw_tuple.Max,
+            mean=gw_tuple.Mean,
+            last=gw_tuple.Last,
+            first_read_time_unix_ms=gw_tuple.FirstReadTimeUnixMs,
+            last_read_time_unix_ms=gw_tuple.LastReadTimeUnixMs,
+            value_list=gw_tuple.ValueList,
+            read_time_unix_ms_list=gw_tuple.ReadTimeUnixMsList,
+        )
+
+    ######################################
+    # MpSchemaError raised if hand-coded constraints are violated
+    ######################################
+
+    gw_dict["ReadTimeUnixMsList"] = [1656443705063]
+    with pytest.raises(MpSchemaError):
+        Maker.dict_to_tuple(gw_dict)
+    gw_dict["ReadTimeUnixMsList"] = [1656443705063, 1656443705143]
+
+    gw_dict["Count"] = 1
+    with pytest.raises(MpSchemaError):
+        Maker.dict_to_tuple(gw_dict)
+    gw_dict["Count"] = 8
+
+    gw_dict["Min"] = 5001
+    with pytest.raises(MpSchemaError):
+        Maker.dict_to_tuple(gw_dict)
+    gw_dict["Min"] = 900
+
+    ######################################
+    # MpSchemaError raised if TypeAlias is incorrect
+    ######################################
+
+    gw_dict["TypeAlias"] = "not the type alias"
+    with pytest.raises(MpSchemaError):
+        Maker.dict_to_tuple(gw_dict)
+    gw_dict["TypeAlias"] = "gt.sh.telemetry.aggregate.100"
+
+    ######################################
+    # MpSchemaError raised if primitive attributes do not have appropriate property_format
+    ######################################
+
+    gw_dict["AboutNodeAlias"] = "a.b-h"
+    with pytest.raises(MpSchemaError):
+        Maker.dict_to_tuple(gw_dict)
+    gw_dict["AboutNodeAlias"] = "a.elt1"
+
+    gw_dict["Count"] = 0
+    with pytest.raises(MpSchemaError):
+        Maker.dict_to_tuple(gw_dict)
+    gw_dict["Count"] = 8
+
+    gw_dict["FirstReadTimeUnixMs"] = 1656443705
+    with pytest.raises(MpSchemaError):
+        Maker.dict_to_tuple(gw_dict)
+    gw_dict["FirstReadTimeUnixMs"] = 1656443705023
+
+    # End of Test
@@ -0,0 +1,72 @@
+"""Test the validation policy applied by schema Makers"""
+import pytest
+
+from config import SchemaValidation
+from config import ValidationPolicy
+from schema import validation
+from schema.errors import MpSchemaError
+from schema.maker_benchmark import main
+from schema.messages import GsPwr_Maker
+from schema.messages import GtTelemetry_Maker
+from schema.enums import TelemetryName
+from schema.property_format import is_reasonable_unix_time_ms
+from schema.property_format import is_reasonable_unix_time_s
+
+
+@pytest.fixture(autouse=True)
+def default_validation():
+    validation.configure(SchemaValidation())
+    yield
+    validation.configure(SchemaValidation())
+
+
+def bad_telemetry() -> GtTelemetry_Maker:
+    return GtTelemetry_Maker(
+        scada_read_time_unix_ms=1,
+        value=1,
+        name=TelemetryName.WATER_TEMP_F_TIMES1000,
+        exponent=3,
+    )
+
+
+def test_reasonable_unix_time():
+    assert is_reasonable_unix_time_s(1656945390)
+    assert not is_reasonable_unix_time_s(1656945390152)
+    assert is_reasonable_unix_time_ms(1656945390152)
+    assert not is_reasonable_unix_time_ms(1656945390)
+    assert not is_reasonable_unix_time_ms(33_000_000_000_000)
+
+
+def test_policies():
+    alias = GtTelemetry_Maker.type_alias
+    with pytest.raises(MpSchemaError):
+        bad_telemetry()
+
+    validation.set_policy(ValidationPolicy.trusted, alias)
+    gw_tuple = bad_telemetry().tuple
+    with pytest.raises(MpSchemaError):
+        GtTelemetry_Maker.dict_to_tuple(gw_tuple.asdict())
+    # Other types still use the default.
+    with pytest.raises(MpSchemaError):
+        GsPwr_Maker(power=100_000)
+
+    validation.configure(SchemaValidation(default_policy=ValidationPolicy.sampled, sample_every=3))
+    assert validation.validator().policy(alias) == ValidationPolicy.sampled
+    raised = []
+    for _ in range(7):
+        try:
+            bad_telemetry()
+            raised.append(False)
+        except MpSchemaError:
+            raised.append(True)
+    assert raised == [True, False, False, True, False, False, True]
+    stats = validation.validator().stats()[alias]
+    assert stats.as_dict() == dict(num_constructed=7, num_checked=3, num_skipped=4)
+    assert validation.validator().settings().sample_every == 3
+
+
+def test_maker_benchmark(tmp_path):
+    report = main(["--iterations", "5", "--samples", "5", "-o", str(tmp_path / "report.json")])
+    for benchmark in report["benchmarks"]:
+        assert set(benchmark["messages_per_s"]) == {policy.value for policy in ValidationPolicy} | {"dict_to_tuple"}
+    assert validation.validator().settings() == SchemaValidation()
@@ -64,8 +64,7 @@ def test_scada2_small():
     s = scada._data.make_simple_telemetry_status(node=typing.cast(ShNode, "garbage"))
     assert s is None
 
-    scada._data.recent_simple_read_times_unix_ms[temp_node] = [int(time.time() * 1000)]
-    scada._data.recent_simple_values[temp_node] = [63000]
+    scada._data.record_simple_reading(temp_node, 63000, int(time.time() * 1000))
     s = scada._data.make_simple_telemetry_status(temp_node)
     assert isinstance(s, GtShSimpleTelemetryStatus)
 
@@ -74,10 +73,9 @@ def test_scada2_small():
         SensorNode=layout.node("a.m"),
         TelemetryName=TelemetryName.CURRENT_RMS_MICRO_AMPS,
     )
-    scada._data.recent_values_from_multipurpose_sensor[tt] = [72000]
-    scada._data.recent_read_times_unix_ms_from_multipurpose_sensor[tt] = [
-        int(time.time() * 1000)
-    ]
+    scada._data.record_multipurpose_reading(
+        layout.telemetry_channels.ids[tt], 72000, int(time.time() * 1000)
+    )
     s = scada._data.make_multipurpose_telemetry_status(tt=tt)
     assert isinstance(s, GtShMultipurposeTelemetryStatus)
     s = scada._data.make_multipurpose_telemetry_status(
@@ -85,9 +83,6 @@ def test_scada2_small():
     )
     assert s is None
 
-    scada._data.recent_ba_cmds[relay_node] = []
-    scada._data.recent_ba_cmd_times_unix_ms[relay_node] = []
-
     # returns None if asked make boolean actuator status for
     # a node that is not a boolean actuator
 
@@ -97,8 +92,7 @@ def test_scada2_small():
     s = scada._data.make_booleanactuator_cmd_status(relay_node)
     assert s is None
 
-    scada._data.recent_ba_cmds[relay_node] = [0]
-    scada._data.recent_ba_cmd_times_unix_ms[relay_node] = [int(time.time() * 1000)]
+    scada._data.record_ba_cmd(relay_node, 0, int(time.time() * 1000))
     s = scada._data.make_booleanactuator_cmd_status(relay_node)
     assert isinstance(s, GtShBooleanactuatorCmdStatus)
 
@@ -350,6 +344,44 @@ async def test_scada2_snaphot_request_delivery():
     await AsyncFragmentRunner.async_run_fragment(Fragment)
 
 
+@pytest.mark.asyncio
+async def test_scada2_snapshot_delta_request_delivery():
+    """Verify scada sends the values changed since the sequence number the Atn acknowledged"""
+
+    class Fragment(ProtocolFragment):
+
+        def get_requested_actors(self):
+            return [self.runner.actors.scada2, self.runner.actors.atn]
+
+        async def async_run(self):
+            atn = self.runner.actors.atn
+            scada2 = self.runner.actors.scada2
+            layout = self.runner.layout
+            temp_node = layout.node("a.tank.temp0")
+            relay_node = layout.node("a.elt1.relay")
+            now_ms = int(time.time() * 1000)
+            scada2._data.record_simple_reading(temp_node, 63000, now_ms)
+            first_seq = scada2._data.snapshot_cache.seq
+
+            atn.snapshot_delta()
+            await await_for(lambda: atn.snapshot_seq == first_seq, 10, "Atn wait for first snapshot delta")
+            assert atn.snapshot_values == {(temp_node.alias, TelemetryName.WATER_TEMP_F_TIMES1000): 63000}
+
+            scada2._data.record_simple_reading(relay_node, 1, now_ms)
+            scada2._data.record_simple_reading(temp_node, 63000, now_ms)
+            assert scada2._data.make_snapshot_delta(first_seq).Snapshot.AboutNodeAliasList == [relay_node.alias]
+            atn.snapshot_delta()
+            await await_for(
+                lambda: atn.snapshot_seq == scada2._data.snapshot_cache.seq, 10, "Atn wait for second snapshot delta"
+            )
+            assert atn.snapshot_values == {
+                (temp_node.alias, TelemetryName.WATER_TEMP_F_TIMES1000): 63000,
+                (relay_node.alias, TelemetryName.RELAY_STATE): 1,
+            }
+
+    await AsyncFragmentRunner.async_run_fragment(Fragment)
+
+
 @pytest.mark.asyncio
 async def test_scada2_status_content_dynamics(tmp_path, monkeypatch):
     """Verify Scada status contains command acks from BooleanActuators and telemetry from SimpleSensor and
@@ -493,3 +525,40 @@ async def test_scada2_status_content_dynamics(tmp_path, monkeypatch):
     runner = AsyncFragmentRunner(settings, actors=actors)
     runner.add_fragment(Fragment(runner))
     await runner.async_run()
+
+
+@pytest.mark.asyncio
+async def test_scada2_status_backfill():
+    """Verify scada resends the statuses it stored for the slots the Atn asks to backfill"""
+
+    class Fragment(ProtocolFragment):
+
+        def get_requested_actors(self):
+            return [self.runner.actors.scada2, self.runner.actors.atn]
+
+        async def async_run(self):
+            atn = self.runner.actors.atn
+            scada2 = self.runner.actors.scada2
+            period_s = scada2.settings.seconds_per_report
+            now_s = int(time.time())
+            slots = [now_s - now_s % period_s - i * period_s for i in range(10, 5, -1)]
+            for slot in slots:
+                assert scada2.status_history.add(scada2._data.make_status(slot)).is_ok()
+            for slot in slots:
+                (atn.status_output_dir / f"GtShStatus.{slot}.json").unlink(missing_ok=True)
+            scada2.send_status()
+            await await_for(lambda: atn.latest_status is not None, 10, "Atn wait for status")
+            latest = atn.latest_status
+
+            atn.status_backfill(slots[1], slots[-1])
+            backfilled = [atn.status_output_dir / f"GtShStatus.{slot}.json" for slot in slots[1:-1]]
+            await await_for(
+                lambda: all(path.exists() for path in backfilled), 10, "Atn wait for backfilled statuses"
+            )
+            for slot, path in zip(slots[1:-1], backfilled):
+                assert GtShStatus_Maker.type_to_tuple(path.read_text()).SlotStartUnixS == slot
+            assert not (atn.status_output_dir / f"GtShStatus.{slots[0]}.json").exists()
+            assert not (atn.status_output_dir / f"GtShStatus.{slots[-1]}.json").exists()
+            assert atn.latest_status is latest
+
+    await AsyncFragmentRunner.async_run_fragment(Fragment)
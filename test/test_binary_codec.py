@@ -0,0 +1,116 @@
+"""Test the binary gridworks payload encoding"""
+import json
+import struct
+from pathlib import Path
+
+import pytest
+
+from actors2.scada2 import GridworksMQTTCodec
+from actors.utils import gw_mqtt_topic_encode
+from config import PayloadEncoding
+from config import ScadaSettings
+from data_classes.hardware_layout import HardwareLayout
+from proactor.message import Message
+from proactor.message import MQTTMessageModel
+from proactor.message import MQTTReceiptPayload
+from schema import binary_codec
+from schema.codec_benchmark import main
+from schema.messages import GsPwr_Maker
+from schema.messages import GtDispatchBoolean_Maker
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        None,
+        True,
+        False,
+        0,
+        23,
+        24,
+        255,
+        65536,
+        2**64 - 1,
+        -1,
+        -25,
+        -(2**64),
+        0.5,
+        1.1,
+        -1e300,
+        "",
+        "héllo",
+        [],
+        [1, 2, 3],
+        list(range(300)),
+        [2**40 + i for i in range(10)],
+        [1, -2] * 10,
+        [1, True] * 10,
+        [1, 2.5] * 10,
+        {"a": 1},
+        {"ValueList": [1] * 8, "TypeAlias": "gt.sh.status.110", "unknown key": ["gt.sh.status.110", "gt"] * 3},
+        {1: "one", 2.5: "two and a half", None: "nothing"},
+        {True: "yes", False: "no"},
+        (1, ("a", "b")),
+    ],
+)
+def test_round_trip(value):
+    encoded = binary_codec.dumps(value)
+    assert binary_codec.is_binary(encoded)
+    assert not binary_codec.is_binary(json.dumps(value).encode())
+    assert binary_codec.loads(encoded) == json.loads(json.dumps(value))
+
+
+def test_smaller_than_json(tmp_path: Path):
+    report = main(["--samples", "20", "--iterations", "2", "-o", str(tmp_path / "report.json")])
+    for benchmark in report["benchmarks"]:
+        json_result, cbor_result = benchmark["results"]
+        assert json_result["encoding"] == PayloadEncoding.json.value
+        assert cbor_result["round_trip_ok"]
+        assert cbor_result["bytes"] < 0.7 * json_result["bytes"]
+
+
+def test_malformed_payloads():
+    encoded = binary_codec.dumps({"ValueList": list(range(100)), "ShNodeAlias": "a.tank.temp0"})
+    with pytest.raises(binary_codec.BinaryCodecError):
+        binary_codec.loads(b'{"a": 1}')
+    for end in range(len(binary_codec.SELF_DESCRIBE), len(encoded) - 1, 7):
+        with pytest.raises(binary_codec.BinaryCodecError):
+            binary_codec.loads(encoded[:end])
+    with pytest.raises(binary_codec.BinaryCodecError):
+        binary_codec.loads(encoded + b"\x00")
+    # A peer built from a different schema is refused rather than misread.
+    table_id = struct.pack(">I", binary_codec.TABLE_ID)
+    other_table = encoded.replace(table_id, struct.pack(">I", binary_codec.TABLE_ID ^ 1), 1)
+    with pytest.raises(binary_codec.BinaryCodecError, match="field table"):
+        binary_codec.loads(other_table)
+
+
+def test_gridworks_codec_accepts_either_encoding():
+    layout = HardwareLayout.load(ScadaSettings().paths.hardware_layout)
+    dispatch = GtDispatchBoolean_Maker(
+        about_node_alias="a.elt1.relay",
+        to_g_node_alias=layout.scada_g_node_alias,
+        from_g_node_alias=layout.atn_g_node_alias,
+        from_g_node_id=layout.atn_g_node_id,
+        relay_state=1,
+        send_time_unix_ms=1656945390152,
+    ).tuple
+    topic = gw_mqtt_topic_encode(f"{layout.atn_g_node_alias}/{dispatch.TypeAlias}")
+    for encoding in PayloadEncoding:
+        codec = GridworksMQTTCodec(layout, encoding)
+        encoded = codec.encode(dispatch)
+        assert binary_codec.is_binary(encoded) == (encoding == PayloadEncoding.cbor)
+        for decoding_codec in [GridworksMQTTCodec(layout, e) for e in PayloadEncoding]:
+            receipt = MQTTReceiptPayload(
+                client_name="gridworks",
+                userdata=None,
+                message=MQTTMessageModel(topic=topic, payload=encoded),
+            )
+            assert decoding_codec.decode(receipt) == dispatch
+
+    # Messages are encoded whole; payloads that have their own binary form keep it.
+    codec = GridworksMQTTCodec(layout, PayloadEncoding.cbor)
+    power = GsPwr_Maker(power=3200).tuple
+    message = Message(src=layout.scada_g_node_alias, payload=power)
+    assert binary_codec.loads(codec.encode(message)) == json.loads(message.json())
+    assert codec.encode(power) == power.as_type()
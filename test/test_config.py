@@ -4,10 +4,19 @@ import textwrap
 from pathlib import Path
 
 import dotenv
+from config import CompactStatusSettings
+from config import DEFAULT_RECEIVE_LANES
 from config import LoggingSettings
+from config import MQTTBackend
+from config import ProcessBatch
+from config import StatusHistorySettings
+from config import StoreAndForwardSettings
+from config import TelemetryCompressionSettings
 from config import MQTTClient
 from config import Paths
+from config import PayloadEncoding
 from config import ScadaSettings
+from config import SchemaValidation
 from pydantic import SecretStr
 
 
@@ -163,6 +172,15 @@ def test_scada_settings_defaults(clean_scada_env, tmp_path):
         async_power_reporting_threshold=0.02,
         paths=exp_paths_dict(home=tmp_path),
         logging=LoggingSettings().dict(),
+        receive_lanes=[lane.dict() for lane in DEFAULT_RECEIVE_LANES],
+        process_batch=ProcessBatch().dict(),
+        mqtt_backend=MQTTBackend.threaded,
+        gridworks_outbound=StoreAndForwardSettings().dict(),
+        status_history=StatusHistorySettings().dict(),
+        compact_status=CompactStatusSettings().dict(),
+        telemetry_compression=TelemetryCompressionSettings().dict(),
+        gridworks_payload_encoding=PayloadEncoding.json,
+        schema_validation=SchemaValidation().dict(),
     )
     assert settings.dict() == exp
     assert settings.local_mqtt == MQTTClient()
@@ -0,0 +1,70 @@
+"""Test the table-driven message dispatch"""
+import asyncio
+
+import pytest
+
+from proactor.dispatch import DispatchTable
+
+
+class Base:
+    pass
+
+
+class Derived(Base):
+    pass
+
+
+class Other:
+    pass
+
+
+@pytest.mark.asyncio
+async def test_dispatch_table():
+    table = DispatchTable("test")
+    calls = []
+
+    def on_base(payload):
+        calls.append(("base", payload))
+        return "sync"
+
+    async def on_other(payload):
+        await asyncio.sleep(0)
+        calls.append(("other", payload))
+        return "async"
+
+    table.register(Base, on_base)
+    table.register(Other, on_other)
+    assert len(table) == 2
+    with pytest.raises(ValueError):
+        table.register(Base, on_base)
+
+    # Exact and subclass lookups; a subclass resolves to its nearest registered base.
+    assert await table.lookup(Base)(1) == "sync"
+    assert await table.lookup(Derived)(2) == "sync"
+    assert await table.lookup(Other)(3) == "async"
+    assert table.lookup(int) is None
+    assert Derived in table
+    assert calls == [("base", 1), ("base", 2), ("other", 3)]
+
+    # Registering a more specific handler takes precedence over the cached resolution.
+    table.register(Derived, lambda payload: calls.append(("derived", payload)))
+    await table.lookup(Derived)(4)
+    assert calls[-1] == ("derived", 4)
+
+    def on_fail(payload):
+        raise RuntimeError(payload)
+
+    table.register("fail", on_fail)
+    with pytest.raises(RuntimeError):
+        await table.lookup("fail")(5)
+
+    stats = table.stats()
+    assert set(stats) == {"test/Base", "test/Other", "test/Derived", "test/fail"}
+    assert stats["test/Base"].num_calls == 2
+    assert stats["test/Other"].num_calls == 1
+    assert stats["test/Other"].total_s > 0
+    assert stats["test/fail"].as_dict()["num_errors"] == 1
+
+    assert table.unregister(Derived) is not None
+    await table.lookup(Derived)(6)
+    assert calls[-1] == ("base", 6)
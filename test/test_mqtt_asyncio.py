@@ -0,0 +1,41 @@
+"""Test the asyncio MQTT backend without a broker"""
+import asyncio
+
+import pytest
+
+from config import MQTTClient
+from proactor.message import MessageType
+from proactor.mqtt import AsyncioMQTTClientWrapper
+from proactor.sync_thread import AsyncQueueWriter
+
+
+@pytest.mark.asyncio
+async def test_asyncio_backend_retries_non_oserror_connect_failure(monkeypatch):
+    monkeypatch.setattr(AsyncioMQTTClientWrapper, "RECONNECT_MIN_DELAY_S", 0.01)
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    client = AsyncioMQTTClientWrapper("gridworks", MQTTClient(), AsyncQueueWriter(loop, queue), loop)
+    attempts = 0
+
+    def reconnect():
+        nonlocal attempts
+        attempts += 1
+        raise ValueError("Invalid host.")
+
+    monkeypatch.setattr(client._client, "reconnect", reconnect)
+    client.start()
+    try:
+        for _ in range(500):
+            if attempts >= 3:
+                break
+            await asyncio.sleep(0.01)
+        # The misc task keeps retrying rather than ending with the first failure.
+        assert attempts >= 3
+        assert not client._misc_task.done()
+        assert isinstance(client.last_connect_error, ValueError)
+        assert queue.qsize() >= 2
+        assert (await queue.get()).header.message_type == MessageType.mqtt_connect_failed.value
+    finally:
+        client.stop()
+        with pytest.raises(asyncio.CancelledError):
+            await client._misc_task
@@ -0,0 +1,19 @@
+"""Test the MQTT backends through the MQTT benchmark"""
+import json
+from pathlib import Path
+
+from proactor.mqtt_benchmark import main
+
+
+def test_mqtt_benchmark_report(tmp_path: Path):
+    output = tmp_path / "report.json"
+    report = main(["-n", "200", "--burst", "20", "--timeout", "20", "-o", str(output)])
+    assert json.loads(output.read_text()) == report
+    by_backend = {benchmark["backend"]: benchmark for benchmark in report["benchmarks"]}
+    assert set(by_backend) == {"threaded", "asyncio"}
+    for benchmark in by_backend.values():
+        assert benchmark["received"] == 200
+        assert benchmark["latency_s"]["max"] > 0
+    # Asyncio backend callbacks run on the event loop thread, so receipts need no cross-thread wakeups.
+    assert by_backend["asyncio"]["wakeups"]["num_wakeups"] == 0
+    assert by_backend["threaded"]["wakeups"]["num_wakeups"] > 0
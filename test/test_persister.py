@@ -0,0 +1,747 @@
+"""Test PersisterInterface implementations"""
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Callable
+
+import pendulum
+import pytest
+from result import Err
+from result import Ok
+
+from proactor.async_persister import AsyncPersister
+from proactor.async_persister import PersisterStopped
+from proactor.persister import Compression
+from proactor.persister import ContentTooLarge
+from proactor.persister import Durability
+from proactor.persister import DurabilityMode
+from proactor.persister import FileMissingWarning
+from proactor.persister import PayloadCodec
+from proactor.persister import PersisterInterface
+from proactor.persister import TimedRollingFilePersister
+from proactor.persister import UIDExistedWarning
+from proactor.segmented_persister import CorruptRecord
+from proactor.segmented_persister import SegmentedLogPersister
+from proactor.sqlite_persister import SqlitePersister
+
+PersisterFactory = Callable[..., PersisterInterface]
+
+PERSISTER_FACTORIES = [
+    pytest.param(TimedRollingFilePersister, id="TimedRollingFilePersister"),
+    pytest.param(SegmentedLogPersister, id="SegmentedLogPersister"),
+    pytest.param(SqlitePersister, id="SqlitePersister"),
+]
+# Persisters which sync through os.fsync rather than inside a database engine.
+FILE_PERSISTER_FACTORIES = PERSISTER_FACTORIES[:2]
+
+
+@pytest.fixture
+def persister_dir(tmp_path: Path) -> Path:
+    """A directory used only by the persister, separate from the xdg directories the test env creates."""
+    return tmp_path / "persister"
+
+
+def make_content(i: int, size: int = 100) -> bytes:
+    prefix = f'{{"i": {i}, "pad": "'.encode()
+    suffix = b'"}'
+    return prefix + b"x" * max(0, size - len(prefix) - len(suffix)) + suffix
+
+
+@pytest.mark.parametrize("factory", PERSISTER_FACTORIES)
+def test_persister_basic(factory: PersisterFactory, persister_dir: Path):
+    p = factory(persister_dir)
+    assert p.num_pending == 0
+    assert p.pending() == set()
+
+    uids = [str(uuid.uuid4()) for _ in range(5)]
+    for i, uid in enumerate(uids):
+        assert p.persist(uid, make_content(i)).is_ok()
+    assert p.num_pending == len(uids)
+    assert p.pending() == set(uids)
+    for i, uid in enumerate(uids):
+        assert p.retrieve(uid) == Ok(make_content(i))
+
+    # Unknown uid
+    assert p.retrieve("not-a-uid") == Ok(None)
+    match p.clear("not-a-uid"):
+        case Err(problems):
+            assert not problems.errors
+            assert isinstance(problems.warnings[0], FileMissingWarning)
+        case _:
+            raise AssertionError("Expected Err from clear() of unknown uid")
+
+    # Clear
+    assert p.clear(uids[0]) == Ok()
+    assert p.num_pending == len(uids) - 1
+    assert uids[0] not in p.pending()
+    assert p.retrieve(uids[0]) == Ok(None)
+
+    # Re-persist of existing uid warns but replaces content
+    match p.persist(uids[1], b"replaced"):
+        case Err(problems):
+            assert not problems.errors
+            assert isinstance(problems.warnings[0], UIDExistedWarning)
+        case _:
+            raise AssertionError("Expected Err from re-persist of existing uid")
+    assert p.retrieve(uids[1]) == Ok(b"replaced")
+    assert p.num_pending == len(uids) - 1
+
+
+@pytest.mark.parametrize("factory", PERSISTER_FACTORIES)
+def test_persister_reindex(factory: PersisterFactory, persister_dir: Path):
+    p = factory(persister_dir)
+    uids = [str(uuid.uuid4()) for _ in range(10)]
+    for i, uid in enumerate(uids):
+        assert p.persist(uid, make_content(i)).is_ok()
+    for uid in uids[:3]:
+        assert p.clear(uid).is_ok()
+    if hasattr(p, "close"):
+        p.close()
+
+    p2 = factory(persister_dir)
+    assert p2.pending() == set(uids[3:])
+    for i, uid in enumerate(uids[3:], start=3):
+        assert p2.retrieve(uid) == Ok(make_content(i))
+    assert p2.reindex().is_ok()
+    assert p2.pending() == set(uids[3:])
+
+
+@pytest.mark.parametrize("factory", PERSISTER_FACTORIES)
+def test_persister_content_too_large(factory: PersisterFactory, persister_dir: Path):
+    p = factory(persister_dir, max_bytes=1000)
+    match p.persist("big", b"x" * 1001):
+        case Err(problems):
+            assert isinstance(problems.errors[0], ContentTooLarge)
+        case _:
+            raise AssertionError("Expected ContentTooLarge")
+    assert p.num_pending == 0
+
+
+@pytest.mark.parametrize("factory", FILE_PERSISTER_FACTORIES)
+def test_persister_durability(factory: PersisterFactory, persister_dir: Path, monkeypatch):
+    fsyncs = []
+    original_fsync = os.fsync
+
+    def counting_fsync(fd):
+        fsyncs.append(fd)
+        return original_fsync(fd)
+
+    monkeypatch.setattr(os, "fsync", counting_fsync)
+
+    # none: nothing is synced; futures are resolved on return.
+    p = factory(persister_dir / "none")
+    future = p.persist("a", b"a").unwrap()
+    assert future.done() and future.result()
+    assert not fsyncs
+
+    # fsync: every persist is synced before it returns.
+    p = factory(persister_dir / "fsync", durability=Durability(mode=DurabilityMode.fsync))
+    fsyncs.clear()
+    for i in range(10):
+        future = p.persist(str(i), make_content(i)).unwrap()
+        assert future.done() and future.result()
+    fsyncs_per_write = len(fsyncs)
+    assert fsyncs_per_write >= 10
+
+    # group: futures resolve together, when enough bytes are unsynced or on commit().
+    p = factory(
+        persister_dir / "group",
+        durability=Durability(mode=DurabilityMode.group, group_ms=60_000, group_bytes=10_000),
+    )
+    fsyncs.clear()
+    futures = [p.persist(str(i), make_content(i)).unwrap() for i in range(10)]
+    assert not any(future.done() for future in futures)
+    assert p.num_unsynced == 10
+    assert p.commit().is_ok()
+    assert all(future.done() and future.result() for future in futures)
+    assert p.num_unsynced == 0
+    assert 0 < len(fsyncs) < fsyncs_per_write
+
+    futures = [p.persist(f"big-{i}", make_content(i, size=3_000)).unwrap() for i in range(4)]
+    assert all(future.done() for future in futures)
+    assert p.num_unsynced == 0
+    future = p.persist("last", b"last").unwrap()
+    assert not future.done()
+    p.close()
+    assert future.done()
+    assert factory(persister_dir / "group").pending() == {str(i) for i in range(10)} | {
+        f"big-{i}" for i in range(4)
+    } | {"last"}
+
+
+@pytest.mark.parametrize("factory", PERSISTER_FACTORIES)
+def test_persister_iter_pending(factory: PersisterFactory, persister_dir: Path):
+    p = factory(persister_dir)
+    assert list(p.iter_pending()) == []
+    uids = [str(uuid.uuid4()) for _ in range(20)]
+    for i, uid in enumerate(uids):
+        assert p.persist(uid, make_content(i)).is_ok()
+    # Re-persisting moves a uid to the end of the persisted-time order.
+    p.persist(uids[0], make_content(0))
+    uids = uids[1:] + uids[:1]
+    contents = {uid: p.retrieve(uid).unwrap() for uid in uids}
+
+    batches = list(p.iter_pending(batch_bytes=250))
+    assert 1 < len(batches) < len(uids)
+    assert [uid for batch in batches for uid, _ in batch.items] == uids
+    assert all(content == contents[uid] for batch in batches for uid, content in batch.items)
+    assert not any(batch.problems for batch in batches)
+
+    # Resume from a cursor, in a later process, skipping items cleared in the meantime.
+    cursor = batches[2].cursor
+    resume_at = uids.index(cursor.uid) + 1
+    p.clear(uids[resume_at + 1])
+    if hasattr(p, "close"):
+        p.close()
+    p = factory(persister_dir)
+    resumed = [uid for batch in p.iter_pending(since=cursor) for uid, _ in batch.items]
+    assert resumed == uids[resume_at:resume_at + 1] + uids[resume_at + 2:]
+
+    # Items cleared during iteration are skipped.
+    batches = p.iter_pending(batch_bytes=100)
+    assert next(batches).items[0][0] == uids[0]
+    p.clear(uids[1])
+    remaining = [uid for batch in batches for uid, _ in batch.items]
+    assert remaining[0] == uids[2]
+    assert uids[1] not in remaining
+
+
+def make_status_content(i: int) -> bytes:
+    """Repetitive JSON resembling a persisted status message."""
+    return json.dumps(
+        dict(
+            Header=dict(
+                Src="dw1.isone.ct.newhaven.orange1.scada",
+                MessageType="gt.sh.status",
+                MessageId=str(uuid.uuid5(uuid.NAMESPACE_OID, str(i))),
+            ),
+            Payload=dict(
+                SlotStartUnixS=1656945300 + 300 * i,
+                ReportingPeriodS=300,
+                SimpleTelemetryList=[
+                    dict(
+                        ShNodeAlias=f"a.elt{j}",
+                        TelemetryName="WaterTempCTimes1000",
+                        ValueList=[40000 + (i * j + k) % 97 for k in range(5)],
+                        ReadTimeUnixMsList=[1656945300000 + 300_000 * i + 60_000 * k for k in range(5)],
+                        TypeAlias="gt.sh.simple.telemetry.status",
+                    )
+                    for j in range(4)
+                ],
+                TypeAlias="gt.sh.status.110",
+            ),
+        )
+    ).encode()
+
+
+@pytest.mark.parametrize("factory", PERSISTER_FACTORIES)
+def test_persister_compression(factory: PersisterFactory, persister_dir: Path):
+    # Records written before compression is enabled remain readable.
+    p = factory(persister_dir)
+    assert p.persist("raw", make_status_content(-1)).is_ok()
+    if hasattr(p, "close"):
+        p.close()
+
+    p = factory(persister_dir, compression=Compression(enabled=True, learn_samples=10))
+    contents = {str(i): make_status_content(i) for i in range(50)}
+    for uid, content in contents.items():
+        assert p.persist(uid, content).is_ok()
+    assert p.codec.dictionary_id is not None
+    assert p.codec.ratio > 5
+    for uid, content in contents.items():
+        assert p.retrieve(uid) == Ok(content)
+    if hasattr(p, "close"):
+        p.close()
+
+    # A reopened persister, even one no longer compressing, reads back all records using the saved dictionary.
+    p = factory(persister_dir)
+    assert p.retrieve("raw") == Ok(make_status_content(-1))
+    replayed = {uid: content for batch in p.iter_pending() for uid, content in batch.items}
+    assert replayed == {"raw": make_status_content(-1)} | contents
+
+    # Content which does not compress is stored raw.
+    p = factory(persister_dir / "incompressible", compression=Compression(enabled=True, learn_samples=0))
+    assert p.persist("x", b"{}").is_ok()
+    assert p.codec.stored_bytes == 2
+    assert p.retrieve("x") == Ok(b"{}")
+
+    # Whether a record is compressed is recorded with it, so a raw payload which looks like a compressed one reads
+    # back unchanged, with or without compression enabled.
+    lookalike = PayloadCodec.MAGIC + bytes([1, 0, 0, 0, 0]) + b"not zlib"
+    assert p.persist("lookalike", lookalike).is_ok()
+    assert p.retrieve("lookalike") == Ok(lookalike)
+    if hasattr(p, "close"):
+        p.close()
+    p = factory(persister_dir / "incompressible")
+    assert p.retrieve("lookalike") == Ok(lookalike)
+    assert p.retrieve("x") == Ok(b"{}")
+
+
+def test_timed_rolling_file_persister_trim(persister_dir: Path, monkeypatch):
+    # Three full days of older items.
+    day_dirs = []
+    day_uids = []
+    for days_ago in [3, 2, 1]:
+        day = pendulum.today("utc").subtract(days=days_ago)
+        day_dir = persister_dir / day.isoformat()
+        day_dir.mkdir(parents=True)
+        day_dirs.append(day_dir)
+        day_uids.append([str(uuid.uuid4()) for _ in range(10)])
+        for i, uid in enumerate(day_uids[-1]):
+            (day_dir / TimedRollingFilePersister._make_name(day.add(minutes=i), uid)).write_bytes(make_content(i))
+    events = []
+    p = TimedRollingFilePersister(persister_dir, max_bytes=3_000, on_trim=events.append)
+    assert p.num_pending == 30
+    cleared = []
+    original_clear = TimedRollingFilePersister.clear
+
+    def recording_clear(self, uid):
+        cleared.append(uid)
+        return original_clear(self, uid)
+
+    monkeypatch.setattr(TimedRollingFilePersister, "clear", recording_clear)
+
+    # Whole days are dropped without per-file work; only the boundary day is trimmed file by file.
+    assert p.persist("big", b"x" * 2_500).is_ok()
+    assert not day_dirs[0].exists()
+    assert not day_dirs[1].exists()
+    assert cleared == day_uids[2][:5]
+    assert p.pending() == set(day_uids[2][5:]) | {"big"}
+    assert p.last_trim == events[-1]
+    assert events[-1].freed_bytes == 2_500
+    assert events[-1].num_cleared == 25
+    assert events[-1].units_dropped == 2
+    p.close()
+    assert TimedRollingFilePersister(persister_dir).pending() == p.pending()
+
+    # The current day is never dropped whole.
+    cleared.clear()
+    assert p.persist("big2", b"x" * 2_500).is_ok()
+    assert not day_dirs[2].exists()
+    assert cleared == ["big"]
+    assert p.pending() == {"big2"}
+    assert events[-1].units_dropped == 1
+
+
+def test_segmented_log_persister_trim(persister_dir: Path):
+    max_bytes = 10_000
+    events = []
+    p = SegmentedLogPersister(persister_dir, max_bytes=max_bytes, segment_bytes=1_000, on_trim=events.append)
+    uids = [str(uuid.uuid4()) for _ in range(200)]
+    for i, uid in enumerate(uids):
+        assert p.persist(uid, make_content(i)).is_ok()
+        assert p.curr_bytes <= max_bytes
+    assert events
+    assert all(event.units_dropped >= 1 and event.freed_bytes > 0 for event in events)
+    # Oldest segments were dropped whole; the newest items survive.
+    assert 0 < p.num_pending < len(uids)
+    assert uids[-1] in p.pending()
+    assert uids[0] not in p.pending()
+    assert sum(path.stat().st_size for path in persister_dir.iterdir()) == p.curr_bytes
+
+
+def test_segmented_log_persister_tombstones_and_reclaim(persister_dir: Path):
+    p = SegmentedLogPersister(persister_dir, segment_bytes=1_000)
+    uids = [str(uuid.uuid4()) for _ in range(50)]
+    for i, uid in enumerate(uids):
+        assert p.persist(uid, make_content(i)).is_ok()
+    num_segments = p.num_segments
+    assert num_segments > 3
+
+    # Clearing everything appends tombstones and unlinks dead closed segments.
+    for uid in uids:
+        assert p.clear(uid).is_ok()
+    assert p.num_pending == 0
+    assert p.num_segments < num_segments
+    p.close()
+    assert SegmentedLogPersister(persister_dir, segment_bytes=1_000).num_pending == 0
+
+    # Cleared, then re-persisted uid is live after reopen.
+    p = SegmentedLogPersister(persister_dir, segment_bytes=1_000)
+    assert p.persist("a", b"1").is_ok()
+    assert p.clear("a").is_ok()
+    assert p.persist("a", b"2").is_ok()
+    p.close()
+    p = SegmentedLogPersister(persister_dir, segment_bytes=1_000)
+    assert p.retrieve("a") == Ok(b"2")
+
+
+def test_segmented_log_persister_compaction(persister_dir: Path):
+    p = SegmentedLogPersister(persister_dir, segment_bytes=2_000, compact_ratio=0.5)
+    uids = [str(uuid.uuid4()) for _ in range(100)]
+    for i, uid in enumerate(uids):
+        assert p.persist(uid, make_content(i)).is_ok()
+    # Clear most, but not all, of every segment so that compaction must copy survivors.
+    keep = set(uids[::5])
+    for uid in uids:
+        if uid not in keep:
+            assert p.clear(uid).is_ok()
+    assert p.compact(compact_ratio=1.0).is_ok()
+    assert p.pending() == keep
+    for i, uid in enumerate(uids):
+        if uid in keep:
+            assert p.retrieve(uid) == Ok(make_content(i))
+    p.close()
+    p = SegmentedLogPersister(persister_dir, segment_bytes=2_000, compact_ratio=0.5)
+    assert p.pending() == keep
+    assert list(p._pending.keys()) == [uid for uid in uids if uid in keep]
+
+
+def test_segmented_log_persister_torn_tail(persister_dir: Path):
+    p = SegmentedLogPersister(persister_dir)
+    assert p.persist("a", b"aaaa").is_ok()
+    assert p.persist("b", b"bbbb").is_ok()
+    p.close()
+    segment_path = sorted(persister_dir.iterdir())[-1]
+    with segment_path.open("r+b") as f:
+        f.truncate(segment_path.stat().st_size - 2)
+
+    p = SegmentedLogPersister(persister_dir)
+    assert p.pending() == {"a"}
+    assert p.retrieve("a") == Ok(b"aaaa")
+    # A record damaged after indexing is reported as a problem on retrieve rather than returned.
+    with segment_path.open("r+b") as f:
+        f.seek(21)
+        f.write(b"\xff")
+    match p.retrieve("a"):
+        case Err(problems):
+            assert isinstance(problems.errors[0], CorruptRecord)
+        case _:
+            raise AssertionError("Expected CorruptRecord")
+    # And is skipped on reindex.
+    assert p.reindex().is_err()
+    assert p.num_pending == 0
+
+
+def test_segmented_log_persister_sequence_order(persister_dir: Path, monkeypatch):
+    # The clock steps back between persists: order, and cursors, follow persist order regardless.
+    times_ns = iter(range(10_000, 0, -1))
+    monkeypatch.setattr(time, "time_ns", lambda: next(times_ns))
+    p = SegmentedLogPersister(persister_dir)
+    uids = ["a", "b", "c", "d"]
+    for uid in uids:
+        assert p.persist(uid, uid.encode()).is_ok()
+    assert p.pending_in_order() == uids
+    first = next(p.iter_pending(batch_bytes=1))
+    assert first.items == [("a", b"a")]
+    assert [uid for batch in p.iter_pending(since=first.cursor) for uid, _ in batch.items] == uids[1:]
+    p.close()
+
+    p = SegmentedLogPersister(persister_dir)
+    assert p.pending_in_order() == uids
+    last = list(p.iter_pending())[-1].cursor
+    # A cursor stays valid after everything is cleared and the persister reopened: the segment header carries the
+    # sequence on.
+    for uid in uids:
+        assert p.clear(uid).is_ok()
+    p.close()
+    p = SegmentedLogPersister(persister_dir)
+    p.close()
+    p = SegmentedLogPersister(persister_dir)
+    # Only the new, empty, segment is left.
+    assert p.num_segments == 1
+    assert p.persist("e", b"e").is_ok()
+    assert [uid for batch in p.iter_pending(since=last) for uid, _ in batch.items] == ["e"]
+
+
+def test_timed_rolling_file_persister_manifest(persister_dir: Path, monkeypatch):
+    p = TimedRollingFilePersister(persister_dir)
+    generation = p.manifest_generation
+    uids = [str(uuid.uuid4()) for _ in range(20)]
+    for i, uid in enumerate(uids):
+        assert p.persist(uid, make_content(i)).is_ok()
+    for uid in uids[:5]:
+        assert p.clear(uid).is_ok()
+    p.close()
+
+    # A trusted manifest means no day directory is re-walked and nothing is re-written.
+    scanned = []
+    original_scan = TimedRollingFilePersister._scan_day_dir
+
+    def recording_scan(self, day_dir, problems):
+        scanned.append(day_dir)
+        return original_scan(self, day_dir, problems)
+
+    monkeypatch.setattr(TimedRollingFilePersister, "_scan_day_dir", recording_scan)
+    p = TimedRollingFilePersister(persister_dir)
+    assert not scanned
+    assert p.manifest_generation == generation
+    assert p.pending() == set(uids[5:])
+    assert p.retrieve(uids[5]) == Ok(make_content(5))
+    p.close()
+
+    # A file added behind the persister's back makes only its day directory stale.
+    day_dir = p._curr_dir
+    extra_uid = str(uuid.uuid4())
+    (day_dir / TimedRollingFilePersister._make_name(pendulum.now("utc"), extra_uid)).write_bytes(b"extra")
+    p = TimedRollingFilePersister(persister_dir)
+    assert scanned == [day_dir]
+    assert p.pending() == set(uids[5:]) | {extra_uid}
+    assert p.manifest_generation == generation + 1
+    p.close()
+
+    # As does a file replaced by another, which leaves the entry count unchanged.
+    scanned.clear()
+    (replaced_path,) = day_dir.glob(f"*{extra_uid}*")
+    replaced_path.unlink()
+    replacement_uid = str(uuid.uuid4())
+    (day_dir / TimedRollingFilePersister._make_name(pendulum.now("utc"), replacement_uid)).write_bytes(b"extra")
+    p = TimedRollingFilePersister(persister_dir)
+    assert scanned == [day_dir]
+    assert p.pending() == set(uids[5:]) | {replacement_uid}
+    p.close()
+
+    # A torn journal tail falls back to a rescan of the affected day rather than losing items.
+    scanned.clear()
+    assert p.reindex().is_ok()
+    assert p.persist("torn", b"torn").is_ok()
+    p.close()
+    journal_path = persister_dir / "manifest.journal"
+    journal_path.write_text(journal_path.read_text()[:-5])
+    p = TimedRollingFilePersister(persister_dir)
+    assert scanned == [day_dir]
+    assert "torn" in p.pending()
+
+    # Without a manifest, everything is scanned.
+    scanned.clear()
+    p = TimedRollingFilePersister(persister_dir, use_manifest=False)
+    assert scanned == [day_dir]
+    assert p.manifest_generation is None
+
+
+class SlowPersister(TimedRollingFilePersister):
+    """Stand-in for slow storage. Records the thread each persist runs on."""
+
+    delay_s: float = 0.02
+    persist_threads: set[str]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.persist_threads = set()
+
+    def persist(self, uid: str, content: bytes):
+        self.persist_threads.add(threading.current_thread().name)
+        time.sleep(self.delay_s)
+        return super().persist(uid, content)
+
+
+@pytest.mark.asyncio
+async def test_async_persister(persister_dir: Path):
+    persister = SlowPersister(
+        persister_dir,
+        durability=Durability(mode=DurabilityMode.group, group_ms=10, group_bytes=1_000_000),
+    )
+    p = AsyncPersister(persister, max_queue_depth=4, commit_interval_s=0.01)
+    assert (await p.persist("early", b"x")).is_err()
+    p.start()
+
+    # The loop keeps running while persists wait on storage.
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.001)
+
+    ticker = asyncio.create_task(tick())
+    uids = [str(uuid.uuid4()) for _ in range(10)]
+    results = await asyncio.gather(*[p.persist(uid, make_content(i)) for i, uid in enumerate(uids)])
+    ticker.cancel()
+    assert all(result.is_ok() for result in results)
+    assert ticks > 10 * SlowPersister.delay_s / 0.001 / 2
+    assert persister.persist_threads == {"AsyncPersister"}
+
+    # Requests run in submission order, so persisted files sort in uid order.
+    assert list(persister._pending.keys()) == uids
+    assert p.stats.num_requests == 10
+    assert p.stats.max_queue_depth == 4
+    assert p.stats.max_wait_s > 0
+    assert p.stats.mean_latency_s >= SlowPersister.delay_s
+    assert p.queue_depth == 0
+
+    # An idle writer thread commits group writes once they are due.
+    assert (await p.persist("durable", b"d", wait_durable=True)).is_ok()
+    assert persister.num_unsynced == 0
+
+    assert await p.retrieve(uids[0]) == Ok(make_content(0))
+    assert (await p.clear(uids[0])).is_ok()
+    assert await p.pending() == set(uids[1:]) | {"durable"}
+
+    replayed = [uid async for batch in p.iter_pending(batch_bytes=1) for uid, _ in batch.items]
+    assert replayed == uids[1:] + ["durable"]
+
+    p.stop()
+    await p.join()
+    match await p.persist("late", b"x"):
+        case Err(problems):
+            assert isinstance(problems.errors[0], PersisterStopped)
+        case _:
+            raise AssertionError("Expected PersisterStopped")
+
+
+@pytest.mark.asyncio
+async def test_async_persister_cancelled_request(persister_dir: Path):
+    persister = SlowPersister(persister_dir)
+    p = AsyncPersister(persister, max_queue_depth=4, commit_interval_s=0.01)
+    p.start()
+
+    # The first persist occupies the writer thread while the second, queued behind it, is cancelled.
+    first = asyncio.create_task(p.persist("first", b"1"))
+    cancelled = asyncio.create_task(p.persist("cancelled", b"2"))
+    await asyncio.sleep(SlowPersister.delay_s / 4)
+    cancelled.cancel()
+    assert (await first).is_ok()
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+
+    # The writer thread survives and later requests complete.
+    assert (await asyncio.wait_for(p.persist("after", b"3"), timeout=5)).is_ok()
+    assert await p.pending() == {"first", "after"}
+    assert p.stats.num_cancelled == 1
+    assert p.queue_depth == 0
+
+    p.stop()
+    await asyncio.wait_for(p.join(), timeout=5)
+
+
+def test_sqlite_persister(persister_dir: Path):
+    events = []
+    p = SqlitePersister(
+        persister_dir,
+        max_bytes=10_000,
+        durability=Durability(mode=DurabilityMode.group, group_ms=60_000, group_bytes=1_000_000),
+        on_trim=events.append,
+    )
+    # Writes inside batch() are one transaction; group mode leaves it open until commit().
+    t0 = time.time()
+    with p.batch():
+        futures = [p.persist(f"status-{i}", make_status_content(i)).unwrap() for i in range(3)]
+    t1 = time.time()
+    futures.append(p.persist("event", b'{"Header": {"MessageType": "gridworks.event.problem"}}').unwrap())
+    assert not any(future.done() for future in futures)
+    assert p.commit().is_ok()
+    assert all(future.done() for future in futures)
+
+    # Range and message type queries.
+    statuses = p.retrieve_range(message_type="gt.sh.status").unwrap()
+    assert [uid for uid, _ in statuses] == ["status-0", "status-1", "status-2"]
+    assert statuses[1][1] == make_status_content(1)
+    assert [uid for uid, _ in p.retrieve_range(start_s=t0, end_s=t1).unwrap()] == [f"status-{i}" for i in range(3)]
+    assert [uid for uid, _ in p.retrieve_range(start_s=t1).unwrap()] == ["event"]
+    assert p.retrieve_range(end_s=t0).unwrap() == []
+
+    # Trimming deletes the oldest rows in one statement.
+    uids = [str(uuid.uuid4()) for _ in range(200)]
+    for i, uid in enumerate(uids):
+        assert p.persist(uid, make_content(i)).is_ok()
+        assert p.curr_bytes <= 10_000
+    assert events and events[-1].num_cleared >= 1
+    assert uids[-1] in p.pending()
+    assert uids[0] not in p.pending()
+    p.close()
+    p = SqlitePersister(persister_dir, max_bytes=10_000)
+    assert list(p._pending.keys()) == [uid for uid in uids if uid in p.pending()]
+    assert p.curr_bytes <= 10_000
+
+
+class FailingConnection:
+    """Wraps a sqlite3.Connection, raising from statements which start with fail_prefix."""
+
+    def __init__(self, connection, fail_prefix: str):
+        self.connection = connection
+        self.fail_prefix = fail_prefix
+
+    def execute(self, sql: str, *args):
+        if sql.strip().startswith(self.fail_prefix):
+            raise sqlite3.OperationalError(f"failing {self.fail_prefix}")
+        return self.connection.execute(sql, *args)
+
+    def __getattr__(self, name):
+        return getattr(self.connection, name)
+
+
+@pytest.mark.parametrize("fail_prefix", ["INSERT", "DELETE FROM items WHERE seq <="])
+def test_sqlite_persister_failed_persist_rolls_back(persister_dir: Path, fail_prefix: str):
+    p = SqlitePersister(
+        persister_dir,
+        max_bytes=1_000,
+        durability=Durability(mode=DurabilityMode.group, group_ms=60_000, group_bytes=1_000_000),
+    )
+    for i in range(9):
+        assert p.persist(f"uid-{i}", make_content(i)).is_ok()
+    pending = list(p._pending.keys())
+    curr_bytes = p.curr_bytes
+
+    # Replacing uid-0 needs a trim; failing the trim or the insert leaves everything as it was, including the
+    # uncommitted writes before it.
+    connection = p._connection
+    p._connection = FailingConnection(connection, fail_prefix)
+    assert p.persist("uid-0", make_content(100, size=300)).is_err()
+    p._connection = connection
+    assert list(p._pending.keys()) == pending
+    assert p.curr_bytes == curr_bytes
+    assert p.retrieve("uid-0") == Ok(make_content(0))
+
+    assert p.commit().is_ok()
+    p.close()
+    p = SqlitePersister(persister_dir, max_bytes=1_000)
+    assert list(p._pending.keys()) == pending
+    assert p.retrieve("uid-0") == Ok(make_content(0))
+    p.close()
+
+
+def test_sqlite_persister_adds_compressed_column(persister_dir: Path):
+    # A database created before rows recorded whether they are compressed holds only raw rows.
+    persister_dir.mkdir(parents=True)
+    connection = sqlite3.connect(persister_dir / SqlitePersister.DATABASE_NAME)
+    connection.execute(
+        "CREATE TABLE items (seq INTEGER PRIMARY KEY AUTOINCREMENT, uid TEXT NOT NULL UNIQUE, "
+        "persisted_ns INTEGER NOT NULL, message_type TEXT, size INTEGER NOT NULL, content BLOB NOT NULL)"
+    )
+    connection.execute(
+        "INSERT INTO items (uid, persisted_ns, message_type, size, content) VALUES (?, ?, ?, ?, ?)",
+        ("old", time.time_ns(), None, 2, b"{}"),
+    )
+    connection.commit()
+    connection.close()
+
+    p = SqlitePersister(persister_dir, compression=Compression(enabled=True, learn_samples=0))
+    assert p.retrieve("old") == Ok(b"{}")
+    assert p.persist("new", make_status_content(0)).is_ok()
+    assert p.retrieve("new") == Ok(make_status_content(0))
+    p.close()
+
+
+@pytest.mark.parametrize("fail_prefix", ["DELETE FROM items WHERE seq = ?", "COMMIT"])
+def test_sqlite_persister_failed_clear_keeps_item(persister_dir: Path, fail_prefix: str):
+    p = SqlitePersister(persister_dir)
+    assert p.persist("uid-0", make_content(0)).is_ok()
+    curr_bytes = p.curr_bytes
+
+    connection = p._connection
+    p._connection = FailingConnection(connection, fail_prefix)
+    assert p.clear("uid-0").is_err()
+    p._connection = connection
+    assert p.pending() == {"uid-0"}
+    assert p.curr_bytes == curr_bytes
+    p.close()
+
+
+def test_sqlite_persister_batch_reads_are_chunked(persister_dir: Path):
+    p = SqlitePersister(persister_dir)
+    p.MAX_UIDS_PER_SELECT = 3
+    contents = {f"uid-{i}": make_content(i) for i in range(10)}
+    for uid, content in contents.items():
+        assert p.persist(uid, content).is_ok()
+    statements = []
+    p._connection.set_trace_callback(statements.append)
+    (batch,) = list(p.iter_pending(batch_bytes=1_000_000))
+    assert dict(batch.items) == contents
+    assert len([statement for statement in statements if " IN (" in statement]) == 4
+    p.close()
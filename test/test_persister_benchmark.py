@@ -0,0 +1,39 @@
+"""Test the persister benchmark and fault-injection suite"""
+import json
+from pathlib import Path
+
+import pytest
+
+from proactor.persister_benchmark import FaultConfig
+from proactor.persister_benchmark import PERSISTERS
+from proactor.persister_benchmark import fault_injection
+from proactor.persister_benchmark import main
+
+
+@pytest.mark.parametrize("name", list(PERSISTERS.keys()))
+def test_persister_fault_injection(name: str, tmp_path: Path):
+    report = fault_injection(name, PERSISTERS[name], tmp_path / "faults", FaultConfig(operations=300, seed=1))
+    for phase in ["write_faults", "deleted_files"]:
+        assert report[phase]["outcomes"]["raised"] == 0, report[phase]["outcomes"]["exceptions"]
+        assert report[phase]["outcomes"]["unbounded_problems"] == 0
+        assert report[phase]["misread"] == 0
+    # Every persist() reported as successful survives write failures, and nothing else appears.
+    assert report["write_faults"]["lost"] == 0
+    assert report["write_faults"]["unexpected"] == 0
+    if name != "SqlitePersister":
+        assert report["injected"]["enospc"] > 0
+        assert report["injected"]["partial_write"] > 0
+
+
+def test_persister_benchmark_report(tmp_path: Path):
+    output = tmp_path / "report.json"
+    main(["-c", "50", "-b", "200", "--retrieve-samples", "10", "-d", str(tmp_path / "bench"), "-o", str(output)])
+    report = json.loads(output.read_text())
+    assert {benchmark["persister"] for benchmark in report["benchmarks"]} == set(PERSISTERS)
+    for benchmark in report["benchmarks"]:
+        assert benchmark["count"] == 50
+        assert benchmark["persist"]["errors"] == 0
+        assert benchmark["persist"]["latency_s"]["p99"] >= benchmark["persist"]["latency_s"]["p50"]
+        assert benchmark["reindex"]["ok"]
+        assert benchmark["trim"]["count"] > 0
+        assert benchmark["replay"]["items"] == benchmark["num_pending"]
@@ -0,0 +1,63 @@
+"""Test batched draining of the Proactor receive queue"""
+import asyncio
+
+import pytest
+
+from proactor import ProactorLogger
+from proactor.message import Header
+from proactor.message import Message
+from proactor.proactor_implementation import ProcessBatching
+from proactor.proactor_implementation import Proactor
+
+
+class RecordingProactor(Proactor):
+    def __init__(self, batching: ProcessBatching):
+        super().__init__(
+            name="recorder",
+            logger=ProactorLogger(
+                base="test.proactor",
+                message_summary="test.proactor.summary",
+                lifecycle="test.proactor.lifecycle",
+                comm_event="test.proactor.comm_event",
+            ),
+            batching=batching,
+        )
+        self.processed = []
+
+    async def _derived_process_message(self, message: Message):
+        self.processed.append(message.payload)
+
+
+def message(i: int) -> Message:
+    return Message(header=Header(src="test", message_type="x"), payload=i)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "batching,exp_batches,exp_max_batch_size",
+    [
+        (ProcessBatching(max_messages=1), 10, 1),
+        (ProcessBatching(max_messages=4, max_batch_s=60), 3, 4),
+        (ProcessBatching(max_messages=100, max_batch_s=0), 10, 1),
+    ],
+)
+async def test_process_messages_batches(batching: ProcessBatching, exp_batches: int, exp_max_batch_size: int):
+    proactor = RecordingProactor(batching)
+    for i in range(10):
+        proactor.send(message(i))
+    proactor.start_tasks()
+    await asyncio.wait_for(proactor.async_receive_queue.join(), timeout=5)
+    assert proactor.processed == list(range(10))
+    stats = proactor.process_stats
+    assert stats.num_messages == 10
+    assert stats.num_batches == exp_batches
+    assert stats.max_batch_size == exp_max_batch_size
+    assert stats.as_dict()["messages_per_s"] > 0
+
+    # Cancellation is unchanged: stop() cancels the task, which finishes without error.
+    proactor.stop()
+    await asyncio.wait_for(asyncio.gather(*proactor._tasks, return_exceptions=True), timeout=5)
+    assert all(task.done() for task in proactor._tasks)
+    proactor.send(message(10))
+    await asyncio.sleep(0)
+    assert proactor.processed == list(range(10))
@@ -0,0 +1,93 @@
+"""Test the Proactor receive queue lanes"""
+import asyncio
+import threading
+
+import pytest
+from paho.mqtt.client import MQTTMessage
+
+from actors2.message import GsPwrMessage
+from actors2.message import GtTelemetryMessage
+from actors2.scada2 import scada_lane_key
+from proactor.message import Header
+from proactor.message import Message
+from proactor.message import MQTTReceiptMessage
+from proactor.receive_queue import Lane
+from proactor.receive_queue import ReceiveQueue
+from schema.enums import TelemetryName
+
+
+def message(message_type: str, i: int = 0) -> Message:
+    return Message(header=Header(src=str(i), message_type=message_type), payload=i)
+
+
+LANES = [
+    Lane("power", ("p",)),
+    Lane("telemetry", ("t",), max_skips=2),
+    Lane("default", max_skips=4),
+]
+
+
+@pytest.mark.asyncio
+async def test_receive_queue_priority_and_fairness():
+    queue = ReceiveQueue(LANES)
+    for i in range(6):
+        queue.put_nowait(message("x", i))
+        queue.put_nowait(message("t", i))
+    queue.put_nowait(message("p", 0))
+    assert queue.qsize() == 13
+    assert queue.lane_depths() == dict(power=1, telemetry=6, default=6)
+
+    # Power first, then telemetry, with the default lane given a turn every 4 skips and telemetry never skipped
+    # more than twice.
+    order = []
+    while not queue.empty():
+        got = await queue.get()
+        order.append(got.header.message_type)
+        queue.task_done()
+    assert order == ["p", "t", "t", "t", "x", "t", "t", "t", "x", "x", "x", "x", "x"]
+    stats = queue.lane_stats()
+    assert stats["power"].num_get == 1
+    assert stats["default"].num_fair_turns == 1
+    assert stats["telemetry"].max_depth == 6
+    assert stats["default"].max_wait_s >= stats["power"].max_wait_s
+
+    # Starvation is bounded while power keeps arriving.
+    for i in range(10):
+        queue.put_nowait(message("x", i))
+    order = []
+    for i in range(20):
+        queue.put_nowait(message("p", i))
+        order.append((await queue.get()).header.message_type)
+    assert order.count("x") == 4
+
+
+@pytest.mark.asyncio
+async def test_receive_queue_threadsafe_put():
+    loop = asyncio.get_running_loop()
+    queue = ReceiveQueue(LANES)
+    got = asyncio.create_task(queue.get())
+    await asyncio.sleep(0)
+    thread = threading.Thread(target=lambda: loop.call_soon_threadsafe(queue.put_nowait, message("p")))
+    thread.start()
+    thread.join()
+    assert (await asyncio.wait_for(got, 1)).header.message_type == "p"
+
+
+def test_scada_lane_key():
+    assert scada_lane_key(GsPwrMessage(src="a.m", dst="a.s", power=1)) == "p"
+    assert (
+        scada_lane_key(
+            GtTelemetryMessage(
+                src="a.t",
+                dst="a.s",
+                telemetry_name=TelemetryName.WATER_TEMP_F_TIMES1000,
+                value=1,
+                exponent=0,
+                scada_read_time_unix_ms=1656945390152,
+            )
+        )
+        == "gt.telemetry.110"
+    )
+    mqtt_message = MQTTMessage(topic=b"dw1.isone.ct.newhaven.orange1/gt-dispatch-boolean-100")
+    assert scada_lane_key(MQTTReceiptMessage("gridworks", None, mqtt_message)) == "gt.dispatch.boolean.100"
+    assert scada_lane_key(message("mqtt_connected")) == "mqtt_connected"
@@ -0,0 +1,75 @@
+"""Test per-topic decode routing in ScadaMQTTCodec"""
+import pytest
+
+from actors2.scada2 import LocalMQTTCodec
+from config import ScadaSettings
+from data_classes.hardware_layout import HardwareLayout
+from proactor.message import MQTTMessageModel
+from proactor.message import MQTTReceiptPayload
+from schema.enums import TelemetryName
+from schema.messages import GtTelemetry_Maker
+
+
+def receipt(topic: str, payload: bytes) -> MQTTReceiptPayload:
+    return MQTTReceiptPayload(
+        client_name="local",
+        userdata=None,
+        message=MQTTMessageModel(topic=topic, payload=payload),
+    )
+
+
+def telemetry(value: int) -> bytes:
+    return GtTelemetry_Maker(
+        scada_read_time_unix_ms=1656945390152,
+        value=value,
+        name=TelemetryName.WATER_TEMP_F_TIMES1000,
+        exponent=3,
+    ).tuple.as_type().encode()
+
+
+def test_routes_are_cached():
+    layout = HardwareLayout.load(ScadaSettings().paths.hardware_layout)
+    codec = LocalMQTTCodec(layout, max_routes=2)
+    aliases = [node.alias for node in layout.nodes.values()][:3]
+    topics = [f"{alias}/{GtTelemetry_Maker.type_alias}" for alias in aliases]
+
+    assert codec.decode(receipt(topics[0], telemetry(1))).Value == 1
+    assert codec.decode(receipt(topics[0], telemetry(2))).Value == 2
+    route = codec.route(topics[0])
+    assert (route.source_alias, route.type_alias) == (aliases[0], GtTelemetry_Maker.type_alias)
+    assert codec.route_stats.as_dict() == dict(hits=2, misses=1, evictions=0, invalidations=0)
+
+    # Least recently used topics are evicted.
+    codec.route(topics[1])
+    codec.route(topics[0])
+    codec.route(topics[2])
+    assert codec.num_routes == 2
+    assert codec.route_stats.evictions == 1
+    misses = codec.route_stats.misses
+    codec.route(topics[0])
+    assert codec.route_stats.misses == misses
+    codec.route(topics[1])
+    assert codec.route_stats.misses == misses + 1
+
+    # Replacing the layout drops every route.
+    codec.hardware_layout = layout
+    assert codec.num_routes == 0
+    assert codec.route_stats.invalidations == 1
+
+
+@pytest.mark.parametrize(
+    "topic",
+    [
+        "a.s",
+        "a.s/gt.telemetry.110/x",
+        "a.s/unknown.type",
+        "not.a.node/gt.telemetry.110",
+    ],
+)
+def test_bad_topics_are_not_cached(topic: str):
+    codec = LocalMQTTCodec(HardwareLayout.load(ScadaSettings().paths.hardware_layout))
+    for _ in range(2):
+        with pytest.raises(Exception):
+            codec.decode(receipt(topic, telemetry(1)))
+    assert codec.num_routes == 0
+    assert codec.route_stats.misses == 2
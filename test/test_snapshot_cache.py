@@ -0,0 +1,102 @@
+"""Test the Scada snapshot cache"""
+from actors2.scada_data import ScadaData
+from actors2.snapshot_cache import SnapshotCache
+from actors2.snapshot_cache import SnapshotChannel
+from config import ScadaSettings
+from data_classes.hardware_layout import HardwareLayout
+from schema.enums import TelemetryName
+
+NOW_MS = 1_656_945_300_000
+
+CHANNELS = [
+    SnapshotChannel("a.tank.temp0", TelemetryName.WATER_TEMP_F_TIMES1000),
+    SnapshotChannel("a.elt1.relay", TelemetryName.RELAY_STATE),
+    SnapshotChannel("a.elt1", TelemetryName.POWER_W),
+]
+
+
+def test_snapshot_cache():
+    cache = SnapshotCache(CHANNELS)
+    assert cache.seq == 0
+    empty = cache.snapshot(NOW_MS)
+    assert empty.AboutNodeAliasList == []
+    assert empty.ReportTimeUnixMs == NOW_MS
+
+    assert cache.update(2, 4000, NOW_MS)
+    assert cache.update(0, 63000, NOW_MS)
+    assert not cache.update(0, 63000, NOW_MS + 1)
+    assert cache.num_dirty == 2
+    # Sequence numbers increase even within a millisecond.
+    assert cache.seq == NOW_MS + 1
+
+    snapshot = cache.snapshot(NOW_MS + 10)
+    assert snapshot.AboutNodeAliasList == ["a.tank.temp0", "a.elt1"]
+    assert snapshot.ValueList == [63000, 4000]
+    assert snapshot.TelemetryNameList == [TelemetryName.WATER_TEMP_F_TIMES1000, TelemetryName.POWER_W]
+    assert cache.num_dirty == 0
+    assert cache.stats.num_rebuilds == 2
+
+    # Unchanged values are served from the cache with the new report time.
+    again = cache.snapshot(NOW_MS + 20)
+    assert again._replace(ReportTimeUnixMs=NOW_MS + 10) == snapshot
+    assert again.ReportTimeUnixMs == NOW_MS + 20
+    assert cache.stats.num_rebuilds == 2
+    assert cache.stats.num_cache_hits == 1
+
+    cache.update(2, 4500, NOW_MS + 30)
+    assert cache.snapshot(NOW_MS + 40).ValueList == [63000, 4500]
+    assert cache.stats.num_rebuilds == 3
+    assert cache.stats.num_changes == 3
+
+
+def test_snapshot_cache_delta():
+    cache = SnapshotCache(CHANNELS)
+    cache.update(0, 63000, NOW_MS)
+    cache.update(1, 0, NOW_MS + 1)
+    first_seq = cache.seq
+
+    full = cache.delta(0, NOW_MS + 2)
+    assert full.from_seq == 0
+    assert full.seq == first_seq
+    assert full.snapshot.AboutNodeAliasList == ["a.tank.temp0", "a.elt1.relay"]
+
+    nothing = cache.delta(first_seq, NOW_MS + 2)
+    assert nothing.from_seq == nothing.seq == first_seq
+    assert nothing.snapshot.AboutNodeAliasList == []
+
+    cache.update(1, 1, NOW_MS + 3)
+    cache.update(2, 4000, NOW_MS + 4)
+    delta = cache.delta(first_seq, NOW_MS + 5)
+    assert delta.from_seq == first_seq
+    assert delta.seq == NOW_MS + 4
+    assert delta.snapshot.AboutNodeAliasList == ["a.elt1.relay", "a.elt1"]
+    assert delta.snapshot.ValueList == [1, 4000]
+
+    # An acknowledgement ahead of this cache's numbering gets everything.
+    assert cache.delta(NOW_MS + 1000, NOW_MS + 5).from_seq == 0
+    assert cache.stats.num_deltas == 4
+    assert cache.stats.num_full_deltas == 2
+
+
+def test_scada_data_snapshot():
+    settings = ScadaSettings()
+    layout = HardwareLayout.load(settings.paths.hardware_layout)
+    data = ScadaData(settings, layout)
+    temp_node = layout.node("a.tank.temp0")
+    tt = layout.telemetry_channels.tuples[0]
+    data.record_simple_reading(temp_node, 63000, NOW_MS)
+    data.record_multipurpose_reading(0, 72000, NOW_MS)
+    assert data.latest_simple_value[temp_node] == 63000
+    assert data.latest_value_from_multipurpose_sensor[tt] == 72000
+
+    snapshot = data.make_snapshot().Snapshot
+    assert snapshot.AboutNodeAliasList == [temp_node.alias, tt.AboutNode.alias]
+    assert snapshot.ValueList == [63000, 72000]
+    assert snapshot.TelemetryNameList == [data.telemetry_names[temp_node], tt.TelemetryName]
+
+    delta = data.make_snapshot_delta(0)
+    assert delta.Seq == data.snapshot_cache.seq
+    assert delta.Snapshot.AboutNodeAliasList == snapshot.AboutNodeAliasList
+    data.record_multipurpose_reading(0, 72500, NOW_MS)
+    assert data.make_snapshot_delta(delta.Seq).Snapshot.ValueList == [72500]
+    data.close()
@@ -0,0 +1,49 @@
+"""Test building statuses off the event loop and the status benchmark"""
+import json
+from pathlib import Path
+
+import pytest
+
+from actors2.scada2 import Scada2
+from actors2.status_benchmark import StatusBenchmarkConfig
+from actors2.status_benchmark import fill_readings
+from actors2.status_benchmark import main
+from config import Paths
+from config import ScadaSettings
+from data_classes.hardware_layout import HardwareLayout
+
+
+@pytest.mark.asyncio
+async def test_send_status_from_executor(tmp_path: Path):
+    settings = ScadaSettings(paths=Paths(data_dir=tmp_path))
+    layout = HardwareLayout.load(settings.paths.hardware_layout)
+    scada = Scada2(layout.scada_node.alias, settings, layout)
+    cfg = StatusBenchmarkConfig(multipurpose_samples=20, simple_samples=3)
+    try:
+        fill_readings(scada, cfg)
+        await scada.send_status_from_executor()
+        status = scada.status_history.get(scada.status_history.slots()[-1]).unwrap()
+        assert len(status.MultipurposeTelemetryList) == len(layout.my_telemetry_tuples)
+        assert all(len(s.ValueList) == 20 for s in status.MultipurposeTelemetryList)
+        assert all(len(s.ValueList) == 3 for s in status.SimpleTelemetryList)
+        # The readings were swapped out on the loop, so the next period starts empty.
+        assert all(len(values) == 0 for values in scada._data.recent_values_from_multipurpose_sensor.values())
+
+        # The inline path builds the same status from the same readings.
+        fill_readings(scada, cfg)
+        scada.send_status()
+        inline = scada.status_history.get(scada.status_history.slots()[-1]).unwrap()
+        assert inline.MultipurposeTelemetryList == status.MultipurposeTelemetryList
+        assert inline.SimpleTelemetryList == status.SimpleTelemetryList
+    finally:
+        scada.stop()
+
+
+def test_status_benchmark_report(tmp_path: Path):
+    output = tmp_path / "report.json"
+    main(["-m", "50", "-s", "2", "-n", "2", "-d", str(tmp_path / "bench"), "-o", str(output)])
+    report = json.loads(output.read_text())
+    assert [result["mode"] for result in report["results"]] == ["inline", "executor"]
+    for result in report["results"]:
+        assert result["send_s"]["max"] > 0
+        assert "p99" in result["tick_lateness_s"]
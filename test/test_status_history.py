@@ -0,0 +1,125 @@
+"""Test the Scada status history"""
+import uuid
+from pathlib import Path
+
+from result import Ok
+
+from actors2.status_history import StatusHistory
+from proactor.persister import TimedRollingFilePersister
+from schema.enums import TelemetryName
+from schema.messages import GtShSimpleTelemetryStatus_Maker
+from schema.messages import GtShStatus
+from schema.messages import GtShStatus_Maker
+
+START_S = 1_656_945_300
+PERIOD_S = 300
+
+
+def make_status(slot_start_unix_s: int, value: int = 63_000) -> GtShStatus:
+    return GtShStatus_Maker(
+        from_g_node_alias="dw1.isone.ct.newhaven.orange1.ta.scada",
+        from_g_node_id="0384ef21-648b-4455-b917-58a1172d7fc1",
+        status_uid=str(uuid.uuid4()),
+        about_g_node_alias="dw1.isone.ct.newhaven.orange1.ta",
+        slot_start_unix_s=slot_start_unix_s,
+        reporting_period_s=PERIOD_S,
+        booleanactuator_cmd_list=[],
+        multipurpose_telemetry_list=[],
+        simple_telemetry_list=[
+            GtShSimpleTelemetryStatus_Maker(
+                value_list=[value],
+                read_time_unix_ms_list=[1000 * slot_start_unix_s + 1],
+                telemetry_name=TelemetryName.WATER_TEMP_F_TIMES1000,
+                sh_node_alias="a.tank.temp0",
+            ).tuple
+        ],
+    ).tuple
+
+
+def make_history(path: Path, **kwargs) -> StatusHistory:
+    max_bytes = kwargs.pop("max_bytes", TimedRollingFilePersister.DEFAULT_MAX_BYTES)
+    return StatusHistory(TimedRollingFilePersister(path, max_bytes=max_bytes), reporting_period_s=PERIOD_S, **kwargs)
+
+
+def test_status_history(tmp_path: Path):
+    history = make_history(tmp_path, max_cached=2)
+    assert len(history) == 0
+    assert history.get(START_S) == Ok(None)
+    assert history.gaps(START_S, START_S + PERIOD_S) == [(START_S, START_S + PERIOD_S)]
+
+    missed = {2, 5, 6}
+    statuses = {}
+    for i in range(10):
+        if i not in missed:
+            statuses[i] = make_status(START_S + i * PERIOD_S, value=i)
+            assert history.add(statuses[i]).is_ok()
+    assert len(history) == 7
+    assert history.num_cached == 2
+    assert START_S in history
+    assert START_S + 2 * PERIOD_S not in history
+
+    assert history.slots(START_S + PERIOD_S, START_S + 5 * PERIOD_S) == [START_S + PERIOD_S * i for i in [1, 3, 4]]
+    assert history.gaps(START_S, START_S + 10 * PERIOD_S) == [
+        (START_S + 2 * PERIOD_S, START_S + 3 * PERIOD_S),
+        (START_S + 5 * PERIOD_S, START_S + 7 * PERIOD_S),
+    ]
+    assert history.gaps(START_S + 100, START_S + 11 * PERIOD_S) == [
+        (START_S + 2 * PERIOD_S, START_S + 3 * PERIOD_S),
+        (START_S + 5 * PERIOD_S, START_S + 7 * PERIOD_S),
+        (START_S + 10 * PERIOD_S, START_S + 11 * PERIOD_S),
+    ]
+
+    # The two newest come from memory, the rest from disk.
+    result = history.get_range(START_S, START_S + 10 * PERIOD_S)
+    assert not result.problems
+    assert result.statuses == [statuses[i] for i in sorted(statuses)]
+    assert history.stats.num_cache_hits == 2
+    assert history.stats.num_disk_reads == 5
+
+    # Adding a status for a slot already stored replaces it.
+    replacement = make_status(START_S + 3 * PERIOD_S, value=33)
+    assert history.add(replacement).is_ok()
+    assert len(history) == 7
+    assert history.persister.num_pending == 7
+    assert history.get(START_S + 3 * PERIOD_S) == Ok(replacement)
+    assert history.stats.num_replaced == 1
+
+    # The index is rebuilt from disk.
+    history.close()
+    reloaded = make_history(tmp_path)
+    assert reloaded.slots() == history.slots()
+    statuses[3] = replacement
+    assert reloaded.get_range(START_S, START_S + 10 * PERIOD_S).statuses == [statuses[i] for i in sorted(statuses)]
+
+
+def test_status_history_keeps_newest_duplicate(tmp_path: Path):
+    # As left by a stop between persisting a slot's new status and clearing its old one, with the new uid sorting first.
+    persister = TimedRollingFilePersister(tmp_path)
+    old = make_status(START_S, value=1)._replace(StatusUid="ffffffff-0000-4000-8000-000000000000")
+    new = make_status(START_S, value=2)._replace(StatusUid="00000000-0000-4000-8000-000000000000")
+    for status in [old, new]:
+        assert persister.persist(StatusHistory.uid(status), status.as_type().encode()).is_ok()
+    persister.close()
+
+    history = make_history(tmp_path)
+    assert history.slots() == [START_S]
+    assert history.get(START_S) == Ok(new)
+    assert history.persister.pending() == {StatusHistory.uid(new)}
+
+
+def test_status_history_is_bounded(tmp_path: Path):
+    history = make_history(tmp_path / "retention", retention_s=4 * PERIOD_S)
+    for i in range(10):
+        assert history.add(make_status(START_S + i * PERIOD_S)).is_ok()
+    assert history.slots() == [START_S + i * PERIOD_S for i in range(5, 10)]
+    assert history.persister.num_pending == 5
+    assert history.stats.num_expired == 5
+
+    # Statuses the persister trims to stay under max_bytes leave the index too.
+    status_bytes = len(make_status(START_S).as_type().encode())
+    history = make_history(tmp_path / "trim", max_bytes=int(3.5 * status_bytes))
+    for i in range(10):
+        assert history.add(make_status(START_S + i * PERIOD_S)).is_ok()
+    assert history.slots() == [START_S + i * PERIOD_S for i in range(7, 10)]
+    assert history.stats.num_trimmed == 7
+    assert history.get_range(START_S, START_S + 10 * PERIOD_S).statuses[0].SlotStartUnixS == START_S + 7 * PERIOD_S
@@ -0,0 +1,193 @@
+"""Test store-and-forward publishing through the persister"""
+import asyncio
+from pathlib import Path
+
+import pytest
+from paho.mqtt.client import MQTTMessageInfo
+
+from actors.utils import QOS
+from actors2.scada2 import Scada2
+from config import DEFAULT_GRIDWORKS_FORWARD_POLICIES
+from config import ForwardPolicy
+from config import Paths
+from config import ScadaSettings
+from config import StoreAndForwardSettings
+from data_classes.hardware_layout import HardwareLayout
+from proactor.async_persister import AsyncPersister
+from proactor.persister import TimedRollingFilePersister
+from proactor.store_and_forward import OutboundRecord
+from proactor.store_and_forward import StoreAndForward
+
+CLIENT = "gridworks"
+STATUS = "gt.sh.status.110"
+SNAPSHOT = "snapshot.spaceheat.100"
+POWER = "p"
+
+
+class FakeMQTTClients:
+    def __init__(self):
+        self.is_connected = False
+        self.published: list[tuple[str, bytes, int, MQTTMessageInfo]] = []
+
+    def connected(self, client: str) -> bool:
+        assert client == CLIENT
+        return self.is_connected
+
+    def publish(self, client: str, topic: str, payload: bytes, qos: int) -> MQTTMessageInfo:
+        assert client == CLIENT
+        info = MQTTMessageInfo(len(self.published))
+        self.published.append((topic, payload, qos, info))
+        return info
+
+    def payloads(self) -> list[bytes]:
+        return [payload for _, payload, _, _ in self.published]
+
+    def ack_all(self):
+        for _, _, _, info in self.published:
+            if not info.is_published():
+                info._set_as_published()
+
+
+class FastStoreAndForward(StoreAndForward):
+    TICK_S = 0.001
+
+
+def make_forwarder(clients: FakeMQTTClients, base_dir: Path, max_in_flight: int = 2) -> StoreAndForward:
+    return FastStoreAndForward(
+        CLIENT,
+        clients,
+        AsyncPersister(TimedRollingFilePersister(base_dir)),
+        policies=DEFAULT_GRIDWORKS_FORWARD_POLICIES,
+        drain_messages_per_s=10_000,
+        max_in_flight=max_in_flight,
+    )
+
+
+async def wait_for(condition, timeout_s: float = 5.0):
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.001)
+
+    await asyncio.wait_for(poll(), timeout_s)
+
+
+def test_outbound_record():
+    record = OutboundRecord(STATUS, "a/b", 1, b'{"x": "1\\n2"}\n')
+    assert OutboundRecord.decode(record.encode()) == record
+
+
+@pytest.mark.asyncio
+async def test_store_and_forward(tmp_path: Path):
+    clients = FakeMQTTClients()
+    forwarder = make_forwarder(clients, tmp_path)
+    storage = forwarder.persister.persister
+    assert forwarder.policy(SNAPSHOT) == ForwardPolicy.keep_latest
+    assert forwarder.policy("unknown") == ForwardPolicy.keep_all
+    forwarder.start()
+    task = asyncio.create_task(forwarder.run())
+    try:
+        await wait_for(lambda: forwarder.loaded)
+        # Connected with nothing waiting: published at once, without touching storage.
+        clients.is_connected = True
+        assert forwarder.publish("status", b"s0", 1, STATUS) is not None
+        assert forwarder.publish("power", b"p0", 0, POWER) is not None
+        assert forwarder.num_unpersisted == 0
+        assert forwarder.stats.num_direct == 2
+
+        # Disconnected: statuses kept, only the latest snapshot kept, power dropped. Stored messages are held in
+        # memory until the run() task has persisted them.
+        clients.is_connected = False
+        for i in range(1, 4):
+            assert forwarder.publish("status", f"s{i}".encode(), 1, STATUS) is None
+            assert forwarder.publish("snapshot", f"n{i}".encode(), 1, SNAPSHOT) is None
+            assert forwarder.publish("power", f"p{i}".encode(), 1, POWER) is None
+        assert forwarder.num_unpersisted == 4
+        assert forwarder.num_unsent == 4
+        assert forwarder.stats.num_superseded == 2
+        assert forwarder.stats.num_dropped == 3
+        await wait_for(lambda: forwarder.num_unpersisted == 0)
+        assert storage.num_pending == 4
+        assert forwarder.stats.num_persisted == 4
+        assert clients.payloads() == [b"s0", b"p0"]
+
+        # Reconnected: forwarded in order, no more than max_in_flight unacknowledged at a time.
+        clients.is_connected = True
+        await wait_for(lambda: len(clients.published) == 4)
+        await asyncio.sleep(0.01)
+        assert clients.payloads()[2:] == [b"s1", b"s2"]
+        assert forwarder.num_in_flight == 2
+        # While older messages wait, a new publish is stored behind them.
+        assert forwarder.publish("status", b"s4", 1, STATUS) is None
+        while len(clients.published) < 7:
+            clients.ack_all()
+            await asyncio.sleep(0.005)
+        clients.ack_all()
+        await wait_for(lambda: storage.num_pending == 0 and forwarder.num_in_flight == 0)
+        assert clients.payloads()[2:] == [b"s1", b"s2", b"s3", b"n3", b"s4"]
+        assert forwarder.stats.num_forwarded == 5
+        assert forwarder.num_unsent == forwarder.num_unpersisted == 0
+    finally:
+        task.cancel()
+        await forwarder.stop_and_join()
+
+
+@pytest.mark.asyncio
+async def test_store_and_forward_survives_restart(tmp_path: Path):
+    # Stored before the run() task ever persisted them: stop() hands them to the persister.
+    clients = FakeMQTTClients()
+    forwarder = make_forwarder(clients, tmp_path)
+    forwarder.start()
+    forwarder.publish("status", b"s1", 1, STATUS)
+    forwarder.publish("snapshot", b"n1", 1, SNAPSHOT)
+    forwarder.publish("status", b"s2", 1, STATUS)
+    assert forwarder.num_unpersisted == 3
+    await forwarder.stop_and_join()
+    assert forwarder.persister.persister.num_pending == 3
+
+    clients = FakeMQTTClients()
+    forwarder = make_forwarder(clients, tmp_path, max_in_flight=10)
+    forwarder.start()
+    # Published before the stored messages are loaded: kept behind them.
+    forwarder.publish("status", b"s3", 1, STATUS)
+    task = asyncio.create_task(forwarder.run())
+    try:
+        await wait_for(lambda: forwarder.loaded)
+        assert forwarder.num_unsent == 4
+        # keep_latest still applies to messages loaded from storage.
+        forwarder.publish("snapshot", b"n2", 1, SNAPSHOT)
+        assert forwarder.num_unsent == 4
+        clients.is_connected = True
+        await wait_for(lambda: len(clients.published) == 4)
+        assert clients.payloads() == [b"s1", b"s2", b"s3", b"n2"]
+        assert all(topic in ["status", "snapshot"] and qos == 1 for topic, _, qos, _ in clients.published)
+        clients.ack_all()
+        await wait_for(lambda: forwarder.persister.persister.num_pending == 0 and forwarder.num_in_flight == 0)
+    finally:
+        task.cancel()
+        await forwarder.stop_and_join()
+
+
+@pytest.mark.asyncio
+async def test_scada2_gridworks_status_qos(tmp_path: Path):
+    # Without store-and-forward, the default, statuses and snapshots go out at QoS 0 as they always have.
+    settings = ScadaSettings(paths=Paths(data_dir=tmp_path / "default"))
+    layout = HardwareLayout.load(settings.paths.hardware_layout)
+    scada = Scada2(layout.scada_node.alias, settings, layout)
+    try:
+        assert scada.gridworks_outbound is None
+        assert scada._gridworks_status_qos(STATUS) == QOS.AtMostOnce
+    finally:
+        scada.stop()
+
+    # With it, message types it keeps go out at QoS 1 so they are stored while the link is down.
+    settings = ScadaSettings(
+        paths=Paths(data_dir=tmp_path / "enabled"),
+        gridworks_outbound=StoreAndForwardSettings(enabled=True),
+    )
+    scada = Scada2(layout.scada_node.alias, settings, layout)
+    try:
+        assert scada._gridworks_status_qos(STATUS) == QOS.AtLeastOnce
+        assert scada._gridworks_status_qos(SNAPSHOT) == QOS.AtLeastOnce
+        assert scada._gridworks_status_qos(POWER) == QOS.AtMostOnce
+    finally:
+        scada.stop()
@@ -0,0 +1,70 @@
+"""Test coalesced cross-thread writes to asyncio queues"""
+import asyncio
+import threading
+
+import pytest
+
+from proactor.sync_thread import AsyncQueueWriter
+from proactor.sync_thread import SyncAsyncQueueWriter
+
+
+@pytest.mark.asyncio
+async def test_async_queue_writer_coalesces_wakeups():
+    loop = asyncio.get_running_loop()
+    async_queue = asyncio.Queue()
+    writer = AsyncQueueWriter(loop, async_queue)
+
+    # A burst from one thread, before the loop runs again, needs one wakeup.
+    thread = threading.Thread(target=lambda: [writer.put(i) for i in range(100)])
+    thread.start()
+    thread.join()
+    assert async_queue.qsize() == 0
+    await asyncio.sleep(0)
+    assert [async_queue.get_nowait() for _ in range(100)] == list(range(100))
+    stats = writer.wakeup_stats
+    assert stats.num_items == 100
+    assert stats.num_wakeups == 1
+    assert stats.wakeups_saved == 99
+    assert stats.max_burst == 100
+
+    # Bursts from several threads preserve each thread's order.
+    num_threads = 4
+    per_thread = 250
+
+    def produce(thread_idx: int):
+        for i in range(per_thread):
+            writer.put((thread_idx, i))
+
+    threads = [threading.Thread(target=produce, args=(idx,)) for idx in range(num_threads)]
+    for thread in threads:
+        thread.start()
+    while any(thread.is_alive() for thread in threads) or async_queue.qsize() < num_threads * per_thread:
+        await asyncio.sleep(0.001)
+    received = [async_queue.get_nowait() for _ in range(num_threads * per_thread)]
+    for idx in range(num_threads):
+        assert [i for thread_idx, i in received if thread_idx == idx] == list(range(per_thread))
+    assert stats.num_items == 100 + num_threads * per_thread
+    assert stats.wakeups_saved == stats.num_items - stats.num_wakeups
+
+    # Puts from the loop thread need no wakeup, and are not counted as wakeups saved.
+    wakeups_saved = stats.wakeups_saved
+    writer.put(-1)
+    for i in range(3):
+        writer.put_local(i)
+    assert [async_queue.get_nowait() for _ in range(4)] == [-1, 0, 1, 2]
+    assert (stats.num_items, stats.num_local_items) == (101 + num_threads * per_thread, 3)
+    assert stats.wakeups_saved == wakeups_saved
+
+
+@pytest.mark.asyncio
+async def test_sync_async_queue_writer_closed_loop():
+    loop = asyncio.new_event_loop()
+    async_queue = asyncio.Queue()
+    channel = SyncAsyncQueueWriter(loop, async_queue)
+    loop.close()
+    with pytest.raises(RuntimeError):
+        channel.put_to_async_queue(1)
+    # The failed put does not leave the buffer stuck: the next put tries to wake the loop again.
+    with pytest.raises(RuntimeError):
+        channel.put_to_async_queue(2)
+    assert channel.wakeup_stats.num_wakeups == 2
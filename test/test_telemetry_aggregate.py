@@ -0,0 +1,127 @@
+"""Test streaming telemetry aggregates and the compact status"""
+from pathlib import Path
+
+import pytest
+
+from actors2.scada2 import Scada2
+from actors2.scada_data import ScadaData
+from actors2.telemetry_aggregate import TelemetryAggregate
+from actors2.telemetry_aggregate import deadband_samples
+from actors2.telemetry_aggregate import extrema_samples
+from actors2.telemetry_aggregate import pick_samples
+from config import CompactStatusSettings
+from config import Paths
+from config import SampleRule
+from config import ScadaSettings
+from data_classes.hardware_layout import HardwareLayout
+from schema.messages import GtShStatusCompact_Maker
+
+START_MS = 1_656_945_300_000
+SLOT_S = 1_656_945_300
+
+
+def test_telemetry_aggregate():
+    aggregate = TelemetryAggregate()
+    assert aggregate.count == 0
+    assert aggregate.mean is None
+    for i, value in enumerate([5, 3, 9, 7]):
+        aggregate.add(value, START_MS + i)
+    assert aggregate.as_dict() == dict(
+        count=4,
+        min=3,
+        max=9,
+        mean=6.0,
+        last=7,
+        first_read_time_unix_ms=START_MS,
+        last_read_time_unix_ms=START_MS + 3,
+    )
+    aggregate.clear()
+    assert aggregate.count == 0
+    assert aggregate.min is None
+    aggregate.add(-2, START_MS)
+    assert (aggregate.min, aggregate.max, aggregate.mean) == (-2, -2, -2.0)
+
+
+def test_sample_rules():
+    values = [0, 10, 2, 8, 1, 1, 1, 9, 3, 4]
+    assert extrema_samples(values, 20) == list(range(10))
+    # Two runs of five: lowest and highest of each, in order.
+    assert extrema_samples(values, 4) == [0, 1, 5, 7]
+    assert extrema_samples(values, 1) == [0]
+    assert extrema_samples([1, 1, 1, 1], 2) == [0]
+
+    assert deadband_samples(values, 20, 3) == [0, 1, 2, 3, 4, 7, 8, 9]
+    assert deadband_samples(values, 4, 3) == [0, 1, 4, 7]
+    assert deadband_samples([5], 4, 3) == [0]
+    assert deadband_samples([], 4, 3) == []
+
+    assert pick_samples(values, SampleRule.extrema, 4) == [0, 1, 5, 7]
+    assert pick_samples(values, SampleRule.deadband, 20, deadband_fraction=0.3) == [0, 1, 2, 3, 4, 7, 8, 9]
+    assert pick_samples(values, SampleRule.extrema, 0) == []
+    for max_samples in range(1, 12):
+        for rule in SampleRule:
+            picked = pick_samples(values, rule, max_samples, 0.1)
+            assert len(picked) <= max_samples
+            assert picked == sorted(set(picked))
+
+
+def test_compact_status():
+    settings = ScadaSettings(compact_status=CompactStatusSettings(enabled=True, max_samples=4))
+    layout = HardwareLayout.load(settings.paths.hardware_layout)
+    data = ScadaData(settings, layout)
+    temp_node = layout.node("a.tank.temp0")
+    tt = layout.telemetry_channels.tuples[0]
+    power = [1000, 5000, 1200, 900, 4000, 4100, 3900, 1000]
+    for i, value in enumerate(power):
+        data.record_multipurpose_reading(0, value, START_MS + 40 * i)
+    data.record_simple_reading(temp_node, 63000, START_MS)
+    data.record_simple_reading(temp_node, 64000, START_MS + 1000)
+
+    readings = data.flush_latest_readings()
+    status = data.make_compact_status(SLOT_S, readings, status_uid="2a5fed1e-8d53-4aad-bf0c-eda5d4c2ed56")
+    assert status.StatusUid == "2a5fed1e-8d53-4aad-bf0c-eda5d4c2ed56"
+    assert status.SampleRule == SampleRule.extrema.value
+    temp, meter = status.TelemetryAggregateList
+    assert (temp.AboutNodeAlias, temp.SensorNodeAlias) == (temp_node.alias, temp_node.alias)
+    assert (temp.Count, temp.Min, temp.Max, temp.Mean, temp.Last) == (2, 63000, 64000, 63500.0, 64000)
+    assert temp.ValueList == [63000, 64000]
+    assert (meter.AboutNodeAlias, meter.SensorNodeAlias) == (tt.AboutNode.alias, tt.SensorNode.alias)
+    assert (meter.Count, meter.Min, meter.Max, meter.Last) == (8, 900, 5000, 1000)
+    assert meter.Mean == sum(power) / len(power)
+    assert (meter.FirstReadTimeUnixMs, meter.LastReadTimeUnixMs) == (START_MS, START_MS + 280)
+    # The lowest and highest reading of each half of the period.
+    assert meter.ValueList == [5000, 900, 4100, 1000]
+    assert meter.ReadTimeUnixMsList == [START_MS + 40, START_MS + 120, START_MS + 200, START_MS + 280]
+    assert GtShStatusCompact_Maker.type_to_tuple(status.as_type()) == status
+
+    # The new period starts with cleared aggregates.
+    assert all(aggregate.count == 0 for aggregate in data.readings.multipurpose_aggregates.values())
+    assert data.make_compact_status(SLOT_S + 300).TelemetryAggregateList == []
+
+    data.record_simple_reading(temp_node, 62000, START_MS)
+    (temp,) = data.make_compact_status(SLOT_S + 300).TelemetryAggregateList
+    assert (temp.Count, temp.Min, temp.Last) == (1, 62000, 62000)
+    data.close()
+
+
+@pytest.mark.asyncio
+async def test_compact_status_publication(tmp_path: Path):
+    settings = ScadaSettings(
+        paths=Paths(data_dir=tmp_path),
+        compact_status=CompactStatusSettings(enabled=True, send_full_status=False),
+    )
+    layout = HardwareLayout.load(settings.paths.hardware_layout)
+    scada = Scada2(layout.scada_node.alias, settings, layout)
+    try:
+        scada._data.record_multipurpose_reading(0, 1000, START_MS)
+        readings = scada._data.flush_latest_readings()
+        publication = scada._build_status_publication(SLOT_S, readings, scada._data.make_snapshot())
+        published = [(encoded.client, encoded.message.header.message_type) for encoded in publication.publishes]
+        assert published == [
+            (Scada2.GRIDWORKS_MQTT, "gt.sh.status.compact.100"),
+            (Scada2.LOCAL_MQTT, "gt.sh.status.110"),
+            (Scada2.GRIDWORKS_MQTT, "snapshot.spaceheat.100"),
+        ]
+        assert publication.publishes[0].message.payload["StatusUid"] == publication.status.StatusUid
+    finally:
+        scada.stop()
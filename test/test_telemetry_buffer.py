@@ -0,0 +1,79 @@
+"""Test the typed reading buffers behind ScadaData"""
+import pytest
+
+from actors2.scada_data import ScadaData
+from actors2.telemetry_buffer import TelemetryBuffer
+from config import ScadaSettings
+from data_classes.hardware_layout import HardwareLayout
+from schema.messages import GtShStatus
+
+
+def test_telemetry_buffer():
+    buffer = TelemetryBuffer(capacity=2)
+    assert len(buffer) == 0
+    assert buffer.tolist() == []
+    for value in range(5):
+        buffer.append(2**40 + value)
+    assert len(buffer) == 5
+    assert buffer.capacity == 8
+    assert buffer.nbytes == 64
+    assert buffer.tolist() == [2**40 + value for value in range(5)]
+    assert list(buffer) == buffer.tolist()
+    copy = TelemetryBuffer()
+    for value in buffer:
+        copy.append(value)
+    assert buffer == copy
+    assert buffer != buffer.tolist()
+    assert buffer[0] == 2**40
+    assert buffer[-1] == 2**40 + 4
+    assert buffer[1:3] == [2**40 + 1, 2**40 + 2]
+    with pytest.raises(IndexError):
+        _ = buffer[5]
+    with pytest.raises(OverflowError):
+        buffer.append(2**63)
+
+    # Clearing keeps the storage for the next period.
+    buffer.clear()
+    assert len(buffer) == 0
+    assert buffer.capacity == 8
+    buffer.append(-1)
+    assert buffer.tolist() == [-1]
+
+
+def test_scada_data_swaps_buffers_on_flush():
+    settings = ScadaSettings()
+    layout = HardwareLayout.load(settings.paths.hardware_layout)
+    data = ScadaData(settings, layout)
+    node = next(node for node in layout.my_simple_sensors if node not in layout.my_boolean_actuators)
+    tt = layout.my_telemetry_tuples[0]
+    relay = layout.my_boolean_actuators[0]
+
+    for i in range(100):
+        data.record_simple_reading(node, 60_000 + i, 1656945390152 + i)
+    data.record_multipurpose_reading(layout.telemetry_channels.ids[tt], 72_000, 1656945390152)
+    data.record_ba_cmd(relay, 1, 1656945390152)
+    current = data.make_status(1656945300)
+
+    readings = data.flush_latest_readings()
+    assert len(data.recent_simple_values[node]) == 0
+    assert len(readings.simple_values[node]) == 100
+    status = data.make_status(1656945300, readings)
+    assert isinstance(status, GtShStatus)
+    assert status.SimpleTelemetryList == current.SimpleTelemetryList
+    assert status.SimpleTelemetryList[0].ValueList == [60_000 + i for i in range(100)]
+    assert status.MultipurposeTelemetryList[0].ValueList == [72_000]
+    assert status.BooleanactuatorCmdList[0].RelayStateCommandList == [1]
+    assert data.make_status(1656945600).SimpleTelemetryList == []
+
+    # The next period reuses the storage of the period before the one just flushed.
+    assert data.recent_simple_values[node] is not readings.simple_values[node]
+    data.flush_latest_readings()
+    assert data.recent_simple_values[node] is readings.simple_values[node]
+    assert len(data.recent_simple_values[node]) == 0
+    assert data.recent_simple_values[node].capacity >= 100
+
+    memory = data.memory_by_channel()
+    assert memory[node.alias].as_dict()["nbytes"] >= 100 * 8 * 2
+    assert memory[node.alias].buffers == 4
+    data.record_simple_reading(node, 1, 1656945390152)
+    assert data.memory_by_channel()[node.alias].readings == 1
@@ -0,0 +1,60 @@
+"""Test telemetry channel ids in HardwareLayout"""
+import pytest
+
+from config import ScadaSettings
+from data_classes.hardware_layout import HardwareLayout
+from data_classes.telemetry_channels import ChannelMap
+from data_classes.telemetry_channels import TelemetryChannels
+from named_tuples.telemetry_tuple import TelemetryTuple
+from schema.enums import TelemetryName
+
+
+def test_telemetry_channels():
+    layout = HardwareLayout.load(ScadaSettings().paths.hardware_layout)
+    channels = layout.telemetry_channels
+    assert channels is layout.telemetry_channels
+    assert channels.tuples == layout.my_telemetry_tuples
+    assert len(channels) == len(layout.my_telemetry_tuples) > 0
+    for channel_id, tt in enumerate(layout.my_telemetry_tuples):
+        assert channels.ids[tt] == channel_id
+        assert tt in channels
+        assert channels.id(tt.AboutNode.alias, tt.SensorNode.alias, tt.TelemetryName) == channel_id
+        assert layout.telemetry_channel_id(tt.AboutNode.alias, tt.SensorNode.alias, tt.TelemetryName) == channel_id
+    tt = channels.tuples[0]
+    assert channels.id(tt.AboutNode.alias, "a.tank.temp0", tt.TelemetryName) is None
+    assert channels.id("not.a.node", tt.SensorNode.alias, tt.TelemetryName) is None
+    assert channels.id(tt.AboutNode.alias, tt.SensorNode.alias, TelemetryName.WATER_TEMP_F_TIMES1000) is None
+    with pytest.raises(ValueError):
+        TelemetryChannels([tt, tt])
+
+
+def test_channel_map():
+    layout = HardwareLayout.load(ScadaSettings().paths.hardware_layout)
+    channels = layout.telemetry_channels
+    values = channels.map(lambda tt: None)
+    assert isinstance(values, ChannelMap)
+    assert list(values.keys()) == channels.tuples
+    assert values.by_id == [None] * len(channels)
+
+    tt = channels.tuples[-1]
+    values[tt] = 5
+    values[tt] += 1
+    assert values[tt] == 6
+    assert values.by_id[-1] == 6
+    assert values.get(tt) == 6
+    assert dict(values)[tt] == 6
+
+    not_a_channel = TelemetryTuple(
+        AboutNode=layout.node("a.tank.temp0"),
+        SensorNode=tt.SensorNode,
+        TelemetryName=tt.TelemetryName,
+    )
+    assert not_a_channel not in values
+    with pytest.raises(KeyError):
+        _ = values[not_a_channel]
+    with pytest.raises(KeyError):
+        values[not_a_channel] = 1
+    with pytest.raises(TypeError):
+        del values[tt]
+    with pytest.raises(ValueError):
+        ChannelMap(channels, [])
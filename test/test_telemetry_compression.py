@@ -0,0 +1,177 @@
+"""Test compression of telemetry before it enters the status"""
+import random
+from pathlib import Path
+
+import pytest
+
+from actors.atn import Atn
+from actors2.scada_data import ScadaData
+from actors2.telemetry_compression import TelemetryCompressor
+from actors2.telemetry_compression import reconstruct
+from config import CompressionMethod
+from config import Paths
+from config import ScadaSettings
+from config import TelemetryCompressionSettings
+from data_classes.hardware_layout import HardwareLayout
+
+START_MS = 1_656_945_300_000
+SLOT_S = 1_656_945_300
+
+
+def compress(compressor: TelemetryCompressor, values, read_times_unix_ms) -> tuple[list[int], list[int]]:
+    kept = []
+    for value, read_time_unix_ms in zip(values, read_times_unix_ms):
+        kept.extend(compressor.add(value, read_time_unix_ms))
+    pending = compressor.flush()
+    if pending is not None:
+        kept.append(pending)
+    return [value for value, _ in kept], [read_time_unix_ms for _, read_time_unix_ms in kept]
+
+
+def test_deadband():
+    compressor = TelemetryCompressor(CompressionMethod.deadband, 10)
+    values = [100, 105, 110, 111, 95, 96, 200, 201]
+    times = [START_MS + 1000 * i for i in range(len(values))]
+    assert compressor.add(100, times[0]) == [(100, times[0])]
+    assert compressor.add(105, times[1]) == []
+    assert compressor.add(111, times[3]) == [(111, times[3])]
+    compressor.flush()
+
+    kept_values, kept_times = compress(compressor, values, times)
+    assert kept_values == [100, 111, 95, 200, 201]
+    assert kept_times == [times[0], times[3], times[4], times[6], times[7]]
+    series = reconstruct(CompressionMethod.deadband, kept_values, kept_times, times)
+    assert series == [100, 100, 100, 111, 95, 95, 200, 201]
+
+
+def test_swinging_door():
+    compressor = TelemetryCompressor(CompressionMethod.swinging_door, 5)
+    # A ramp is kept as its two ends.
+    ramp = [100 + 20 * i for i in range(30)]
+    times = [START_MS + 1000 * i for i in range(30)]
+    assert compress(compressor, ramp, times) == ([100, 680], [times[0], times[-1]])
+
+    # A corner is kept.
+    vee = [100 - 20 * i for i in range(10)] + [-80 + 20 * i for i in range(1, 10)]
+    kept_values, kept_times = compress(compressor, vee, times[:19])
+    assert kept_values == [100, -80, 100]
+    assert kept_times == [times[0], times[9], times[18]]
+    assert reconstruct(CompressionMethod.swinging_door, kept_values, kept_times, [times[4], times[13]]) == [20, 0]
+
+    # Readings at the time of the one kept must be within the bound of it.
+    assert compressor.add(100, START_MS) == [(100, START_MS)]
+    assert compressor.add(103, START_MS) == []
+    assert compressor.add(120, START_MS) == [(103, START_MS), (120, START_MS)]
+    assert compressor.flush() is None
+
+
+@pytest.mark.parametrize("method", list(CompressionMethod))
+def test_compression_error_bound(method: CompressionMethod):
+    rng = random.Random(7)
+    error_bound = 50
+    values = []
+    value = 120_000
+    for _ in range(2000):
+        value += rng.randint(-30, 30)
+        values.append(value)
+    times = [START_MS + 500 * i + rng.randint(0, 100) for i in range(len(values))]
+    compressor = TelemetryCompressor(method, error_bound)
+    kept_values, kept_times = compress(compressor, values, times)
+    assert kept_times == sorted(kept_times)
+    assert (kept_values[0], kept_times[0]) == (values[0], times[0])
+    assert (kept_values[-1], kept_times[-1]) == (values[-1], times[-1])
+    series = reconstruct(method, kept_values, kept_times, times)
+    assert max(abs(a - b) for a, b in zip(series, values)) <= error_bound
+    assert compressor.stats.num_received == len(values)
+    assert compressor.stats.num_kept == len(kept_values)
+    assert compressor.stats.ratio > 2
+    assert compressor.stats.as_dict()["ratio"] == compressor.stats.ratio
+
+
+def test_reconstruct_edges():
+    assert reconstruct(CompressionMethod.swinging_door, [], [], [START_MS]) == [None]
+    series = reconstruct(CompressionMethod.swinging_door, [10, 20], [START_MS, START_MS + 10], [
+        START_MS - 1, START_MS, START_MS + 5, START_MS + 10, START_MS + 11
+    ])
+    assert series == [None, 10.0, 15.0, 20.0, 20.0]
+
+
+def test_scada_data_compression():
+    settings = ScadaSettings(
+        telemetry_compression=TelemetryCompressionSettings(enabled=True, method=CompressionMethod.swinging_door)
+    )
+    layout = HardwareLayout.load(settings.paths.hardware_layout)
+    data = ScadaData(settings, layout)
+    temp_node = layout.node("a.tank.temp0")
+    compressor = data.compressors[temp_node]
+    # 0.05 deg F, in the thousandths the sensor reports.
+    assert compressor.error_bound == pytest.approx(50)
+    assert all(
+        data.telemetry_names[node].value in settings.telemetry_compression.error_bounds for node in data.compressors
+    )
+
+    # A tank warming steadily, read every second.
+    values = [120_000 + 10 * i for i in range(60)]
+    times = [START_MS + 1000 * i for i in range(60)]
+    for value, read_time_unix_ms in zip(values, times):
+        data.record_simple_reading(temp_node, value, read_time_unix_ms)
+    assert data.latest_simple_value[temp_node] == values[-1]
+    assert len(data.recent_simple_values[temp_node]) == 1
+
+    readings = data.flush_latest_readings()
+    status = data.make_simple_telemetry_status(temp_node, readings)
+    assert status.ValueList == [values[0], values[-1]]
+    assert status.ReadTimeUnixMsList == [times[0], times[-1]]
+    assert (status.CompressionMethod, status.CompressionErrorBound) == ("swinging_door", pytest.approx(50))
+    assert status.TypeAlias == "gt.sh.simple.telemetry.status.101"
+    assert readings.simple_aggregates[temp_node].count == 60
+    assert data.compression_by_channel()[temp_node.alias].ratio == 30
+
+    # The compact status aggregates every reading, not only those kept.
+    (aggregate,) = data.make_compact_status(SLOT_S, readings).TelemetryAggregateList
+    assert (aggregate.Count, aggregate.Min, aggregate.Max) == (60, values[0], values[-1])
+    assert aggregate.ValueList == status.ValueList
+
+    # The next period starts with its own first reading.
+    data.record_simple_reading(temp_node, 200_000, START_MS + 60_000)
+    assert data.recent_simple_values[temp_node].tolist() == [200_000]
+    data.close()
+
+
+def test_compression_disabled():
+    settings = ScadaSettings()
+    layout = HardwareLayout.load(settings.paths.hardware_layout)
+    data = ScadaData(settings, layout)
+    assert data.compressors == {}
+    temp_node = layout.node("a.tank.temp0")
+    for i in range(5):
+        data.record_simple_reading(temp_node, 120_000, START_MS + 1000 * i)
+    status = data.make_simple_telemetry_status(temp_node, data.flush_latest_readings())
+    assert len(status.ValueList) == 5
+    assert (status.CompressionMethod, status.CompressionErrorBound) == (None, None)
+    assert status.TypeAlias == "gt.sh.simple.telemetry.status.100"
+    assert "CompressionMethod" not in status.asdict()
+    assert data.compression_by_channel() == {}
+    data.close()
+
+
+def test_atn_reconstructs_by_status_compression(tmp_path: Path):
+    # The Scada compresses by deadband while the Atn's own settings name swinging_door.
+    scada_settings = ScadaSettings(
+        paths=Paths(data_dir=tmp_path / "scada"),
+        telemetry_compression=TelemetryCompressionSettings(enabled=True, method=CompressionMethod.deadband),
+    )
+    layout = HardwareLayout.load(scada_settings.paths.hardware_layout)
+    data = ScadaData(scada_settings, layout)
+    temp_node = layout.node("a.tank.temp0")
+    for value, read_time_unix_ms in [(120_000, START_MS), (120_500, START_MS + 10_000), (121_000, START_MS + 20_000)]:
+        data.record_simple_reading(temp_node, value, read_time_unix_ms)
+    status = data.make_status(SLOT_S, data.flush_latest_readings())
+
+    atn_settings = ScadaSettings(paths=Paths(data_dir=tmp_path / "atn"))
+    assert atn_settings.telemetry_compression.method == CompressionMethod.swinging_door
+    atn = Atn("a", atn_settings, layout)
+    atn.gt_sh_status_received(status)
+    assert atn.simple_telemetry_series(temp_node.alias, [START_MS + 5_000, START_MS + 15_000]) == [120_000, 120_500]
+    assert atn.simple_telemetry_series("a.not.a.node", [START_MS]) is None
+    data.close()
@@ -49,6 +49,7 @@ from proactor.message import MQTTConnectPayload
 from proactor.message import MQTTDisconnectPayload
 from proactor.message import MQTTReceiptPayload
 from proactor.message import MQTTSubackPayload
+from schema import binary_codec
 from schema.gt.gt_dispatch_boolean_local.gt_dispatch_boolean_local import (
     GtDispatchBooleanLocal,
 )
@@ -260,7 +261,10 @@ class AtnRecorder(Atn):
         self.logger.info(
             f"type_alias: [{type_alias}] present in {self.decoders.types()}? {type_alias in self.decoders.types()}")
         if type_alias not in TypeMakerByAliasDict.keys():
-            topic = self.decoders.decode_str(type_alias, message.payload).header.message_type
+            if binary_codec.is_binary(message.payload):
+                topic = self.decoders.decode(type_alias, binary_codec.loads(message.payload)).header.message_type
+            else:
+                topic = self.decoders.decode_str(type_alias, message.payload).header.message_type
         else:
             topic = message.topic
         old_num_received_by_topic = self.num_received_by_topic[topic]